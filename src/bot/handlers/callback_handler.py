@@ -8,6 +8,7 @@ from pathlib import Path
 sys.path.insert(0, str(Path(__file__).parent.parent.parent / 'src'))
 
 from src.utils.concert_utils import get_concert_date, get_concert_venue
+from src.bot.outbound import get_outbound
 
 from src.bot.utils import (
     remove_duplicate_concerts,
@@ -35,7 +36,8 @@ async def handle_city_selection(callback: CallbackQuery, user_results: Dict):
         available_cities = results.get('available_cities', [])
         if available_cities:
             city_keyboard = create_city_selection_keyboard(available_cities)
-            await callback.message.edit_text(
+            await get_outbound().edit(
+                callback.message,
                 f"📍 Выберите город для просмотра концертов:",
                 reply_markup=city_keyboard
             )
@@ -76,7 +78,8 @@ async def handle_city_selection(callback: CallbackQuery, user_results: Dict):
             results.get('available_cities', [])
         )
 
-        await callback.message.edit_text(
+        await get_outbound().edit(
+            callback.message,
             f"✅ Готово! Вот список концертов по вашим интересам:\n\n{concert_text}",
             reply_markup=keyboard
         )
@@ -88,7 +91,8 @@ async def handle_city_selection(callback: CallbackQuery, user_results: Dict):
         available_cities = results.get('available_cities', [])
         if available_cities:
             city_keyboard = create_city_selection_keyboard(available_cities)
-            await callback.message.edit_text(
+            await get_outbound().edit(
+                callback.message,
                 f"📍 Выберите город для просмотра концертов:",
                 reply_markup=city_keyboard
             )
@@ -130,7 +134,8 @@ async def handle_city_selection(callback: CallbackQuery, user_results: Dict):
         results.get('available_cities', [])
     )
 
-    await callback.message.edit_text(
+    await get_outbound().edit(
+        callback.message,
         f"✅ Готово! Вот список концертов по вашим интересам:\n\n{concert_text}",
         reply_markup=keyboard
     )
@@ -176,7 +181,8 @@ async def handle_sort(callback: CallbackQuery, user_results: Dict):
         results.get('available_cities', [])
     )
 
-    await callback.message.edit_text(
+    await get_outbound().edit(
+        callback.message,
         f"✅ Готово! Вот список концертов по вашим интересам:\n\n{concert_text}",
         reply_markup=keyboard
     )
@@ -206,7 +212,8 @@ async def handle_pagination(callback: CallbackQuery, user_results: Dict):
         results.get('available_cities', [])
     )
 
-    await callback.message.edit_text(
+    await get_outbound().edit(
+        callback.message,
         f"✅ Готово! Вот список концертов по вашим интересам:\n\n{concert_text}",
         reply_markup=keyboard
     )
@@ -260,7 +267,9 @@ async def handle_recommendations(callback: CallbackQuery, user_results: Dict):
 
     try:
         from src.services.recommendation_service import RecommendationService
+        from src.services.recommendation_cache import get_recommendation_cache, profile_key
         from src.repositories.concert_repository import ConcertRepository
+        from src.repositories.user_recommendation_repository import UserRecommendationRepository
 
         repository = ConcertRepository()
 
@@ -280,18 +289,18 @@ async def handle_recommendations(callback: CallbackQuery, user_results: Dict):
         else:
             city_code = ''
 
-        recommendation_service = RecommendationService(repository, city=city_code)
+        store = UserRecommendationRepository()
+        await store.mark_active(user_id, city_code)
+        recommended_concerts = await store.get_recommendations(user_id, city_code, profile_key(artists))
 
-        if not recommendation_service.enabled:
-            await callback.answer(
-                "⚠️ Рекомендации отключены. Установите GEMINI_API_KEY в .env",
-                show_alert=True
+        if not recommended_concerts:
+            recommendation_service = RecommendationService(
+                repository, city=city_code, cache=get_recommendation_cache(), use_playlist_stats=True
+            )
+            recommended_concerts = await recommendation_service.get_recommendations_async(
+                artists,
+                max_recommendations=10
             )
-            return
-        recommended_concerts = recommendation_service.get_recommendations(
-            artists,
-            max_recommendations=10
-        )
 
         if not recommended_concerts:
             await callback.answer(
@@ -320,7 +329,8 @@ async def handle_recommendations(callback: CallbackQuery, user_results: Dict):
             results.get('available_cities', [])
         )
 
-        await callback.message.answer(
+        await get_outbound().send(
+            callback.message,
             f"{header}{concert_text}",
             reply_markup=keyboard
         )
@@ -360,7 +370,8 @@ async def handle_refresh(callback: CallbackQuery, user_results: Dict):
             results['sort_by'],
             results.get('available_cities', [])
         )
-        await callback.message.edit_text(
+        await get_outbound().edit(
+            callback.message,
             f"✅ Готово! Вот список концертов по вашим интересам:\n\n{concert_text}",
             reply_markup=keyboard
         )
@@ -1,6 +1,6 @@
 import re
 import logging
-from typing import Dict, List
+from typing import Dict, List, Optional, Tuple
 from aiogram import F
 from aiogram.types import Message, InlineKeyboardMarkup, InlineKeyboardButton
 from aiogram.fsm.context import FSMContext
@@ -9,14 +9,21 @@ import sys
 from pathlib import Path
 sys.path.insert(0, str(Path(__file__).parent.parent.parent / 'src'))
 
-from src.services.music_playlist_client import MusicClient
-from src.services.playlist_service import ServicePlaylist
+from src.services.music_playlist_client import get_shared_music_client
+from src.bot.outbound import get_outbound
+from src.utils.metrics import inc, span, timer
 from src.repositories.concert_repository import ConcertRepository
+from src.repositories.artist_repository import ArtistRepository
+from src.repositories.user_artist_repository import UserArtistRepository
+from src.repositories.user_recommendation_repository import UserRecommendationRepository
+from src.services.artist_resolver import ArtistResolver, playlist_artists
+from src.services.concert_service import ConcertMatcherService, CatalogIndex, StreamingConcertMatcher
 from src.utils.url_parser import extract_from_url
 from src.utils.concert_utils import get_concert_date
 from src.clients.global_concert_client import (
     get_artist_events,
     convert_ticketmaster_to_afisha_format,
+    record_playlist_artists,
     TicketmasterError,
     DEFAULT_USER_ARTISTS_LIMIT
 )
@@ -35,17 +42,18 @@ from src.bot.utils import (
 
 logger = logging.getLogger(__name__)
 
+_catalog: Optional[Tuple[Tuple[int, Optional[str]], CatalogIndex]] = None
+_catalog_lock = asyncio.Lock()
+
 class ConcertService:
     def __init__(self, repository: ConcertRepository):
-        from src.services.concert_service import ConcertMatcherService
         self.matcher = ConcertMatcherService(repository, city='')
         self.repository = repository
 
     def get_available_cities(self, concerts: list) -> list:
         return get_available_cities(concerts)
 
-    def find_concerts_by_artists(self, artist_names: list) -> list:
-        all_concerts = self.repository.get_events_by_category('concert')
+    def log_catalog(self, all_concerts: list):
         logger.info(f"Found {len(all_concerts)} concerts in database (all cities and sources)")
 
         source_counts_db = {}
@@ -67,55 +75,50 @@ class ConcertService:
         logger.info(f"Sample distribution by source in DB: {source_counts_db}")
         logger.info(f"Sample distribution by city in DB: {city_counts_db}")
 
-        artist_to_concerts = {}
-        for artist_name in artist_names:
-            matching_concerts = []
-            for concert in all_concerts:
-                title = concert.get('title', '')
-                if title and self.matcher.find_artist_in_text(artist_name, title):
-                    matching_concerts.append(concert)
-                    continue
-
-                full_title = concert.get('full_title', '')
-                if full_title and self.matcher.find_artist_in_text(artist_name, full_title):
-                    matching_concerts.append(concert)
-                    continue
-
-                description = concert.get('description', '')
-                if description and len(description) > 20:
-                    normalized_artist = self.matcher.normalize_name(artist_name)
-                    artist_clean = re.sub(r'[^\w\s]', '', normalized_artist)
-                    desc_clean = re.sub(r'[^\w\s]', '', description.lower())
-
-                    if len(artist_clean) >= 4:
-                        pattern = r'\b' + re.escape(artist_clean) + r'\b'
-                        if re.search(pattern, desc_clean):
-                            matching_concerts.append(concert)
-                            continue
-
-            if matching_concerts:
-                artist_to_concerts[artist_name] = matching_concerts
-        seen_urls = set()
-        url_to_artists = {}
-        concerts = []
-
-        for artist_name, artist_concerts in artist_to_concerts.items():
-            for concert in artist_concerts:
-                url = concert.get('url')
-                if url:
-                    if url not in url_to_artists:
-                        url_to_artists[url] = []
-                    url_to_artists[url].append(artist_name)
-
-        for artist_concerts in artist_to_concerts.values():
-            for concert in artist_concerts:
-                url = concert.get('url')
-                if url and url not in seen_urls:
-                    seen_urls.add(url)
-                    if url in url_to_artists:
-                        concert['matched_artist'] = ', '.join(url_to_artists[url])
-                    concerts.append(concert)
+    def build_index(self, all_concerts: list) -> CatalogIndex:
+        index = CatalogIndex(all_concerts, self.matcher)
+        logger.info(f"Catalog index built for {len(index)} concerts (version {index.version[:8]})")
+        return index
+
+    def load_catalog(self) -> CatalogIndex:
+        with span('catalog.load'):
+            all_concerts = self.repository.get_events_by_category('concert')
+        self.log_catalog(all_concerts)
+
+        with span('catalog.index'):
+            return CatalogIndex(all_concerts, self.matcher)
+
+    async def load_catalog_async(self) -> CatalogIndex:
+        global _catalog
+        stamp = await self.repository.get_catalog_stamp('concert')
+        async with _catalog_lock:
+            if stamp is not None and _catalog is not None and _catalog[0] == stamp:
+                inc('catalog_cache_total', result='hit')
+                return _catalog[1]
+            inc('catalog_cache_total', result='miss')
+
+            with span('catalog.load'):
+                all_concerts = await self.repository.get_events_by_category_async('concert')
+            self.log_catalog(all_concerts)
+
+            with span('catalog.index'):
+                index = await asyncio.to_thread(self.build_index, all_concerts)
+            if stamp is not None:
+                _catalog = (stamp, index)
+            return index
+
+    def create_streaming_matcher(self) -> StreamingConcertMatcher:
+        return StreamingConcertMatcher(self.load_catalog())
+
+    async def create_streaming_matcher_async(self) -> StreamingConcertMatcher:
+        return StreamingConcertMatcher(await self.load_catalog_async())
 
+    def find_concerts_by_artists(self, artist_names: list) -> list:
+        streaming = self.create_streaming_matcher()
+        streaming.add_artists(artist_names)
+        return self.finalize_concerts(streaming.results())
+
+    def finalize_concerts(self, concerts: list) -> list:
         logger.info(f"Found {len(concerts)} unique concerts matching artists (all cities)")
 
         unique_concerts = remove_duplicate_concerts(concerts)
@@ -201,6 +204,16 @@ class ConcertService:
     def group_by_artist(self, concerts: list) -> dict:
         return group_by_artist(concerts)
 
+def format_streaming_progress(processed: int, total_tracks: int, artists_count: int, concerts: list, preview: int = 3) -> str:
+    text = (
+        f"⏳ Обработано {processed}/{total_tracks if total_tracks > 0 else '?'} треков, "
+        f"найдено {artists_count} артистов, концертов в БД: {len(concerts)}"
+    )
+    if concerts:
+        titles = '\n'.join(f"• {c.get('title', 'Без названия')}" for c in concerts[:preview])
+        text += f"\n\n🎫 Первые находки:\n{titles}"
+    return text
+
 async def handle_playlist_url(message: Message, state: FSMContext, user_results: Dict):
     user_id = message.from_user.id
 
@@ -231,61 +244,74 @@ async def handle_playlist_url(message: Message, state: FSMContext, user_results:
                 )
                 return
 
-        status_msg = await message.answer("⏳ Сканирую плейлист (это займет ~2-3 минуты)...")
+        outbound = get_outbound()
+        status_msg = await outbound.send(message, "⏳ Сканирую плейлист (это займет ~2-3 минуты)...")
 
         try:
-            music_client = MusicClient.from_env()
-            playlist_service = ServicePlaylist(music_client)
+            music_client = await get_shared_music_client()
             repository = ConcertRepository()
             concert_service = ConcertService(repository)
         except Exception as e:
             logger.error(f"Ошибка инициализации: {e}", exc_info=True)
-            await status_msg.edit_text("❌ Ошибка инициализации сервисов. Проверьте настройки.")
+            await outbound.edit(status_msg, "❌ Ошибка инициализации сервисов. Проверьте настройки.")
             await state.clear()
             return
 
+        total_timer = timer('playlist.total')
         try:
-            playlist = music_client.get_playlist(kind, owner)
-            tracks = playlist.fetch_tracks()
+            with span('playlist.fetch'):
+                playlist = await music_client.get_playlist(kind, owner)
+            total_tracks = playlist.track_count or len(playlist.tracks or [])
 
-            total_tracks = 0
-            tracks_list = []
-            for tr in tracks:
-                tracks_list.append(tr)
-                total_tracks += 1
+            streaming = await concert_service.create_streaming_matcher_async()
+            resolver = ArtistResolver(ArtistRepository(), streaming, streaming.index.version)
 
-            artists = set()
+            artists = []
+            seen_artists = set()
             processed = 0
 
-            for tr in tracks_list:
-                t = tr.track
-                if t and t.artists:
-                    for artist in t.artists:
-                        if artist.name:
-                            artists.add(artist.name)
-                processed += 1
-
-                if processed % 50 == 0:
-                    try:
-                        await status_msg.edit_text(
-                            f"⏳ Обработано {processed}/{total_tracks if total_tracks > 0 else '?'} треков..."
-                        )
-                    except:
-                        pass
-
-            artist_list = list(artists)
-
-            await status_msg.edit_text(
-                f"✅ Найдено {len(artist_list)} уникальных артистов\n"
-                f"🔍 Ищу концерты в базе данных..."
+            scan_timer = timer('playlist.scan')
+            async for batch in music_client.iter_track_batches(playlist):
+                new_artists = []
+                for artist_id, name in playlist_artists(batch):
+                    if name not in seen_artists:
+                        seen_artists.add(name)
+                        new_artists.append((artist_id, name))
+                processed += len(batch)
+
+                artists.extend(name for _, name in new_artists)
+                with span('playlist.resolve'):
+                    await resolver.resolve(new_artists)
+
+                outbound.edit(status_msg, format_streaming_progress(processed, total_tracks, len(artists), streaming.results()))
+
+            artist_list = artists
+            with span('playlist.resolve'):
+                await resolver.flush()
+            scan_timer.stop()
+            inc('playlist_tracks_total', processed)
+            inc('playlist_artists_total', len(artist_list))
+            for source in ('cached', 'materialized', 'matched'):
+                inc('artist_resolve_total', resolver.stats[source], source=source)
+            logger.info(
+                f"Артисты: {resolver.stats['cached']} из кэша по id, {resolver.stats['materialized']} из artist_events, "
+                f"{resolver.stats['matched']} сопоставлено по тексту"
             )
-
-            concerts = concert_service.find_concerts_by_artists(artist_list)
+            with span('playlist.save_artists'):
+                await asyncio.to_thread(record_playlist_artists, artist_list)
+                await UserArtistRepository().save_user_artists(user_id, artist_list)
+                await UserRecommendationRepository().mark_active(user_id, '')
+
+            with span('playlist.finalize'):
+                concerts = concert_service.finalize_concerts(streaming.results())
+            inc('playlist_concerts_matched_total', len(concerts))
             logger.info(f"Найдено концертов в БД: {len(concerts)}")
 
             ticketmaster_concerts = []
+            ticketmaster_timer = timer('playlist.ticketmaster')
             try:
-                await status_msg.edit_text(
+                outbound.edit(
+                    status_msg,
                     f"✅ Найдено {len(concerts)} концертов в БД\n"
                     f"🌍 Ищу концерты через Ticketmaster..."
                 )
@@ -296,15 +322,13 @@ async def handle_playlist_url(message: Message, state: FSMContext, user_results:
                 for i, artist_name in enumerate(artists_to_check, 1):
                     try:
                         if i % 5 == 0:
-                            try:
-                                await status_msg.edit_text(
-                                    f"✅ Найдено {len(concerts)} концертов в БД\n"
-                                    f"🌍 Проверяю Ticketmaster: {i}/{len(artists_to_check)} артистов..."
-                                )
-                            except:
-                                pass
-
-                        events = get_artist_events(artist_name, page_size=10)
+                            outbound.edit(
+                                status_msg,
+                                f"✅ Найдено {len(concerts)} концертов в БД\n"
+                                f"🌍 Проверяю Ticketmaster: {i}/{len(artists_to_check)} артистов..."
+                            )
+
+                        events = get_artist_events(artist_name, page_size=10, max_pages=1)
                         if events:
                             for event in events:
                                 afisha_event = convert_ticketmaster_to_afisha_format(event)
@@ -325,7 +349,9 @@ async def handle_playlist_url(message: Message, state: FSMContext, user_results:
 
             except Exception as e:
                 logger.error(f"Ошибка при поиске через Ticketmaster: {e}", exc_info=True)
+            ticketmaster_timer.stop()
 
+            sort_timer = timer('playlist.sort')
             all_concerts = concerts + ticketmaster_concerts
             logger.info(f"Всего концертов (БД + Ticketmaster): {len(all_concerts)}")
 
@@ -340,6 +366,7 @@ async def handle_playlist_url(message: Message, state: FSMContext, user_results:
                                        get_concert_date(x) or ''
                                    ))
             sorted_concerts = remove_duplicate_concerts(sorted_concerts)
+            sort_timer.stop()
 
             user_results[user_id] = {
                 'concerts': sorted_concerts,
@@ -353,10 +380,12 @@ async def handle_playlist_url(message: Message, state: FSMContext, user_results:
                 'available_cities': available_cities
             }
 
+            render_timer = timer('playlist.render')
             if sorted_concerts:
                 if len(available_cities) > 0:
                     city_keyboard = create_city_selection_keyboard(available_cities)
-                    await status_msg.edit_text(
+                    await outbound.edit(
+                        status_msg,
                         f"✅ Найдено {len(sorted_concerts)} концертов в {len(available_cities)} городе(ах).\n\n"
                         f"📍 Выберите город для просмотра концертов или нажмите '🌍 Все города' для просмотра всех событий:",
                         reply_markup=city_keyboard
@@ -365,21 +394,26 @@ async def handle_playlist_url(message: Message, state: FSMContext, user_results:
                     concert_text = format_concert_message(sorted_concerts, 0, 10, 'date')
                     keyboard = create_concert_keyboard(sorted_concerts, 0, 10, None, 'date', available_cities)
 
-                    await status_msg.edit_text(
+                    await outbound.edit(
+                        status_msg,
                         f"✅ Готово! Вот список концертов по вашим интересам:\n\n{concert_text}",
                         reply_markup=keyboard
                     )
             else:
-                await status_msg.edit_text(
+                await outbound.edit(
+                    status_msg,
                     f"😔 К сожалению, концерты для ваших артистов не найдены.\n"
                     f"Найдено артистов: {len(artist_list)}\n\n"
                     f"Возможно, концерты еще не добавлены в базу данных. "
                     f"Попробуйте запустить парсер концертов."
                 )
+            render_timer.stop()
+            inc('playlists_total', result='ok')
 
             await state.clear()
 
         except Exception as e:
+            inc('playlists_total', result='error')
             logger.error(f"Ошибка обработки плейлиста: {e}", exc_info=True)
             error_msg = str(e)
             if "not found" in error_msg.lower() or "404" in error_msg.lower():
@@ -406,11 +440,12 @@ async def handle_playlist_url(message: Message, state: FSMContext, user_results:
                     f"• Токен Яндекс Музыки настроен правильно"
                 )
             try:
-                await status_msg.edit_text(user_msg)
+                await outbound.edit(status_msg, user_msg)
             except:
-                await message.answer(user_msg)
+                await outbound.send(message, user_msg)
             await state.clear()
         finally:
+            total_timer.stop()
             try:
                 await repository.close()
             except:
@@ -17,6 +17,11 @@ sys.path.insert(0, str(project_root))
 sys.path.insert(0, str(project_root / 'src'))
 
 from src.bot.handlers.playlist_handler import handle_playlist_url
+from src.bot.outbound import get_outbound
+from src.utils.metrics import log_periodically, metrics
+from src.services.music_playlist_client import get_shared_music_client
+from src.db.database import init_db, close_db
+from src.config.settings import config
 from src.bot.handlers.callback_handler import (
     handle_city_selection,
     handle_sort,
@@ -43,6 +48,7 @@ class PlaylistStates(StatesGroup):
     processing = State()
 
 user_results = {}
+background_tasks = []
 
 @dp.message(Command(commands="start"))
 async def start_command(message: Message):
@@ -101,13 +107,53 @@ async def handle_other_messages(message: Message):
         "Используйте /help для получения инструкций."
     )
 
+async def on_startup():
+    try:
+        await init_db()
+    except Exception as e:
+        logger.warning(f"Не удалось создать таблицы БД при старте: {e}")
+    try:
+        await get_shared_music_client()
+    except Exception as e:
+        logger.warning(f"Клиент Яндекс Музыки не инициализирован при старте: {e}")
+    if config.METRICS_LOG_INTERVAL > 0:
+        background_tasks.append(asyncio.create_task(log_periodically(config.METRICS_LOG_INTERVAL)))
+
+async def on_shutdown():
+    for task in background_tasks:
+        task.cancel()
+    background_tasks.clear()
+    await get_outbound().close()
+    metrics.log_summary()
+    await close_db()
+
+dp.startup.register(on_startup)
+dp.shutdown.register(on_shutdown)
+
 async def main():
     logger.info("Запуск бота...")
-    await dp.start_polling(bot)
+    await bot.delete_webhook()
+    metrics_runner = None
+    if config.METRICS_PORT:
+        from src.bot.webhook import start_metrics_server
+        metrics_runner = await start_metrics_server()
+    try:
+        await dp.start_polling(bot)
+    finally:
+        if metrics_runner:
+            await metrics_runner.cleanup()
+
+def run_webhook_mode():
+    from src.bot.webhook import run_webhook
+    logger.info("Запуск бота в режиме webhook...")
+    run_webhook(dp, bot)
 
 if __name__ == "__main__":
     try:
-        asyncio.run(main())
+        if config.BOT_MODE == 'webhook':
+            run_webhook_mode()
+        else:
+            asyncio.run(main())
     except KeyboardInterrupt:
         logger.info("Бот остановлен")
     except Exception as e:
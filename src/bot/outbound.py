@@ -0,0 +1,198 @@
+import time
+import asyncio
+import logging
+from collections import OrderedDict, deque
+from typing import Any, Awaitable, Callable, Deque, Dict, Hashable, Optional, Tuple
+from aiogram.exceptions import TelegramRetryAfter
+from src.config.settings import config
+from src.utils.rate_limit import TokenBucket
+
+logger = logging.getLogger(__name__)
+
+MAX_CHAT_BUCKETS = 10000
+
+class _Job:
+    __slots__ = ('call', 'key', 'future', 'enqueued_at', 'attempts')
+
+    def __init__(self, call: Callable[[], Awaitable], key: Optional[Hashable], future: asyncio.Future, enqueued_at: float):
+        self.call = call
+        self.key = key
+        self.future = future
+        self.enqueued_at = enqueued_at
+        self.attempts = 0
+
+def _consume_exception(future: asyncio.Future):
+    if not future.cancelled() and future.exception() is not None:
+        logger.debug(f"Outbound call failed: {future.exception()}")
+
+def _log_failure(chat_id: Hashable, error: Exception):
+    if 'message is not modified' in str(error):
+        logger.debug(f"Outbound edit for chat {chat_id} skipped: {error}")
+    else:
+        logger.warning(f"Outbound call to chat {chat_id} failed: {error}")
+
+def _chain(source: asyncio.Future, target: asyncio.Future):
+    if target.done():
+        return
+    if source.cancelled():
+        target.cancel()
+    elif source.exception() is not None:
+        target.set_exception(source.exception())
+    else:
+        target.set_result(source.result())
+
+class OutboundScheduler:
+    def __init__(
+        self,
+        global_rate: float = None,
+        chat_rate: float = None,
+        chat_burst: float = None,
+        retries: int = None,
+        delay_warning: float = None,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        self.chat_rate = chat_rate or config.TELEGRAM_CHAT_RATE
+        self.chat_burst = chat_burst or config.TELEGRAM_CHAT_BURST
+        self.retries = retries if retries is not None else config.TELEGRAM_MAX_RETRIES
+        self.delay_warning = delay_warning if delay_warning is not None else config.TELEGRAM_QUEUE_DELAY_WARNING
+        self.clock = clock
+        self.global_bucket = TokenBucket(global_rate or config.TELEGRAM_GLOBAL_RATE, clock=clock, name="Telegram")
+        self._chat_buckets: "OrderedDict[Hashable, TokenBucket]" = OrderedDict()
+        self._queues: Dict[Hashable, Deque[_Job]] = {}
+        self._pending: Dict[Tuple[Hashable, Hashable], _Job] = {}
+        self._workers: Dict[Hashable, asyncio.Task] = {}
+        self.delays: Deque[float] = deque(maxlen=1000)
+        self.stats = {"sent": 0, "coalesced": 0, "retried": 0, "failed": 0}
+
+    @property
+    def pending(self) -> int:
+        return sum(len(queue) for queue in self._queues.values())
+
+    def chat_bucket(self, chat_id: Hashable) -> TokenBucket:
+        bucket = self._chat_buckets.get(chat_id)
+        if bucket is None:
+            bucket = TokenBucket(self.chat_rate, capacity=self.chat_burst, clock=self.clock, name=f"Telegram chat {chat_id}")
+            self._chat_buckets[chat_id] = bucket
+            while len(self._chat_buckets) > MAX_CHAT_BUCKETS:
+                self._chat_buckets.popitem(last=False)
+        else:
+            self._chat_buckets.move_to_end(chat_id)
+        return bucket
+
+    def submit(self, chat_id: Hashable, call: Callable[[], Awaitable], key: Optional[Hashable] = None) -> asyncio.Future:
+        if key is not None:
+            job = self._pending.get((chat_id, key))
+            if job is not None:
+                job.call = call
+                self.stats["coalesced"] += 1
+                return job.future
+
+        job = _Job(call, key, asyncio.get_running_loop().create_future(), self.clock())
+        job.future.add_done_callback(_consume_exception)
+        if key is not None:
+            self._pending[(chat_id, key)] = job
+        self._queues.setdefault(chat_id, deque()).append(job)
+
+        if chat_id not in self._workers:
+            self._workers[chat_id] = asyncio.create_task(self._drain(chat_id))
+        return job.future
+
+    def send(self, message, text: str, **kwargs) -> asyncio.Future:
+        return self.submit(message.chat.id, lambda: message.answer(text, **kwargs))
+
+    def edit(self, message, text: str, **kwargs) -> asyncio.Future:
+        return self.submit(message.chat.id, lambda: message.edit_text(text, **kwargs), key=message.message_id)
+
+    def send_message(self, bot, chat_id: Hashable, text: str, **kwargs) -> asyncio.Future:
+        return self.submit(chat_id, lambda: bot.send_message(chat_id, text, **kwargs))
+
+    async def _drain(self, chat_id: Hashable):
+        queue = self._queues[chat_id]
+        try:
+            while queue:
+                job = queue[0]
+                await self.chat_bucket(chat_id).acquire()
+                await self.global_bucket.acquire()
+
+                queue.popleft()
+                if job.key is not None:
+                    self._pending.pop((chat_id, job.key), None)
+                if job.future.done():
+                    continue
+
+                if job.attempts == 0:
+                    self._record_delay(chat_id, self.clock() - job.enqueued_at)
+
+                try:
+                    result = await job.call()
+                except TelegramRetryAfter as e:
+                    if job.attempts < self.retries:
+                        job.attempts += 1
+                        self.stats["retried"] += 1
+                        self.chat_bucket(chat_id).pause(e.retry_after)
+                        self._requeue(chat_id, queue, job)
+                        continue
+                    self.stats["failed"] += 1
+                    _log_failure(chat_id, e)
+                    job.future.set_exception(e)
+                except Exception as e:
+                    self.stats["failed"] += 1
+                    _log_failure(chat_id, e)
+                    job.future.set_exception(e)
+                else:
+                    self.stats["sent"] += 1
+                    job.future.set_result(result)
+        finally:
+            for job in queue:
+                job.future.cancel()
+                if job.key is not None:
+                    self._pending.pop((chat_id, job.key), None)
+            del self._queues[chat_id]
+            del self._workers[chat_id]
+
+    def _requeue(self, chat_id: Hashable, queue: Deque[_Job], job: _Job):
+        newer = self._pending.get((chat_id, job.key)) if job.key is not None else None
+        if newer is not None:
+            newer.future.add_done_callback(lambda future: _chain(future, job.future))
+            return
+        queue.appendleft(job)
+        if job.key is not None:
+            self._pending[(chat_id, job.key)] = job
+
+    def _record_delay(self, chat_id: Hashable, delay: float):
+        self.delays.append(delay)
+        if delay >= self.delay_warning:
+            logger.warning(f"Outbound message to chat {chat_id} waited {delay:.1f}s in queue")
+
+    def summary(self) -> Dict[str, Any]:
+        delays = sorted(self.delays)
+
+        def pct(value: float) -> float:
+            if not delays:
+                return 0.0
+            return delays[min(len(delays) - 1, int(value / 100 * len(delays)))]
+
+        return dict(self.stats, pending=self.pending, delay_p50=pct(50), delay_p95=pct(95), delay_max=delays[-1] if delays else 0.0)
+
+    async def close(self, timeout: float = 10):
+        workers = list(self._workers.values())
+        if workers:
+            _, still_running = await asyncio.wait(workers, timeout=timeout)
+            for task in still_running:
+                task.cancel()
+            await asyncio.gather(*still_running, return_exceptions=True)
+
+        summary = self.summary()
+        logger.info(
+            f"Outbound: {summary['sent']} sent, {summary['coalesced']} coalesced, {summary['retried']} retried, "
+            f"{summary['failed']} failed, queue delay p50 {summary['delay_p50'] * 1000:.0f} ms, "
+            f"p95 {summary['delay_p95'] * 1000:.0f} ms"
+        )
+
+_shared_scheduler: Optional[OutboundScheduler] = None
+
+def get_outbound() -> OutboundScheduler:
+    global _shared_scheduler
+    if _shared_scheduler is None:
+        _shared_scheduler = OutboundScheduler()
+    return _shared_scheduler
@@ -28,6 +28,9 @@ def mock_callback():
     callback.from_user.id = 12345
     callback.data = "city_moscow"
     callback.message = MagicMock(spec=Message)
+    callback.message.chat = MagicMock(spec=Chat)
+    callback.message.chat.id = 12345
+    callback.message.message_id = 1
     callback.message.edit_text = AsyncMock()
     callback.answer = AsyncMock()
     return callback
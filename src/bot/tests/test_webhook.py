@@ -0,0 +1,169 @@
+import socket
+import asyncio
+import aiohttp
+import pytest
+from unittest.mock import AsyncMock, patch
+from aiohttp.test_utils import TestServer
+from aiogram import Bot, Dispatcher, F
+from aiogram.types import Message, CallbackQuery
+from src.bot.webhook import HANDLER_KEY, HEALTH_PATH, METRICS_PATH, create_webhook_app, run_webhook, start_metrics_server, webhook_url
+from src.utils.metrics import metrics
+from src.scripts.fake_telegram_updates import message_update, push_updates, synthetic_updates
+
+SECRET = 'test-secret'
+
+def make_dispatcher(received, delay: float = 0):
+    dispatcher = Dispatcher()
+
+    @dispatcher.message(F.text)
+    async def on_message(message: Message):
+        await asyncio.sleep(delay)
+        received.append(('message', message.chat.id, message.text))
+
+    @dispatcher.callback_query()
+    async def on_callback(callback: CallbackQuery):
+        received.append(('callback', callback.from_user.id, callback.data))
+
+    return dispatcher
+
+async def start(dispatcher, **kwargs):
+    bot = Bot(token='42:TEST')
+    server = TestServer(create_webhook_app(dispatcher, bot, path='/webhook', secret_token=SECRET, **kwargs))
+    await server.start_server()
+    return server
+
+@pytest.fixture
+def received():
+    return []
+
+@pytest.mark.asyncio
+async def test_updates_are_dispatched(received):
+    server = await start(make_dispatcher(received))
+    try:
+        updates = synthetic_updates(40, chats=5, callback_ratio=0.3, seed=1)
+        stats = await push_updates(str(server.make_url('/webhook')), updates, SECRET, concurrency=8)
+        for _ in range(50):
+            if len(received) == len(updates):
+                break
+            await asyncio.sleep(0.01)
+    finally:
+        await server.close()
+
+    assert stats['accepted'] == 40 and stats['rejected'] == 0
+    assert len(received) == 40
+    assert {kind for kind, _, _ in received} == {'message', 'callback'}
+
+@pytest.mark.asyncio
+async def test_wrong_secret_is_rejected(received):
+    server = await start(make_dispatcher(received))
+    try:
+        stats = await push_updates(str(server.make_url('/webhook')), [message_update(1, 7, '/start')], 'wrong')
+        await asyncio.sleep(0.05)
+    finally:
+        await server.close()
+
+    assert stats['rejected'] == 1
+    assert received == []
+
+@pytest.mark.asyncio
+async def test_health_reports_pending_updates(received):
+    server = await start(make_dispatcher(received, delay=0.2))
+    try:
+        await push_updates(str(server.make_url('/webhook')), [message_update(1, 7, 'slow')], SECRET)
+        pending = server.app[HANDLER_KEY].pending
+        async with aiohttp.ClientSession() as session:
+            async with session.get(server.make_url(HEALTH_PATH)) as response:
+                payload = await response.json()
+    finally:
+        await server.close()
+
+    assert pending == 1
+    assert payload == {'status': 'ok', 'pending_updates': 1}
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+@pytest.mark.asyncio
+async def test_metrics_served_on_internal_port_only(received):
+    metrics.inc('webhook_test_total', 3)
+    port = free_port()
+    server = await start(make_dispatcher(received), metrics_port=port)
+    try:
+        async with aiohttp.ClientSession() as session:
+            async with session.get(server.make_url(METRICS_PATH)) as response:
+                public_status = response.status
+            async with session.get(f'http://127.0.0.1:{port}{METRICS_PATH}') as response:
+                text = await response.text()
+                content_type = response.content_type
+    finally:
+        await server.close()
+
+    assert public_status == 404
+    assert content_type == 'text/plain'
+    assert 'concert_bot_webhook_test_total 3' in text
+
+@pytest.mark.asyncio
+async def test_standalone_metrics_server():
+    metrics.inc('polling_test_total')
+    runner = await start_metrics_server('127.0.0.1', 0)
+    try:
+        port = runner.addresses[0][1]
+        async with aiohttp.ClientSession() as session:
+            async with session.get(f'http://127.0.0.1:{port}{METRICS_PATH}') as response:
+                text = await response.text()
+    finally:
+        await runner.cleanup()
+
+    assert 'concert_bot_polling_test_total 1' in text
+
+@pytest.mark.asyncio
+async def test_shutdown_drains_updates_in_progress(received):
+    server = await start(make_dispatcher(received, delay=0.2))
+    await push_updates(str(server.make_url('/webhook')), [message_update(1, 7, 'slow')], SECRET)
+    await server.close()
+    assert received == [('message', 7, 'slow')]
+
+@pytest.mark.asyncio
+async def test_shutdown_cancels_after_timeout(received):
+    server = await start(make_dispatcher(received, delay=5), drain_timeout=0.05)
+    await push_updates(str(server.make_url('/webhook')), [message_update(1, 7, 'stuck')], SECRET)
+    await server.close()
+    assert received == []
+
+@pytest.mark.asyncio
+async def test_webhook_registered_on_startup(received):
+    dispatcher = make_dispatcher(received)
+    bot = Bot(token='42:TEST')
+    with patch.object(Bot, 'set_webhook', AsyncMock(return_value=True)) as set_webhook:
+        server = TestServer(create_webhook_app(
+            dispatcher, bot, path='/webhook', secret_token=SECRET, register_url='https://bot.example/webhook'
+        ))
+        await server.start_server()
+        await server.close()
+
+    set_webhook.assert_awaited_once()
+    assert set_webhook.await_args.args[0] == 'https://bot.example/webhook'
+    assert set_webhook.await_args.kwargs['secret_token'] == SECRET
+    assert set(set_webhook.await_args.kwargs['allowed_updates']) == {'message', 'callback_query'}
+
+def test_webhook_url_requires_base_url():
+    with patch('src.bot.webhook.config') as mock_config:
+        mock_config.WEBHOOK_BASE_URL = ''
+        with pytest.raises(ValueError):
+            webhook_url()
+        mock_config.WEBHOOK_BASE_URL = 'https://bot.example/'
+        mock_config.WEBHOOK_PATH = '/hook'
+        assert webhook_url() == 'https://bot.example/hook'
+
+def test_webhook_requires_secret(received):
+    with pytest.raises(ValueError):
+        create_webhook_app(make_dispatcher(received), Bot(token='42:TEST'), path='/webhook', secret_token='')
+
+    with patch('src.bot.webhook.config') as mock_config, patch('src.bot.webhook.serve') as serve:
+        mock_config.WEBHOOK_BASE_URL = 'https://bot.example'
+        mock_config.WEBHOOK_SECRET = ''
+        with pytest.raises(ValueError, match='WEBHOOK_SECRET'):
+            run_webhook(make_dispatcher(received), Bot(token='42:TEST'))
+    serve.assert_not_called()
@@ -1,8 +1,11 @@
 import re
 import logging
 from typing import List, Dict
-from aiogram.types import InlineKeyboardMarkup, InlineKeyboardButton
 from src.utils.concert_utils import get_concert_date, get_concert_time, get_concert_venue
+from src.utils.lazy import lazy_attribute
+
+InlineKeyboardMarkup = lazy_attribute('aiogram.types', 'InlineKeyboardMarkup')
+InlineKeyboardButton = lazy_attribute('aiogram.types', 'InlineKeyboardButton')
 
 logger = logging.getLogger(__name__)
 
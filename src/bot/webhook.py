@@ -0,0 +1,121 @@
+import asyncio
+import logging
+from typing import Optional
+from aiohttp import web
+from aiogram import Bot, Dispatcher
+from aiogram.webhook.aiohttp_server import SimpleRequestHandler, setup_application
+from src.config.settings import config
+from src.utils.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+HEALTH_PATH = '/healthz'
+METRICS_PATH = '/metrics'
+
+class DrainingRequestHandler(SimpleRequestHandler):
+    def __init__(self, *args, drain_timeout: float = None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.drain_timeout = drain_timeout if drain_timeout is not None else config.WEBHOOK_SHUTDOWN_TIMEOUT
+
+    @property
+    def pending(self) -> int:
+        return len(self._background_feed_update_tasks)
+
+    async def close(self) -> None:
+        pending = set(self._background_feed_update_tasks)
+        if pending:
+            logger.info(f"Waiting up to {self.drain_timeout:.0f}s for {len(pending)} updates in progress")
+            _, unfinished = await asyncio.wait(pending, timeout=self.drain_timeout)
+            for task in unfinished:
+                task.cancel()
+            if unfinished:
+                logger.warning(f"Cancelled {len(unfinished)} updates on shutdown")
+        await super().close()
+
+HANDLER_KEY = web.AppKey('webhook_handler', DrainingRequestHandler)
+METRICS_RUNNER_KEY = web.AppKey('metrics_runner', web.AppRunner)
+
+async def metrics_endpoint(request: web.Request) -> web.Response:
+    return web.Response(text=metrics.render(), content_type='text/plain')
+
+async def start_metrics_server(host: str = None, port: int = None) -> web.AppRunner:
+    app = web.Application()
+    app.router.add_get(METRICS_PATH, metrics_endpoint)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    await web.TCPSite(runner, host or config.METRICS_HOST, port if port is not None else config.METRICS_PORT).start()
+    logger.info(f"Metrics available at http://{host or config.METRICS_HOST}:{runner.addresses[0][1]}{METRICS_PATH}")
+    return runner
+
+def webhook_url() -> str:
+    if not config.WEBHOOK_BASE_URL:
+        raise ValueError("WEBHOOK_BASE_URL is not set")
+    return config.WEBHOOK_BASE_URL.rstrip('/') + config.WEBHOOK_PATH
+
+def create_webhook_app(
+    dispatcher: Dispatcher,
+    bot: Bot,
+    path: str = None,
+    secret_token: str = None,
+    register_url: Optional[str] = None,
+    drain_timeout: float = None,
+    metrics_port: int = 0
+) -> web.Application:
+    if not secret_token:
+        raise ValueError("A secret token is required for the webhook endpoint")
+    app = web.Application()
+    handler = DrainingRequestHandler(
+        dispatcher=dispatcher, bot=bot, secret_token=secret_token, drain_timeout=drain_timeout
+    )
+    handler.register(app, path=path or config.WEBHOOK_PATH)
+    app[HANDLER_KEY] = handler
+
+    async def health(request: web.Request) -> web.Response:
+        return web.json_response({'status': 'ok', 'pending_updates': handler.pending})
+
+    app.router.add_get(HEALTH_PATH, health)
+
+    if metrics_port:
+        async def metrics_server(app: web.Application):
+            app[METRICS_RUNNER_KEY] = await start_metrics_server(port=metrics_port)
+            yield
+            await app[METRICS_RUNNER_KEY].cleanup()
+
+        app.cleanup_ctx.append(metrics_server)
+
+    if register_url:
+        async def set_webhook(app: web.Application):
+            await bot.set_webhook(
+                register_url,
+                secret_token=secret_token,
+                allowed_updates=dispatcher.resolve_used_update_types()
+            )
+            logger.info(f"Webhook registered at {register_url}")
+
+        app.on_startup.append(set_webhook)
+
+    setup_application(app, dispatcher, bot=bot)
+    return app
+
+def webhook_secret() -> str:
+    if not config.WEBHOOK_SECRET:
+        raise ValueError("WEBHOOK_SECRET is not set, refusing to accept unauthenticated updates")
+    return config.WEBHOOK_SECRET
+
+def serve(dispatcher: Dispatcher, bot: Bot):
+    app = create_webhook_app(
+        dispatcher, bot, secret_token=webhook_secret(), register_url=webhook_url(), metrics_port=config.METRICS_PORT
+    )
+    logger.info(f"Webhook listening on {config.WEBHOOK_HOST}:{config.WEBHOOK_PORT}{config.WEBHOOK_PATH}")
+    web.run_app(
+        app,
+        host=config.WEBHOOK_HOST,
+        port=config.WEBHOOK_PORT,
+        shutdown_timeout=config.WEBHOOK_SHUTDOWN_TIMEOUT,
+        print=None
+    )
+
+def run_webhook(dispatcher: Dispatcher, bot: Bot):
+    webhook_url()
+    webhook_secret()
+    serve(dispatcher, bot)
@@ -0,0 +1,221 @@
+import re
+import json
+import base64
+import logging
+from datetime import datetime
+from typing import Callable, Dict, Iterable, List, Optional
+
+logger = logging.getLogger(__name__)
+
+AFISHA_BASE_URL = 'https://afisha.yandex.ru'
+AFISHA_API_PATTERN = re.compile(r'afisha\.yandex\.ru/api/')
+
+MONTHS_RU = {
+    1: 'января', 2: 'февраля', 3: 'марта', 4: 'апреля',
+    5: 'мая', 6: 'июня', 7: 'июля', 8: 'августа',
+    9: 'сентября', 10: 'октября', 11: 'ноября', 12: 'декабря'
+}
+
+EMBEDDED_STATE_SCRIPT = """
+return Array.from(document.querySelectorAll('script[type="application/json"], script#__NEXT_DATA__'))
+    .map(s => s.textContent)
+    .filter(t => t && t.indexOf('"url"') !== -1);
+"""
+
+def is_afisha_api_url(url: str) -> bool:
+    return bool(url and AFISHA_API_PATTERN.search(url))
+
+def drain_performance_log(driver) -> List[Dict]:
+    messages = []
+    try:
+        for entry in driver.get_log('performance'):
+            try:
+                messages.append(json.loads(entry['message'])['message'])
+            except (KeyError, ValueError):
+                continue
+    except Exception as e:
+        logger.debug(f"Performance log unavailable: {e}")
+    return messages
+
+def collect_json_responses(driver, url_filter: Callable[[str], bool] = is_afisha_api_url) -> List:
+    responses = {}
+    finished = set()
+
+    for message in drain_performance_log(driver):
+        method = message.get('method')
+        params = message.get('params', {})
+        if method == 'Network.responseReceived':
+            response = params.get('response', {})
+            if 'json' in (response.get('mimeType') or '') and url_filter(response.get('url', '')):
+                responses[params.get('requestId')] = response.get('url')
+        elif method == 'Network.loadingFinished':
+            finished.add(params.get('requestId'))
+
+    payloads = []
+    for request_id, url in responses.items():
+        if request_id not in finished:
+            continue
+        try:
+            result = driver.execute_cdp_cmd('Network.getResponseBody', {'requestId': request_id})
+            body = result.get('body', '')
+            if result.get('base64Encoded'):
+                body = base64.b64decode(body).decode('utf-8')
+            payloads.append(json.loads(body))
+        except Exception as e:
+            logger.debug(f"Could not read response body for {url}: {e}")
+
+    logger.debug(f"Captured {len(payloads)} JSON responses")
+    return payloads
+
+def collect_embedded_state(driver) -> List:
+    payloads = []
+    try:
+        for text in driver.execute_script(EMBEDDED_STATE_SCRIPT) or []:
+            try:
+                payloads.append(json.loads(text))
+            except ValueError:
+                continue
+    except Exception as e:
+        logger.debug(f"Could not read embedded page state: {e}")
+    return payloads
+
+def _iter_event_items(node) -> Iterable[Dict]:
+    if isinstance(node, dict):
+        event = node.get('event')
+        if isinstance(event, dict) and event.get('url') and event.get('title'):
+            yield node
+            return
+        if node.get('url') and node.get('title') and ('scheduleInfo' in node or 'dates' in node):
+            yield node
+            return
+        for value in node.values():
+            yield from _iter_event_items(value)
+    elif isinstance(node, list):
+        for value in node:
+            yield from _iter_event_items(value)
+
+def _parse_iso(value: Optional[str]) -> Optional[datetime]:
+    if not value or not isinstance(value, str):
+        return None
+    try:
+        return datetime.fromisoformat(value.replace('Z', '+00:00'))
+    except ValueError:
+        return None
+
+def _human_date(value: Optional[str]) -> Optional[str]:
+    parsed = _parse_iso(value)
+    if not parsed:
+        return None
+    text = f"{parsed.day} {MONTHS_RU[parsed.month]}"
+    if 'T' in value and (parsed.hour or parsed.minute):
+        text += f", {parsed.hour:02d}:{parsed.minute:02d}"
+    return text
+
+def _extract_dates(schedule: Dict, event: Dict) -> List[str]:
+    dates = schedule.get('dates') or event.get('dates') or []
+    if isinstance(dates, dict):
+        dates = list(dates.values())
+    dates = [d for d in dates if isinstance(d, str)]
+
+    if not dates:
+        for session in schedule.get('sessions') or []:
+            if isinstance(session, dict) and session.get('datetime'):
+                dates.append(session['datetime'])
+
+    if not dates:
+        for key in ('dateStarted', 'date'):
+            if isinstance(schedule.get(key), str):
+                dates.append(schedule[key])
+                break
+
+    return dates
+
+def _extract_place(schedule: Dict, item: Dict) -> Dict:
+    for place in (schedule.get('onlyPlace'), schedule.get('place'), item.get('place')):
+        if isinstance(place, dict) and place.get('title'):
+            return place
+    preview = schedule.get('placePreview')
+    if isinstance(preview, str):
+        return {'title': preview}
+    return {}
+
+def _extract_price(event: Dict, schedule: Dict) -> Optional[str]:
+    candidates = []
+    for ticket in event.get('tickets') or []:
+        if isinstance(ticket, dict) and isinstance(ticket.get('price'), dict):
+            candidates.append(ticket['price'])
+    if isinstance(schedule.get('price'), dict):
+        candidates.append(schedule['price'])
+
+    for price in candidates:
+        minimum = price.get('min')
+        if minimum:
+            currency = '₽' if (price.get('currency') or 'rub').lower() == 'rub' else price.get('currency')
+            return f"от {minimum} {currency}"
+    return None
+
+def _extract_image(event: Dict) -> Optional[str]:
+    image = event.get('image')
+    if isinstance(image, dict):
+        for key in ('url', 'src'):
+            if isinstance(image.get(key), str):
+                return image[key]
+        for size in (image.get('sizes') or {}).values():
+            if isinstance(size, dict) and size.get('url'):
+                return size['url']
+    elif isinstance(image, str):
+        return image
+    return None
+
+def convert_event_item(item: Dict, category: str, city: str) -> Optional[Dict]:
+    event = item.get('event') if isinstance(item.get('event'), dict) else item
+    schedule = item.get('scheduleInfo') or event.get('scheduleInfo') or {}
+
+    url = event.get('url')
+    title = event.get('title')
+    if not url or not title:
+        return None
+    if url.startswith('/'):
+        url = AFISHA_BASE_URL + url
+    if any(x in url for x in ['/selections/', '/places/', '/filters']):
+        return None
+
+    dates = _extract_dates(schedule, event)
+    place = _extract_place(schedule, item)
+    venue = place.get('title')
+
+    details = [d for d in (_human_date(dates[0]) if dates else None, venue) if d]
+
+    return {
+        'title': title[:500],
+        'full_title': event.get('fullTitle') or event.get('originalTitle'),
+        'url': url,
+        'category': category,
+        'description': ' • '.join(details) if details else None,
+        'date': dates[0] if dates else None,
+        'dates': dates[:10] or None,
+        'price': _extract_price(event, schedule),
+        'venue': venue,
+        'venue_id': place.get('id'),
+        'afisha_id': event.get('id'),
+        'city': city,
+        'image': _extract_image(event),
+        'scraped_at': datetime.utcnow()
+    }
+
+def extract_events_from_payloads(payloads: Iterable, category: str, city: str) -> List[Dict]:
+    events = []
+    seen_urls = set()
+
+    for payload in payloads:
+        for item in _iter_event_items(payload):
+            try:
+                event = convert_event_item(item, category, city)
+            except Exception as e:
+                logger.debug(f"Could not convert captured event: {e}")
+                continue
+            if event and event['url'] not in seen_urls:
+                seen_urls.add(event['url'])
+                events.append(event)
+
+    return events
@@ -0,0 +1,33 @@
+import re
+import math
+from datetime import datetime, timezone
+from typing import Dict, List, Optional
+from src.config.settings import config
+
+def normalize_artist_name(name: str) -> str:
+    return re.sub(r'\s+', ' ', name.lower().strip())
+
+def _as_utc(value: datetime) -> datetime:
+    if value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value
+
+def staleness_hours(last_checked: Optional[datetime], now: datetime, max_hours: float) -> float:
+    if not isinstance(last_checked, datetime):
+        return max_hours * 2
+    age = (now - _as_utc(last_checked)).total_seconds() / 3600
+    return min(max(age, 0.0), max_hours)
+
+def priority_score(artist: Dict, now: datetime, max_staleness_hours: float = None, empty_check_penalty: float = None) -> float:
+    max_hours = max_staleness_hours if max_staleness_hours is not None else config.REFRESH_MAX_STALENESS_HOURS
+    penalty = empty_check_penalty if empty_check_penalty is not None else config.REFRESH_EMPTY_CHECK_PENALTY
+
+    staleness = staleness_hours(artist.get('last_checked'), now, max_hours)
+    popularity = 1 + math.log1p(artist.get('playlist_hits') or 0)
+    yield_factor = 1 / (1 + penalty * (artist.get('empty_checks') or 0))
+    return staleness * popularity * yield_factor
+
+def rank_artists(artists: List[Dict], limit: Optional[int] = None, now: Optional[datetime] = None) -> List[Dict]:
+    now = now or datetime.now(timezone.utc)
+    ranked = sorted(artists, key=lambda a: priority_score(a, now), reverse=True)
+    return ranked[:limit] if limit else ranked
@@ -0,0 +1,112 @@
+from typing import Dict, Iterable, List, Optional
+import logging
+
+logger = logging.getLogger(__name__)
+
+RESOURCE_PATTERNS = {
+    'image': [
+        '*.png', '*.jpg', '*.jpeg', '*.gif', '*.webp', '*.avif', '*.svg', '*.ico', '*.bmp',
+    ],
+    'media': [
+        '*.mp4', '*.webm', '*.ogg', '*.mp3', '*.wav', '*.m3u8', '*.ts', '*.m4s',
+    ],
+    'font': [
+        '*.woff', '*.woff2', '*.ttf', '*.otf', '*.eot',
+    ],
+    'analytics': [
+        '*mc.yandex.ru*',
+        '*mc.yandex.com*',
+        '*an.yandex.ru*',
+        '*ads.adfox.ru*',
+        '*google-analytics.com*',
+        '*googletagmanager.com*',
+        '*doubleclick.net*',
+        '*top-fwz1.mail.ru*',
+        '*counter.yadro.ru*',
+        '*vk.com/rtrg*',
+        '*connect.facebook.net*',
+    ],
+}
+
+def pattern_host(pattern: str) -> Optional[str]:
+    if pattern.startswith('*.'):
+        return None
+    return pattern.strip('*').split('/')[0]
+
+def is_allowlisted(pattern: str, allowlist: Iterable[str]) -> bool:
+    host = pattern_host(pattern)
+    if host is None:
+        extension = pattern[2:]
+        return any(entry.lstrip('.') == extension for entry in allowlist)
+    return any(host == entry or host.endswith('.' + entry) for entry in allowlist)
+
+def url_patterns(pattern: str) -> List[str]:
+    if pattern_host(pattern) is None:
+        return [pattern, f'{pattern}?*']
+    return [pattern]
+
+def build_blocked_url_patterns(resource_types: Iterable[str], allowlist: Iterable[str] = ()) -> List[str]:
+    allowlist = [entry.lower() for entry in allowlist]
+    patterns = []
+
+    for resource_type in resource_types:
+        resource_type = resource_type.lower()
+        if resource_type in allowlist:
+            continue
+        if resource_type not in RESOURCE_PATTERNS:
+            logger.warning(f"Unknown resource type to block: {resource_type}")
+            continue
+
+        for pattern in RESOURCE_PATTERNS[resource_type]:
+            if is_allowlisted(pattern, allowlist):
+                continue
+            for url_pattern in url_patterns(pattern):
+                if url_pattern not in patterns:
+                    patterns.append(url_pattern)
+
+    return patterns
+
+def is_blocked(resource_type: str, resource_types: Iterable[str], allowlist: Iterable[str] = ()) -> bool:
+    allowlist = [entry.lower() for entry in allowlist]
+    return resource_type in [t.lower() for t in resource_types] and resource_type not in allowlist
+
+def light_profile_arguments(resource_types: Iterable[str], allowlist: Iterable[str] = ()) -> List[str]:
+    arguments = [
+        '--disable-background-networking',
+        '--disable-component-update',
+        '--disable-default-apps',
+        '--disable-sync',
+        '--metrics-recording-only',
+        '--no-first-run',
+    ]
+    if is_blocked('image', resource_types, allowlist):
+        arguments.append('--blink-settings=imagesEnabled=false')
+    if is_blocked('media', resource_types, allowlist):
+        arguments.append('--autoplay-policy=user-gesture-required')
+        arguments.append('--mute-audio')
+    if is_blocked('font', resource_types, allowlist):
+        arguments.append('--disable-remote-fonts')
+    return arguments
+
+def light_profile_prefs(resource_types: Iterable[str], allowlist: Iterable[str] = ()) -> Dict:
+    prefs = {}
+    if is_blocked('image', resource_types, allowlist):
+        prefs['profile.managed_default_content_settings.images'] = 2
+    if is_blocked('media', resource_types, allowlist):
+        prefs['profile.managed_default_content_settings.media_stream'] = 2
+    return prefs
+
+def apply_resource_blocking(driver, resource_types: Iterable[str], allowlist: Iterable[str] = ()) -> List[str]:
+    patterns = build_blocked_url_patterns(resource_types, allowlist)
+    if not patterns:
+        return patterns
+
+    try:
+        driver.execute_cdp_cmd('Network.enable', {})
+        driver.execute_cdp_cmd('Network.setBlockedURLs', {'urls': patterns})
+        logger.info(f"Blocking {len(patterns)} URL patterns via CDP")
+    except Exception as e:
+        logger.warning(f"Could not enable CDP request blocking: {e}")
+        return []
+
+    return patterns
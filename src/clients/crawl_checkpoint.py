@@ -0,0 +1,116 @@
+import json
+import os
+import logging
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, Optional
+from src.config.settings import config
+from src.utils.paths import logs_dir
+
+logger = logging.getLogger(__name__)
+
+def default_checkpoint_dir() -> Path:
+    if config.CHECKPOINT_DIR:
+        return Path(config.CHECKPOINT_DIR)
+    return logs_dir() / 'checkpoints'
+
+class CrawlCheckpoint:
+    def __init__(self, city: str, directory: Optional[Path] = None, max_age_hours: Optional[float] = None):
+        self.city = city
+        self.directory = Path(directory) if directory else default_checkpoint_dir()
+        self.path = self.directory / f'{city}.jsonl'
+        self.max_age_hours = max_age_hours if max_age_hours is not None else config.CHECKPOINT_MAX_AGE_HOURS
+        self.completed: Dict[str, int] = {}
+        self.started_at: Optional[datetime] = None
+        self._load()
+        self.resumed = bool(self.completed)
+
+    @staticmethod
+    def category_key(name: str) -> str:
+        return f'category:{name}'
+
+    @staticmethod
+    def page_key(url: str) -> str:
+        return f'page:{url}'
+
+    @staticmethod
+    def selection_key(url: str) -> str:
+        return f'selection:{url}'
+
+    def _load(self):
+        if not self.path.exists():
+            return
+
+        try:
+            self._truncate_partial_tail()
+            with open(self.path, 'r', encoding='utf-8') as f:
+                for line in f:
+                    line = line.strip()
+                    if not line:
+                        continue
+                    try:
+                        entry = json.loads(line)
+                    except json.JSONDecodeError:
+                        logger.debug(f"Skipping truncated checkpoint line in {self.path}")
+                        continue
+
+                    if 'started_at' in entry:
+                        self.started_at = datetime.fromisoformat(entry['started_at'])
+                    elif 'key' in entry:
+                        self.completed[entry['key']] = entry.get('events', 0)
+        except Exception as e:
+            logger.warning(f"Could not read checkpoint {self.path}: {e}")
+            self.completed = {}
+            self.started_at = None
+            return
+
+        if self.started_at is None or self._is_stale():
+            logger.info(f"Discarding stale checkpoint for {self.city}")
+            self.clear()
+            return
+
+        if self.completed:
+            logger.info(f"Loaded checkpoint for {self.city}: {len(self.completed)} completed steps")
+
+    def _truncate_partial_tail(self):
+        with open(self.path, 'rb+') as f:
+            data = f.read()
+            complete = data.rfind(b'\n') + 1
+            if complete < len(data):
+                logger.info(f"Dropping truncated checkpoint tail in {self.path} ({len(data) - complete} bytes)")
+                f.truncate(complete)
+
+    def _is_stale(self) -> bool:
+        age = datetime.now(timezone.utc) - self.started_at
+        return age.total_seconds() > self.max_age_hours * 3600
+
+    def _append(self, entry: Dict):
+        self.directory.mkdir(parents=True, exist_ok=True)
+        with open(self.path, 'a', encoding='utf-8') as f:
+            f.write(json.dumps(entry, ensure_ascii=False) + '\n')
+            f.flush()
+            os.fsync(f.fileno())
+
+    def is_done(self, key: str) -> bool:
+        return key in self.completed
+
+    def mark_done(self, key: str, events_count: int = 0):
+        if self.started_at is None:
+            self.started_at = datetime.now(timezone.utc)
+            self._append({'started_at': self.started_at.isoformat(), 'city': self.city})
+
+        self._append({'key': key, 'events': events_count})
+        self.completed[key] = events_count
+
+    @property
+    def events_count(self) -> int:
+        return sum(self.completed.values())
+
+    def clear(self):
+        try:
+            if self.path.exists():
+                self.path.unlink()
+        except Exception as e:
+            logger.warning(f"Could not remove checkpoint {self.path}: {e}")
+        self.completed = {}
+        self.started_at = None
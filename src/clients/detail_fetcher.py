@@ -0,0 +1,173 @@
+import time
+import logging
+from typing import Callable, Dict, List, Optional
+from selenium.webdriver.support.ui import WebDriverWait
+from src.clients.politeness import PolitenessScheduler
+
+logger = logging.getLogger(__name__)
+
+class RateLimiter:
+    def __init__(self, rate_per_second: float):
+        self.interval = 1.0 / rate_per_second if rate_per_second > 0 else 0.0
+        self._next_slot = 0.0
+
+    def wait(self, multiplier: float = 1.0) -> float:
+        now = time.monotonic()
+        slept = 0.0
+        if now < self._next_slot:
+            slept = self._next_slot - now
+            time.sleep(slept)
+            now = self._next_slot
+        self._next_slot = now + self.interval * multiplier
+        return slept
+
+class DetailCache:
+    def __init__(self, ttl_seconds: float):
+        self.ttl_seconds = ttl_seconds
+        self._entries: Dict[str, tuple] = {}
+
+    def get(self, url: str) -> Optional[Dict]:
+        entry = self._entries.get(url)
+        if not entry:
+            return None
+        stored_at, details = entry
+        if time.time() - stored_at > self.ttl_seconds:
+            del self._entries[url]
+            return None
+        return details
+
+    def set(self, url: str, details: Dict):
+        self._entries[url] = (time.time(), details)
+
+    def __len__(self):
+        return len(self._entries)
+
+class EventDetailFetcher:
+    def __init__(
+        self,
+        driver,
+        extract: Callable[[], Dict],
+        cache: DetailCache,
+        rate_limiter: RateLimiter,
+        tabs: int = 4,
+        page_timeout: int = 30,
+        prepare_tab: Optional[Callable[[], None]] = None,
+        is_blocked: Optional[Callable[[], bool]] = None,
+        scheduler: Optional[PolitenessScheduler] = None
+    ):
+        self.driver = driver
+        self.extract = extract
+        self.cache = cache
+        self.rate_limiter = rate_limiter
+        self.tabs = max(1, tabs)
+        self.page_timeout = page_timeout
+        self.prepare_tab = prepare_tab
+        self.is_blocked = is_blocked
+        self.scheduler = scheduler
+        self.cache_hits = 0
+        self.fetched = 0
+        self.failed = 0
+
+    def fetch(self, urls: List[str]) -> Dict[str, Dict]:
+        results = {}
+        pending = []
+
+        for url in dict.fromkeys(u for u in urls if u):
+            cached = self.cache.get(url)
+            if cached is not None:
+                results[url] = cached
+                self.cache_hits += 1
+            else:
+                pending.append(url)
+
+        if not pending:
+            return results
+
+        main_handle = self.driver.current_window_handle
+        try:
+            for i in range(0, len(pending), self.tabs):
+                batch = pending[i:i + self.tabs]
+                opened = self._open_tabs(batch)
+                for handle, url, started in opened:
+                    details = self._collect(handle, url, started)
+                    if details is not None:
+                        results[url] = details
+        finally:
+            self.driver.switch_to.window(main_handle)
+
+        logger.info(
+            f"Event details: {len(results)}/{len(dict.fromkeys(urls))} "
+            f"(cache hits: {self.cache_hits}, fetched: {self.fetched}, failed: {self.failed})"
+        )
+        return results
+
+    def _wait_for_slot(self, url: str):
+        if not self.scheduler:
+            self.rate_limiter.wait()
+            return
+
+        domain = self.scheduler.domain_of(url)
+        slept = self.rate_limiter.wait(self.scheduler.multiplier(domain))
+        self.scheduler.record_wait(domain, slept)
+
+    def _record(self, url: str, latency: Optional[float] = None, error: bool = False):
+        if self.scheduler:
+            self.scheduler.record(self.scheduler.domain_of(url), latency=latency, error=error)
+
+    def _load_seconds(self, started: float) -> float:
+        try:
+            elapsed_ms = self.driver.execute_script(
+                'const t = performance.timing; return t.domComplete - t.navigationStart;'
+            )
+            if isinstance(elapsed_ms, (int, float)) and elapsed_ms > 0:
+                return elapsed_ms / 1000
+        except Exception:
+            pass
+        return time.monotonic() - started
+
+    def _open_tabs(self, urls: List[str]) -> List[tuple]:
+        opened = []
+        for url in urls:
+            try:
+                self.driver.switch_to.new_window('tab')
+                if self.prepare_tab:
+                    self.prepare_tab()
+                self._wait_for_slot(url)
+                started = time.monotonic()
+                self.driver.execute_script("window.location.href = arguments[0];", url)
+                opened.append((self.driver.current_window_handle, url, started))
+            except Exception as e:
+                self.failed += 1
+                logger.warning(f"Could not open tab for {url}: {e}")
+        return opened
+
+    def _collect(self, handle: str, url: str, started: float) -> Optional[Dict]:
+        try:
+            self.driver.switch_to.window(handle)
+            try:
+                WebDriverWait(self.driver, self.page_timeout).until(
+                    lambda d: d.execute_script('return document.readyState') == 'complete'
+                    and d.current_url != 'about:blank'
+                )
+            except Exception:
+                self._record(url, error=True)
+                raise
+            if self.is_blocked and self.is_blocked():
+                self.failed += 1
+                logger.warning(f"CAPTCHA on event page, skipping details: {url}")
+                return None
+
+            self._record(url, latency=self._load_seconds(started))
+            details = self.extract()
+            self.cache.set(url, details)
+            self.fetched += 1
+            return details
+        except Exception as e:
+            self.failed += 1
+            logger.warning(f"Could not fetch details for {url}: {e}")
+            return None
+        finally:
+            try:
+                self.driver.close()
+            except Exception:
+                pass
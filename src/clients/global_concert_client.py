@@ -1,15 +1,15 @@
 import os
 import sys
+import json
 import time
+import asyncio
 import random
-import requests
 import argparse
 import logging
-from datetime import datetime, timezone
+from datetime import datetime, timedelta, timezone
 from pathlib import Path
-from typing import List, Dict
+from typing import List, Dict, Tuple
 from dotenv import load_dotenv
-from pymongo import MongoClient
 
 project_root = Path(__file__).parent.parent.parent
 src_path = Path(__file__).parent.parent
@@ -18,6 +18,13 @@ sys.path.insert(0, str(src_path))
 
 from src.repositories.concert_repository import ConcertRepository
 from src.config.settings import config
+from src.clients.artist_priority import normalize_artist_name, rank_artists
+from src.utils.lazy import lazy_attribute, lazy_module
+from src.utils.metrics import inc, timed
+
+requests = lazy_module('requests')
+MongoClient = lazy_attribute('pymongo', 'MongoClient')
+UpdateOne = lazy_attribute('pymongo', 'UpdateOne')
 
 load_dotenv()
 
@@ -28,33 +35,132 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 API_TOKEN = os.getenv("TICKETMASTER_API_TOKEN")
-BASE_URL = "https://app.ticketmaster.com/discovery/v2/events.json"
+BASE_URL = config.TICKETMASTER_BASE_URL
 
 ARTISTS_DB = "artists_db"
 ARTISTS_COLLECTION = "big_artists"
 
 DEFAULT_INTERVAL_HOURS = 6
-DEFAULT_SCHEDULED_ARTISTS_LIMIT = 100
+DEFAULT_SCHEDULED_ARTISTS_LIMIT = 1000
 DEFAULT_USER_ARTISTS_LIMIT = 20
+ARTIST_BATCH_SIZE = 25
+
+MAX_DEEP_PAGING = 1000
+UNUSED_TICKETMASTER_FIELDS = frozenset({
+    "images", "classifications", "attractions", "seatmap", "products", "promoter", "promoters",
+    "sales", "accessibility", "ticketLimit", "ageRestrictions", "ticketing", "outlets",
+    "externalLinks", "boxOfficeInfo", "generalInfo", "parkingDetail", "ada", "social",
+    "markets", "dmas", "upcomingEvents", "pleaseNote", "info", "priceRanges", "test"
+})
 
 class TicketmasterError(Exception):
     pass
 
+def trim_ticketmaster_object(pairs) -> Dict:
+    return {key: value for key, value in pairs if key not in UNUSED_TICKETMASTER_FIELDS}
+
+def loads_trimmed(text: str):
+    return json.loads(text, object_pairs_hook=trim_ticketmaster_object)
+
+def parse_ticketmaster_events(data: Dict, artist: str) -> List[Dict]:
+    events = data.get("_embedded", {}).get("events", [])
+    result = []
+
+    for e in events:
+        venue = e.get("_embedded", {}).get("venues", [{}])[0]
+        result.append({
+            "artist_name": artist,
+            "event_name": e.get("name"),
+            "datetime": e.get("dates", {}).get("start", {}).get("dateTime"),
+            "venue": venue.get("name"),
+            "city": venue.get("city", {}).get("name"),
+            "country": venue.get("country", {}).get("name"),
+            "fetched_at": datetime.now(timezone.utc),
+            "timezone": e.get("dates", {}).get("timezone"),
+            "url": e.get("_links", {}).get("self", {}).get("href"),
+            "source": "ticketmaster"
+        })
+    return result
+
+def format_ticketmaster_datetime(value) -> str:
+    if isinstance(value, datetime):
+        if value.tzinfo is not None:
+            value = value.astimezone(timezone.utc)
+        return value.strftime("%Y-%m-%dT%H:%M:%SZ")
+    return value
+
+def build_search_params(
+    token: str,
+    artist: str,
+    page_size: int = 20,
+    country_code: str | None = None,
+    latlong: str | None = None,
+    radius: int | None = None,
+    start_date=None,
+    end_date=None
+) -> Dict:
+    params = {
+        "apikey": token,
+        "keyword": artist,
+        "size": page_size
+    }
+
+    country_code = country_code if country_code is not None else config.TICKETMASTER_COUNTRY_CODE
+    latlong = latlong if latlong is not None else config.TICKETMASTER_LATLONG
+    radius = radius if radius is not None else config.TICKETMASTER_RADIUS
+
+    if end_date is None and config.TICKETMASTER_DAYS_AHEAD:
+        end_date = datetime.now(timezone.utc) + timedelta(days=config.TICKETMASTER_DAYS_AHEAD)
+
+    if country_code:
+        params["countryCode"] = country_code
+    if latlong:
+        params["latlong"] = latlong
+        if radius:
+            params["radius"] = radius
+            params["unit"] = "km"
+    if start_date:
+        params["startDateTime"] = format_ticketmaster_datetime(start_date)
+    if end_date:
+        params["endDateTime"] = format_ticketmaster_datetime(end_date)
+
+    return params
+
+def next_page(data: Dict, page: int, page_size: int, max_pages: int | None) -> int | None:
+    info = data.get("page")
+    if not info:
+        return None
+
+    following = page + 1
+    if following >= info.get("totalPages", 0):
+        return None
+    if max_pages and following >= max_pages:
+        return None
+    if (following + 1) * page_size > MAX_DEEP_PAGING:
+        return None
+    return following
+
+@timed('ticketmaster.get_artist_events')
 def get_artist_events(
     artist: str,
     api_token: str | None = None,
     retries: int = 3,
-    page_size: int = 20
+    page_size: int = 20,
+    max_pages: int | None = None,
+    country_code: str | None = None,
+    latlong: str | None = None,
+    radius: int | None = None,
+    start_date=None,
+    end_date=None,
+    base_url: str | None = None,
+    session=None
 ):
     token = api_token or API_TOKEN
     if not token:
         raise TicketmasterError("TICKETMASTER_API_TOKEN is not set")
 
-    params = {
-        "apikey": token,
-        "keyword": artist,
-        "size": page_size
-    }
+    params = build_search_params(token, artist, page_size, country_code, latlong, radius, start_date, end_date)
+    max_pages = max_pages if max_pages is not None else config.TICKETMASTER_MAX_PAGES
 
     headers = {"User-Agent": "Mozilla/5.0 (Ticketmaster Collector Bot)"}
 
@@ -64,39 +170,36 @@ def get_artist_events(
     else:
         logger.info("No proxy configured for Ticketmaster API")
 
-    for attempt in range(retries):
-        response = requests.get(BASE_URL, params=params, headers=headers, proxies=proxies, timeout=15)
-
-        if response.status_code == 200:
-            data = response.json()
-            events = data.get("_embedded", {}).get("events", [])
-            result = []
-
-            for e in events:
-                venue = e.get("_embedded", {}).get("venues", [{}])[0]
-                result.append({
-                    "artist_name": artist,
-                    "event_name": e.get("name"),
-                    "datetime": e.get("dates", {}).get("start", {}).get("dateTime"),
-                    "venue": venue.get("name"),
-                    "city": venue.get("city", {}).get("name"),
-                    "country": venue.get("country", {}).get("name"),
-                    "fetched_at": datetime.now(timezone.utc),
-                    "timezone": e.get("dates", {}).get("timezone"),
-                    "url": e.get("_links", {}).get("self", {}).get("href"),
-                    "source": "ticketmaster"
-                })
-            return result
-
-        if response.status_code == 429:
-            sleep_time = (2 ** attempt) + random.uniform(0.2, 0.6)
-            logger.warning(f"[Ticketmaster] 429 for '{artist}', retry in {sleep_time:.1f}s (attempt {attempt+1}/{retries})")
-            time.sleep(sleep_time)
-            continue
-
-        raise TicketmasterError(f"Ticketmaster API error {response.status_code}: {response.text}")
-
-    return []
+    result = []
+    page = 0
+    while page is not None:
+        data = None
+        page_params = dict(params, page=page) if page else params
+
+        for attempt in range(retries):
+            response = (session or requests).get(base_url or BASE_URL, params=page_params, headers=headers, proxies=proxies, timeout=15)
+            inc('ticketmaster_requests_total', status=response.status_code)
+
+            if response.status_code == 200:
+                data = response.json(object_pairs_hook=trim_ticketmaster_object)
+                break
+
+            if response.status_code == 429:
+                sleep_time = (2 ** attempt) + random.uniform(0.2, 0.6)
+                logger.warning(f"[Ticketmaster] 429 for '{artist}', retry in {sleep_time:.1f}s (attempt {attempt+1}/{retries})")
+                time.sleep(sleep_time)
+                continue
+
+            raise TicketmasterError(f"Ticketmaster API error {response.status_code}: {response.text}")
+
+        if data is None:
+            raise TicketmasterError(f"Ticketmaster rate limit for '{artist}' persisted after {retries} attempts")
+
+        result.extend(parse_ticketmaster_events(data, artist))
+        page = next_page(data, page, page_size, max_pages)
+
+    inc('ticketmaster_events_total', len(result))
+    return result
 
 def get_artists_from_db() -> List[str]:
     try:
@@ -110,6 +213,85 @@ def get_artists_from_db() -> List[str]:
         logger.error(f"Error getting artists from DB: {e}")
         return []
 
+def get_artist_aliases_from_db() -> Dict[str, List[str]]:
+    try:
+        client = MongoClient(config.mongo_uri)
+        collection = client[ARTISTS_DB][ARTISTS_COLLECTION]
+        artists = list(collection.find(
+            {"aliases.0": {"$exists": True}},
+            {"artist_name": 1, "aliases": 1, "_id": 0}
+        ))
+        client.close()
+        return {artist["artist_name"]: artist["aliases"] for artist in artists if artist.get("artist_name")}
+    except Exception as e:
+        logger.error(f"Error getting artist aliases from DB: {e}")
+        return {}
+
+def get_artists_for_refresh(limit: int = None) -> List[str]:
+    try:
+        client = MongoClient(config.mongo_uri)
+        collection = client[ARTISTS_DB][ARTISTS_COLLECTION]
+        artists = list(collection.find(
+            {},
+            {"artist_name": 1, "last_checked": 1, "playlist_hits": 1, "empty_checks": 1, "_id": 0}
+        ))
+        client.close()
+    except Exception as e:
+        logger.error(f"Error getting artists from DB: {e}")
+        return []
+
+    ranked = rank_artists([a for a in artists if a.get("artist_name")], limit=limit)
+    never_checked = sum(1 for a in ranked if not a.get("last_checked"))
+    logger.info(f"Selected {len(ranked)} of {len(artists)} artists for refresh ({never_checked} never checked)")
+    return [a["artist_name"] for a in ranked]
+
+def mark_artists_checked(results: Dict[str, int]):
+    if not results:
+        return
+
+    now = datetime.now(timezone.utc)
+    operations = []
+    for artist, events_count in results.items():
+        update = {"$set": {"last_checked": now, "last_events_count": events_count}}
+        if events_count:
+            update["$set"]["empty_checks"] = 0
+        else:
+            update["$inc"] = {"empty_checks": 1}
+        operations.append(UpdateOne({"artist_name": artist}, update))
+
+    try:
+        client = MongoClient(config.mongo_uri)
+        result = client[ARTISTS_DB][ARTISTS_COLLECTION].bulk_write(operations, ordered=False)
+        client.close()
+        logger.info(f"Updated last_checked for {result.modified_count} artists")
+    except Exception as e:
+        logger.error(f"Error updating last_checked: {e}")
+
+def record_playlist_artists(artist_names: List[str]):
+    if not artist_names:
+        return
+
+    now = datetime.now(timezone.utc)
+    operations = [
+        UpdateOne(
+            {"normalized": normalize_artist_name(name)},
+            {
+                "$inc": {"playlist_hits": 1},
+                "$set": {"last_seen_at": now},
+                "$setOnInsert": {"artist_name": name, "last_checked": None, "empty_checks": 0}
+            },
+            upsert=True
+        )
+        for name in artist_names if name and name.strip()
+    ]
+
+    try:
+        client = MongoClient(config.mongo_uri, serverSelectionTimeoutMS=2000)
+        client[ARTISTS_DB][ARTISTS_COLLECTION].bulk_write(operations, ordered=False)
+        client.close()
+    except Exception as e:
+        logger.warning(f"Could not record playlist artists: {e}")
+
 def convert_ticketmaster_to_afisha_format(event: Dict) -> Dict:
     return {
         "title": event.get("event_name", "-"),
@@ -124,80 +306,153 @@ def convert_ticketmaster_to_afisha_format(event: Dict) -> Dict:
         "source": "ticketmaster"
     }
 
-def process_artists(artists: List[str], limit: int = None) -> tuple:
+async def _write_batch(db: ConcertRepository, events: List[Dict], stats: Dict):
+    if not events:
+        return
+
+    start = time.perf_counter()
+    inserted, updated = await db.upsert_events_batch(events)
+    elapsed = time.perf_counter() - start
+
+    stats["inserted"] += inserted
+    stats["updated"] += updated
+    stats["write_seconds"] += elapsed
+    logger.info(
+        f"  Batch written: {inserted} inserted, {updated} updated "
+        f"in {elapsed:.2f}s ({len(events) / elapsed if elapsed else 0:.0f} events/sec)"
+    )
+
+def plan_run_budget(artists: List[str], runs_per_day: float = 1) -> Tuple[List[str], int]:
+    budget = max(1, int(config.TICKETMASTER_DAILY_QUOTA / max(runs_per_day, 1)))
+    if len(artists) > budget:
+        logger.warning(
+            f"{len(artists)} artists exceed the per-run budget of {budget} requests "
+            f"({config.TICKETMASTER_DAILY_QUOTA}/day over {runs_per_day:g} runs), checking the first {budget}"
+        )
+        artists = artists[:budget]
+    max_pages = max(1, min(config.TICKETMASTER_MAX_PAGES, budget // max(len(artists), 1)))
+    logger.info(f"Request budget for this run: {budget} ({max_pages} page(s) per artist)")
+    return artists, max_pages
+
+async def process_artists(
+    artists: List[str],
+    limit: int = None,
+    batch_size: int = ARTIST_BATCH_SIZE,
+    max_pages: int = None
+) -> Dict:
+    stats = {"events": 0, "inserted": 0, "updated": 0, "write_seconds": 0.0, "elapsed_seconds": 0.0}
+
     if not API_TOKEN:
         logger.error("TICKETMASTER_API_TOKEN is not set")
-        return 0, 0
+        return stats
 
     db = ConcertRepository()
     artists_to_process = artists[:limit] if limit else artists
-    total_events = 0
-    total_saved = 0
+    checked = {}
+    batch = []
+    started = time.perf_counter()
 
     logger.info(f"Processing {len(artists_to_process)} artists...")
 
-    for i, artist in enumerate(artists_to_process, 1):
-        try:
-            logger.info(f"[{i}/{len(artists_to_process)}] Fetching events for: {artist}")
-            events = get_artist_events(artist)
+    try:
+        for i, artist in enumerate(artists_to_process, 1):
+            try:
+                logger.info(f"[{i}/{len(artists_to_process)}] Fetching events for: {artist}")
+                events = await asyncio.to_thread(get_artist_events, artist, max_pages=max_pages)
+                checked[artist] = len(events)
 
-            if events:
-                saved_count = 0
                 for event in events:
                     afisha_event = convert_ticketmaster_to_afisha_format(event)
-                    if db.save_event(afisha_event):
-                        saved_count += 1
+                    afisha_event["artist_name"] = artist
+                    batch.append(afisha_event)
 
-                total_events += len(events)
-                total_saved += saved_count
-                logger.info(f"  Found {len(events)} events, saved {saved_count} new")
-            else:
-                logger.info(f"  No events found")
+                stats["events"] += len(events)
+                logger.info(f"  Found {len(events)} events" if events else "  No events found")
 
-            if i < len(artists_to_process):
-                time.sleep(1.1)
+                if i < len(artists_to_process):
+                    await asyncio.sleep(1.1)
 
-        except Exception as e:
-            logger.error(f"Error processing {artist}: {e}")
-            continue
+            except Exception as e:
+                logger.error(f"Error processing {artist}: {e}")
+
+            if i % batch_size == 0:
+                await _write_batch(db, batch, stats)
+                batch = []
+    finally:
+        await _write_batch(db, batch, stats)
+        mark_artists_checked(checked)
+        await db.close()
+
+    stats["elapsed_seconds"] = time.perf_counter() - started
+    return stats
 
-    db.close()
-    return total_events, total_saved
+async def harvest_artists(artists: List[str], repository: ConcertRepository, max_pages: int = None) -> Dict:
+    from src.clients.ticketmaster_harvester import TicketmasterHarvester
 
-def run_ticketmaster_update(limit: int = None):
+    harvester = TicketmasterHarvester(API_TOKEN, max_pages=max_pages)
+    stats = await harvester.run(artists, repository)
+    mark_artists_checked(harvester.checked)
+    return stats
+
+async def run_ticketmaster_update_async(limit: int = None, sequential: bool = False, runs_per_day: float = 1):
     logger.info("=" * 60)
     logger.info("Ticketmaster Event Updater")
     logger.info("=" * 60)
 
-    artists = get_artists_from_db()
+    if not API_TOKEN:
+        logger.error("TICKETMASTER_API_TOKEN is not set")
+        return
+
+    artists = get_artists_for_refresh(limit=limit)
     if not artists:
         logger.warning("No artists found in database. Run src/scripts/load_artists.py first.")
         return
+    artists, max_pages = plan_run_budget(artists, runs_per_day)
 
-    logger.info(f"Found {len(artists)} artists in database")
-
-    initial_count = ConcertRepository().count_events_by_category('concert')
-    ConcertRepository().close()
+    repository = ConcertRepository()
+    initial_count = await repository.count_events_by_category('concert')
     logger.info(f"Current concerts in database: {initial_count}")
 
-    total_events, total_saved = process_artists(artists, limit=limit)
+    if sequential:
+        stats = await process_artists(artists, max_pages=max_pages)
+    else:
+        stats = await harvest_artists(artists, repository, max_pages)
+
+    final_count = await repository.count_events_by_category('concert')
+    if stats["inserted"] or stats["updated"]:
+        from src.services.artist_events_service import refresh_artist_events
+        from src.services.recommendation_batch import precompute_recommendations
+        try:
+            await refresh_artist_events(repository)
+        except Exception as e:
+            logger.error(f"Failed to refresh artist events: {e}")
+        try:
+            await precompute_recommendations(repository)
+        except Exception as e:
+            logger.error(f"Failed to precompute recommendations: {e}")
+    await repository.close()
 
-    final_count = ConcertRepository().count_events_by_category('concert')
-    ConcertRepository().close()
+    write_seconds = stats["write_seconds"]
+    written = stats["inserted"] + stats["updated"]
 
     logger.info("\n" + "=" * 60)
     logger.info("FINAL SUMMARY")
     logger.info("=" * 60)
-    logger.info(f"Artists processed: {len(artists[:limit]) if limit else len(artists)}")
-    logger.info(f"Total events found: {total_events}")
-    logger.info(f"New events saved: {total_saved}")
-    logger.info(f"Duplicates skipped: {total_events - total_saved}")
+    logger.info(f"Artists processed: {len(artists)}")
+    logger.info(f"Total events found: {stats['events']}")
+    logger.info(f"New events inserted: {stats['inserted']}")
+    logger.info(f"Existing events updated: {stats['updated']}")
+    logger.info(f"Write throughput: {written / write_seconds if write_seconds else 0:.0f} events/sec")
+    logger.info(f"Overall throughput: {stats['events'] / stats['elapsed_seconds'] if stats['elapsed_seconds'] else 0:.1f} events/sec")
     logger.info(f"Initial concerts in database: {initial_count}")
     logger.info(f"Final concerts in database: {final_count}")
     logger.info(f"New concerts added: {final_count - initial_count}")
     logger.info("=" * 60)
 
-def run_scheduled_updates(interval_seconds: int, artists_limit: int = DEFAULT_SCHEDULED_ARTISTS_LIMIT):
+def run_ticketmaster_update(limit: int = None, sequential: bool = False, runs_per_day: float = 1):
+    asyncio.run(run_ticketmaster_update_async(limit=limit, sequential=sequential, runs_per_day=runs_per_day))
+
+def run_scheduled_updates(interval_seconds: int, artists_limit: int = DEFAULT_SCHEDULED_ARTISTS_LIMIT, sequential: bool = False):
     logger.info("=" * 60)
     logger.info("Starting scheduled Ticketmaster updates")
     logger.info(f"Interval: {interval_seconds / 3600:.1f} hours ({interval_seconds} seconds)")
@@ -218,7 +473,7 @@ def run_scheduled_updates(interval_seconds: int, artists_limit: int = DEFAULT_SC
             logger.info("=" * 60)
 
             try:
-                run_ticketmaster_update(limit=artists_limit)
+                run_ticketmaster_update(limit=artists_limit, sequential=sequential, runs_per_day=86400 / max(interval_seconds, 1))
                 logger.info(f"\n✓ Run #{iteration} completed successfully")
             except KeyboardInterrupt:
                 logger.info("\nScheduled updates stopped by user")
@@ -263,16 +518,22 @@ def main():
         help=f'Limit number of artists to process (default: {DEFAULT_USER_ARTISTS_LIMIT} for single run, {DEFAULT_SCHEDULED_ARTISTS_LIMIT} for scheduled)'
     )
 
+    parser.add_argument(
+        '--sequential',
+        action='store_true',
+        help='Fetch artists one at a time instead of using the concurrent harvester'
+    )
+
     args = parser.parse_args()
 
     if args.schedule:
         interval_seconds = args.interval * 3600
         artists_limit = args.limit if args.limit else DEFAULT_SCHEDULED_ARTISTS_LIMIT
-        run_scheduled_updates(interval_seconds, artists_limit=artists_limit)
+        run_scheduled_updates(interval_seconds, artists_limit=artists_limit, sequential=args.sequential)
         return
 
     artists_limit = args.limit if args.limit else DEFAULT_USER_ARTISTS_LIMIT
-    run_ticketmaster_update(limit=artists_limit)
+    run_ticketmaster_update(limit=artists_limit, sequential=args.sequential)
 
 if __name__ == '__main__':
     main()
\ No newline at end of file
@@ -6,12 +6,26 @@ from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import TimeoutException, NoSuchElementException
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Callable
 import logging
 import time
 import random
 from datetime import datetime
 from src.config.settings import config
+from src.clients.crawl_checkpoint import CrawlCheckpoint
+from src.clients.detail_fetcher import DetailCache, EventDetailFetcher, RateLimiter
+from src.clients.politeness import PolitenessScheduler, DEFAULT_DOMAIN
+from src.clients.browser_profile import (
+    apply_resource_blocking,
+    light_profile_arguments,
+    light_profile_prefs
+)
+from src.clients.afisha_json_capture import (
+    collect_embedded_state,
+    collect_json_responses,
+    drain_performance_log,
+    extract_events_from_payloads
+)
 
 logging.basicConfig(
     level=logging.INFO,
@@ -23,6 +37,21 @@ class AfishaSeleniumParser:
     def __init__(self, headless: bool = True):
         self.headless = headless
         self.driver = None
+        self.checkpoint: Optional[CrawlCheckpoint] = None
+        self.on_events: Optional[Callable[[List[Dict]], None]] = None
+        self.detail_cache = DetailCache(config.DETAIL_CACHE_TTL_HOURS * 3600)
+        self.detail_rate_limiter = RateLimiter(config.DETAIL_REQUESTS_PER_SECOND)
+        self.details_budget = 0
+        self.page_complete = False
+        self.category_complete = False
+        self.scheduler = PolitenessScheduler(
+            min_multiplier=config.POLITENESS_MIN_MULTIPLIER,
+            max_multiplier=config.POLITENESS_MAX_MULTIPLIER,
+            latency_target=config.POLITENESS_LATENCY_TARGET
+        )
+        self.current_domain = DEFAULT_DOMAIN
+        self._captcha_reported_url = None
+        self.capture_enabled = config.AFISHA_CAPTURE_MODE in ('xhr', 'auto')
 
     def start(self):
         logger.info("Starting Chrome with undetected-chromedriver...")
@@ -69,6 +98,11 @@ class AfishaSeleniumParser:
         options.add_argument('--disable-backgrounding-occluded-windows')
         options.add_argument('--disable-renderer-backgrounding')
 
+        if config.LIGHT_BROWSER_PROFILE:
+            for argument in light_profile_arguments(config.BLOCKED_RESOURCE_TYPES, config.RESOURCE_ALLOWLIST):
+                options.add_argument(argument)
+            logger.info(f"Using light browser profile, blocking: {config.BLOCKED_RESOURCE_TYPES}")
+
         if config.proxy_url:
             proxy_url = config.proxy_url
             options.add_argument(f'--proxy-server={proxy_url}')
@@ -78,8 +112,14 @@ class AfishaSeleniumParser:
             "profile.default_content_setting_values.notifications": 2,
             "profile.default_content_settings.popups": 0,
         }
+        if config.LIGHT_BROWSER_PROFILE:
+            prefs.update(light_profile_prefs(config.BLOCKED_RESOURCE_TYPES, config.RESOURCE_ALLOWLIST))
         options.add_experimental_option("prefs", prefs)
 
+        if self.capture_enabled:
+            options.set_capability('goog:loggingPrefs', {'performance': 'ALL'})
+            logger.info(f"Network capture enabled, mode: {config.AFISHA_CAPTURE_MODE}")
+
         import os
         driver_executable_path = None
         use_system_driver = os.path.exists('/.dockerenv')
@@ -96,6 +136,11 @@ class AfishaSeleniumParser:
             )
             self.driver.set_page_load_timeout(60)
 
+            if config.LIGHT_BROWSER_PROFILE:
+                apply_resource_blocking(self.driver, config.BLOCKED_RESOURCE_TYPES, config.RESOURCE_ALLOWLIST)
+            if self.capture_enabled:
+                self.driver.execute_cdp_cmd('Network.enable', {})
+
             logger.info("Chrome started successfully")
         except Exception as e:
             logger.error(f"Failed to start Chrome: {e}")
@@ -106,9 +151,51 @@ class AfishaSeleniumParser:
             self.driver.quit()
         logger.info("Browser closed")
 
+    def is_alive(self) -> bool:
+        if not self.driver:
+            return False
+        try:
+            self.driver.current_url
+            return True
+        except Exception:
+            return False
+
+    def _commit_page(self, key: str, events: List[Dict], complete: bool = True) -> bool:
+        if self.on_events and events:
+            try:
+                self.on_events(events)
+            except Exception as e:
+                logger.error(f"Error flushing {len(events)} events for {key}: {e}")
+                return False
+
+        if not complete:
+            logger.warning(f"  {key} was not parsed completely, leaving it for the next run")
+            return False
+
+        if self.checkpoint:
+            self.checkpoint.mark_done(key, len(events))
+        return True
+
+    def _page_parsed(self) -> bool:
+        return self.page_complete and self.is_alive()
+
+    def _is_done(self, key: str) -> bool:
+        return bool(self.checkpoint and self.checkpoint.is_done(key))
+
     def human_like_delay(self, min_sec=1, max_sec=3):
-        delay = random.uniform(min_sec, max_sec)
-        time.sleep(delay)
+        return self.scheduler.wait(min_sec, max_sec, self.current_domain)
+
+    def _navigate(self, url: str):
+        self.current_domain = self.scheduler.domain_of(url)
+        if self.capture_enabled:
+            drain_performance_log(self.driver)
+        start = time.time()
+        try:
+            self.driver.get(url)
+        except Exception:
+            self.scheduler.record(self.current_domain, latency=time.time() - start, error=True)
+            raise
+        self.scheduler.record(self.current_domain, latency=time.time() - start)
 
     def close_popups(self):
         try:
@@ -272,9 +359,51 @@ class AfishaSeleniumParser:
         try:
             logger.debug(f"Parsing event details: {event_url}")
 
-            self.driver.get(event_url)
+            self._navigate(event_url)
             self.human_like_delay(2, 3)
 
+            return self._extract_event_details()
+
+        except Exception as e:
+            logger.error(f"Error parsing event details: {e}")
+            return {}
+
+    def _prepare_detail_tab(self):
+        if config.LIGHT_BROWSER_PROFILE:
+            apply_resource_blocking(self.driver, config.BLOCKED_RESOURCE_TYPES, config.RESOURCE_ALLOWLIST)
+
+    def _enrich_with_details(self, events: List[Dict]):
+        if not config.PARSE_EVENT_DETAILS or not events:
+            return
+
+        if config.MAX_EVENTS_FOR_DETAILS:
+            if self.details_budget <= 0:
+                return
+            events = events[:self.details_budget]
+            self.details_budget -= len(events)
+
+        fetcher = EventDetailFetcher(
+            self.driver,
+            extract=self._extract_event_details,
+            cache=self.detail_cache,
+            rate_limiter=self.detail_rate_limiter,
+            tabs=config.DETAIL_TABS,
+            page_timeout=config.DETAIL_PAGE_TIMEOUT,
+            prepare_tab=self._prepare_detail_tab,
+            is_blocked=self.check_for_captcha,
+            scheduler=self.scheduler
+        )
+
+        logger.info(f"  Fetching details for {len(events)} events in {config.DETAIL_TABS} tabs...")
+        details_by_url = fetcher.fetch([event['url'] for event in events])
+
+        for event in events:
+            details = details_by_url.get(event['url'])
+            if details:
+                event.update(details)
+
+    def _extract_event_details(self) -> Dict:
+        try:
             details = {}
 
             try:
@@ -348,6 +477,10 @@ class AfishaSeleniumParser:
         try:
             page_source = self.driver.page_source
             if 'Я не робот' in page_source or 'SmartCaptcha' in page_source:
+                current_url = self.driver.current_url
+                if current_url != self._captcha_reported_url:
+                    self._captcha_reported_url = current_url
+                    self.scheduler.record(self.scheduler.domain_of(current_url), captcha=True)
                 return True
             return False
         except:
@@ -401,6 +534,7 @@ class AfishaSeleniumParser:
 
     def parse_events_from_page(self, category: str) -> List[Dict]:
         events = []
+        self.page_complete = False
 
         try:
             self.human_like_delay(5, 8)
@@ -423,7 +557,7 @@ class AfishaSeleniumParser:
 
                 if self.headless:
                     logger.warning("CAPTCHA detected in headless mode, waiting and retrying...")
-                    time.sleep(10)
+                    self.human_like_delay(10, 10)
                     self.driver.refresh()
                     self.human_like_delay(5, 8)
 
@@ -468,6 +602,13 @@ class AfishaSeleniumParser:
             self.driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
             self.human_like_delay(1, 2)
 
+            if self.capture_enabled:
+                events = self._parse_events_from_network(category)
+                if events or config.AFISHA_CAPTURE_MODE == 'xhr':
+                    self.page_complete = True
+                    return events
+                logger.info("No events captured from network, falling back to DOM parsing")
+
             event_elements = []
 
             xpath_selectors = [
@@ -504,6 +645,7 @@ class AfishaSeleniumParser:
                     logger.info(f"Saved debug screenshot: {screenshot_path}")
                 except Exception as e:
                     logger.debug(f"Could not save screenshot: {e}")
+                self.page_complete = True
                 return events
 
             seen_urls = set()
@@ -524,12 +666,22 @@ class AfishaSeleniumParser:
                     continue
 
             logger.info(f"Successfully parsed {len(events)} events from category: {category}")
+            self.page_complete = True
 
         except Exception as e:
             logger.error(f"Error parsing events: {e}", exc_info=True)
 
         return events
 
+    def _parse_events_from_network(self, category: str) -> List[Dict]:
+        payloads = collect_json_responses(self.driver) + collect_embedded_state(self.driver)
+        events = extract_events_from_payloads(payloads, category, config.CITY)
+
+        for idx, event_data in enumerate(events, 1):
+            logger.info(f"✓ [{idx}] {event_data['title'][:60]}")
+        logger.info(f"Captured {len(events)} events from {len(payloads)} JSON payloads for category: {category}")
+        return events
+
     def _extract_event_data(self, element, category: str) -> Optional[Dict]:
         try:
             tag_name = element.tag_name.lower()
@@ -728,9 +880,12 @@ class AfishaSeleniumParser:
         logger.info(f"Parsing category: {category['title']} ({category['url']})")
 
         all_events = []
+        self.details_budget = config.MAX_EVENTS_FOR_DETAILS
+        self.category_complete = False
+        complete = True
 
         try:
-            self.driver.get(category['url'])
+            self._navigate(category['url'])
             self.human_like_delay(3, 5)
 
             if self.check_for_captcha():
@@ -746,9 +901,16 @@ class AfishaSeleniumParser:
 
             self.scroll_page(scrolls=3)
 
-            main_events = self.parse_events_from_page(category['name'])
-            all_events.extend(main_events)
-            logger.info(f"  Main page: {len(main_events)} events")
+            page_key = CrawlCheckpoint.page_key(category['url'])
+            if self._is_done(page_key):
+                logger.info("  Main page: already parsed (checkpoint)")
+            else:
+                main_events = self.parse_events_from_page(category['name'])
+                self._enrich_with_details(main_events)
+                all_events.extend(main_events)
+                if not self._commit_page(page_key, main_events, complete=self._page_parsed()):
+                    complete = False
+                logger.info(f"  Main page: {len(main_events)} events")
 
             if config.PARSE_SELECTIONS:
                 logger.info(f"  Looking for selections...")
@@ -759,18 +921,27 @@ class AfishaSeleniumParser:
 
                     for sel_idx, selection in enumerate(selections, 1):
                         try:
+                            selection_key = CrawlCheckpoint.selection_key(selection['url'])
+                            if self._is_done(selection_key):
+                                logger.info(f"    Selection {sel_idx}/{len(selections)}: {selection['name']} (checkpoint, skipped)")
+                                continue
+
                             logger.info(f"    Selection {sel_idx}/{len(selections)}: {selection['name']}")
 
-                            self.driver.get(selection['url'])
+                            self._navigate(selection['url'])
                             self.human_like_delay(2, 3)
 
                             if self.check_for_captcha():
                                 if not self.wait_for_captcha_solution(max_wait_seconds=90, skip_if_headless=True):
                                     logger.warning("⏭️  Пропускаю страницу события с CAPTCHA")
+                                    complete = False
                                     continue
 
                             sel_events = self.parse_events_from_page(category['name'])
+                            self._enrich_with_details(sel_events)
                             all_events.extend(sel_events)
+                            if not self._commit_page(selection_key, sel_events, complete=self._page_parsed()):
+                                complete = False
                             logger.info(f"      → {len(sel_events)} events")
 
                             if sel_idx < len(selections):
@@ -778,43 +949,30 @@ class AfishaSeleniumParser:
 
                         except Exception as e:
                             logger.error(f"    Error parsing selection {selection['name']}: {e}")
+                            complete = False
                             continue
                 else:
                     logger.info(f"  No selections found for {category['name']}")
 
-            if config.PARSE_EVENT_DETAILS and all_events:
-                logger.info(f"  Parsing event details for first {config.MAX_EVENTS_FOR_DETAILS} events...")
-                events_to_detail = all_events[:config.MAX_EVENTS_FOR_DETAILS]
-
-                for evt_idx, event in enumerate(events_to_detail, 1):
-                    try:
-                        logger.info(f"    Event {evt_idx}/{len(events_to_detail)}: {event['title'][:40]}...")
-
-                        details = self.parse_event_details(event['url'])
-
-                        if details:
-                            event.update(details)
-                            logger.debug(f"      Added details: {list(details.keys())}")
-
-                        if evt_idx < len(events_to_detail):
-                            self.human_like_delay(1, 2)
-
-                    except Exception as e:
-                        logger.error(f"    Error parsing details for {event['title']}: {e}")
-                        continue
-
+            self.category_complete = complete
             return all_events
 
         except Exception as e:
             logger.error(f"Error parsing category {category['title']}: {e}", exc_info=True)
             return []
 
-    def parse_all_events(self) -> List[Dict]:
+    def parse_all_events(
+        self,
+        checkpoint: Optional[CrawlCheckpoint] = None,
+        on_events: Optional[Callable[[List[Dict]], None]] = None
+    ) -> List[Dict]:
         all_events = []
+        self.checkpoint = checkpoint
+        self.on_events = on_events
 
         try:
             logger.info(f"Navigating to {config.BASE_URL}")
-            self.driver.get(config.BASE_URL)
+            self._navigate(config.BASE_URL)
             self.human_like_delay(4, 6)
 
             if self.check_for_captcha():
@@ -868,21 +1026,27 @@ class AfishaSeleniumParser:
 
             for idx, category in enumerate(categories_to_parse, 1):
                 try:
+                    category_key = CrawlCheckpoint.category_key(category['name'])
+                    if self._is_done(category_key):
+                        logger.info(f"Category {idx}/{len(categories_to_parse)}: {category['title']} (checkpoint, skipped)")
+                        continue
+
                     logger.info(f"\n{'=' * 60}")
                     logger.info(f"Category {idx}/{len(categories_to_parse)}: {category['title']}")
                     logger.info(f"{'=' * 60}")
 
                     events = self.parse_category(category)
                     all_events.extend(events)
+                    if self.category_complete and self.is_alive():
+                        self._commit_page(category_key, [])
                     logger.info(f"✓ '{category['title']}': {len(events)} events")
 
                     if idx < len(categories_to_parse):
-                        delay = random.uniform(
+                        delay = self.human_like_delay(
                             config.MIN_DELAY_BETWEEN_CATEGORIES,
                             config.MAX_DELAY_BETWEEN_CATEGORIES
                         )
-                        logger.info(f"Waiting {delay:.1f}s...")
-                        time.sleep(delay)
+                        logger.info(f"Waited {delay:.1f}s between categories")
 
                 except Exception as e:
                     logger.error(f"✗ Error: {category['title']}: {e}")
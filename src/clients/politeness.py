@@ -0,0 +1,121 @@
+import json
+import time
+import random
+import logging
+from dataclasses import dataclass, asdict
+from pathlib import Path
+from typing import Callable, Dict, Optional
+from urllib.parse import urlparse
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_DOMAIN = 'default'
+
+@dataclass
+class DomainStats:
+    requests: int = 0
+    errors: int = 0
+    captchas: int = 0
+    latency_ewma: float = 0.0
+    latency_max: float = 0.0
+    slept_seconds: float = 0.0
+    waits: int = 0
+    multiplier: float = 1.0
+
+class PolitenessScheduler:
+    def __init__(
+        self,
+        min_multiplier: float = 0.25,
+        max_multiplier: float = 4.0,
+        latency_target: float = 4.0,
+        healthy_decay: float = 0.9,
+        backoff_factor: float = 2.0,
+        sleep: Callable[[float], None] = time.sleep
+    ):
+        self.min_multiplier = min_multiplier
+        self.max_multiplier = max_multiplier
+        self.latency_target = latency_target
+        self.healthy_decay = healthy_decay
+        self.backoff_factor = backoff_factor
+        self.sleep = sleep
+        self.domains: Dict[str, DomainStats] = {}
+        self.started_at = time.time()
+
+    @staticmethod
+    def domain_of(url: Optional[str]) -> str:
+        if not url:
+            return DEFAULT_DOMAIN
+        return urlparse(url).netloc or DEFAULT_DOMAIN
+
+    def _stats(self, domain: str) -> DomainStats:
+        if domain not in self.domains:
+            self.domains[domain] = DomainStats()
+        return self.domains[domain]
+
+    def _clamp(self, value: float) -> float:
+        return min(self.max_multiplier, max(self.min_multiplier, value))
+
+    def record(self, domain: str, latency: Optional[float] = None, error: bool = False, captcha: bool = False):
+        stats = self._stats(domain)
+        stats.requests += 1
+
+        if latency is not None:
+            if stats.latency_ewma == 0:
+                stats.latency_ewma = latency
+            else:
+                stats.latency_ewma = 0.7 * stats.latency_ewma + 0.3 * latency
+            stats.latency_max = max(stats.latency_max, latency)
+
+        if captcha:
+            stats.captchas += 1
+            stats.multiplier = self._clamp(stats.multiplier * self.backoff_factor ** 2)
+            logger.warning(f"[politeness] CAPTCHA on {domain}, delay multiplier -> {stats.multiplier:.2f}")
+        elif error:
+            stats.errors += 1
+            stats.multiplier = self._clamp(stats.multiplier * self.backoff_factor)
+            logger.warning(f"[politeness] Error on {domain}, delay multiplier -> {stats.multiplier:.2f}")
+        elif stats.latency_ewma > self.latency_target:
+            stats.multiplier = self._clamp(stats.multiplier * 1.25)
+        else:
+            stats.multiplier = self._clamp(stats.multiplier * self.healthy_decay)
+
+    def delay(self, min_sec: float, max_sec: float, domain: str = DEFAULT_DOMAIN) -> float:
+        multiplier = self._stats(domain).multiplier
+        return random.uniform(min_sec, max_sec) * multiplier
+
+    def multiplier(self, domain: str = DEFAULT_DOMAIN) -> float:
+        return self._stats(domain).multiplier
+
+    def record_wait(self, domain: str, seconds: float):
+        stats = self._stats(domain)
+        stats.slept_seconds += seconds
+        stats.waits += 1
+
+    def wait(self, min_sec: float, max_sec: float, domain: str = DEFAULT_DOMAIN) -> float:
+        delay = self.delay(min_sec, max_sec, domain)
+        self.record_wait(domain, delay)
+        self.sleep(delay)
+        return delay
+
+    def summary(self) -> Dict:
+        return {
+            'started_at': self.started_at,
+            'duration_seconds': round(time.time() - self.started_at, 1),
+            'domains': {domain: asdict(stats) for domain, stats in self.domains.items()},
+        }
+
+    def log_summary(self):
+        for domain, stats in self.domains.items():
+            logger.info(
+                f"[politeness] {domain}: requests={stats.requests}, errors={stats.errors}, "
+                f"captchas={stats.captchas}, latency~{stats.latency_ewma:.2f}s, "
+                f"slept={stats.slept_seconds:.0f}s over {stats.waits} waits, multiplier={stats.multiplier:.2f}"
+            )
+
+    def export(self, path: Path) -> Path:
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(self.summary(), f, ensure_ascii=False, indent=2)
+        logger.info(f"Politeness stats saved: {path}")
+        return path
@@ -0,0 +1,188 @@
+import time
+import random
+import asyncio
+import logging
+from typing import Dict, List, Optional
+import aiohttp
+from src.config.settings import config
+from src.utils.rate_limit import TokenBucket
+from src.clients.global_concert_client import (
+    BASE_URL,
+    TicketmasterError,
+    build_search_params,
+    loads_trimmed,
+    next_page,
+    parse_ticketmaster_events,
+    convert_ticketmaster_to_afisha_format
+)
+
+logger = logging.getLogger(__name__)
+
+_DONE = object()
+
+def retry_after_seconds(value: Optional[str], attempt: int) -> float:
+    try:
+        return max(float(value), 0.0)
+    except (TypeError, ValueError):
+        return (2 ** attempt) + random.uniform(0.2, 0.6)
+
+class TicketmasterHarvester:
+    def __init__(
+        self,
+        api_token: str,
+        rate_per_second: float = None,
+        concurrency: int = None,
+        queue_size: int = 100,
+        write_batch_size: int = 500,
+        page_size: int = 20,
+        max_pages: int = None,
+        retries: int = 3,
+        base_url: str = BASE_URL
+    ):
+        if not api_token:
+            raise TicketmasterError("TICKETMASTER_API_TOKEN is not set")
+
+        self.api_token = api_token
+        self.bucket = TokenBucket(rate_per_second or config.TICKETMASTER_RATE_LIMIT)
+        self.concurrency = concurrency or config.TICKETMASTER_CONCURRENCY
+        self.queue_size = queue_size
+        self.write_batch_size = write_batch_size
+        self.page_size = page_size
+        self.max_pages = max_pages if max_pages is not None else config.TICKETMASTER_MAX_PAGES
+        self.retries = retries
+        self.base_url = base_url
+        self.checked: Dict[str, int] = {}
+        self.latencies: List[float] = []
+        self.stats = {
+            "requests": 0, "rate_limited": 0, "failed": 0, "events": 0,
+            "inserted": 0, "updated": 0, "write_seconds": 0.0, "elapsed_seconds": 0.0
+        }
+
+    async def _fetch_page(self, session: aiohttp.ClientSession, params: Dict) -> Dict:
+        for attempt in range(self.retries):
+            await self.bucket.acquire()
+            self.stats["requests"] += 1
+            started = time.perf_counter()
+
+            async with session.get(self.base_url, params=params, proxy=config.proxy_url) as response:
+                self.latencies.append(time.perf_counter() - started)
+                if response.status == 200:
+                    return await response.json(loads=loads_trimmed, content_type=None)
+
+                if response.status == 429:
+                    self.stats["rate_limited"] += 1
+                    self.bucket.pause(retry_after_seconds(response.headers.get("Retry-After"), attempt))
+                    continue
+
+                raise TicketmasterError(f"Ticketmaster API error {response.status}: {await response.text()}")
+
+        raise TicketmasterError(f"Ticketmaster rate limit persisted after {self.retries} attempts")
+
+    async def fetch_artist(self, session: aiohttp.ClientSession, artist: str) -> List[Dict]:
+        params = build_search_params(self.api_token, artist, self.page_size)
+        events = []
+        page = 0
+
+        while page is not None:
+            data = await self._fetch_page(session, dict(params, page=page) if page else params)
+            events.extend(parse_ticketmaster_events(data, artist))
+            page = next_page(data, page, self.page_size, self.max_pages)
+
+        return events
+
+    async def _fetcher(self, session: aiohttp.ClientSession, artists: asyncio.Queue, converted: asyncio.Queue):
+        while True:
+            artist = await artists.get()
+            if artist is _DONE:
+                return
+
+            try:
+                events = await self.fetch_artist(session, artist)
+                self.checked[artist] = len(events)
+                await converted.put((artist, events))
+            except Exception as e:
+                self.stats["failed"] += 1
+                logger.error(f"Error fetching {artist}: {e}")
+
+    async def _converter(self, converted: asyncio.Queue, batches: asyncio.Queue):
+        batch = []
+        while True:
+            item = await converted.get()
+            if item is _DONE:
+                break
+
+            artist, events = item
+            for event in events:
+                try:
+                    afisha_event = convert_ticketmaster_to_afisha_format(event)
+                    afisha_event["artist_name"] = artist
+                    batch.append(afisha_event)
+                except Exception as e:
+                    logger.error(f"Error converting event for {artist}: {e}")
+            self.stats["events"] += len(events)
+
+            if len(batch) >= self.write_batch_size:
+                await batches.put(batch)
+                batch = []
+
+        if batch:
+            await batches.put(batch)
+        await batches.put(_DONE)
+
+    async def _writer(self, repository, batches: asyncio.Queue):
+        while True:
+            batch = await batches.get()
+            if batch is _DONE:
+                return
+
+            start = time.perf_counter()
+            inserted, updated = await repository.upsert_events_batch(batch)
+            elapsed = time.perf_counter() - start
+
+            self.stats["inserted"] += inserted
+            self.stats["updated"] += updated
+            self.stats["write_seconds"] += elapsed
+            logger.info(
+                f"Batch written: {inserted} inserted, {updated} updated "
+                f"in {elapsed:.2f}s ({len(batch) / elapsed if elapsed else 0:.0f} events/sec)"
+            )
+
+    async def run(self, artists: List[str], repository) -> Dict:
+        started = time.perf_counter()
+        artist_queue: asyncio.Queue = asyncio.Queue()
+        converted: asyncio.Queue = asyncio.Queue(maxsize=self.queue_size)
+        batches: asyncio.Queue = asyncio.Queue(maxsize=2)
+
+        for artist in artists:
+            artist_queue.put_nowait(artist)
+        for _ in range(self.concurrency):
+            artist_queue.put_nowait(_DONE)
+
+        logger.info(
+            f"Harvesting {len(artists)} artists with {self.concurrency} workers "
+            f"at {self.bucket.rate:.1f} requests/sec"
+        )
+
+        timeout = aiohttp.ClientTimeout(total=15)
+        headers = {"User-Agent": "Mozilla/5.0 (Ticketmaster Collector Bot)"}
+        async def fetch_all(session: aiohttp.ClientSession):
+            await asyncio.gather(*(self._fetcher(session, artist_queue, converted) for _ in range(self.concurrency)))
+            await converted.put(_DONE)
+
+        async with aiohttp.ClientSession(timeout=timeout, headers=headers) as session:
+            try:
+                async with asyncio.TaskGroup() as group:
+                    group.create_task(fetch_all(session))
+                    group.create_task(self._converter(converted, batches))
+                    group.create_task(self._writer(repository, batches))
+            except ExceptionGroup as errors:
+                logger.error(f"Harvest pipeline stopped: {errors.exceptions[0]}")
+                raise errors.exceptions[0]
+
+        self.stats["elapsed_seconds"] = time.perf_counter() - started
+        logger.info(
+            f"Harvest finished: {len(self.checked)}/{len(artists)} artists, {self.stats['requests']} requests "
+            f"({self.stats['rate_limited']} rate limited), {self.stats['events']} events in "
+            f"{self.stats['elapsed_seconds']:.1f}s"
+        )
+        return self.stats
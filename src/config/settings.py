@@ -35,16 +35,84 @@ class Config:
 
     CAPTCHA_WAIT_TIMEOUT = int(os.getenv('CAPTCHA_WAIT_TIMEOUT', 120))
 
+    POLITENESS_MIN_MULTIPLIER = float(os.getenv('POLITENESS_MIN_MULTIPLIER', 0.25))
+    POLITENESS_MAX_MULTIPLIER = float(os.getenv('POLITENESS_MAX_MULTIPLIER', 4))
+    POLITENESS_LATENCY_TARGET = float(os.getenv('POLITENESS_LATENCY_TARGET', 4))
+
+    LIGHT_BROWSER_PROFILE = os.getenv('LIGHT_BROWSER_PROFILE', 'true').lower() == 'true'
+    BLOCKED_RESOURCE_TYPES = [
+        t.strip() for t in os.getenv('BLOCKED_RESOURCE_TYPES', 'image,media,font,analytics').split(',') if t.strip()
+    ]
+    RESOURCE_ALLOWLIST = [
+        p.strip() for p in os.getenv('RESOURCE_ALLOWLIST', '').split(',') if p.strip()
+    ]
+
+    AFISHA_CAPTURE_MODE = os.getenv('AFISHA_CAPTURE_MODE', 'auto').lower()
+
+    CHECKPOINT_DIR = os.getenv('CHECKPOINT_DIR', '')
+    CHECKPOINT_MAX_AGE_HOURS = float(os.getenv('CHECKPOINT_MAX_AGE_HOURS', 12))
+    CRAWL_RESTART_ATTEMPTS = int(os.getenv('CRAWL_RESTART_ATTEMPTS', 2))
+
     MAX_CATEGORIES = 6
     CATEGORIES_TO_PARSE = ['concert']
 
     PARSE_SELECTIONS = True
     MAX_SELECTIONS_PER_CATEGORY = 6
 
-    PARSE_EVENT_DETAILS = False
-    MAX_EVENTS_FOR_DETAILS = 10
+    PARSE_EVENT_DETAILS = os.getenv('PARSE_EVENT_DETAILS', 'false').lower() == 'true'
+    MAX_EVENTS_FOR_DETAILS = int(os.getenv('MAX_EVENTS_FOR_DETAILS', 10))
+    DETAIL_TABS = int(os.getenv('DETAIL_TABS', 4))
+    DETAIL_REQUESTS_PER_SECOND = float(os.getenv('DETAIL_REQUESTS_PER_SECOND', 2))
+    DETAIL_PAGE_TIMEOUT = int(os.getenv('DETAIL_PAGE_TIMEOUT', 30))
+    DETAIL_CACHE_TTL_HOURS = float(os.getenv('DETAIL_CACHE_TTL_HOURS', 24))
+
+    TICKETMASTER_BASE_URL = os.getenv('TICKETMASTER_BASE_URL', 'https://app.ticketmaster.com/discovery/v2/events.json')
+    TICKETMASTER_RATE_LIMIT = float(os.getenv('TICKETMASTER_RATE_LIMIT', 4))
+    TICKETMASTER_CONCURRENCY = int(os.getenv('TICKETMASTER_CONCURRENCY', 8))
+    TICKETMASTER_MAX_PAGES = int(os.getenv('TICKETMASTER_MAX_PAGES', 5))
+    TICKETMASTER_DAILY_QUOTA = int(os.getenv('TICKETMASTER_DAILY_QUOTA', 5000))
+    TICKETMASTER_COUNTRY_CODE = os.getenv('TICKETMASTER_COUNTRY_CODE', '')
+    TICKETMASTER_LATLONG = os.getenv('TICKETMASTER_LATLONG', '')
+    TICKETMASTER_RADIUS = int(os.getenv('TICKETMASTER_RADIUS', 0))
+    TICKETMASTER_DAYS_AHEAD = int(os.getenv('TICKETMASTER_DAYS_AHEAD', 0))
+
+    REFRESH_MAX_STALENESS_HOURS = float(os.getenv('REFRESH_MAX_STALENESS_HOURS', 168))
+    REFRESH_EMPTY_CHECK_PENALTY = float(os.getenv('REFRESH_EMPTY_CHECK_PENALTY', 0.5))
 
     GEMINI_API_KEY = os.getenv('GEMINI_API_KEY', '')
+    GEMINI_CONCURRENCY = int(os.getenv('GEMINI_CONCURRENCY', 2))
+    GEMINI_DEADLINE_SECONDS = float(os.getenv('GEMINI_DEADLINE_SECONDS', 15))
+    GEMINI_MAX_RETRIES = int(os.getenv('GEMINI_MAX_RETRIES', 3))
+    GEMINI_RETRY_BASE_DELAY = float(os.getenv('GEMINI_RETRY_BASE_DELAY', 2))
+    GEMINI_CANDIDATES = int(os.getenv('GEMINI_CANDIDATES', 30))
+    GEMINI_DESCRIPTION_CHARS = int(os.getenv('GEMINI_DESCRIPTION_CHARS', 80))
+
+    RECOMMENDATION_CACHE_SIZE = int(os.getenv('RECOMMENDATION_CACHE_SIZE', 1024))
+    RECOMMENDATION_CACHE_TTL_SECONDS = float(os.getenv('RECOMMENDATION_CACHE_TTL_SECONDS', 6 * 3600))
+    RECOMMENDATION_CACHE_DIR = os.getenv('RECOMMENDATION_CACHE_DIR', '')
+    RECOMMENDATION_CACHE_DISK_ENTRIES = int(os.getenv('RECOMMENDATION_CACHE_DISK_ENTRIES', 10000))
+    RECOMMENDATION_MAX_AGE_HOURS = float(os.getenv('RECOMMENDATION_MAX_AGE_HOURS', 12))
+    RECOMMENDATION_ACTIVE_DAYS = int(os.getenv('RECOMMENDATION_ACTIVE_DAYS', 14))
+    RECOMMENDATION_GROUP_SIMILARITY = float(os.getenv('RECOMMENDATION_GROUP_SIMILARITY', 0.6))
+    NOTIFY_AFTER_INGEST = os.getenv('NOTIFY_AFTER_INGEST', 'true').lower() == 'true'
+
+    BOT_MODE = os.getenv('BOT_MODE', 'polling')
+    WEBHOOK_BASE_URL = os.getenv('WEBHOOK_BASE_URL', '')
+    WEBHOOK_PATH = os.getenv('WEBHOOK_PATH', '/webhook')
+    WEBHOOK_SECRET = os.getenv('WEBHOOK_SECRET', '')
+    WEBHOOK_HOST = os.getenv('WEBHOOK_HOST', '0.0.0.0')
+    WEBHOOK_PORT = int(os.getenv('WEBHOOK_PORT', 8080))
+    WEBHOOK_SHUTDOWN_TIMEOUT = float(os.getenv('WEBHOOK_SHUTDOWN_TIMEOUT', 30))
+
+    TELEGRAM_GLOBAL_RATE = float(os.getenv('TELEGRAM_GLOBAL_RATE', 25))
+    TELEGRAM_CHAT_RATE = float(os.getenv('TELEGRAM_CHAT_RATE', 1))
+    TELEGRAM_CHAT_BURST = float(os.getenv('TELEGRAM_CHAT_BURST', 3))
+    TELEGRAM_MAX_RETRIES = int(os.getenv('TELEGRAM_MAX_RETRIES', 3))
+    TELEGRAM_QUEUE_DELAY_WARNING = float(os.getenv('TELEGRAM_QUEUE_DELAY_WARNING', 5))
+
+    METRICS_HOST = os.getenv('METRICS_HOST', '127.0.0.1')
+    METRICS_PORT = int(os.getenv('METRICS_PORT', 0))
+    METRICS_LOG_INTERVAL = float(os.getenv('METRICS_LOG_INTERVAL', 300))
 
     PROXY_HOST = os.getenv('PROXY_HOST', '')
     PROXY_PORT = os.getenv('PROXY_PORT', '')
@@ -1,8 +1,6 @@
-from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession, async_sessionmaker
-from sqlalchemy.orm import declarative_base
-from sqlalchemy.pool import NullPool
 import logging
 from src.config.settings import config
+from src.utils.lazy import LazyObject, is_loaded, resolve
 
 logger = logging.getLogger(__name__)
 
@@ -12,20 +10,33 @@ def get_database_url() -> str:
         f"@{config.DB_HOST}:{config.DB_PORT}/{config.DB_NAME}"
     )
 
-engine = create_async_engine(
-    get_database_url(),
-    echo=False,
-    poolclass=NullPool,
-    future=True
-)
+def create_engine():
+    from sqlalchemy.ext.asyncio import create_async_engine
+    from sqlalchemy.pool import NullPool
+    return create_async_engine(
+        get_database_url(),
+        echo=False,
+        poolclass=NullPool,
+        future=True
+    )
+
+def create_session_maker():
+    from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+    return async_sessionmaker(
+        resolve(engine),
+        class_=AsyncSession,
+        expire_on_commit=False
+    )
 
-async_session_maker = async_sessionmaker(
-    engine,
-    class_=AsyncSession,
-    expire_on_commit=False
-)
+EVENT_COLUMN_MIGRATIONS = [
+    "ALTER TABLE events ADD COLUMN IF NOT EXISTS price VARCHAR",
+    "ALTER TABLE events ADD COLUMN IF NOT EXISTS extra JSONB",
+]
 
-async def get_session() -> AsyncSession:
+engine = LazyObject(create_engine)
+async_session_maker = LazyObject(create_session_maker)
+
+async def get_session():
     async with async_session_maker() as session:
         try:
             yield session
@@ -33,12 +44,16 @@ async def get_session() -> AsyncSession:
             await session.close()
 
 async def init_db():
+    from sqlalchemy import text
     from src.db.models import Base
     async with engine.begin() as conn:
         await conn.run_sync(Base.metadata.create_all)
+        for statement in EVENT_COLUMN_MIGRATIONS:
+            await conn.execute(text(statement))
     logger.info("Database tables created successfully")
 
 async def close_db():
+    if not is_loaded(engine):
+        return
     await engine.dispose()
     logger.info("Database connections closed")
-
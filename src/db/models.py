@@ -1,11 +1,13 @@
 from datetime import datetime, timezone
 from typing import Optional
-from sqlalchemy import Column, String, DateTime, Text, Index, UniqueConstraint
+from sqlalchemy import Column, String, DateTime, Text, Index, UniqueConstraint, BigInteger
 from sqlalchemy.orm import declarative_base
 from sqlalchemy.dialects.postgresql import JSONB
 
 Base = declarative_base()
 
+EVENT_EXTRA_FIELDS = ('venue_id', 'afisha_id', 'image')
+
 class Event(Base):
     __tablename__ = 'events'
 
@@ -20,6 +22,8 @@ class Event(Base):
     venue = Column(String, nullable=True)
     city = Column(String, nullable=True)
     source = Column(String, nullable=True)
+    price = Column(String, nullable=True)
+    extra = Column(JSONB, nullable=True)
     artist_name = Column(String, nullable=True)
     matched_artist = Column(String, nullable=True)
     scraped_at = Column(DateTime(timezone=True), default=lambda: datetime.now(timezone.utc), nullable=False)
@@ -48,11 +52,13 @@ class Event(Base):
             'venue': self.venue,
             'city': self.city,
             'source': self.source,
+            'price': self.price,
             'artist_name': self.artist_name,
             'matched_artist': self.matched_artist,
             'scraped_at': self.scraped_at.isoformat() if self.scraped_at else None,
             'created_at': self.created_at.isoformat() if self.created_at else None,
             'updated_at': self.updated_at.isoformat() if self.updated_at else None,
+            **(self.extra or {}),
         }
 
     @classmethod
@@ -73,6 +79,8 @@ class Event(Base):
             venue=data.get('venue'),
             city=data.get('city'),
             source=data.get('source'),
+            price=data.get('price'),
+            extra={field: data[field] for field in EVENT_EXTRA_FIELDS if data.get(field) is not None} or None,
             artist_name=data.get('artist_name'),
             matched_artist=data.get('matched_artist'),
         )
@@ -85,3 +93,78 @@ class Event(Base):
 
         return event
 
+
+class Artist(Base):
+    __tablename__ = 'artists'
+
+    id = Column(String, primary_key=True)
+    name = Column(String, nullable=False)
+    normalized_name = Column(String, nullable=False)
+    variants = Column(JSONB, nullable=False, default=list)
+    aliases = Column(JSONB, nullable=False, default=list)
+    event_ids = Column(JSONB, nullable=False, default=list)
+    catalog_version = Column(String, nullable=True)
+    matched_at = Column(DateTime(timezone=True), nullable=True)
+    created_at = Column(DateTime(timezone=True), default=lambda: datetime.now(timezone.utc), nullable=False)
+    updated_at = Column(DateTime(timezone=True), default=lambda: datetime.now(timezone.utc),
+                       onupdate=lambda: datetime.now(timezone.utc), nullable=False)
+
+    __table_args__ = (
+        Index('idx_artists_normalized_name', 'normalized_name'),
+    )
+
+    def to_dict(self) -> dict:
+        return {
+            'id': self.id,
+            'name': self.name,
+            'normalized_name': self.normalized_name,
+            'variants': self.variants or [],
+            'aliases': self.aliases or [],
+            'event_ids': self.event_ids or [],
+            'catalog_version': self.catalog_version,
+            'matched_at': self.matched_at.isoformat() if self.matched_at else None,
+        }
+
+class ArtistEvents(Base):
+    __tablename__ = 'artist_events'
+
+    normalized_name = Column(String, primary_key=True)
+    artist_name = Column(String, nullable=False)
+    event_ids = Column(JSONB, nullable=False, default=list)
+    catalog_version = Column(String, nullable=False, index=True)
+    refreshed_at = Column(DateTime(timezone=True), default=lambda: datetime.now(timezone.utc), nullable=False)
+
+    def to_dict(self) -> dict:
+        return {
+            'normalized_name': self.normalized_name,
+            'artist_name': self.artist_name,
+            'event_ids': self.event_ids or [],
+            'catalog_version': self.catalog_version,
+            'refreshed_at': self.refreshed_at.isoformat() if self.refreshed_at else None,
+        }
+
+class UserArtist(Base):
+    __tablename__ = 'user_artists'
+
+    user_id = Column(BigInteger, primary_key=True)
+    normalized_name = Column(String, primary_key=True)
+    artist_name = Column(String, nullable=False)
+    updated_at = Column(DateTime(timezone=True), default=lambda: datetime.now(timezone.utc), nullable=False)
+
+class UserNotification(Base):
+    __tablename__ = 'user_notifications'
+
+    user_id = Column(BigInteger, primary_key=True)
+    event_id = Column(String, primary_key=True)
+    notified_at = Column(DateTime(timezone=True), default=lambda: datetime.now(timezone.utc), nullable=False)
+
+class UserRecommendation(Base):
+    __tablename__ = 'user_recommendations'
+
+    user_id = Column(BigInteger, primary_key=True)
+    city = Column(String, primary_key=True)
+    profile_key = Column(String, nullable=True)
+    concerts = Column(JSONB, nullable=True)
+    catalog_version = Column(String, nullable=True)
+    active_at = Column(DateTime(timezone=True), default=lambda: datetime.now(timezone.utc), nullable=False, index=True)
+    computed_at = Column(DateTime(timezone=True), nullable=True)
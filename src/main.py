@@ -1,5 +1,6 @@
 import sys
 import time
+import asyncio
 import logging
 from pathlib import Path
 
@@ -197,10 +198,10 @@ def main():
 
     if recommendation_service.enabled:
         print("\nАнализирую музыкальные стили и ищу похожие концерты...")
-        recommended_concerts = recommendation_service.get_recommendations(
+        recommended_concerts = asyncio.run(recommendation_service.get_recommendations_async(
             artist_names,
             max_recommendations=10
-        )
+        ))
 
         if recommended_concerts:
             print(f"\n✨ Найдено {len(recommended_concerts)} рекомендованных концертов:\n")
@@ -1,4 +1,15 @@
-from .concert_repository import ConcertRepository
+import importlib
 
-__all__ = ['ConcertRepository']
+_EXPORTS = {
+    'ConcertRepository': '.concert_repository',
+    'ArtistRepository': '.artist_repository',
+    'UserArtistRepository': '.user_artist_repository',
+    'UserRecommendationRepository': '.user_recommendation_repository',
+}
 
+__all__ = list(_EXPORTS)
+
+def __getattr__(name):
+    if name in _EXPORTS:
+        return getattr(importlib.import_module(_EXPORTS[name], __name__), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
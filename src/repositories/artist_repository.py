@@ -0,0 +1,176 @@
+from datetime import datetime, timezone
+from typing import List, Dict, Optional
+import logging
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select, delete
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from src.db.models import Artist, ArtistEvents
+from src.db.database import async_session_maker
+
+logger = logging.getLogger(__name__)
+
+ARTIST_UPDATE_COLUMNS = ['name', 'normalized_name', 'variants', 'event_ids', 'catalog_version', 'matched_at', 'updated_at']
+ARTIST_EVENTS_UPDATE_COLUMNS = ['artist_name', 'event_ids', 'catalog_version', 'refreshed_at']
+ARTIST_EVENTS_CHUNK_SIZE = 1000
+
+class ArtistRepository:
+    def __init__(self, session: Optional[AsyncSession] = None):
+        self._session = session
+        self._own_session = session is None
+
+    async def _get_session(self) -> AsyncSession:
+        if self._session:
+            return self._session
+        return async_session_maker()
+
+    async def _close_session(self, session: AsyncSession):
+        if self._own_session and session:
+            await session.close()
+
+    async def get_artists(self, artist_ids: List[str]) -> Dict[str, Dict]:
+        if not artist_ids:
+            return {}
+
+        session = await self._get_session()
+        try:
+            result = await session.execute(
+                select(Artist).where(Artist.id.in_(list(set(artist_ids))))
+            )
+            return {artist.id: artist.to_dict() for artist in result.scalars().all()}
+        except Exception as e:
+            logger.error(f"Error getting artists: {e}")
+            return {}
+        finally:
+            await self._close_session(session)
+
+    async def upsert_artists(self, artists: List[Dict]) -> int:
+        now = datetime.now(timezone.utc)
+        rows = {}
+        for artist in artists:
+            if not artist.get('id'):
+                continue
+            rows[artist['id']] = {
+                'id': artist['id'],
+                'name': artist['name'],
+                'normalized_name': artist['normalized_name'],
+                'variants': artist.get('variants') or [],
+                'aliases': artist.get('aliases') or [],
+                'event_ids': artist.get('event_ids') or [],
+                'catalog_version': artist.get('catalog_version'),
+                'matched_at': now,
+                'created_at': now,
+                'updated_at': now,
+            }
+
+        if not rows:
+            return 0
+
+        session = await self._get_session()
+        try:
+            stmt = pg_insert(Artist).values(list(rows.values()))
+            stmt = stmt.on_conflict_do_update(
+                index_elements=[Artist.id],
+                set_={column: stmt.excluded[column] for column in ARTIST_UPDATE_COLUMNS}
+            )
+            await session.execute(stmt)
+            await session.commit()
+            logger.info(f"Upserted {len(rows)} artists")
+            return len(rows)
+        except Exception as e:
+            await session.rollback()
+            logger.error(f"Error upserting artists: {e}", exc_info=True)
+            return 0
+        finally:
+            await self._close_session(session)
+
+    async def add_aliases(self, aliases_by_name: Dict[str, List[str]]) -> int:
+        if not aliases_by_name:
+            return 0
+
+        session = await self._get_session()
+        try:
+            result = await session.execute(
+                select(Artist).where(Artist.normalized_name.in_(list(aliases_by_name)))
+            )
+            changed = 0
+            for artist in result.scalars().all():
+                merged = list(dict.fromkeys((artist.aliases or []) + aliases_by_name[artist.normalized_name]))
+                if merged != (artist.aliases or []):
+                    artist.aliases = merged
+                    artist.catalog_version = None
+                    changed += 1
+            await session.commit()
+            if changed:
+                logger.info(f"Added aliases to {changed} artists")
+            return changed
+        except Exception as e:
+            await session.rollback()
+            logger.error(f"Error adding artist aliases: {e}")
+            return 0
+        finally:
+            await self._close_session(session)
+
+    async def get_known_artists(self) -> List[Dict]:
+        session = await self._get_session()
+        try:
+            result = await session.execute(select(Artist.name, Artist.aliases))
+            return [{'name': name, 'aliases': aliases or []} for name, aliases in result.all()]
+        except Exception as e:
+            logger.error(f"Error getting known artists: {e}")
+            return []
+        finally:
+            await self._close_session(session)
+
+    async def get_artist_events(self, normalized_names: List[str]) -> Dict[str, Dict]:
+        if not normalized_names:
+            return {}
+
+        session = await self._get_session()
+        try:
+            result = await session.execute(
+                select(ArtistEvents).where(ArtistEvents.normalized_name.in_(list(set(normalized_names))))
+            )
+            return {row.normalized_name: row.to_dict() for row in result.scalars().all()}
+        except Exception as e:
+            logger.error(f"Error getting artist events: {e}")
+            return {}
+        finally:
+            await self._close_session(session)
+
+    async def replace_artist_events(self, rows: List[Dict], catalog_version: str) -> int:
+        now = datetime.now(timezone.utc)
+        values = [
+            {
+                'normalized_name': row['normalized_name'],
+                'artist_name': row['artist_name'],
+                'event_ids': row.get('event_ids') or [],
+                'catalog_version': catalog_version,
+                'refreshed_at': now,
+            }
+            for row in rows
+        ]
+
+        session = await self._get_session()
+        try:
+            for start in range(0, len(values), ARTIST_EVENTS_CHUNK_SIZE):
+                stmt = pg_insert(ArtistEvents).values(values[start:start + ARTIST_EVENTS_CHUNK_SIZE])
+                stmt = stmt.on_conflict_do_update(
+                    index_elements=[ArtistEvents.normalized_name],
+                    set_={column: stmt.excluded[column] for column in ARTIST_EVENTS_UPDATE_COLUMNS}
+                )
+                await session.execute(stmt)
+
+            await session.execute(delete(ArtistEvents).where(ArtistEvents.catalog_version != catalog_version))
+            await session.commit()
+            logger.info(f"Materialized events for {len(values)} artists (catalog {catalog_version[:8]})")
+            return len(values)
+        except Exception as e:
+            await session.rollback()
+            logger.error(f"Error materializing artist events: {e}", exc_info=True)
+            return 0
+        finally:
+            await self._close_session(session)
+
+    async def close(self):
+        if self._session:
+            await self._session.close()
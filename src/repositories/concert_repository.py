@@ -1,14 +1,26 @@
 from datetime import datetime, timezone
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Tuple
 import logging
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, update, delete
+from sqlalchemy import select, update, delete, literal_column
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.exc import IntegrityError
 from src.db.models import Event
 from src.db.database import async_session_maker
+from src.utils.metrics import inc, timed
 
 logger = logging.getLogger(__name__)
 
+UPSERT_COLUMNS = [
+    'id', 'url', 'title', 'full_title', 'description', 'category', 'date', 'dates',
+    'venue', 'city', 'source', 'price', 'extra', 'artist_name', 'matched_artist'
+]
+UPSERT_UPDATE_COLUMNS = [
+    'title', 'full_title', 'description', 'date', 'dates', 'venue', 'city', 'source',
+    'price', 'extra', 'artist_name', 'scraped_at', 'updated_at'
+]
+UPSERT_CHUNK_SIZE = 1000
+
 class ConcertRepository:
     def __init__(self, session: Optional[AsyncSession] = None):
         self._session = session
@@ -44,6 +56,7 @@ class ConcertRepository:
         finally:
             await self._close_session(session)
 
+    @timed('repository.save_events_batch')
     async def save_events_batch(self, events: List[Dict]) -> int:
         saved_count = 0
         session = await self._get_session()
@@ -80,6 +93,54 @@ class ConcertRepository:
 
         return saved_count
 
+    @timed('repository.upsert_events_batch')
+    async def upsert_events_batch(self, events: List[Dict]) -> Tuple[int, int]:
+        now = datetime.now(timezone.utc)
+        rows = {}
+        for event_data in events:
+            url = event_data.get('url')
+            if not url:
+                logger.warning("Skipping event without URL")
+                continue
+
+            event = Event.from_dict(event_data)
+            row = {column: getattr(event, column) for column in UPSERT_COLUMNS}
+            row.update(scraped_at=now, created_at=now, updated_at=now)
+            rows[url] = row
+
+        if not rows:
+            return 0, 0
+
+        inserted = 0
+        updated = 0
+        values = list(rows.values())
+        session = await self._get_session()
+        try:
+            for start in range(0, len(values), UPSERT_CHUNK_SIZE):
+                stmt = pg_insert(Event).values(values[start:start + UPSERT_CHUNK_SIZE])
+                stmt = stmt.on_conflict_do_update(
+                    index_elements=[Event.url],
+                    set_={column: stmt.excluded[column] for column in UPSERT_UPDATE_COLUMNS}
+                ).returning(literal_column('(xmax = 0)').label('inserted'))
+
+                result = await session.execute(stmt)
+                flags = result.scalars().all()
+                chunk_inserted = sum(1 for flag in flags if flag)
+                inserted += chunk_inserted
+                updated += len(flags) - chunk_inserted
+
+            await session.commit()
+            logger.info(f"Upserted {len(values)} events: {inserted} inserted, {updated} updated")
+        except Exception as e:
+            await session.rollback()
+            logger.error(f"Error in batch upsert: {e}", exc_info=True)
+            return 0, 0
+        finally:
+            await self._close_session(session)
+
+        return inserted, updated
+
+    @timed('repository.get_event_by_url')
     async def get_event_by_url(self, url: str) -> Optional[Dict]:
         session = await self._get_session()
         try:
@@ -94,6 +155,7 @@ class ConcertRepository:
         finally:
             await self._close_session(session)
 
+    @timed('repository.get_events_by_category')
     async def _get_events_by_category_async(self, category: str) -> List[Dict]:
 
         session = await self._get_session()
@@ -102,6 +164,7 @@ class ConcertRepository:
                 select(Event).where(Event.category == category)
             )
             events = result.scalars().all()
+            inc('repository_rows_loaded_total', len(events))
             return [event.to_dict() for event in events]
         except Exception as e:
             logger.error(f"Error getting events by category: {e}")
@@ -109,6 +172,21 @@ class ConcertRepository:
         finally:
             await self._close_session(session)
 
+    @timed('repository.get_events_created_since')
+    async def get_events_created_since(self, since: datetime, category: str = 'concert') -> List[Dict]:
+        session = await self._get_session()
+        try:
+            result = await session.execute(
+                select(Event).where(Event.category == category, Event.created_at > since).order_by(Event.created_at)
+            )
+            return [event.to_dict() for event in result.scalars().all()]
+        except Exception as e:
+            logger.error(f"Error getting new events: {e}")
+            return []
+        finally:
+            await self._close_session(session)
+
+    @timed('repository.get_all_events')
     async def get_all_events(self) -> List[Dict]:
 
         session = await self._get_session()
@@ -135,6 +213,22 @@ class ConcertRepository:
         finally:
             await self._close_session(session)
 
+    @timed('repository.get_catalog_stamp')
+    async def get_catalog_stamp(self, category: str) -> Optional[Tuple[int, Optional[str]]]:
+        session = await self._get_session()
+        try:
+            from sqlalchemy import func
+            result = await session.execute(
+                select(func.count(Event.id), func.max(Event.updated_at)).where(Event.category == category)
+            )
+            count, latest = result.one()
+            return count or 0, latest.isoformat() if latest else None
+        except Exception as e:
+            logger.error(f"Error getting catalog stamp: {e}")
+            return None
+        finally:
+            await self._close_session(session)
+
     async def count_events_by_category(self, category: str) -> int:
 
         session = await self._get_session()
@@ -174,6 +268,9 @@ class ConcertRepository:
     def connect(self):
         pass
 
+    async def get_events_by_category_async(self, category: str) -> List[Dict]:
+        return await self._get_events_by_category_async(category)
+
     def get_events_by_category(self, category: str) -> List[Dict]:
         import asyncio
         try:
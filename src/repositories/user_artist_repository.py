@@ -0,0 +1,124 @@
+from datetime import datetime, timezone
+from typing import List, Dict, Iterable, Optional, Set, Tuple
+import logging
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select, delete, tuple_
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from src.db.models import UserArtist, UserNotification
+from src.db.database import async_session_maker
+from src.utils.transliteration import normalize
+
+logger = logging.getLogger(__name__)
+
+class UserArtistRepository:
+    def __init__(self, session: Optional[AsyncSession] = None):
+        self._session = session
+        self._own_session = session is None
+
+    async def _get_session(self) -> AsyncSession:
+        if self._session:
+            return self._session
+        return async_session_maker()
+
+    async def _close_session(self, session: AsyncSession):
+        if self._own_session and session:
+            await session.close()
+
+    async def save_user_artists(self, user_id: int, artist_names: Iterable[str]) -> int:
+        now = datetime.now(timezone.utc)
+        rows = {}
+        for name in artist_names:
+            if name and normalize(name):
+                rows.setdefault(normalize(name), {
+                    'user_id': user_id, 'normalized_name': normalize(name), 'artist_name': name, 'updated_at': now
+                })
+
+        session = await self._get_session()
+        try:
+            await session.execute(delete(UserArtist).where(UserArtist.user_id == user_id))
+            if rows:
+                await session.execute(pg_insert(UserArtist).values(list(rows.values())))
+            await session.commit()
+            logger.info(f"Saved {len(rows)} artists for user {user_id}")
+            return len(rows)
+        except Exception as e:
+            await session.rollback()
+            logger.error(f"Error saving artists for user {user_id}: {e}")
+            return 0
+        finally:
+            await self._close_session(session)
+
+    async def get_all_user_artists(self) -> Dict[int, List[str]]:
+        session = await self._get_session()
+        try:
+            result = await session.execute(select(UserArtist.user_id, UserArtist.artist_name))
+            users: Dict[int, List[str]] = {}
+            for user_id, artist_name in result.all():
+                users.setdefault(user_id, []).append(artist_name)
+            return users
+        except Exception as e:
+            logger.error(f"Error getting user artists: {e}")
+            return {}
+        finally:
+            await self._close_session(session)
+
+    async def get_user_artists(self, user_ids: List[int]) -> Dict[int, List[str]]:
+        if not user_ids:
+            return {}
+
+        session = await self._get_session()
+        try:
+            result = await session.execute(
+                select(UserArtist.user_id, UserArtist.artist_name).where(UserArtist.user_id.in_(user_ids))
+            )
+            users: Dict[int, List[str]] = {}
+            for user_id, artist_name in result.all():
+                users.setdefault(user_id, []).append(artist_name)
+            return users
+        except Exception as e:
+            logger.error(f"Error getting artists for {len(user_ids)} users: {e}")
+            return {}
+        finally:
+            await self._close_session(session)
+
+    async def get_notified(self, pairs: List[Tuple[int, str]]) -> Set[Tuple[int, str]]:
+        if not pairs:
+            return set()
+
+        session = await self._get_session()
+        try:
+            result = await session.execute(
+                select(UserNotification.user_id, UserNotification.event_id).where(
+                    tuple_(UserNotification.user_id, UserNotification.event_id).in_(pairs)
+                )
+            )
+            return {(user_id, event_id) for user_id, event_id in result.all()}
+        except Exception as e:
+            logger.error(f"Error getting sent notifications: {e}")
+            return set()
+        finally:
+            await self._close_session(session)
+
+    async def mark_notified(self, pairs: List[Tuple[int, str]]) -> int:
+        if not pairs:
+            return 0
+
+        now = datetime.now(timezone.utc)
+        session = await self._get_session()
+        try:
+            stmt = pg_insert(UserNotification).values(
+                [{'user_id': user_id, 'event_id': event_id, 'notified_at': now} for user_id, event_id in set(pairs)]
+            ).on_conflict_do_nothing()
+            await session.execute(stmt)
+            await session.commit()
+            return len(set(pairs))
+        except Exception as e:
+            await session.rollback()
+            logger.error(f"Error saving notifications: {e}")
+            return 0
+        finally:
+            await self._close_session(session)
+
+    async def close(self):
+        if self._session:
+            await self._session.close()
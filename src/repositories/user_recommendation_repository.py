@@ -0,0 +1,125 @@
+from datetime import datetime, timedelta, timezone
+from typing import List, Dict, Optional
+import logging
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from src.config.settings import config
+from src.db.models import UserRecommendation
+from src.db.database import async_session_maker
+
+logger = logging.getLogger(__name__)
+
+class UserRecommendationRepository:
+    def __init__(self, session: Optional[AsyncSession] = None):
+        self._session = session
+        self._own_session = session is None
+
+    async def _get_session(self) -> AsyncSession:
+        if self._session:
+            return self._session
+        return async_session_maker()
+
+    async def _close_session(self, session: AsyncSession):
+        if self._own_session and session:
+            await session.close()
+
+    async def mark_active(self, user_id: int, city: str) -> bool:
+        now = datetime.now(timezone.utc)
+        session = await self._get_session()
+        try:
+            stmt = pg_insert(UserRecommendation).values(user_id=user_id, city=city or '', active_at=now)
+            stmt = stmt.on_conflict_do_update(
+                index_elements=[UserRecommendation.user_id, UserRecommendation.city],
+                set_={'active_at': now}
+            )
+            await session.execute(stmt)
+            await session.commit()
+            return True
+        except Exception as e:
+            await session.rollback()
+            logger.error(f"Error marking user {user_id} active: {e}")
+            return False
+        finally:
+            await self._close_session(session)
+
+    async def get_active_users(self, since: datetime) -> Dict[str, List[int]]:
+        session = await self._get_session()
+        try:
+            result = await session.execute(
+                select(UserRecommendation.city, UserRecommendation.user_id).where(UserRecommendation.active_at >= since)
+            )
+            cities: Dict[str, List[int]] = {}
+            for city, user_id in result.all():
+                cities.setdefault(city, []).append(user_id)
+            return cities
+        except Exception as e:
+            logger.error(f"Error getting active users: {e}")
+            return {}
+        finally:
+            await self._close_session(session)
+
+    async def get_recommendations(
+        self, user_id: int, city: str, profile_key: str, max_age: Optional[timedelta] = None
+    ) -> Optional[List[Dict]]:
+        max_age = max_age or timedelta(hours=config.RECOMMENDATION_MAX_AGE_HOURS)
+        session = await self._get_session()
+        try:
+            result = await session.execute(
+                select(UserRecommendation).where(
+                    UserRecommendation.user_id == user_id,
+                    UserRecommendation.city == (city or '')
+                )
+            )
+            row = result.scalar_one_or_none()
+            if row is None or row.concerts is None or row.profile_key != profile_key:
+                return None
+            if row.computed_at is None or row.computed_at < datetime.now(timezone.utc) - max_age:
+                return None
+            return row.concerts
+        except Exception as e:
+            logger.error(f"Error getting stored recommendations for user {user_id}: {e}")
+            return None
+        finally:
+            await self._close_session(session)
+
+    async def save_recommendations(self, rows: List[Dict], catalog_version: str) -> int:
+        if not rows:
+            return 0
+
+        now = datetime.now(timezone.utc)
+        session = await self._get_session()
+        try:
+            values = [{
+                'user_id': row['user_id'],
+                'city': row['city'] or '',
+                'profile_key': row['profile_key'],
+                'concerts': row['concerts'],
+                'catalog_version': catalog_version,
+                'active_at': now,
+                'computed_at': now,
+            } for row in rows]
+            stmt = pg_insert(UserRecommendation).values(values)
+            stmt = stmt.on_conflict_do_update(
+                index_elements=[UserRecommendation.user_id, UserRecommendation.city],
+                set_={
+                    'profile_key': stmt.excluded.profile_key,
+                    'concerts': stmt.excluded.concerts,
+                    'catalog_version': stmt.excluded.catalog_version,
+                    'computed_at': stmt.excluded.computed_at,
+                }
+            )
+            await session.execute(stmt)
+            await session.commit()
+            logger.info(f"Stored recommendations for {len(values)} users")
+            return len(values)
+        except Exception as e:
+            await session.rollback()
+            logger.error(f"Error storing recommendations: {e}")
+            return 0
+        finally:
+            await self._close_session(session)
+
+    async def close(self):
+        if self._session:
+            await self._session.close()
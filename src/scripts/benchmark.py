@@ -0,0 +1,202 @@
+import re
+import sys
+import json
+import time
+import random
+import logging
+import platform
+import argparse
+import statistics
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+project_root = Path(__file__).parent.parent.parent
+src_path = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+sys.path.insert(0, str(src_path))
+
+from src.bot.handlers.playlist_handler import ConcertService
+from src.bot.utils import extract_date_sort_key, filter_by_city, format_concert_message, get_available_cities
+from src.services.concert_service import ConcertMatcherService
+from src.utils.concert_utils import get_concert_date
+from src.scripts.synthetic_catalog import generate_artists, generate_catalog, generate_playlist
+
+logger = logging.getLogger(__name__)
+
+BASELINE_PATH = project_root / 'benchmarks' / 'baseline.json'
+BASELINE_VERSION = 1
+PLAYLIST_SIZES = [100, 1000, 5000]
+CATALOG_SIZE = 5000
+DEFAULT_TOLERANCE = 0.5
+
+class StaticRepository:
+    def __init__(self, concerts: List[Dict]):
+        self.concerts = concerts
+
+    def get_events_by_category(self, category: str) -> List[Dict]:
+        return [c for c in self.concerts if c.get('category') == category]
+
+def calibrate(repeats: int = 3) -> float:
+    rng = random.Random(0)
+    words = [''.join(rng.choice('abcdefghijklmnopqrstuvwxyzабвгдеёжзийклмнопрст') for _ in range(12)) for _ in range(20000)]
+    pattern = re.compile(r'(\d{1,2})\s+([а-яё]+)')
+
+    def workload():
+        index = {}
+        for word in sorted(words):
+            index.setdefault(word[:3], []).append(word.lower())
+        return sum(1 for word in words if pattern.search(word)) + len(index)
+
+    return measure(workload, repeats)['best']
+
+def measure(func: Callable, repeats: int) -> Dict[str, float]:
+    timings = []
+    for _ in range(repeats):
+        started = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - started)
+    return {'best': min(timings), 'median': statistics.median(timings)}
+
+def sort_by_date(concerts: List[Dict]) -> List[Dict]:
+    return sorted(concerts, key=lambda c: extract_date_sort_key(get_concert_date(c) or ''))
+
+def benchmark_cases(catalog: List[Dict], playlists: Dict[int, List[str]]) -> Dict[str, Callable]:
+    repository = StaticRepository(catalog)
+    cases = {}
+
+    for size, playlist in playlists.items():
+        cases[f'matcher.find_concerts_for_artists[{size}]'] = (
+            lambda playlist=playlist: ConcertMatcherService(repository, city='moscow').find_concerts_for_artists(playlist)
+        )
+        cases[f'concert_service.find_concerts_by_artists[{size}]'] = (
+            lambda playlist=playlist: ConcertService(repository).find_concerts_by_artists(playlist)
+        )
+
+    ordered = sort_by_date(catalog)
+    cases['get_available_cities'] = lambda: get_available_cities(catalog)
+    cases['filter_by_city'] = lambda: filter_by_city(catalog, 'Москва')
+    cases['sort_by_date'] = lambda: sort_by_date(catalog)
+    cases['format_concert_message'] = lambda: format_concert_message(ordered, len(ordered) // 2, 10, 'date')
+    return cases
+
+def run_benchmarks(
+    playlist_sizes: List[int] = None,
+    catalog_size: int = CATALOG_SIZE,
+    seed: int = 42,
+    repeats: int = 3,
+    only: Optional[str] = None
+) -> Dict:
+    playlist_sizes = playlist_sizes or PLAYLIST_SIZES
+    artists = generate_artists(max(playlist_sizes) * 3 // 2, seed)
+    catalog = generate_catalog(catalog_size, artists, seed)
+    playlists = {size: generate_playlist(artists, size, seed) for size in playlist_sizes}
+
+    calibration = calibrate(repeats)
+    results = {}
+    for name, func in benchmark_cases(catalog, playlists).items():
+        if only and only not in name:
+            continue
+        timing = measure(func, repeats)
+        results[name] = dict(timing, normalized=timing['best'] / calibration)
+
+    return {
+        'version': BASELINE_VERSION,
+        'seed': seed,
+        'catalog_size': catalog_size,
+        'playlist_sizes': playlist_sizes,
+        'python': platform.python_version(),
+        'calibration': calibration,
+        'results': results,
+    }
+
+def compare(current: Dict, baseline: Dict, tolerance: float = DEFAULT_TOLERANCE) -> List[Dict]:
+    rows = []
+    for name, result in current['results'].items():
+        reference = baseline.get('results', {}).get(name)
+        if reference is None:
+            rows.append({'name': name, 'ratio': None, 'regression': False})
+            continue
+        ratio = result['normalized'] / reference['normalized']
+        rows.append({'name': name, 'ratio': ratio, 'regression': ratio > 1 + tolerance})
+    return rows
+
+def load_baseline(path: Path) -> Optional[Dict]:
+    if not path.exists():
+        return None
+    baseline = json.loads(path.read_text(encoding='utf-8'))
+    if baseline.get('version') != BASELINE_VERSION:
+        logger.warning(f"Baseline {path} has version {baseline.get('version')}, expected {BASELINE_VERSION}")
+        return None
+    return baseline
+
+def save_baseline(result: Dict, path: Path):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(result, indent=2, ensure_ascii=False, sort_keys=True) + '\n', encoding='utf-8')
+
+def print_report(current: Dict, rows: Optional[List[Dict]] = None):
+    ratios = {row['name']: row for row in rows or []}
+    print("\n" + "=" * 88)
+    print(f"Benchmarks (catalog {current['catalog_size']}, seed {current['seed']}, calibration {current['calibration'] * 1000:.1f} ms)")
+    print("=" * 88)
+    for name, result in current['results'].items():
+        line = f"  {name:<50} best {result['best'] * 1000:9.2f} ms  median {result['median'] * 1000:9.2f} ms"
+        row = ratios.get(name)
+        if row and row['ratio'] is not None:
+            line += f"  x{row['ratio']:.2f}" + ("  REGRESSION" if row['regression'] else "")
+        elif row:
+            line += "  new"
+        print(line)
+    print("=" * 88)
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(description='Benchmark matching, sorting and rendering on a synthetic catalog')
+    parser.add_argument('--playlist-sizes', default=','.join(map(str, PLAYLIST_SIZES)), help='Comma-separated playlist sizes')
+    parser.add_argument('--catalog-size', type=int, default=CATALOG_SIZE)
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--repeats', type=int, default=3)
+    parser.add_argument('--only', help='Run only cases whose name contains this text')
+    parser.add_argument('--baseline', type=Path, default=BASELINE_PATH)
+    parser.add_argument('--tolerance', type=float, default=DEFAULT_TOLERANCE,
+                        help='Allowed slowdown relative to the baseline (0.5 = 50%%)')
+    parser.add_argument('--update-baseline', action='store_true', help='Save results as the new baseline')
+    parser.add_argument('--output', type=Path, help='Also write results as JSON to this path')
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.WARNING, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+    logging.getLogger('src').setLevel(logging.WARNING)
+
+    current = run_benchmarks(
+        [int(size) for size in args.playlist_sizes.split(',') if size],
+        args.catalog_size, args.seed, args.repeats, args.only
+    )
+    if args.output:
+        save_baseline(current, args.output)
+
+    if args.update_baseline:
+        save_baseline(current, args.baseline)
+        print_report(current)
+        print(f"Baseline saved to {args.baseline}")
+        return 0
+
+    baseline = load_baseline(args.baseline)
+    if baseline is None:
+        print_report(current)
+        print(f"No baseline at {args.baseline}, run with --update-baseline to create one")
+        return 0
+
+    if (baseline['seed'], baseline['catalog_size']) != (current['seed'], current['catalog_size']):
+        print(f"Baseline was recorded with seed {baseline['seed']} and catalog {baseline['catalog_size']}, results are not comparable")
+        return 2
+
+    rows = compare(current, baseline, args.tolerance)
+    print_report(current, rows)
+    regressions = [row for row in rows if row['regression']]
+    if regressions:
+        print(f"{len(regressions)} benchmark(s) slower than the baseline by more than {args.tolerance:.0%}:")
+        for row in regressions:
+            print(f"  {row['name']}: x{row['ratio']:.2f}")
+        return 1
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
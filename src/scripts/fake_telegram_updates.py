@@ -0,0 +1,129 @@
+import sys
+import time
+import random
+import asyncio
+import logging
+import argparse
+from pathlib import Path
+from typing import Dict, List, Optional
+import aiohttp
+
+project_root = Path(__file__).parent.parent.parent
+src_path = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+sys.path.insert(0, str(src_path))
+
+from src.scripts.ticketmaster_load_test import percentile
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+SECRET_HEADER = 'X-Telegram-Bot-Api-Secret-Token'
+SAMPLE_TEXTS = ['/start', '/help', 'привет', 'https://music.yandex.ru/users/test/playlists/3']
+SAMPLE_CALLBACKS = ['sort_date', 'sort_artist', 'page_1', 'refresh', 'city_all']
+
+def _user(chat_id: int) -> Dict:
+    return {'id': chat_id, 'is_bot': False, 'first_name': f'User {chat_id}'}
+
+def message_update(update_id: int, chat_id: int, text: str) -> Dict:
+    return {
+        'update_id': update_id,
+        'message': {
+            'message_id': update_id,
+            'date': int(time.time()),
+            'chat': {'id': chat_id, 'type': 'private'},
+            'from': _user(chat_id),
+            'text': text,
+        }
+    }
+
+def callback_update(update_id: int, chat_id: int, data: str) -> Dict:
+    return {
+        'update_id': update_id,
+        'callback_query': {
+            'id': str(update_id),
+            'chat_instance': str(chat_id),
+            'from': _user(chat_id),
+            'data': data,
+            'message': {
+                'message_id': update_id - 1,
+                'date': int(time.time()),
+                'chat': {'id': chat_id, 'type': 'private'},
+                'text': 'results',
+            },
+        }
+    }
+
+def synthetic_updates(count: int, chats: int = 10, callback_ratio: float = 0.3, seed: int = 42) -> List[Dict]:
+    rng = random.Random(seed)
+    updates = []
+    for update_id in range(1, count + 1):
+        chat_id = 100000 + rng.randrange(chats)
+        if rng.random() < callback_ratio:
+            updates.append(callback_update(update_id, chat_id, rng.choice(SAMPLE_CALLBACKS)))
+        else:
+            updates.append(message_update(update_id, chat_id, rng.choice(SAMPLE_TEXTS)))
+    return updates
+
+async def push_updates(url: str, updates: List[Dict], secret_token: Optional[str] = None, concurrency: int = 8) -> Dict:
+    headers = {SECRET_HEADER: secret_token} if secret_token else {}
+    semaphore = asyncio.Semaphore(concurrency)
+    stats = {'sent': 0, 'accepted': 0, 'rejected': 0, 'failed': 0, 'latencies': []}
+
+    async def push(session: aiohttp.ClientSession, update: Dict):
+        async with semaphore:
+            started = time.perf_counter()
+            try:
+                async with session.post(url, json=update, headers=headers) as response:
+                    await response.read()
+                    status = response.status
+            except aiohttp.ClientError as e:
+                logger.warning(f"Update {update['update_id']} failed: {e}")
+                stats['failed'] += 1
+                return
+            stats['latencies'].append(time.perf_counter() - started)
+            stats['sent'] += 1
+            if status == 200:
+                stats['accepted'] += 1
+            else:
+                stats['rejected'] += 1
+
+    started = time.perf_counter()
+    async with aiohttp.ClientSession(timeout=aiohttp.ClientTimeout(total=30)) as session:
+        await asyncio.gather(*(push(session, update) for update in updates))
+    stats['elapsed'] = time.perf_counter() - started
+    return stats
+
+def print_report(stats: Dict):
+    elapsed = stats['elapsed'] or 1e-9
+    print("\n" + "=" * 60)
+    print("Fake Telegram update source")
+    print("=" * 60)
+    print(f"  Sent:          {stats['sent']}")
+    print(f"  Accepted:      {stats['accepted']}")
+    print(f"  Rejected:      {stats['rejected']}")
+    print(f"  Failures:      {stats['failed']}")
+    print(f"  Throughput:    {stats['sent'] / elapsed:.1f} updates/sec")
+    print(f"  Latency p50:   {percentile(stats['latencies'], 50) * 1000:.1f} ms")
+    print(f"  Latency p95:   {percentile(stats['latencies'], 95) * 1000:.1f} ms")
+    print("=" * 60)
+
+def main():
+    parser = argparse.ArgumentParser(description='Push synthetic Telegram updates to a webhook endpoint')
+    parser.add_argument('--url', default='http://127.0.0.1:8080/webhook')
+    parser.add_argument('--secret', default='', help='Value for X-Telegram-Bot-Api-Secret-Token')
+    parser.add_argument('--count', type=int, default=200)
+    parser.add_argument('--chats', type=int, default=10)
+    parser.add_argument('--callback-ratio', type=float, default=0.3)
+    parser.add_argument('--concurrency', type=int, default=8)
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args()
+
+    updates = synthetic_updates(args.count, args.chats, args.callback_ratio, args.seed)
+    print_report(asyncio.run(push_updates(args.url, updates, args.secret or None, args.concurrency)))
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,149 @@
+import sys
+import random
+import asyncio
+import hashlib
+import logging
+import argparse
+from dataclasses import dataclass
+from pathlib import Path
+from aiohttp import web
+
+project_root = Path(__file__).parent.parent.parent
+src_path = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+sys.path.insert(0, str(src_path))
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+EVENTS_PATH = '/discovery/v2/events.json'
+CITIES = [('Berlin', 'Germany', 'DE'), ('London', 'United Kingdom', 'GB'), ('New York', 'United States Of America', 'US'),
+          ('Paris', 'France', 'FR'), ('Warsaw', 'Poland', 'PL'), ('Prague', 'Czech Republic', 'CZ')]
+
+@dataclass
+class FakeServerOptions:
+    latency_ms: float = 0
+    jitter_ms: float = 0
+    rate_limit_ratio: float = 0.0
+    failure_ratio: float = 0.0
+    retry_after: float = 1.0
+    max_events: int = 60
+    seed: int = 42
+
+STATS_KEY = web.AppKey('stats', dict)
+OPTIONS_KEY = web.AppKey('options', FakeServerOptions)
+
+def _artist_seed(keyword: str, seed: int) -> int:
+    return int(hashlib.md5(f'{seed}:{keyword.lower()}'.encode()).hexdigest()[:8], 16)
+
+def synthetic_events(keyword: str, options: FakeServerOptions):
+    rng = random.Random(_artist_seed(keyword, options.seed))
+    count = rng.randint(0, options.max_events)
+    slug = hashlib.md5(keyword.lower().encode()).hexdigest()[:10]
+    events = []
+
+    for i in range(count):
+        city, country, country_code = rng.choice(CITIES)
+        events.append({
+            'name': f'{keyword} - World Tour',
+            'id': f'fake-{slug}-{i}',
+            'url': f'https://tm.example/event/{slug}-{i}',
+            'images': [{'url': f'https://tm.example/img/{slug}/{n}.jpg', 'width': 1024, 'height': 576} for n in range(8)],
+            'classifications': [{'segment': {'name': 'Music'}, 'genre': {'name': 'Rock'}}],
+            'dates': {
+                'start': {'dateTime': f'2026-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}T19:00:00Z'},
+                'timezone': 'Europe/Berlin'
+            },
+            '_embedded': {
+                'venues': [{
+                    'name': f'{city} Arena {rng.randint(1, 5)}',
+                    'city': {'name': city},
+                    'country': {'name': country, 'countryCode': country_code}
+                }],
+                'attractions': [{'name': keyword, 'images': []}]
+            },
+            '_links': {'self': {'href': f'/discovery/v2/events/fake-{slug}-{i}'}}
+        })
+    return events
+
+def create_app(options: FakeServerOptions = None) -> web.Application:
+    options = options or FakeServerOptions()
+    rng = random.Random(options.seed)
+    stats = {'requests': 0, 'rate_limited': 0, 'failed': 0}
+
+    async def events_handler(request: web.Request) -> web.Response:
+        stats['requests'] += 1
+
+        if options.latency_ms or options.jitter_ms:
+            delay = options.latency_ms + rng.uniform(0, options.jitter_ms)
+            await asyncio.sleep(delay / 1000)
+
+        if not request.query.get('apikey'):
+            return web.json_response({'fault': {'faultstring': 'Invalid ApiKey'}}, status=401)
+
+        if rng.random() < options.rate_limit_ratio:
+            stats['rate_limited'] += 1
+            return web.json_response(
+                {'fault': {'faultstring': 'Rate limit quota violation'}},
+                status=429,
+                headers={'Retry-After': str(options.retry_after)}
+            )
+
+        if rng.random() < options.failure_ratio:
+            stats['failed'] += 1
+            return web.json_response({'fault': {'faultstring': 'Internal error'}}, status=500)
+
+        keyword = request.query.get('keyword', '')
+        size = int(request.query.get('size', 20))
+        page = int(request.query.get('page', 0))
+        country_code = request.query.get('countryCode')
+
+        events = synthetic_events(keyword, options)
+        if country_code:
+            events = [e for e in events if e['_embedded']['venues'][0]['country']['countryCode'] == country_code]
+
+        total_pages = (len(events) + size - 1) // size
+        page_events = events[page * size:(page + 1) * size]
+
+        payload = {'page': {'size': size, 'totalElements': len(events), 'totalPages': total_pages, 'number': page}}
+        if page_events:
+            payload['_embedded'] = {'events': page_events}
+        return web.json_response(payload)
+
+    app = web.Application()
+    app[STATS_KEY] = stats
+    app[OPTIONS_KEY] = options
+    app.router.add_get(EVENTS_PATH, events_handler)
+    return app
+
+def main():
+    parser = argparse.ArgumentParser(description='Local stand-in for the Ticketmaster Discovery API')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8089)
+    parser.add_argument('--latency-ms', type=float, default=50, help='Base response latency (default: 50)')
+    parser.add_argument('--jitter-ms', type=float, default=50, help='Random extra latency (default: 50)')
+    parser.add_argument('--rate-limit-ratio', type=float, default=0.02, help='Share of requests answered with 429')
+    parser.add_argument('--failure-ratio', type=float, default=0.01, help='Share of requests answered with 500')
+    parser.add_argument('--retry-after', type=float, default=1.0, help='Retry-After seconds sent with 429')
+    parser.add_argument('--max-events', type=int, default=60, help='Maximum events per artist')
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args()
+
+    options = FakeServerOptions(
+        latency_ms=args.latency_ms,
+        jitter_ms=args.jitter_ms,
+        rate_limit_ratio=args.rate_limit_ratio,
+        failure_ratio=args.failure_ratio,
+        retry_after=args.retry_after,
+        max_events=args.max_events,
+        seed=args.seed
+    )
+    logger.info(f"Fake Ticketmaster API on http://{args.host}:{args.port}{EVENTS_PATH}")
+    logger.info(f"Set TICKETMASTER_BASE_URL=http://{args.host}:{args.port}{EVENTS_PATH} to use it")
+    web.run_app(create_app(options), host=args.host, port=args.port, print=None)
+
+if __name__ == '__main__':
+    main()
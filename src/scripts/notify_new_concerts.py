@@ -0,0 +1,177 @@
+import os
+import sys
+import json
+import asyncio
+import logging
+import argparse
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Dict, List, Optional
+
+project_root = Path(__file__).parent.parent.parent
+src_path = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+sys.path.insert(0, str(src_path))
+
+from dotenv import load_dotenv
+from src.repositories.concert_repository import ConcertRepository
+from src.repositories.user_artist_repository import UserArtistRepository
+from src.services.concert_service import event_key
+from src.services.percolator import ArtistPercolator
+from src.bot.utils import format_concert_message
+from src.config.settings import config
+from src.db.database import close_db
+from src.utils.paths import logs_dir
+
+load_dotenv()
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+STATE_PATH = logs_dir() / 'notify_state.json'
+DEFAULT_LOOKBACK_HOURS = 24
+OVERLAP = timedelta(hours=1)
+MAX_EVENTS_PER_MESSAGE = 10
+MAX_MESSAGES_PER_USER = 3
+
+def load_last_run(path: Path = STATE_PATH) -> Optional[datetime]:
+    try:
+        return datetime.fromisoformat(json.loads(path.read_text(encoding='utf-8'))['last_run'])
+    except (OSError, KeyError, ValueError):
+        return None
+
+def save_last_run(value: datetime, path: Path = STATE_PATH):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps({'last_run': value.isoformat()}), encoding='utf-8')
+
+def format_notification(events: List[Dict], total: Optional[int] = None) -> str:
+    text = (
+        f"🎉 Появились новые концерты ваших артистов ({total or len(events)}):\n\n"
+        f"{format_concert_message(events, 0, len(events), 'artist')}"
+    )
+    return text[:4000]
+
+def notification_batches(events: List[Dict]) -> List[List[Dict]]:
+    return [events[i:i + MAX_EVENTS_PER_MESSAGE] for i in range(0, len(events), MAX_EVENTS_PER_MESSAGE)]
+
+def next_checkpoint(started: datetime, unsent: List[Dict]) -> datetime:
+    checkpoint = started
+    for event in unsent:
+        try:
+            created_at = datetime.fromisoformat(event['created_at'])
+        except (KeyError, TypeError, ValueError):
+            continue
+        checkpoint = min(checkpoint, created_at)
+    return max(checkpoint, started - timedelta(hours=DEFAULT_LOOKBACK_HOURS))
+
+async def collect_notifications(
+    events: List[Dict],
+    user_repository: UserArtistRepository
+) -> Dict[int, List[Dict]]:
+    if not events:
+        return {}
+
+    percolator = ArtistPercolator(await user_repository.get_all_user_artists())
+    notifications = percolator.percolate(events)
+
+    pairs = [(user_id, event_key(event)) for user_id, user_events in notifications.items() for event in user_events]
+    already_sent = await user_repository.get_notified(pairs)
+
+    pending = {}
+    for user_id, user_events in notifications.items():
+        fresh = [event for event in user_events if (user_id, event_key(event)) not in already_sent]
+        if fresh:
+            pending[user_id] = fresh
+    return pending
+
+async def run(since: Optional[datetime] = None, dry_run: bool = False) -> Dict:
+    started = datetime.now(timezone.utc)
+    if since is None:
+        last_run = load_last_run()
+        since = last_run - OVERLAP if last_run else started - timedelta(hours=DEFAULT_LOOKBACK_HOURS)
+
+    concert_repository = ConcertRepository()
+    user_repository = UserArtistRepository()
+    stats = {'events': 0, 'users': 0, 'sent': 0, 'failed': 0, 'deferred': 0}
+
+    events = await concert_repository.get_events_created_since(since)
+    stats['events'] = len(events)
+    logger.info(f"{len(events)} new concerts since {since.isoformat()}")
+
+    pending = await collect_notifications(events, user_repository)
+    stats['users'] = len(pending)
+
+    if dry_run:
+        for user_id, user_events in pending.items():
+            for batch in notification_batches(user_events)[:MAX_MESSAGES_PER_USER]:
+                print(f"--- user {user_id} ---\n{format_notification(batch, len(user_events))}\n")
+        return stats
+
+    unsent = []
+    if pending:
+        from aiogram import Bot
+        from src.bot.outbound import get_outbound
+        bot = Bot(token=os.getenv("BOT_TOKEN"))
+        outbound = get_outbound()
+
+        async def notify(user_id: int, user_events: List[Dict]):
+            batches = notification_batches(user_events)
+            for position, batch in enumerate(batches[:MAX_MESSAGES_PER_USER]):
+                try:
+                    await outbound.send_message(bot, user_id, format_notification(batch, len(user_events)))
+                    await user_repository.mark_notified([(user_id, event_key(e)) for e in batch])
+                except Exception as e:
+                    stats['failed'] += 1
+                    logger.warning(f"Could not notify user {user_id}: {e}")
+                    unsent.extend(event for rest in batches[position:] for event in rest)
+                    return
+            stats['sent'] += 1
+            unsent.extend(event for rest in batches[MAX_MESSAGES_PER_USER:] for event in rest)
+
+        try:
+            await asyncio.gather(*(notify(user_id, user_events) for user_id, user_events in pending.items()))
+        finally:
+            await bot.session.close()
+
+    stats['deferred'] = len(unsent)
+    save_last_run(next_checkpoint(started, unsent))
+    logger.info(
+        f"Notified {stats['sent']}/{stats['users']} users ({stats['failed']} failed, "
+        f"{stats['deferred']} events left for the next run)"
+    )
+    return stats
+
+async def notify_after_ingest() -> Optional[Dict]:
+    if not config.NOTIFY_AFTER_INGEST:
+        return None
+    if not os.getenv("BOT_TOKEN"):
+        logger.warning("BOT_TOKEN is not set, skipping new concert notifications")
+        return None
+    try:
+        return await run()
+    except Exception as e:
+        logger.error(f"Could not send new concert notifications: {e}", exc_info=True)
+        return None
+
+def main():
+    parser = argparse.ArgumentParser(description='Notify users about new concerts of artists from their playlists')
+    parser.add_argument('--since-hours', type=float, help='Look back this many hours instead of the last run time')
+    parser.add_argument('--dry-run', action='store_true', help='Print notifications instead of sending them')
+    args = parser.parse_args()
+
+    since = datetime.now(timezone.utc) - timedelta(hours=args.since_hours) if args.since_hours else None
+
+    async def runner():
+        try:
+            return await run(since=since, dry_run=args.dry_run)
+        finally:
+            await close_db()
+
+    stats = asyncio.run(runner())
+    print(f"✓ {stats['events']} new concerts, {stats['users']} users matched, {stats['sent']} notified")
+
+if __name__ == '__main__':
+    main()
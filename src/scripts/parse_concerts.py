@@ -12,8 +12,11 @@ sys.path.insert(0, str(project_root))
 sys.path.insert(0, str(src_path))
 
 from src.clients.local_concert_client import AfishaSeleniumParser
+from src.clients.crawl_checkpoint import CrawlCheckpoint
 from src.repositories.concert_repository import ConcertRepository
+from src.services.artist_events_service import refresh_artist_events
 from src.config.settings import config
+from src.utils.paths import logs_dir
 import nest_asyncio
 
 nest_asyncio.apply()
@@ -39,40 +42,81 @@ ALL_CITIES = [
 DEFAULT_INTERVAL_HOURS = 6
 DEFAULT_INTERVAL_SECONDS = 20
 
+def export_politeness_stats(parser: AfishaSeleniumParser):
+    try:
+        parser.scheduler.log_summary()
+        stats_path = logs_dir() / 'politeness' / f"stats_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+        parser.scheduler.export(stats_path)
+    except Exception as e:
+        logger.warning(f"Could not export politeness stats: {e}")
+
 async def parse_city(city: str, db: ConcertRepository, parser: AfishaSeleniumParser) -> tuple:
     logger.info("=" * 60)
     logger.info(f"Parsing city: {city}")
     logger.info("=" * 60)
 
     config.CITY = city
+    checkpoint = CrawlCheckpoint(city)
+    resumed_events = checkpoint.events_count
+    if checkpoint.resumed:
+        logger.info(
+            f"Resuming {city} from checkpoint: {len(checkpoint.completed)} steps "
+            f"and {resumed_events} events already done"
+        )
+
+    loop = asyncio.get_running_loop()
+    saved_count = 0
+
+    def flush_events(events):
+        nonlocal saved_count
+        future = asyncio.run_coroutine_threadsafe(db.save_events_batch(events), loop)
+        saved_count += future.result()
 
     try:
-        try:
-            parser.driver.current_url
-        except Exception:
-            logger.warning("Browser session lost, restarting...")
-            parser.close()
-            parser.start()
-
         start_time = time.time()
-        events = parser.parse_all_events()
 
-        if not events:
-            logger.warning(f"No concerts were parsed for {city}!")
-            return 0, 0
+        for attempt in range(config.CRAWL_RESTART_ATTEMPTS + 1):
+            if not parser.is_alive():
+                logger.warning("Browser session lost, restarting...")
+                try:
+                    parser.close()
+                except Exception:
+                    pass
+                parser.start()
 
-        logger.info(f"Saving {len(events)} concerts to database...")
-        saved_count = await db.save_events_batch(events)
+            await asyncio.to_thread(parser.parse_all_events, checkpoint, flush_events)
+
+            if parser.is_alive():
+                break
+
+            if attempt < config.CRAWL_RESTART_ATTEMPTS:
+                logger.warning(
+                    f"Browser died while parsing {city}, resuming from checkpoint "
+                    f"(attempt {attempt + 2}/{config.CRAWL_RESTART_ATTEMPTS + 1})"
+                )
+        else:
+            logger.warning(f"Giving up on {city} for now, checkpoint kept for the next run")
+            return checkpoint.events_count - resumed_events, saved_count
+
+        events_count = checkpoint.events_count - resumed_events
+        checkpoint.clear()
+
+        if not events_count:
+            if not resumed_events:
+                logger.warning(f"No concerts were parsed for {city}!")
+            return 0, saved_count
 
         elapsed_time = time.time() - start_time
 
         logger.info(f"City: {city}")
-        logger.info(f"Total concerts found: {len(events)}")
+        logger.info(f"Total concerts found: {events_count}")
+        if resumed_events:
+            logger.info(f"Found before resume: {resumed_events}")
         logger.info(f"New concerts saved: {saved_count}")
-        logger.info(f"Duplicates skipped: {len(events) - saved_count}")
+        logger.info(f"Duplicates skipped: {max(events_count - saved_count, 0)}")
         logger.info(f"Time elapsed: {elapsed_time:.2f}s")
 
-        return len(events), saved_count
+        return events_count, saved_count
 
     except Exception as e:
         error_msg = str(e)
@@ -83,7 +127,7 @@ async def parse_city(city: str, db: ConcertRepository, parser: AfishaSeleniumPar
             except:
                 pass
         logger.error(f"Error parsing city {city}: {e}", exc_info=True)
-        return 0, 0
+        return 0, saved_count
 
 async def run_parsing_all_cities():
     db = None
@@ -114,9 +158,9 @@ async def run_parsing_all_cities():
             city_results[city] = {'events': events_count, 'saved': saved_count}
 
             if i < len(ALL_CITIES):
-                delay = 5
-                logger.info(f"Waiting {delay} seconds before next city...")
-                time.sleep(delay)
+                delay = parser.scheduler.delay(4, 6, parser.current_domain)
+                logger.info(f"Waiting {delay:.1f} seconds before next city...")
+                await asyncio.sleep(delay)
 
         final_count = await db.count_events_by_category('concert')
         logger.info("\n" + "=" * 60)
@@ -135,6 +179,12 @@ async def run_parsing_all_cities():
         for city, results in city_results.items():
             logger.info(f"  {city}: {results['events']} found, {results['saved']} saved")
 
+        await refresh_artist_events(db)
+        from src.services.recommendation_batch import precompute_recommendations
+        await precompute_recommendations(db)
+        from src.scripts.notify_new_concerts import notify_after_ingest
+        await notify_after_ingest()
+
     except KeyboardInterrupt:
         logger.info("Parser interrupted by user")
         raise
@@ -142,6 +192,7 @@ async def run_parsing_all_cities():
         logger.error(f"Fatal error: {e}", exc_info=True)
     finally:
         if parser:
+            export_politeness_stats(parser)
             logger.info("Closing browser...")
             parser.close()
 
@@ -345,9 +396,9 @@ def main():
                 city_results[city] = {'events': events_count, 'saved': saved_count}
 
                 if i < len(cities_to_parse):
-                    delay = 5
-                    logger.info(f"Waiting {delay} seconds before next city...")
-                    time.sleep(delay)
+                    delay = parser.scheduler.delay(4, 6, parser.current_domain)
+                    logger.info(f"Waiting {delay:.1f} seconds before next city...")
+                    await asyncio.sleep(delay)
 
             final_count = await db.count_events_by_category('concert')
             logger.info("\n" + "=" * 60)
@@ -366,6 +417,12 @@ def main():
             for city, results in city_results.items():
                 logger.info(f"  {city}: {results['events']} found, {results['saved']} saved")
 
+            await refresh_artist_events(db)
+            from src.services.recommendation_batch import precompute_recommendations
+            await precompute_recommendations(db)
+            from src.scripts.notify_new_concerts import notify_after_ingest
+            await notify_after_ingest()
+
         except KeyboardInterrupt:
             logger.info("Parser interrupted by user")
         except Exception as e:
@@ -373,6 +430,7 @@ def main():
             sys.exit(1)
         finally:
             if parser:
+                export_politeness_stats(parser)
                 logger.info("Closing browser...")
                 parser.close()
 
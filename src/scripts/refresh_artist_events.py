@@ -0,0 +1,30 @@
+import sys
+import asyncio
+import logging
+from pathlib import Path
+
+project_root = Path(__file__).parent.parent.parent
+src_path = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+sys.path.insert(0, str(src_path))
+
+from src.db.database import init_db, close_db
+from src.services.artist_events_service import refresh_artist_events
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+async def main():
+    try:
+        await init_db()
+        stats = await refresh_artist_events()
+        print(f"✓ Materialized {stats['artists']} artists ({stats['with_events']} with concerts) "
+              f"against {stats['concerts']} concerts in {stats['elapsed_seconds']:.1f}s")
+    finally:
+        await close_db()
+
+if __name__ == '__main__':
+    asyncio.run(main())
@@ -0,0 +1,109 @@
+import random
+from typing import Dict, List
+
+CITIES = [
+    ('moscow', 'Москва'), ('saint-petersburg', 'Санкт-Петербург'), ('yekaterinburg', 'Екатеринбург'),
+    ('novosibirsk', 'Новосибирск'), ('kazan', 'Казань'), ('nizhny-novgorod', 'Нижний Новгород'),
+    ('samara', 'Самара'), ('orenburg', 'Оренбург')
+]
+CITY_WEIGHTS = [30, 20, 8, 6, 8, 6, 5, 3]
+VENUES = [
+    'Главклуб', 'Adrenaline Stadium', 'ВТБ Арена', 'Известия Hall', 'Театр эстрады', 'А2 Green Concert',
+    'Космонавт', 'Pravda', 'Дом культуры', 'Ray Just Arena', 'Клуб 16 тонн', 'Концертный зал «Мир»'
+]
+MONTHS_RU = ['января', 'февраля', 'марта', 'апреля', 'мая', 'июня', 'июля', 'августа', 'сентября', 'октября', 'ноября', 'декабря']
+CYRILLIC_SYLLABLES = ['ка', 'ми', 'ро', 'на', 'ле', 'ту', 'зи', 'во', 'ря', 'шо', 'да', 'бе', 'гу', 'лу', 'ни', 'сэ']
+LATIN_SYLLABLES = ['ka', 'mo', 'ri', 'ne', 'lu', 'ta', 'zo', 'vi', 'ra', 'sho', 'de', 'be', 'gu', 'lo', 'ni', 'xe']
+CYRILLIC_WORDS = ['группа', 'оркестр', 'бэнд', 'дуэт', 'и друзья']
+LATIN_WORDS = ['Band', 'Orchestra', 'Project', 'Collective', 'Trio', 'and The Lights']
+TITLE_TEMPLATES = [
+    '{artist}', '{artist}', '{artist}. Большой концерт', '{artist} — World Tour', '{artist}: юбилейный тур',
+    'Трибьют {artist}', '{artist} & {other}', '{artist}. Акустика', 'Фестиваль «{word}»: {artist}, {other}'
+]
+FESTIVAL_WORDS = ['Дикая мята', 'Нашествие', 'Park Live', 'Signal', 'Стереолето', 'VK Fest']
+
+def _word(rng: random.Random, syllables: List[str]) -> str:
+    return ''.join(rng.choice(syllables) for _ in range(rng.randint(2, 4))).capitalize()
+
+def artist_name(rng: random.Random) -> str:
+    if rng.random() < 0.45:
+        name = _word(rng, CYRILLIC_SYLLABLES)
+        if rng.random() < 0.3:
+            name = f'{name} {rng.choice(CYRILLIC_WORDS)}'
+        elif rng.random() < 0.2:
+            name = f'{name}-{rng.randint(2, 9)}'
+    else:
+        name = _word(rng, LATIN_SYLLABLES)
+        if rng.random() < 0.4:
+            name = f'{name} {_word(rng, LATIN_SYLLABLES)}'
+        elif rng.random() < 0.3:
+            name = f'{name} {rng.choice(LATIN_WORDS)}'
+    return name
+
+def generate_artists(count: int, seed: int = 42) -> List[str]:
+    rng = random.Random(seed)
+    artists = []
+    seen = set()
+    while len(artists) < count:
+        name = artist_name(rng)
+        if name.lower() not in seen:
+            seen.add(name.lower())
+            artists.append(name)
+    return artists
+
+def _date_fields(rng: random.Random) -> Dict:
+    year, month, day = rng.choice([2025, 2026]), rng.randint(1, 12), rng.randint(1, 28)
+    hour = f'{rng.choice([18, 19, 20, 21])}:{rng.choice(["00", "30"])}'
+    month_name = MONTHS_RU[month - 1]
+    style = rng.random()
+
+    if style < 0.35:
+        return {'description_date': f'{day} {month_name}, {hour}'}
+    if style < 0.5:
+        return {'description_date': f'{day} {month_name} {year}, {hour}'}
+    if style < 0.6:
+        return {'description_date': f'{rng.choice(["завтра", "сегодня"])} {hour}'}
+    if style < 0.75:
+        return {'date': f'{year}-{month:02d}-{day:02d}T{hour}:00', 'description_date': f'{day} {month_name}, {hour}'}
+    if style < 0.85:
+        return {'date': f'{day:02d}.{month:02d}.{year}', 'description_date': ''}
+    if style < 0.95:
+        extra = [f'{day + offset} {month_name}' for offset in range(1, rng.randint(2, 4))]
+        return {'dates': [f'{day} {month_name}', *extra], 'description_date': f'{day} {month_name}, {hour}'}
+    return {'description_date': ''}
+
+def concert(rng: random.Random, index: int, artist: str, other: str) -> Dict:
+    city_code, city_name = rng.choices(CITIES, weights=CITY_WEIGHTS)[0]
+    venue = rng.choice(VENUES)
+    title = rng.choice(TITLE_TEMPLATES).format(artist=artist, other=other, word=rng.choice(FESTIVAL_WORDS))
+    dates = _date_fields(rng)
+    description_date = dates.pop('description_date')
+    source = 'afisha' if rng.random() < 0.8 else 'ticketmaster'
+
+    event = {
+        'id': f'bench-{index}',
+        'title': title,
+        'full_title': title if rng.random() < 0.5 else f'{title} ({venue})',
+        'description': f'{description_date} • {venue}' if description_date else venue,
+        'category': 'concert',
+        'source': source,
+        **dates
+    }
+    if source == 'afisha':
+        event['url'] = f'https://afisha.yandex.ru/{city_code}/concert/bench-{index}'
+        event['venue'] = venue if rng.random() < 0.5 else ''
+        event['city'] = city_name if rng.random() < 0.3 else ''
+    else:
+        event['url'] = f'https://www.ticketmaster.com/event/bench-{index}'
+        event['venue'] = venue
+        event['city'] = city_name
+    return event
+
+def generate_catalog(size: int, artists: List[str], seed: int = 42) -> List[Dict]:
+    rng = random.Random(seed)
+    performers = artists[:max(1, len(artists) // 2)]
+    return [concert(rng, i, rng.choice(performers), rng.choice(artists)) for i in range(size)]
+
+def generate_playlist(artists: List[str], size: int, seed: int = 42) -> List[str]:
+    rng = random.Random(seed + size)
+    return rng.sample(artists, min(size, len(artists)))
@@ -0,0 +1,187 @@
+import sys
+import math
+import time
+import asyncio
+import logging
+import argparse
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, List
+import requests
+from aiohttp import web
+
+project_root = Path(__file__).parent.parent.parent
+src_path = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+sys.path.insert(0, str(src_path))
+
+from src.clients.global_concert_client import get_artist_events
+from src.clients.ticketmaster_harvester import TicketmasterHarvester
+from src.scripts.fake_ticketmaster_server import EVENTS_PATH, FakeServerOptions, create_app
+
+logging.basicConfig(
+    level=logging.WARNING,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+LOAD_TEST_TOKEN = 'load-test'
+
+class NullRepository:
+    def __init__(self):
+        self.events = 0
+
+    async def upsert_events_batch(self, events: List[Dict]):
+        self.events += len(events)
+        return len(events), 0
+
+def percentile(values: List[float], pct: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, math.ceil(pct / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+def synthetic_artists(count: int) -> List[str]:
+    return [f'Load Test Artist {i:05d}' for i in range(count)]
+
+async def start_fake_server(options: FakeServerOptions):
+    runner = web.AppRunner(create_app(options))
+    await runner.setup()
+    site = web.TCPSite(runner, '127.0.0.1', 0)
+    await site.start()
+    host, port = runner.addresses[0][:2]
+    return runner, f'http://{host}:{port}{EVENTS_PATH}'
+
+async def run_harvester(base_url: str, artists: List[str], rate: float, concurrency: int, max_pages: int) -> Dict:
+    harvester = TicketmasterHarvester(
+        LOAD_TEST_TOKEN, rate_per_second=rate, concurrency=concurrency,
+        max_pages=max_pages, base_url=base_url
+    )
+    started = time.perf_counter()
+    stats = await harvester.run(artists, NullRepository())
+    return {
+        'mode': 'harvester',
+        'elapsed': time.perf_counter() - started,
+        'requests': stats['requests'],
+        'rate_limited': stats['rate_limited'],
+        'failed': stats['failed'],
+        'events': stats['events'],
+        'latencies': harvester.latencies,
+    }
+
+def run_sync(base_url: str, artists: List[str], workers: int, max_pages: int) -> Dict:
+    latencies = []
+    counts = {'requests': 0, 'rate_limited': 0}
+    failed = 0
+    events = 0
+    lock = threading.Lock()
+    local = threading.local()
+    sessions = []
+
+    def record(response, *args, **kwargs):
+        with lock:
+            counts['requests'] += 1
+            latencies.append(response.elapsed.total_seconds())
+            if response.status_code == 429:
+                counts['rate_limited'] += 1
+
+    def thread_session() -> requests.Session:
+        if not hasattr(local, 'session'):
+            local.session = requests.Session()
+            local.session.hooks['response'].append(record)
+            with lock:
+                sessions.append(local.session)
+        return local.session
+
+    def fetch(artist):
+        try:
+            return get_artist_events(
+                artist, api_token=LOAD_TEST_TOKEN, max_pages=max_pages, base_url=base_url, session=thread_session()
+            )
+        except Exception:
+            return None
+
+    started = time.perf_counter()
+    try:
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            for result in executor.map(fetch, artists):
+                if result is None:
+                    failed += 1
+                else:
+                    events += len(result)
+    finally:
+        for session in sessions:
+            session.close()
+
+    return {
+        'mode': 'sync',
+        'elapsed': time.perf_counter() - started,
+        'requests': counts['requests'],
+        'rate_limited': counts['rate_limited'],
+        'failed': failed,
+        'events': events,
+        'latencies': latencies,
+    }
+
+def print_report(result: Dict):
+    elapsed = result['elapsed'] or 1e-9
+    latencies = result['latencies']
+    print("\n" + "=" * 60)
+    print(f"Ticketmaster load test ({result['mode']})")
+    print("=" * 60)
+    print(f"  Requests:      {result['requests']}")
+    if result['rate_limited'] is not None:
+        print(f"  429 responses: {result['rate_limited']}")
+    print(f"  Failures:      {result['failed']}")
+    print(f"  Events:        {result['events']}")
+    print(f"  Elapsed:       {elapsed:.2f}s")
+    print(f"  Throughput:    {result['requests'] / elapsed:.1f} requests/sec, {result['events'] / elapsed:.1f} events/sec")
+    print(f"  Latency p50:   {percentile(latencies, 50) * 1000:.0f} ms")
+    print(f"  Latency p95:   {percentile(latencies, 95) * 1000:.0f} ms")
+    print(f"  Latency p99:   {percentile(latencies, 99) * 1000:.0f} ms")
+    print("=" * 60)
+
+async def run(args) -> Dict:
+    runner = None
+    base_url = args.base_url
+    if not base_url:
+        runner, base_url = await start_fake_server(FakeServerOptions(
+            latency_ms=args.latency_ms,
+            jitter_ms=args.jitter_ms,
+            rate_limit_ratio=args.rate_limit_ratio,
+            failure_ratio=args.failure_ratio,
+            retry_after=args.retry_after
+        ))
+
+    artists = synthetic_artists(args.artists)
+    try:
+        if args.mode == 'sync':
+            return await asyncio.to_thread(run_sync, base_url, artists, args.workers, args.max_pages)
+        return await run_harvester(base_url, artists, args.rate, args.concurrency, args.max_pages)
+    finally:
+        if runner:
+            await runner.cleanup()
+
+def main():
+    parser = argparse.ArgumentParser(description='Load test the Ticketmaster client against the fake Discovery API')
+    parser.add_argument('--mode', choices=['harvester', 'sync'], default='harvester',
+                        help='harvester: scheduled updater path, sync: bot path (get_artist_events)')
+    parser.add_argument('--base-url', help='Use an already running server instead of starting one in-process')
+    parser.add_argument('--artists', type=int, default=200)
+    parser.add_argument('--rate', type=float, default=50, help='Harvester requests/sec')
+    parser.add_argument('--concurrency', type=int, default=16, help='Harvester fetch workers')
+    parser.add_argument('--workers', type=int, default=4, help='Threads for sync mode')
+    parser.add_argument('--max-pages', type=int, default=5)
+    parser.add_argument('--latency-ms', type=float, default=50)
+    parser.add_argument('--jitter-ms', type=float, default=50)
+    parser.add_argument('--rate-limit-ratio', type=float, default=0.02)
+    parser.add_argument('--failure-ratio', type=float, default=0.01)
+    parser.add_argument('--retry-after', type=float, default=0.5)
+    args = parser.parse_args()
+
+    print_report(asyncio.run(run(args)))
+
+if __name__ == '__main__':
+    main()
@@ -1,5 +1,6 @@
 import asyncio
 import sys
+import time
 from pathlib import Path
 from typing import List
 from sqlalchemy import select
@@ -13,6 +14,7 @@ sys.path.insert(0, str(src_path))
 
 from src.clients.global_concert_client import get_artist_events, convert_ticketmaster_to_afisha_format
 from src.repositories.concert_repository import ConcertRepository
+from src.services.artist_events_service import refresh_artist_events
 from src.db.database import async_session_maker, close_db
 from src.config.settings import config
 
@@ -125,12 +127,15 @@ async def main():
             processed_count += 1
             print(f"{artist_name}: {len(events)} events found")
 
-        saved_count = 0
+        inserted_count = 0
+        updated_count = 0
         if events_to_save:
             print(f"\nSaving {len(events_to_save)} events to database...")
-            saved_count = await repository.save_events_batch(events_to_save)
-            print(f"✓ Saved {saved_count} new events")
-            print(f"  (Skipped {len(events_to_save) - saved_count} duplicates)")
+            started = time.perf_counter()
+            inserted_count, updated_count = await repository.upsert_events_batch(events_to_save)
+            elapsed = time.perf_counter() - started
+            print(f"✓ Inserted {inserted_count} new events, updated {updated_count} existing")
+            print(f"  ({(inserted_count + updated_count) / elapsed if elapsed else 0:.0f} events/sec)")
         else:
             print("\nNo events to save")
 
@@ -138,9 +143,21 @@ async def main():
         print(f"Summary:")
         print(f"  Artists processed: {processed_count}")
         print(f"  Total events found: {total_events}")
-        print(f"  Events saved: {saved_count}")
+        print(f"  Events inserted: {inserted_count}")
+        print(f"  Events updated: {updated_count}")
         print(f"{'='*60}")
 
+        if inserted_count or updated_count:
+            refresh = await refresh_artist_events(repository)
+            print(f"✓ Refreshed artist_events for {refresh['artists']} artists ({refresh['with_events']} with concerts)")
+            from src.services.recommendation_batch import precompute_recommendations
+            precomputed = await precompute_recommendations(repository)
+            print(f"✓ Precomputed recommendations for {precomputed['users']} active users")
+            from src.scripts.notify_new_concerts import notify_after_ingest
+            notified = await notify_after_ingest()
+            if notified:
+                print(f"✓ Notified {notified['sent']}/{notified['users']} users about new concerts")
+
     except Exception as e:
         print(f"Error in main: {e}", file=sys.stderr)
         import traceback
@@ -0,0 +1,89 @@
+import time
+import asyncio
+import logging
+from typing import Dict, Iterable, List, Optional
+from src.repositories.artist_repository import ArtistRepository
+from src.repositories.concert_repository import ConcertRepository
+from src.services.concert_service import ConcertMatcherService, CatalogIndex, event_key
+from src.utils.transliteration import name_variants, normalize
+
+logger = logging.getLogger(__name__)
+
+def collect_known_artists(
+    mongo_names: Iterable[str],
+    stored_artists: Iterable[Dict],
+    mongo_aliases: Optional[Dict[str, List[str]]] = None
+) -> Dict[str, Dict]:
+    artists: Dict[str, Dict] = {}
+    for name in mongo_names:
+        if name and normalize(name):
+            artists.setdefault(normalize(name), {'name': name, 'aliases': []})
+    for name, aliases in (mongo_aliases or {}).items():
+        if name and normalize(name):
+            entry = artists.setdefault(normalize(name), {'name': name, 'aliases': []})
+            entry['aliases'] = list(dict.fromkeys(entry['aliases'] + aliases))
+    for artist in stored_artists:
+        name = artist.get('name')
+        if not name or not normalize(name):
+            continue
+        entry = artists.setdefault(normalize(name), {'name': name, 'aliases': []})
+        entry['aliases'] = list(dict.fromkeys(entry['aliases'] + (artist.get('aliases') or [])))
+    return artists
+
+def build_artist_events(index: CatalogIndex, artists: Dict[str, Dict]) -> List[Dict]:
+    rows = []
+    for normalized_name, artist in artists.items():
+        names = dict.fromkeys([artist['name'], *artist['aliases']])
+        matches = [concert for name in names for concert in index.match(name)]
+        matches += [concert for variant in name_variants(artist['name'])[1:] for concert in index.match_variant(variant)]
+        event_ids = {}
+        for concert in matches:
+            key = event_key(concert)
+            if key:
+                event_ids[key] = None
+        rows.append({
+            'normalized_name': normalized_name,
+            'artist_name': artist['name'],
+            'event_ids': list(event_ids),
+        })
+    return rows
+
+async def refresh_artist_events(
+    concert_repository: Optional[ConcertRepository] = None,
+    artist_repository: Optional[ArtistRepository] = None
+) -> Dict:
+    from src.clients.global_concert_client import get_artist_aliases_from_db, get_artists_from_db
+
+    started = time.perf_counter()
+    concert_repository = concert_repository or ConcertRepository()
+    artist_repository = artist_repository or ArtistRepository()
+
+    concerts = await concert_repository.get_events_by_category_async('concert')
+    if not concerts:
+        logger.warning("No concerts loaded, keeping the current artist_events mapping")
+        return {'concerts': 0, 'artists': 0, 'with_events': 0, 'written': 0, 'catalog_version': None, 'elapsed_seconds': 0.0}
+
+    index = CatalogIndex(concerts, ConcertMatcherService(concert_repository, city=''))
+
+    mongo_names = await asyncio.to_thread(get_artists_from_db)
+    mongo_aliases = await asyncio.to_thread(get_artist_aliases_from_db)
+    if mongo_aliases:
+        await artist_repository.add_aliases({normalize(name): aliases for name, aliases in mongo_aliases.items()})
+    artists = collect_known_artists(mongo_names, await artist_repository.get_known_artists(), mongo_aliases)
+
+    rows = build_artist_events(index, artists)
+    written = await artist_repository.replace_artist_events(rows, index.version)
+
+    stats = {
+        'concerts': len(concerts),
+        'artists': len(rows),
+        'with_events': sum(1 for row in rows if row['event_ids']),
+        'written': written,
+        'catalog_version': index.version,
+        'elapsed_seconds': time.perf_counter() - started,
+    }
+    logger.info(
+        f"Artist events refreshed: {stats['with_events']}/{stats['artists']} artists with concerts "
+        f"over {stats['concerts']} concerts in {stats['elapsed_seconds']:.1f}s"
+    )
+    return stats
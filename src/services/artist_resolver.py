@@ -0,0 +1,95 @@
+import logging
+from typing import Dict, List, Optional, Tuple
+from src.repositories.artist_repository import ArtistRepository
+from src.services.concert_service import StreamingConcertMatcher
+from src.utils.transliteration import name_variants, normalize
+
+logger = logging.getLogger(__name__)
+
+PlaylistArtist = Tuple[Optional[str], str]
+
+def playlist_artists(tracks) -> List[PlaylistArtist]:
+    artists = []
+    for track in tracks:
+        if not track or not track.artists:
+            continue
+        for artist in track.artists:
+            if artist.name:
+                artist_id = getattr(artist, 'id', None)
+                artists.append((str(artist_id) if isinstance(artist_id, (int, str)) and artist_id else None, artist.name))
+    return artists
+
+class ArtistResolver:
+    def __init__(self, repository: ArtistRepository, streaming: StreamingConcertMatcher, catalog_version: str):
+        self.repository = repository
+        self.streaming = streaming
+        self.catalog_version = catalog_version
+        self.stats = {'cached': 0, 'materialized': 0, 'matched': 0}
+        self._pending: Dict[str, Dict] = {}
+
+    async def resolve(self, artists: List[PlaylistArtist]) -> List[Dict]:
+        ids = [artist_id for artist_id, _ in artists if artist_id]
+        try:
+            known = await self.repository.get_artists(ids) if ids else {}
+        except Exception as e:
+            logger.warning(f"Artist lookup failed, falling back to name matching: {e}")
+            known = {}
+
+        unresolved = [
+            normalize(name) for artist_id, name in artists
+            if not self._is_fresh(known.get(artist_id) if artist_id else None)
+        ]
+        try:
+            materialized = await self.repository.get_artist_events(unresolved) if unresolved else {}
+        except Exception as e:
+            logger.warning(f"Materialized artist events lookup failed: {e}")
+            materialized = {}
+
+        found = []
+        for artist_id, name in artists:
+            row = known.get(artist_id) if artist_id else None
+            if self._is_fresh(row):
+                self.stats['cached'] += 1
+                found.extend(self.streaming.add_artist(name, event_ids=row['event_ids']))
+                continue
+
+            aliases = row.get('aliases', []) if row else []
+            mapping = materialized.get(normalize(name))
+            if self._is_fresh(mapping):
+                self.stats['materialized'] += 1
+                found.extend(self.streaming.add_artist(name, event_ids=mapping['event_ids']))
+                if artist_id:
+                    self._remember(artist_id, name, aliases, mapping['event_ids'])
+                continue
+
+            self.stats['matched'] += 1
+            found.extend(self.streaming.add_artist(name, aliases=aliases, variants=name_variants(name)[1:]))
+
+            if artist_id:
+                self._remember(artist_id, name, aliases, self.streaming.event_ids_for(name))
+        return found
+
+    def _is_fresh(self, row: Optional[Dict]) -> bool:
+        return bool(row) and row.get('catalog_version') == self.catalog_version
+
+    def _remember(self, artist_id: str, name: str, aliases: List[str], event_ids: List[str]):
+        self._pending[artist_id] = {
+            'id': artist_id,
+            'name': name,
+            'normalized_name': normalize(name),
+            'variants': name_variants(name),
+            'aliases': aliases,
+            'event_ids': event_ids,
+            'catalog_version': self.catalog_version,
+        }
+
+    async def flush(self) -> int:
+        if not self._pending:
+            return 0
+        pending = list(self._pending.values())
+        self._pending = {}
+        try:
+            return await self.repository.upsert_artists(pending)
+        except Exception as e:
+            logger.warning(f"Failed to store {len(pending)} artists: {e}")
+            return 0
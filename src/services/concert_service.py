@@ -1,10 +1,35 @@
-from typing import List, Dict
+from typing import List, Dict, Iterable, Optional, Set
 import re
+import hashlib
 import logging
+from collections import defaultdict
 from src.repositories.concert_repository import ConcertRepository
+from src.utils.metrics import inc, span, timed
 
 logger = logging.getLogger(__name__)
 
+MATCH_FIELDS = ('title', 'full_title', 'description')
+NAME_FIELDS = ('title', 'full_title')
+NAME_SEPARATORS = re.compile(r'[.,:;!?()\[\]«»"/&+|\n]|\s[-–—]\s')
+
+def clean_text(text: str) -> str:
+    return re.sub(r'[^\w\s]', '', text.lower())
+
+def name_segments(text: str) -> Set[str]:
+    return {' '.join(clean_text(part).split()) for part in NAME_SEPARATORS.split(text.lower())}
+
+def trigrams(text: str) -> Set[str]:
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+def event_key(concert: Dict) -> Optional[str]:
+    return concert.get('id') or concert.get('url')
+
+def catalog_version(concerts: List[Dict]) -> str:
+    digest = hashlib.md5()
+    for key, updated_at in sorted((str(event_key(c)), str(c.get('updated_at') or '')) for c in concerts):
+        digest.update(f'{key}:{updated_at}\n'.encode())
+    return digest.hexdigest()
+
 class ConcertMatcherService:
     def __init__(self, repository: ConcertRepository, city: str = 'orenburg'):
         self.repository = repository
@@ -70,52 +95,56 @@ class ConcertMatcherService:
 
         return False
 
+    def matches_concert(self, artist_name: str, concert: Dict) -> bool:
+        title = concert.get('title', '')
+        if title and self.find_artist_in_text(artist_name, title):
+            return True
+
+        full_title = concert.get('full_title', '')
+        if full_title and self.find_artist_in_text(artist_name, full_title):
+            return True
+
+        description = concert.get('description', '')
+        if description and len(description) > 20:
+            artist_clean = clean_text(self.normalize_name(artist_name))
+            if len(artist_clean) >= 4:
+                pattern = r'\b' + re.escape(artist_clean) + r'\b'
+                if re.search(pattern, clean_text(description)):
+                    return True
+
+        return False
+
+    def matches_variant(self, variant: str, concert: Dict) -> bool:
+        variant_clean = ' '.join(clean_text(self.normalize_name(variant)).split())
+        if len(variant_clean.replace(' ', '')) < 3:
+            return False
+        return any(variant_clean in name_segments(concert.get(field) or '') for field in NAME_FIELDS)
+
     def is_from_city(self, concert: Dict) -> bool:
         url = concert.get('url', '')
         if not url:
             return False
         return f'/{self.city}/' in url
 
+    @timed('matcher.find_concerts_for_artists')
     def find_concerts_for_artists(self, artist_names: List[str]) -> Dict[str, List[Dict]]:
         logger.info(f"Searching for concerts matching {len(artist_names)} artists")
 
         all_concerts = self.repository.get_events_by_category('concert')
         logger.info(f"Found {len(all_concerts)} concerts in database")
 
+        with span('matcher.index'):
+            index = CatalogIndex([c for c in all_concerts if self.is_from_city(c)], self)
         results = {}
 
         for artist_name in artist_names:
-            matching_concerts = []
-
-            for concert in all_concerts:
-                if not self.is_from_city(concert):
-                    continue
-                title = concert.get('title', '')
-                if title and self.find_artist_in_text(artist_name, title):
-                    matching_concerts.append(concert)
-                    continue
-
-                full_title = concert.get('full_title', '')
-                if full_title and self.find_artist_in_text(artist_name, full_title):
-                    matching_concerts.append(concert)
-                    continue
-
-                description = concert.get('description', '')
-                if description and len(description) > 20:
-                    normalized_artist = self.normalize_name(artist_name)
-                    artist_clean = re.sub(r'[^\w\s]', '', normalized_artist)
-                    desc_clean = re.sub(r'[^\w\s]', '', description.lower())
-
-                    if len(artist_clean) >= 4:
-                        pattern = r'\b' + re.escape(artist_clean) + r'\b'
-                        if re.search(pattern, desc_clean):
-                            matching_concerts.append(concert)
-                            continue
-
+            matching_concerts = index.match(artist_name)
             if matching_concerts:
                 results[artist_name] = matching_concerts
                 logger.info(f"Found {len(matching_concerts)} concerts for {artist_name}")
 
+        inc('matcher_artists_total', len(artist_names))
+        inc('matcher_matches_total', sum(len(concerts) for concerts in results.values()))
         return results
 
     def get_all_matching_concerts(self, artist_names: List[str]) -> List[Dict]:
@@ -134,3 +163,122 @@ class ConcertMatcherService:
         logger.info(f"Found {len(unique_concerts)} unique concerts matching artists")
         return unique_concerts
 
+
+def search_keys(matcher: ConcertMatcherService, artist_name: str) -> Set[str]:
+    artist_clean = clean_text(matcher.normalize_name(artist_name))
+    keys = {w for w in artist_clean.split() if len(w) >= 3 and not matcher.is_stop_word(w)}
+    if len(artist_clean) >= 4:
+        keys.add(artist_clean)
+    return keys
+
+def match_text(concert: Dict) -> str:
+    return '\n'.join(clean_text(concert.get(field) or '') for field in MATCH_FIELDS)
+
+class CatalogIndex:
+    def __init__(self, concerts: List[Dict], matcher: ConcertMatcherService):
+        self.concerts = concerts
+        self.matcher = matcher
+        self._postings: Dict[str, Set[int]] = defaultdict(set)
+        self._by_key: Dict[str, Dict] = {}
+        self._version: Optional[str] = None
+
+        for position, concert in enumerate(concerts):
+            key = event_key(concert)
+            if key:
+                self._by_key[key] = concert
+            for gram in trigrams(match_text(concert)):
+                self._postings[gram].add(position)
+
+    def __len__(self) -> int:
+        return len(self.concerts)
+
+    @property
+    def version(self) -> str:
+        if self._version is None:
+            self._version = catalog_version(self.concerts)
+        return self._version
+
+    def get(self, event_ids: Iterable[str]) -> List[Dict]:
+        return [self._by_key[key] for key in event_ids if key in self._by_key]
+
+    def candidates(self, artist_name: str) -> List[Dict]:
+        positions: Set[int] = set()
+        for key in search_keys(self.matcher, artist_name):
+            postings = [self._postings.get(gram, set()) for gram in trigrams(key)]
+            if postings:
+                positions |= set.intersection(*sorted(postings, key=len))
+        return [self.concerts[p] for p in sorted(positions)]
+
+    def match(self, artist_name: str) -> List[Dict]:
+        candidates = self.candidates(artist_name)
+        inc('matcher_concerts_scanned_total', len(candidates))
+        return [c for c in candidates if self.matcher.matches_concert(artist_name, c)]
+
+    def match_variant(self, variant: str) -> List[Dict]:
+        return [c for c in self.candidates(variant) if self.matcher.matches_variant(variant, c)]
+
+class StreamingConcertMatcher:
+    def __init__(self, index: CatalogIndex):
+        self.index = index
+        self.seen_artists: Set[str] = set()
+        self.artist_events: Dict[str, List[str]] = {}
+        self._concerts: Dict[str, Dict] = {}
+        self._matched_artists: Dict[str, List[str]] = {}
+
+    def __len__(self) -> int:
+        return len(self._concerts)
+
+    def add_artists(self, artist_names: Iterable[str]) -> List[Dict]:
+        found = []
+        for artist_name in artist_names:
+            found.extend(self.add_artist(artist_name))
+        return found
+
+    def add_artist(
+        self,
+        artist_name: str,
+        event_ids: Optional[List[str]] = None,
+        aliases: Iterable[str] = (),
+        variants: Iterable[str] = ()
+    ) -> List[Dict]:
+        key = self.index.matcher.normalize_name(artist_name)
+        if not key or key in self.seen_artists:
+            return []
+        self.seen_artists.add(key)
+
+        if event_ids is not None:
+            matches = self.index.get(event_ids)
+        else:
+            unique = {}
+            for name in dict.fromkeys([artist_name, *aliases]):
+                for concert in self.index.match(name):
+                    unique.setdefault(id(concert), concert)
+            for variant in variants:
+                for concert in self.index.match_variant(variant):
+                    unique.setdefault(id(concert), concert)
+            matches = list(unique.values())
+
+        found = []
+        artist_event_ids = []
+        for concert in matches:
+            url = concert.get('url')
+            if not url:
+                continue
+            artist_event_ids.append(event_key(concert))
+            if url not in self._concerts:
+                self._concerts[url] = concert
+                self._matched_artists[url] = []
+                found.append(concert)
+            self._matched_artists[url].append(artist_name)
+
+        self.artist_events[key] = artist_event_ids
+        return found
+
+    def event_ids_for(self, artist_name: str) -> List[str]:
+        return self.artist_events.get(self.index.matcher.normalize_name(artist_name), [])
+
+    def results(self) -> List[Dict]:
+        return [
+            dict(concert, matched_artist=', '.join(self._matched_artists[url]))
+            for url, concert in self._concerts.items()
+        ]
@@ -0,0 +1,201 @@
+import re
+import time
+import asyncio
+import logging
+from collections import Counter, OrderedDict
+from typing import Dict, Iterable, List, Optional, Tuple
+import numpy as np
+from scipy import sparse
+from src.services.concert_service import catalog_version
+from src.utils.transliteration import name_variants, normalize
+
+logger = logging.getLogger(__name__)
+
+TEXT_FIELDS = ('title', 'full_title', 'description')
+RELATED_ARTISTS = 20
+RELATED_WEIGHT = 0.5
+FITTED_MODELS = 8
+COOCCURRENCE_TTL_SECONDS = 1800
+
+def tokenize(text: str) -> List[str]:
+    return [w for w in re.findall(r'\w+', (text or '').lower()) if len(w) >= 3 and not w.isdigit()]
+
+def artist_tokens(name: str) -> List[str]:
+    tokens = []
+    for variant in name_variants(name):
+        tokens.extend(tokenize(variant))
+    return tokens
+
+class TfidfIndex:
+    def __init__(self, documents: List[List[str]]):
+        self.vocabulary: Dict[str, int] = {}
+        rows, cols, values = [], [], []
+        for row, tokens in enumerate(documents):
+            for token, count in Counter(tokens).items():
+                rows.append(row)
+                cols.append(self.vocabulary.setdefault(token, len(self.vocabulary)))
+                values.append(1.0 + np.log(count))
+
+        shape = (len(documents), len(self.vocabulary))
+        tf = sparse.csr_matrix((values, (rows, cols)), shape=shape, dtype=np.float64)
+        df = np.bincount(cols, minlength=shape[1]) if cols else np.zeros(shape[1])
+        self.idf = np.log((1 + shape[0]) / (1 + df)) + 1.0
+        self.matrix = _l2_normalize(tf @ sparse.diags(self.idf))
+
+    def transform(self, weighted_tokens: Dict[str, float]) -> sparse.csr_matrix:
+        cols, values = [], []
+        for token, weight in weighted_tokens.items():
+            col = self.vocabulary.get(token)
+            if col is not None and weight > 0:
+                cols.append(col)
+                values.append(weight * self.idf[col])
+        vector = sparse.csr_matrix((values, ([0] * len(cols), cols)), shape=(1, len(self.vocabulary)))
+        return _l2_normalize(vector)
+
+def _l2_normalize(matrix: sparse.csr_matrix) -> sparse.csr_matrix:
+    norms = np.sqrt(np.asarray(matrix.multiply(matrix).sum(axis=1)).ravel())
+    norms[norms == 0] = 1.0
+    return sparse.csr_matrix(sparse.diags(1.0 / norms) @ matrix)
+
+class ArtistCooccurrence:
+    def __init__(self, user_artists: Dict[int, Iterable[str]]):
+        self.artists: List[str] = []
+        self.index: Dict[str, int] = {}
+        rows, cols = [], []
+        for row, names in enumerate(user_artists.values()):
+            for key in {normalize(name) for name in names if name and normalize(name)}:
+                if key not in self.index:
+                    self.index[key] = len(self.artists)
+                    self.artists.append(key)
+                rows.append(row)
+                cols.append(self.index[key])
+
+        self.users = sparse.csr_matrix(
+            (np.ones(len(rows)), (rows, cols)), shape=(len(user_artists), len(self.artists))
+        )
+        self.by_artist = self.users.tocsc()
+        self.counts = np.asarray(self.users.sum(axis=0)).ravel()
+
+    def related(self, artist_names: Iterable[str], limit: int = RELATED_ARTISTS) -> List[Tuple[str, float]]:
+        seeds = sorted({self.index[normalize(n)] for n in artist_names if normalize(n) in self.index})
+        if not seeds:
+            return []
+
+        seed_counts = np.asarray(self.by_artist[:, seeds].sum(axis=1)).ravel()
+        user_rows = np.flatnonzero(seed_counts)
+        co = np.asarray(self.users[user_rows].T @ seed_counts[user_rows]).ravel()
+        seed_total = self.counts[seeds].sum()
+        scores = co / np.sqrt(np.maximum(self.counts * seed_total, 1.0))
+        scores[seeds] = 0.0
+
+        ranked = np.argsort(-scores, kind='stable')[:limit]
+        return [(self.artists[i], float(scores[i])) for i in ranked if scores[i] > 0]
+
+class LocalRecommender:
+    def __init__(self, concerts: List[Dict]):
+        self.concerts = concerts
+        self.rows = {concert.get('url'): row for row, concert in enumerate(concerts) if concert.get('url')}
+        self.index = TfidfIndex([
+            tokenize(' '.join(concert.get(field) or '' for field in TEXT_FIELDS)) for concert in concerts
+        ])
+
+    def profile(self, artist_names: List[str], cooccurrence: Optional[ArtistCooccurrence] = None) -> Dict[str, float]:
+        weights: Dict[str, float] = Counter()
+        for name in artist_names:
+            for token in artist_tokens(name):
+                weights[token] += 1.0
+        if cooccurrence is not None:
+            for name, score in cooccurrence.related(artist_names):
+                for token in artist_tokens(name):
+                    weights[token] += RELATED_WEIGHT * score
+        return weights
+
+    def _ranked_rows(
+        self,
+        artist_names: List[str],
+        candidates: Optional[List[Dict]],
+        cooccurrence: Optional[ArtistCooccurrence]
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        if candidates is None:
+            rows = np.arange(len(self.concerts))
+        else:
+            rows = np.array([self.rows[c['url']] for c in candidates if c.get('url') in self.rows], dtype=int)
+
+        vector = self.index.transform(self.profile(artist_names, cooccurrence))
+        if vector.nnz == 0 or rows.size == 0:
+            return rows, np.zeros(len(self.concerts))
+
+        scores = np.asarray((self.index.matrix @ vector.T).todense()).ravel()
+        return rows[np.argsort(-scores[rows], kind='stable')], scores
+
+    def recommend(
+        self,
+        artist_names: List[str],
+        candidates: Optional[List[Dict]] = None,
+        max_recommendations: int = 10,
+        cooccurrence: Optional[ArtistCooccurrence] = None
+    ) -> List[Dict]:
+        if not artist_names or not self.concerts:
+            return []
+
+        order, scores = self._ranked_rows(artist_names, candidates, cooccurrence)
+        return [self.concerts[row] for row in order[:max_recommendations] if scores[row] > 0]
+
+    def rank(
+        self,
+        artist_names: List[str],
+        candidates: List[Dict],
+        limit: int,
+        cooccurrence: Optional[ArtistCooccurrence] = None
+    ) -> List[Dict]:
+        order, _ = self._ranked_rows(artist_names, candidates, cooccurrence)
+        ranked = [self.concerts[row] for row in order[:limit]]
+        if len(ranked) < limit:
+            ranked.extend([c for c in candidates if c.get('url') not in self.rows][:limit - len(ranked)])
+        return ranked
+
+_fitted: "OrderedDict[str, LocalRecommender]" = OrderedDict()
+
+def get_local_recommender(concerts: List[Dict], version: Optional[str] = None) -> LocalRecommender:
+    version = version or catalog_version(concerts)
+    recommender = _fitted.get(version)
+    if recommender is None:
+        started = time.perf_counter()
+        recommender = LocalRecommender(concerts)
+        logger.info(f"Local recommender fitted on {len(concerts)} concerts in {(time.perf_counter() - started) * 1000:.0f} ms")
+        _fitted[version] = recommender
+        while len(_fitted) > FITTED_MODELS:
+            _fitted.popitem(last=False)
+    _fitted.move_to_end(version)
+    return recommender
+
+async def get_local_recommender_async(concerts: List[Dict], version: Optional[str] = None) -> LocalRecommender:
+    if version in _fitted:
+        _fitted.move_to_end(version)
+        return _fitted[version]
+    return await asyncio.to_thread(get_local_recommender, concerts, version)
+
+def recommend_locally(
+    artist_names: List[str],
+    concerts: List[Dict],
+    max_recommendations: int = 10,
+    cooccurrence: Optional[ArtistCooccurrence] = None
+) -> List[Dict]:
+    return get_local_recommender(concerts).recommend(artist_names, None, max_recommendations, cooccurrence)
+
+_cooccurrence: Optional[Tuple[float, Optional[ArtistCooccurrence]]] = None
+
+async def get_shared_cooccurrence(repository=None) -> Optional[ArtistCooccurrence]:
+    global _cooccurrence
+    if _cooccurrence and _cooccurrence[0] > time.monotonic():
+        return _cooccurrence[1]
+
+    from src.repositories.user_artist_repository import UserArtistRepository
+    user_artists = await (repository or UserArtistRepository()).get_all_user_artists()
+    model = ArtistCooccurrence(user_artists) if user_artists else None
+    _cooccurrence = (time.monotonic() + COOCCURRENCE_TTL_SECONDS, model)
+    if model is None:
+        return None
+
+    logger.info(f"Artist co-occurrence built from {len(user_artists)} playlists, {len(model.artists)} artists")
+    return model
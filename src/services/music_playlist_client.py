@@ -1,5 +1,19 @@
 import os
-from yandex_music import Client
+import asyncio
+import logging
+from typing import AsyncIterator, List, Optional
+from yandex_music import Client, ClientAsync
+
+logger = logging.getLogger(__name__)
+
+TRACK_BATCH_SIZE = 200
+TRACK_BATCH_CONCURRENCY = 4
+
+def _token_from_env() -> str:
+    token = os.getenv("YANDEX_MUSIC_TOKEN")
+    if not token:
+        raise EnvironmentError("YANDEX_MUSIC_TOKEN не установлен")
+    return token
 
 class MusicClient:
     def __init__(self, token: str):
@@ -7,11 +21,73 @@ class MusicClient:
 
     @classmethod
     def from_env(cls) -> "MusicClient":
-        token = os.getenv("YANDEX_MUSIC_TOKEN")
-        if not token:
-            raise EnvironmentError("YANDEX_MUSIC_TOKEN не установлен")
-        return cls(token)
+        return cls(_token_from_env())
 
     def get_playlist(self, kind: str, owner: str):
         return self._client.users_playlists(kind, owner)
 
+class AsyncMusicClient:
+    def __init__(self, token: str, batch_size: int = TRACK_BATCH_SIZE, concurrency: int = TRACK_BATCH_CONCURRENCY):
+        self._token = token
+        self._client: Optional[ClientAsync] = None
+        self._init_lock = asyncio.Lock()
+        self.batch_size = batch_size
+        self.concurrency = concurrency
+
+    @classmethod
+    def from_env(cls) -> "AsyncMusicClient":
+        return cls(_token_from_env())
+
+    async def start(self) -> "AsyncMusicClient":
+        async with self._init_lock:
+            if self._client is None:
+                self._client = await ClientAsync(self._token).init()
+                logger.info("Yandex Music async client initialized")
+        return self
+
+    async def get_playlist(self, kind: str, owner: str):
+        await self.start()
+        return await self._client.users_playlists(kind, owner)
+
+    async def iter_track_batches(self, playlist) -> AsyncIterator[List]:
+        shorts = playlist.tracks or []
+        loaded = [short.track for short in shorts if short.track]
+        if loaded:
+            yield loaded
+
+        missing = [short.track_id for short in shorts if not short.track]
+        if not missing:
+            return
+
+        await self.start()
+        semaphore = asyncio.Semaphore(self.concurrency)
+
+        async def load(ids: List[str]) -> List:
+            async with semaphore:
+                try:
+                    return await self._client.tracks(ids)
+                except Exception as e:
+                    logger.warning(f"Failed to load {len(ids)} tracks: {e}")
+                    return []
+
+        batches = [missing[i:i + self.batch_size] for i in range(0, len(missing), self.batch_size)]
+        logger.info(f"Loading {len(missing)} tracks in {len(batches)} batches")
+        for batch in asyncio.as_completed([load(ids) for ids in batches]):
+            yield await batch
+
+    async def get_artist_names(self, kind: str, owner: str) -> List[str]:
+        playlist = await self.get_playlist(kind, owner)
+        artists = []
+        async for tracks in self.iter_track_batches(playlist):
+            for track in tracks:
+                if track and track.artists:
+                    artists.extend(artist.name for artist in track.artists if artist.name)
+        return artists
+
+_shared_client: Optional[AsyncMusicClient] = None
+
+async def get_shared_music_client() -> AsyncMusicClient:
+    global _shared_client
+    if _shared_client is None:
+        _shared_client = AsyncMusicClient.from_env()
+    return await _shared_client.start()
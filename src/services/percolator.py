@@ -0,0 +1,71 @@
+import logging
+from collections import Counter, defaultdict
+from typing import Dict, Iterable, List, Optional, Set
+from src.services.concert_service import ConcertMatcherService, match_text, search_keys, trigrams
+from src.utils.transliteration import name_variants, normalize
+
+logger = logging.getLogger(__name__)
+
+class ArtistPercolator:
+    def __init__(self, user_artists: Dict[int, Iterable[str]], matcher: Optional[ConcertMatcherService] = None):
+        self.matcher = matcher or ConcertMatcherService(None, city='')
+        self.artist_users: Dict[str, Set[int]] = defaultdict(set)
+        self.artist_names: Dict[str, str] = {}
+        self._key_artists: Dict[str, Set[str]] = defaultdict(set)
+        self._key_trigrams: Dict[str, Set[str]] = {}
+        self._postings: Dict[str, Set[str]] = defaultdict(set)
+
+        for user_id, names in user_artists.items():
+            for name in names:
+                normalized = normalize(name or '')
+                if not normalized:
+                    continue
+                self.artist_users[normalized].add(user_id)
+                if normalized in self.artist_names:
+                    continue
+                self.artist_names[normalized] = name
+                for variant in name_variants(name):
+                    for key in search_keys(self.matcher, variant):
+                        self._key_artists[key].add(normalized)
+
+        frequency = Counter()
+        for key in self._key_artists:
+            self._key_trigrams[key] = trigrams(key)
+            frequency.update(self._key_trigrams[key])
+        for key, grams in self._key_trigrams.items():
+            self._postings[min(grams, key=lambda g: (frequency[g], g))].add(key)
+
+        logger.info(
+            f"Percolator built: {len(self.artist_users)} artists, {len(self._key_artists)} keys, "
+            f"{sum(len(users) for users in self.artist_users.values())} subscriptions"
+        )
+
+    def candidate_artists(self, event: Dict) -> Set[str]:
+        grams = trigrams(match_text(event))
+        candidates = set()
+        for gram in grams:
+            for key in self._postings.get(gram, ()):
+                if self._key_trigrams[key] <= grams:
+                    candidates |= self._key_artists[key]
+        return candidates
+
+    def match_event(self, event: Dict) -> Dict[int, List[str]]:
+        users: Dict[int, List[str]] = defaultdict(list)
+        for normalized in self.candidate_artists(event):
+            name = self.artist_names[normalized]
+            if self.matches(name, event):
+                for user_id in self.artist_users[normalized]:
+                    users[user_id].append(name)
+        return dict(users)
+
+    def matches(self, name: str, event: Dict) -> bool:
+        if self.matcher.matches_concert(name, event):
+            return True
+        return any(self.matcher.matches_variant(variant, event) for variant in name_variants(name)[1:])
+
+    def percolate(self, events: Iterable[Dict]) -> Dict[int, List[Dict]]:
+        notifications: Dict[int, List[Dict]] = defaultdict(list)
+        for event in events:
+            for user_id, artists in self.match_event(event).items():
+                notifications[user_id].append(dict(event, matched_artist=', '.join(sorted(artists))))
+        return dict(notifications)
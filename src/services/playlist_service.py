@@ -14,6 +14,6 @@ class ServicePlaylist:
         for tr in tracks:
             t = tr.track
             if t and t.artists:
-                artists.append(t.artists[0].name)
+                artists.extend(artist.name for artist in t.artists if artist.name)
 
         return artists
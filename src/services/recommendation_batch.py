@@ -0,0 +1,114 @@
+import time
+import asyncio
+import logging
+from collections import Counter
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Optional, Tuple
+from src.config.settings import config
+from src.repositories.concert_repository import ConcertRepository
+from src.repositories.user_artist_repository import UserArtistRepository
+from src.repositories.user_recommendation_repository import UserRecommendationRepository
+from src.services.concert_service import catalog_version
+from src.services.local_recommender import get_local_recommender_async
+from src.services.recommendation_cache import TOP_ARTISTS, get_recommendation_cache, profile_key
+from src.services.recommendation_service import RecommendationService
+from src.utils.transliteration import normalize
+
+logger = logging.getLogger(__name__)
+
+def _top_artists(artist_names: List[str]) -> set:
+    return {normalize(name) for name in artist_names[:TOP_ARTISTS] if name and normalize(name)}
+
+def _jaccard(a: set, b: set) -> float:
+    if not a or not b:
+        return 0.0
+    return len(a & b) / len(a | b)
+
+def group_profiles(profiles: Dict[int, List[str]], threshold: float) -> List[Tuple[List[int], List[str]]]:
+    groups: List[Tuple[set, List[int]]] = []
+    for user_id in sorted(profiles, key=lambda uid: (-len(profiles[uid]), uid)):
+        top = _top_artists(profiles[user_id])
+        for seed, members in groups:
+            if _jaccard(seed, top) >= threshold:
+                members.append(user_id)
+                break
+        else:
+            groups.append((top, [user_id]))
+
+    result = []
+    for _, members in groups:
+        counts: Counter = Counter()
+        names: Dict[str, str] = {}
+        for user_id in members:
+            for name in profiles[user_id]:
+                key = normalize(name)
+                if key:
+                    counts[key] += 1
+                    names.setdefault(key, name)
+        artists = [names[key] for key, _ in counts.most_common(TOP_ARTISTS)]
+        result.append((members, artists))
+    return result
+
+async def precompute_recommendations(
+    concert_repository: Optional[ConcertRepository] = None,
+    user_artist_repository: Optional[UserArtistRepository] = None,
+    store: Optional[UserRecommendationRepository] = None,
+    since: Optional[datetime] = None,
+    max_recommendations: int = 10
+) -> Dict:
+    started = time.perf_counter()
+    concert_repository = concert_repository or ConcertRepository()
+    user_artist_repository = user_artist_repository or UserArtistRepository()
+    store = store or UserRecommendationRepository()
+    since = since or datetime.now(timezone.utc) - timedelta(days=config.RECOMMENDATION_ACTIVE_DAYS)
+    stats = {'cities': 0, 'users': 0, 'groups': 0, 'stored': 0, 'elapsed_seconds': 0.0}
+
+    active = await store.get_active_users(since)
+    if not active:
+        logger.info("No recently active users, skipping recommendation precompute")
+        return stats
+
+    concerts = await concert_repository.get_events_by_category_async('concert')
+    if not concerts:
+        logger.warning("No concerts loaded, keeping stored recommendations")
+        return stats
+    version = await asyncio.to_thread(catalog_version, concerts)
+    await get_local_recommender_async(concerts, version)
+
+    artists = await user_artist_repository.get_user_artists(sorted({uid for users in active.values() for uid in users}))
+    rows = []
+    for city, user_ids in active.items():
+        profiles = {uid: artists[uid] for uid in user_ids if artists.get(uid)}
+        if not profiles:
+            continue
+
+        service = RecommendationService(
+            concert_repository, city=city, cache=get_recommendation_cache(), use_playlist_stats=True
+        )
+        if service.enabled:
+            groups = group_profiles(profiles, config.RECOMMENDATION_GROUP_SIMILARITY)
+        else:
+            groups = [([uid], names) for uid, names in profiles.items()]
+
+        for members, group_artists in groups:
+            recommended = await service.recommend_from_catalog(
+                group_artists, concerts, max_recommendations, version=version
+            )
+            rows.extend({
+                'user_id': uid,
+                'city': city,
+                'profile_key': profile_key(profiles[uid]),
+                'concerts': recommended,
+            } for uid in members)
+
+        stats['cities'] += 1
+        stats['users'] += len(profiles)
+        stats['groups'] += len(groups)
+
+    stats['stored'] = await store.save_recommendations(rows, version)
+    stats['elapsed_seconds'] = time.perf_counter() - started
+    logger.info(
+        f"Recommendations precomputed for {stats['users']} users in {stats['cities']} cities "
+        f"in {stats['groups']} profile groups in {stats['elapsed_seconds']:.1f}s"
+    )
+    return stats
@@ -0,0 +1,136 @@
+import json
+import time
+import hashlib
+import logging
+from collections import OrderedDict
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+from src.config.settings import config
+from src.utils.transliteration import normalize
+
+logger = logging.getLogger(__name__)
+
+TOP_ARTISTS = 20
+SWEEP_INTERVAL_SECONDS = 300
+
+def recommendation_key(artist_names: List[str], city: str, catalog_version: str, max_recommendations: int = 10) -> str:
+    top = sorted({normalize(name) for name in artist_names[:TOP_ARTISTS] if name and normalize(name)})
+    payload = json.dumps([top, city or '', catalog_version, max_recommendations], ensure_ascii=False)
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+def profile_key(artist_names: List[str]) -> str:
+    names = sorted({normalize(name) for name in artist_names if name and normalize(name)})
+    return hashlib.sha256(json.dumps(names, ensure_ascii=False).encode()).hexdigest()
+
+class RecommendationCache:
+    def __init__(
+        self,
+        max_entries: int = None,
+        ttl_seconds: float = None,
+        directory: Optional[Path] = None,
+        clock: Callable[[], float] = time.time,
+        max_disk_entries: int = None
+    ):
+        self.max_entries = max_entries if max_entries is not None else config.RECOMMENDATION_CACHE_SIZE
+        self.max_disk_entries = max_disk_entries if max_disk_entries is not None else config.RECOMMENDATION_CACHE_DISK_ENTRIES
+        self.ttl_seconds = ttl_seconds if ttl_seconds is not None else config.RECOMMENDATION_CACHE_TTL_SECONDS
+        self.directory = Path(directory) if directory else None
+        self.clock = clock
+        self.stats = {'hits': 0, 'misses': 0}
+        self._entries: "OrderedDict[str, Tuple[float, List[str]]]" = OrderedDict()
+        self._next_sweep = 0.0
+
+    def _path(self, key: str) -> Path:
+        return self.directory / f'{key}.json'
+
+    def _load(self, key: str) -> Optional[Tuple[float, List[str]]]:
+        if not self.directory:
+            return None
+        try:
+            data = json.loads(self._path(key).read_text(encoding='utf-8'))
+            return data['expires_at'], data['urls']
+        except (OSError, KeyError, ValueError):
+            return None
+
+    def get(self, key: str) -> Optional[List[str]]:
+        entry = self._entries.get(key)
+        if entry is None:
+            entry = self._load(key)
+
+        if entry is None or entry[0] <= self.clock():
+            if entry is not None:
+                self._discard(key)
+            self.stats['misses'] += 1
+            return None
+
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        self._evict()
+        self.stats['hits'] += 1
+        return list(entry[1])
+
+    def set(self, key: str, urls: List[str]):
+        entry = (self.clock() + self.ttl_seconds, list(urls))
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        self._evict()
+
+        if self.directory:
+            try:
+                self.directory.mkdir(parents=True, exist_ok=True)
+                self._path(key).write_text(json.dumps({'expires_at': entry[0], 'urls': entry[1]}), encoding='utf-8')
+            except OSError as e:
+                logger.warning(f"Could not persist recommendation cache entry: {e}")
+            if self.clock() >= self._next_sweep:
+                self._sweep()
+
+    def _sweep(self):
+        now = self.clock()
+        self._next_sweep = now + SWEEP_INTERVAL_SECONDS
+        live = []
+        removed = 0
+        try:
+            for path in self.directory.glob('*.json'):
+                try:
+                    expires_at = json.loads(path.read_text(encoding='utf-8'))['expires_at']
+                except (OSError, KeyError, ValueError):
+                    expires_at = 0
+                if expires_at <= now:
+                    path.unlink(missing_ok=True)
+                    removed += 1
+                else:
+                    live.append((expires_at, path))
+
+            live.sort()
+            for _, path in live[:max(0, len(live) - self.max_disk_entries)]:
+                path.unlink(missing_ok=True)
+                removed += 1
+        except OSError as e:
+            logger.warning(f"Could not sweep recommendation cache directory: {e}")
+            return
+        if removed:
+            logger.info(f"Removed {removed} recommendation cache files, {min(len(live), self.max_disk_entries)} left")
+
+    def _discard(self, key: str):
+        self._entries.pop(key, None)
+        if self.directory:
+            self._path(key).unlink(missing_ok=True)
+
+    def _evict(self):
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def clear(self):
+        self._entries.clear()
+
+def resolve_urls(urls: List[str], concerts: List[Dict]) -> List[Dict]:
+    by_url = {concert.get('url'): concert for concert in concerts if concert.get('url')}
+    return [by_url[url] for url in urls if url in by_url]
+
+_shared_cache: Optional[RecommendationCache] = None
+
+def get_recommendation_cache() -> RecommendationCache:
+    global _shared_cache
+    if _shared_cache is None:
+        _shared_cache = RecommendationCache(directory=config.RECOMMENDATION_CACHE_DIR or None)
+    return _shared_cache
@@ -1,23 +1,88 @@
-from typing import List, Dict, Optional
+from typing import Callable, List, Dict, Optional
 import logging
 import json
 import time
+import random
+import asyncio
 import os
-import google.genai as genai
-from google.genai import errors as genai_errors
 from src.config.settings import config
+from src.utils.lazy import lazy_module
+from src.utils.metrics import inc, span, timed
 from src.repositories.concert_repository import ConcertRepository
+from src.services.concert_service import catalog_version
+from src.utils.concert_utils import get_concert_date, get_concert_venue
+from src.services.recommendation_cache import RecommendationCache, recommendation_key, resolve_urls
+from src.services.local_recommender import (
+    ArtistCooccurrence,
+    LocalRecommender,
+    get_local_recommender_async,
+    get_shared_cooccurrence
+)
 
 logger = logging.getLogger(__name__)
 
+genai = lazy_module('google.genai')
+
+_gemini_semaphore: Optional[asyncio.Semaphore] = None
+
+def _get_gemini_semaphore() -> asyncio.Semaphore:
+    global _gemini_semaphore
+    if _gemini_semaphore is None:
+        _gemini_semaphore = asyncio.Semaphore(config.GEMINI_CONCURRENCY)
+    return _gemini_semaphore
+
+def _compact(text: str) -> str:
+    return ' '.join(str(text).replace('|', '/').split())
+
+def _short_description(description: Optional[str], limit: int) -> str:
+    if not description:
+        return ''
+    parts = description.split('•')
+    if len(parts) > 2:
+        description = '•'.join(parts[2:])
+    elif len(parts) == 2:
+        return ''
+    description = _compact(description)
+    return description[:limit].rstrip() + '…' if len(description) > limit else description
+
+def _prompt_date(concert: Dict) -> str:
+    if not (concert.get('dates') or concert.get('date')) and '•' not in (concert.get('description') or ''):
+        return ''
+    return get_concert_date(concert) or ''
+
+def _usage_summary(response, prompt: str, elapsed: float) -> str:
+    usage = getattr(response, 'usage_metadata', None)
+    tokens = {
+        name: getattr(usage, f'{name}_token_count', None)
+        for name in ('prompt', 'candidates', 'total')
+    }
+    return (
+        f"prompt={len(prompt)} chars, tokens prompt={tokens['prompt']} "
+        f"output={tokens['candidates']} total={tokens['total']}, latency={elapsed:.2f}s"
+    )
+
+def is_quota_error(error: Exception) -> bool:
+    error_str = str(error)
+    return '429' in error_str or 'RESOURCE_EXHAUSTED' in error_str or 'quota' in error_str.lower()
+
 class RecommendationService:
-    def __init__(self, repository: ConcertRepository, city: str = 'orenburg'):
+    def __init__(
+        self,
+        repository: ConcertRepository,
+        city: str = 'orenburg',
+        fallback: Optional[Callable[[List[str], List[Dict], int], List[Dict]]] = None,
+        cache: Optional[RecommendationCache] = None,
+        use_playlist_stats: bool = False
+    ):
         self.repository = repository
         self.city = city
         self.api_key = config.GEMINI_API_KEY
+        self.fallback = fallback
+        self.cache = cache
+        self.use_playlist_stats = use_playlist_stats
 
         if not self.api_key:
-            logger.warning("GEMINI_API_KEY not set, recommendations will be disabled")
+            logger.warning("GEMINI_API_KEY not set, only local recommendations are available")
             self.enabled = False
             self.client = None
             self.model_name = None
@@ -51,154 +116,239 @@ class RecommendationService:
         return filtered
 
     def _format_concerts_for_prompt(self, concerts: List[Dict]) -> str:
-        formatted = []
-        for i, concert in enumerate(concerts[:50], 1):
-            title = concert.get('title', 'N/A')
-            description = concert.get('description', '')
-            url = concert.get('url', '')
-
-            concert_info = f"{i}. {title}"
-            if description:
-                description_short = description[:200] + "..." if len(description) > 200 else description
-                concert_info += f"\n   Описание: {description_short}"
-            if url:
-                concert_info += f"\n   URL: {url}"
-
-            formatted.append(concert_info)
-
-        return "\n".join(formatted)
-
-    def get_recommendations(
+        venues: Dict[str, str] = {}
+        lines = []
+        for i, concert in enumerate(concerts, 1):
+            venue = get_concert_venue(concert)
+            venue_ref = ''
+            if venue:
+                venue_ref = venues.setdefault(venue, f"V{len(venues) + 1}")
+
+            fields = [
+                str(i),
+                _compact(concert.get('title', 'N/A')),
+                _compact(_prompt_date(concert)),
+                venue_ref,
+                _short_description(concert.get('description'), config.GEMINI_DESCRIPTION_CHARS)
+            ]
+            lines.append('|'.join(fields).rstrip('|'))
+
+        legend = [f"{ref} {_compact(name)}" for name, ref in venues.items()]
+        sections = []
+        if legend:
+            sections.append("Площадки:\n" + "\n".join(legend))
+        sections.append("номер|название|дата|площадка|описание\n" + "\n".join(lines))
+        return "\n\n".join(sections)
+
+    def _prerank(
         self,
+        recommender: LocalRecommender,
         artist_names: List[str],
-        max_recommendations: int = 10
+        city_concerts: List[Dict],
+        cooccurrence: Optional[ArtistCooccurrence] = None
     ) -> List[Dict]:
-        if not self.enabled:
-            logger.warning("Recommendations disabled - GEMINI_API_KEY not set")
-            return []
-
-        if not artist_names:
-            logger.warning("No artists provided for recommendations")
-            return []
+        limit = min(config.GEMINI_CANDIDATES, len(city_concerts))
+        return recommender.rank(artist_names, city_concerts, limit, cooccurrence)
 
+    async def _cooccurrence(self) -> Optional[ArtistCooccurrence]:
+        if not self.use_playlist_stats:
+            return None
         try:
-            all_concerts = self.repository.get_events_by_category('concert')
-            city_concerts = self._filter_concerts_by_city(all_concerts)
-
-            if not city_concerts:
-                logger.warning(f"No concerts found for city: {self.city}")
-                return []
-
-            logger.info(f"Analyzing {len(city_concerts)} concerts for recommendations")
+            return await get_shared_cooccurrence()
+        except Exception as e:
+            logger.warning(f"Artist co-occurrence unavailable: {e}")
+            return None
 
-            artists_str = ", ".join(artist_names[:20])
-            concerts_str = self._format_concerts_for_prompt(city_concerts)
+    def _build_prompt(self, artist_names: List[str], city_concerts: List[Dict], max_recommendations: int) -> str:
+        artists_str = ", ".join(artist_names[:20])
+        concerts_str = self._format_concerts_for_prompt(city_concerts)
 
-            prompt = f"""Ты музыкальный эксперт. Проанализируй стиль музыки исполнителей из плейлиста пользователя и порекомендуй концерты, которые могут быть интересны.
+        return f"""Ты музыкальный эксперт. Подбери концерты в городе {self.city} по вкусу пользователя: учти жанры, похожих исполнителей и музыкальные сцены.
 
-Исполнители из плейлиста:
-{artists_str}
+Исполнители из плейлиста: {artists_str}
 
-Доступные концерты в городе {self.city}:
+Концерты (отсортированы по предварительной релевантности, V-коды расшифрованы в списке площадок):
 {concerts_str}
 
-Проанализируй музыкальные стили исполнителей и найди концерты, которые могут быть интересны пользователю.
-Учти:
-1. Музыкальные жанры и стили
-2. Похожих исполнителей или группы в том же направлении
-3. Связанные музыкальные сцены
-
-Верни JSON массив с номерами рекомендованных концертов (только числа, без точек), максимум {max_recommendations} рекомендаций.
-Формат ответа должен быть строго в формате JSON:
-{{"recommended_indices": [1, 5, 12, ...]}}
-
-ВАЖНО: Ответь только JSON объектом, без дополнительного текста, объяснений или markdown форматирования."""
-
-            generation_config = genai.types.GenerateContentConfig(
-                temperature=0.3,
-                top_p=0.95,
-                top_k=40,
-                max_output_tokens=1024,
-            )
-
-            max_retries = 3
-            retry_delay = 20
-            response = None
-            last_error = None
-
-            for attempt in range(max_retries):
-                try:
-                    logger.info(f"Attempting to generate content with model: {self.model_name} (attempt {attempt + 1}/{max_retries})")
-                    response = self.client.models.generate_content(
-                        model=self.model_name,
-                        contents=prompt,
-                        config=generation_config
-                    )
-                    logger.info(f"Successfully generated content with model: {self.model_name}")
-                    break
-                except genai_errors.ClientError as e:
-                    error_str = str(e)
-                    if '429' in error_str or 'RESOURCE_EXHAUSTED' in error_str or 'quota' in error_str.lower():
-                        if attempt < max_retries - 1:
-                            logger.warning(f"Quota exceeded, waiting {retry_delay} seconds before retry...")
-                            time.sleep(retry_delay)
-                            continue
-                        else:
-                            logger.error(f"Quota exceeded after {max_retries} attempts. Please wait or check your API quota.")
-                            last_error = e
-                            break
-                    else:
-                        logger.error(f"API error: {e}")
-                        last_error = e
-                        break
-                except Exception as e:
-                    logger.error(f"Unexpected error: {e}")
-                    last_error = e
-                    break
-
-            if response is None:
-                error_msg = f"Could not generate content with model {self.model_name}"
-                if last_error:
-                    error_msg += f". Error: {last_error}"
-                logger.error(error_msg)
+Ответь только JSON без markdown, максимум {max_recommendations} номеров:
+{{"recommended_indices": [1, 5, 12]}}"""
+
+    def _generation_config(self):
+        return genai.types.GenerateContentConfig(
+            temperature=0.3,
+            top_p=0.95,
+            top_k=40,
+            max_output_tokens=1024,
+        )
+
+    def _parse_recommendations(self, response_text: str, city_concerts: List[Dict], max_recommendations: int) -> List[Dict]:
+        response_text = response_text.strip()
+        logger.info(f"Gemini API response: {response_text[:200]}...")
+
+        json_start = response_text.find('{')
+        json_end = response_text.rfind('}') + 1
+
+        if json_start != -1 and json_end > json_start:
+            json_str = response_text[json_start:json_end]
+            try:
+                result = json.loads(json_str)
+                recommended_indices = result.get('recommended_indices', [])
+                recommended_indices = [int(idx) for idx in recommended_indices if isinstance(idx, (int, str)) and str(idx).isdigit()]
+            except json.JSONDecodeError as e:
+                logger.warning(f"JSON decode error: {e}. Response: {response_text[:500]}")
                 return []
+        else:
+            logger.warning(f"Could not find JSON in response: {response_text[:500]}")
+            return []
 
-            response_text = response.text.strip()
-
-            logger.info(f"Gemini API response: {response_text[:200]}...")
-
-            json_start = response_text.find('{')
-            json_end = response_text.rfind('}') + 1
+        recommended_concerts = []
+        seen_urls = set()
+
+        for idx in recommended_indices:
+            if 1 <= idx <= len(city_concerts):
+                concert = city_concerts[idx - 1]
+                url = concert.get('url')
+                if url and url not in seen_urls:
+                    seen_urls.add(url)
+                    recommended_concerts.append(concert)
+                    if len(recommended_concerts) >= max_recommendations:
+                        break
 
-            if json_start != -1 and json_end > json_start:
-                json_str = response_text[json_start:json_end]
-                try:
-                    result = json.loads(json_str)
-                    recommended_indices = result.get('recommended_indices', [])
-                    recommended_indices = [int(idx) for idx in recommended_indices if isinstance(idx, (int, str)) and str(idx).isdigit()]
-                except json.JSONDecodeError as e:
-                    logger.warning(f"JSON decode error: {e}. Response: {response_text[:500]}")
-                    return []
-            else:
-                logger.warning(f"Could not find JSON in response: {response_text[:500]}")
-                return []
+        logger.info(f"Found {len(recommended_concerts)} recommended concerts")
+        return recommended_concerts
+
+    async def _generate_with_backoff(self, prompt: str, deadline: float) -> Optional[str]:
+        loop = asyncio.get_running_loop()
+        generation_config = self._generation_config()
+
+        for attempt in range(config.GEMINI_MAX_RETRIES):
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                return None
+
+            try:
+                async with _get_gemini_semaphore():
+                    remaining = deadline - loop.time()
+                    if remaining <= 0:
+                        return None
+                    logger.info(f"Generating content with model: {self.model_name} (attempt {attempt + 1}/{config.GEMINI_MAX_RETRIES})")
+                    started = loop.time()
+                    response = await asyncio.wait_for(
+                        self.client.aio.models.generate_content(
+                            model=self.model_name,
+                            contents=prompt,
+                            config=generation_config
+                        ),
+                        timeout=remaining
+                    )
+                logger.info(f"Gemini call: {_usage_summary(response, prompt, loop.time() - started)}")
+                return response.text
+            except asyncio.TimeoutError:
+                logger.warning("Gemini request exceeded the deadline")
+                return None
+            except genai.errors.ClientError as e:
+                if not is_quota_error(e):
+                    logger.error(f"API error: {e}")
+                    return None
+                if attempt == config.GEMINI_MAX_RETRIES - 1:
+                    logger.error(f"Quota exceeded after {config.GEMINI_MAX_RETRIES} attempts")
+                    return None
+                delay = config.GEMINI_RETRY_BASE_DELAY * (2 ** attempt) + random.uniform(0, 0.5)
+                if loop.time() + delay >= deadline:
+                    logger.warning("Quota exceeded and no time left before the deadline")
+                    return None
+                logger.warning(f"Quota exceeded, retrying in {delay:.1f}s")
+                await asyncio.sleep(delay)
+            except Exception as e:
+                logger.error(f"Unexpected error: {e}")
+                return None
+
+        return None
+
+    async def get_recommendations_async(
+        self,
+        artist_names: List[str],
+        max_recommendations: int = 10,
+        deadline_seconds: Optional[float] = None
+    ) -> List[Dict]:
+        if not artist_names:
+            logger.warning("No artists provided for recommendations")
+            return []
 
-            recommended_concerts = []
-            seen_urls = set()
+        try:
+            all_concerts = await self.repository.get_events_by_category_async('concert')
+        except Exception as e:
+            logger.error(f"Error loading concerts for recommendations: {e}", exc_info=True)
+            return []
 
-            for idx in recommended_indices:
-                if 1 <= idx <= len(city_concerts):
-                    concert = city_concerts[idx - 1]
-                    url = concert.get('url')
-                    if url and url not in seen_urls:
-                        seen_urls.add(url)
-                        recommended_concerts.append(concert)
-                        if len(recommended_concerts) >= max_recommendations:
-                            break
+        return await self.recommend_from_catalog(artist_names, all_concerts, max_recommendations, deadline_seconds)
 
-            logger.info(f"Found {len(recommended_concerts)} recommended concerts")
-            return recommended_concerts
+    @timed('recommendations.recommend_from_catalog')
+    async def recommend_from_catalog(
+        self,
+        artist_names: List[str],
+        all_concerts: List[Dict],
+        max_recommendations: int = 10,
+        deadline_seconds: Optional[float] = None,
+        version: Optional[str] = None
+    ) -> List[Dict]:
+        if not artist_names:
+            return []
 
-        except Exception as e:
-            logger.error(f"Error getting recommendations: {e}", exc_info=True)
+        city_concerts = self._filter_concerts_by_city(all_concerts)
+        if not city_concerts:
+            logger.warning(f"No concerts found for city: {self.city}")
             return []
+
+        version = version or await asyncio.to_thread(catalog_version, all_concerts)
+        if self.enabled:
+            cache_key = None
+            if self.cache is not None:
+                cache_key = recommendation_key(artist_names, self.city, version, max_recommendations)
+                cached_urls = self.cache.get(cache_key)
+                if cached_urls is not None:
+                    inc('recommendation_cache_total', result='hit')
+                    logger.info(f"Recommendation cache hit for city {self.city or 'all'}")
+                    return resolve_urls(cached_urls, city_concerts)
+                inc('recommendation_cache_total', result='miss')
+
+            loop = asyncio.get_running_loop()
+            started = loop.time()
+            deadline = started + (deadline_seconds if deadline_seconds is not None else config.GEMINI_DEADLINE_SECONDS)
+            recommender = await get_local_recommender_async(all_concerts, version)
+            cooccurrence = await self._cooccurrence()
+            with span('recommendations.prerank'):
+                candidates = self._prerank(recommender, artist_names, city_concerts, cooccurrence)
+            prompt = self._build_prompt(artist_names, candidates, max_recommendations)
+
+            with span('recommendations.gemini'):
+                response_text = await self._generate_with_backoff(prompt, deadline)
+            inc('gemini_calls_total', result='ok' if response_text else 'failed')
+            logger.info(f"Gemini recommendations over {len(candidates)} candidates finished in {loop.time() - started:.2f}s")
+            if response_text:
+                recommended = self._parse_recommendations(response_text, candidates, max_recommendations)
+                if recommended:
+                    if cache_key:
+                        self.cache.set(cache_key, [c['url'] for c in recommended])
+                    return recommended
+
+        return await self._local_recommendations(artist_names, all_concerts, city_concerts, max_recommendations, version)
+
+    async def _local_recommendations(
+        self,
+        artist_names: List[str],
+        all_concerts: List[Dict],
+        city_concerts: List[Dict],
+        max_recommendations: int,
+        version: Optional[str] = None
+    ) -> List[Dict]:
+        inc('recommendations_local_total')
+        if self.fallback is not None:
+            return self.fallback(artist_names, city_concerts, max_recommendations)
+
+        recommender = await get_local_recommender_async(all_concerts, version)
+        cooccurrence = await self._cooccurrence()
+        started = time.perf_counter()
+        recommended = recommender.recommend(artist_names, city_concerts, max_recommendations, cooccurrence)
+        logger.info(f"Local recommendations: {len(recommended)} in {(time.perf_counter() - started) * 1000:.1f} ms")
+        return recommended
@@ -41,6 +41,15 @@ mock_aiogram.fsm = MagicMock()
 mock_aiogram.fsm.context = MagicMock()
 mock_aiogram.fsm.context.FSMContext = MagicMock
 
+class TelegramRetryAfter(Exception):
+    def __init__(self, method=None, message='Flood control exceeded', retry_after=0):
+        super().__init__(message)
+        self.method = method
+        self.retry_after = retry_after
+
+mock_aiogram.exceptions = MagicMock()
+mock_aiogram.exceptions.TelegramRetryAfter = TelegramRetryAfter
+
 import sys as sys_module
 if 'pymongo' not in sys_module.modules:
     sys_module.modules['pymongo'] = mock_pymongo
@@ -56,4 +65,5 @@ if 'aiogram' not in sys_module.modules:
     sys_module.modules['aiogram.types'] = mock_aiogram.types
     sys_module.modules['aiogram.fsm'] = mock_aiogram.fsm
     sys_module.modules['aiogram.fsm.context'] = mock_aiogram.fsm.context
+    sys_module.modules['aiogram.exceptions'] = mock_aiogram.exceptions
 
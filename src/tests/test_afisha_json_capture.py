@@ -0,0 +1,120 @@
+import json
+import base64
+from unittest.mock import Mock
+from src.clients.afisha_json_capture import (
+    collect_json_responses,
+    collect_embedded_state,
+    convert_event_item,
+    extract_events_from_payloads,
+    is_afisha_api_url
+)
+
+API_URL = 'https://afisha.yandex.ru/api/events/rubric/concert?limit=12&offset=12&city=moscow'
+
+def make_item(url='/moscow/concert/artist-tour', title='Artist', **schedule):
+    return {
+        'event': {
+            'id': 'abc123',
+            'url': url,
+            'title': title,
+            'tickets': [{'price': {'min': 1500, 'max': 5000, 'currency': 'rub'}}],
+            'image': {'url': 'https://avatars.mds.yandex.net/get-afishanew/1/orig'}
+        },
+        'scheduleInfo': {
+            'dates': ['2025-03-15T19:00:00+03:00', '2025-03-16T19:00:00+03:00'],
+            'onlyPlace': {'id': 'place1', 'title': 'Главклуб'},
+            **schedule
+        }
+    }
+
+def log_entry(method, params):
+    return {'message': json.dumps({'message': {'method': method, 'params': params}})}
+
+def test_is_afisha_api_url():
+    assert is_afisha_api_url(API_URL)
+    assert not is_afisha_api_url('https://afisha.yandex.ru/moscow/concert')
+    assert not is_afisha_api_url('')
+
+def test_convert_event_item():
+    event = convert_event_item(make_item(), 'concert', 'moscow')
+
+    assert event['url'] == 'https://afisha.yandex.ru/moscow/concert/artist-tour'
+    assert event['title'] == 'Artist'
+    assert event['date'] == '2025-03-15T19:00:00+03:00'
+    assert len(event['dates']) == 2
+    assert event['venue'] == 'Главклуб'
+    assert event['venue_id'] == 'place1'
+    assert event['price'] == 'от 1500 ₽'
+    assert event['description'] == '15 марта, 19:00 • Главклуб'
+    assert event['image'].startswith('https://avatars')
+    assert event['city'] == 'moscow'
+
+def test_converted_event_keeps_price_and_ids_in_model():
+    from src.db.models import Event
+    from src.repositories.concert_repository import UPSERT_COLUMNS
+
+    event = Event.from_dict(convert_event_item(make_item(), 'concert', 'moscow'))
+    row = {column: getattr(event, column) for column in UPSERT_COLUMNS}
+
+    assert row['price'] == 'от 1500 ₽'
+    assert row['extra'] == {
+        'venue_id': 'place1', 'afisha_id': 'abc123', 'image': 'https://avatars.mds.yandex.net/get-afishanew/1/orig'
+    }
+    restored = event.to_dict()
+    assert restored['price'] == 'от 1500 ₽' and restored['afisha_id'] == 'abc123'
+    assert Event.from_dict({'url': 'u', 'title': 'T'}).extra is None
+
+def test_convert_event_item_skips_selections():
+    assert convert_event_item(make_item(url='/moscow/selections/top'), 'concert', 'moscow') is None
+    assert convert_event_item({'event': {'url': '/moscow/concert/x'}}, 'concert', 'moscow') is None
+
+def test_convert_event_item_tolerates_missing_fields():
+    item = {'event': {'url': '/moscow/concert/x', 'title': 'X'}, 'scheduleInfo': {'dateStarted': '2025-05-01'}}
+    event = convert_event_item(item, 'concert', 'moscow')
+
+    assert event['date'] == '2025-05-01'
+    assert event['venue'] is None
+    assert event['price'] is None
+    assert event['description'] == '1 мая'
+
+def test_extract_events_from_nested_payloads_dedupes():
+    payloads = [
+        {'data': [make_item(), make_item(url='/moscow/concert/other', title='Other')], 'paging': {'total': 2}},
+        {'widgets': {'list': {'items': [make_item()]}}},
+    ]
+    events = extract_events_from_payloads(payloads, 'concert', 'moscow')
+
+    assert [e['title'] for e in events] == ['Artist', 'Other']
+
+def test_collect_json_responses_reads_finished_api_bodies():
+    payload = {'data': [make_item()]}
+    driver = Mock()
+    driver.get_log.return_value = [
+        log_entry('Network.responseReceived', {'requestId': '1', 'response': {'url': API_URL, 'mimeType': 'application/json'}}),
+        log_entry('Network.loadingFinished', {'requestId': '1'}),
+        log_entry('Network.responseReceived', {'requestId': '2', 'response': {'url': API_URL, 'mimeType': 'application/json'}}),
+        log_entry('Network.responseReceived', {'requestId': '3', 'response': {'url': 'https://mc.yandex.ru/watch', 'mimeType': 'application/json'}}),
+        log_entry('Network.loadingFinished', {'requestId': '3'}),
+    ]
+    driver.execute_cdp_cmd.return_value = {
+        'body': base64.b64encode(json.dumps(payload).encode()).decode(),
+        'base64Encoded': True
+    }
+
+    payloads = collect_json_responses(driver)
+
+    assert payloads == [payload]
+    driver.execute_cdp_cmd.assert_called_once_with('Network.getResponseBody', {'requestId': '1'})
+
+def test_collect_json_responses_without_performance_log():
+    driver = Mock()
+    driver.get_log.side_effect = Exception('log type performance not found')
+    assert collect_json_responses(driver) == []
+
+def test_collect_embedded_state_skips_invalid_json():
+    driver = Mock()
+    driver.execute_script.return_value = [json.dumps({'data': [make_item()]}), '{"url": broken']
+    payloads = collect_embedded_state(driver)
+
+    assert len(payloads) == 1
+    assert extract_events_from_payloads(payloads, 'concert', 'moscow')[0]['venue_id'] == 'place1'
@@ -0,0 +1,117 @@
+import pytest
+from unittest.mock import Mock, AsyncMock, MagicMock, patch
+from src.services.concert_service import ConcertMatcherService, CatalogIndex
+from src.services.artist_events_service import collect_known_artists, build_artist_events, refresh_artist_events
+from src.repositories.artist_repository import ArtistRepository
+
+CONCERTS = [
+    {'id': 'e1', 'url': 'u1', 'title': 'Zemfira. Большой концерт'},
+    {'id': 'e2', 'url': 'u2', 'title': 'Кино — трибьют'},
+    {'id': 'e3', 'url': 'u3', 'title': 'Симфоническое Кино'},
+]
+
+def test_collect_known_artists_merges_sources():
+    artists = collect_known_artists(
+        ['Zemfira', 'KINO ', ''],
+        [{'name': 'Kino', 'aliases': ['Виктор Цой']}, {'name': 'Новый', 'aliases': []}, {'name': None}]
+    )
+    assert artists == {
+        'zemfira': {'name': 'Zemfira', 'aliases': []},
+        'kino': {'name': 'KINO ', 'aliases': ['Виктор Цой']},
+        'новый': {'name': 'Новый', 'aliases': []},
+    }
+
+def test_collect_known_artists_adds_mongo_aliases():
+    artists = collect_known_artists(['Maroon5'], [{'name': 'maroon5', 'aliases': ['M5']}], {'Maroon5': ['Maroon 5']})
+    assert artists == {'maroon5': {'name': 'Maroon5', 'aliases': ['Maroon 5', 'M5']}}
+
+def test_read_artist_rows_keeps_aliases():
+    from src.scripts.load_artists import read_artist_rows
+    rows = read_artist_rows([['Maroon5', 'Maroon 5', ' '], [' '], [], ['Sia']])
+    assert rows == [('Maroon5', ['Maroon 5']), ('Sia', [])]
+
+def test_build_artist_events_uses_transliterations():
+    index = CatalogIndex(CONCERTS, ConcertMatcherService(Mock(), city=''))
+    rows = build_artist_events(index, {
+        'земфира': {'name': 'Земфира', 'aliases': []},
+        'kino': {'name': 'Kino', 'aliases': []},
+        'nobody': {'name': 'Nobody', 'aliases': []},
+    })
+    assert {row['normalized_name']: row['event_ids'] for row in rows} == {
+        'земфира': ['e1'], 'kino': ['e2'], 'nobody': []
+    }
+
+@pytest.mark.asyncio
+@patch('src.clients.global_concert_client.get_artists_from_db', return_value=['Zemfira'])
+async def test_refresh_artist_events(mock_mongo):
+    concerts = Mock(get_events_by_category_async=AsyncMock(return_value=CONCERTS))
+    artists = Mock(
+        get_known_artists=AsyncMock(return_value=[{'name': 'Кино', 'aliases': []}]),
+        replace_artist_events=AsyncMock(return_value=2)
+    )
+    stats = await refresh_artist_events(concerts, artists)
+
+    rows, version = artists.replace_artist_events.call_args[0]
+    assert {row['normalized_name'] for row in rows} == {'zemfira', 'кино'}
+    assert version == CatalogIndex(CONCERTS, ConcertMatcherService(Mock(), city='')).version
+    assert stats['artists'] == 2 and stats['with_events'] == 2 and stats['written'] == 2
+
+@pytest.mark.asyncio
+async def test_refresh_artist_events_keeps_mapping_without_catalog():
+    concerts = Mock(get_events_by_category_async=AsyncMock(return_value=[]))
+    artists = Mock(replace_artist_events=AsyncMock())
+    stats = await refresh_artist_events(concerts, artists)
+    assert stats['written'] == 0
+    artists.replace_artist_events.assert_not_called()
+
+@pytest.mark.asyncio
+@patch('src.repositories.artist_repository.ArtistRepository._get_session')
+async def test_replace_artist_events_deletes_stale(mock_get_session):
+    from sqlalchemy.dialects import postgresql
+    session = AsyncMock()
+    mock_get_session.return_value = session
+
+    r = ArtistRepository()
+    res = await r.replace_artist_events([{'normalized_name': 'kino', 'artist_name': 'Kino', 'event_ids': ['e2']}], 'v2')
+
+    assert res == 1
+    upsert, cleanup = [str(c[0][0].compile(dialect=postgresql.dialect())) for c in session.execute.call_args_list]
+    assert 'ON CONFLICT (normalized_name) DO UPDATE' in upsert
+    assert cleanup.startswith('DELETE FROM artist_events') and 'catalog_version !=' in cleanup
+    session.commit.assert_called_once()
+
+@pytest.mark.asyncio
+@patch('src.clients.global_concert_client.get_artist_aliases_from_db', return_value={'Maroon5': ['Maroon 5']})
+@patch('src.clients.global_concert_client.get_artists_from_db', return_value=['Maroon5', 'Zemfira'])
+async def test_refresh_artist_events_ingests_aliases(mock_names, mock_aliases):
+    catalog = CONCERTS + [{'id': 'e4', 'url': 'u4', 'title': 'Maroon 5 — World Tour'}]
+    concerts = Mock(get_events_by_category_async=AsyncMock(return_value=catalog))
+    artists = Mock(
+        add_aliases=AsyncMock(return_value=1),
+        get_known_artists=AsyncMock(return_value=[]),
+        replace_artist_events=AsyncMock(return_value=2)
+    )
+    await refresh_artist_events(concerts, artists)
+
+    artists.add_aliases.assert_awaited_once_with({'maroon5': ['Maroon 5']})
+    rows = {row['normalized_name']: row['event_ids'] for row in artists.replace_artist_events.call_args[0][0]}
+    assert rows == {'maroon5': ['e4'], 'zemfira': ['e1']}
+
+@pytest.mark.asyncio
+@patch('src.repositories.artist_repository.ArtistRepository._get_session')
+async def test_add_aliases_resets_changed_artists(mock_get_session):
+    session = AsyncMock()
+    fresh = Mock(normalized_name='maroon5', aliases=['Maroon 5'], catalog_version='v1')
+    stale = Mock(normalized_name='pink', aliases=[], catalog_version='v1')
+    result = MagicMock()
+    result.scalars.return_value.all.return_value = [fresh, stale]
+    session.execute = AsyncMock(return_value=result)
+    mock_get_session.return_value = session
+
+    changed = await ArtistRepository().add_aliases({'maroon5': ['Maroon 5'], 'pink': ['P!nk']})
+
+    assert changed == 1
+    assert fresh.catalog_version == 'v1'
+    assert stale.aliases == ['P!nk'] and stale.catalog_version is None
+    session.commit.assert_called_once()
+    assert await ArtistRepository().add_aliases({}) == 0
@@ -0,0 +1,86 @@
+from datetime import datetime, timedelta, timezone
+from unittest.mock import MagicMock, patch
+from src.clients.artist_priority import (
+    normalize_artist_name,
+    priority_score,
+    rank_artists,
+    staleness_hours
+)
+
+NOW = datetime(2025, 3, 1, 12, 0, tzinfo=timezone.utc)
+
+def artist(name, hours_ago=None, hits=0, empty_checks=0):
+    return {
+        'artist_name': name,
+        'last_checked': NOW - timedelta(hours=hours_ago) if hours_ago is not None else None,
+        'playlist_hits': hits,
+        'empty_checks': empty_checks
+    }
+
+def test_normalize_artist_name():
+    assert normalize_artist_name('  Кино   Band ') == 'кино band'
+
+def test_staleness_caps_and_handles_naive_datetimes():
+    assert staleness_hours(None, NOW, 168) == 336
+    assert staleness_hours(NOW - timedelta(hours=1000), NOW, 168) == 168
+    naive = (NOW - timedelta(hours=10)).replace(tzinfo=None)
+    assert staleness_hours(naive, NOW, 168) == 10
+
+def test_never_checked_artists_come_first():
+    ranked = rank_artists([artist('fresh', hours_ago=2), artist('new'), artist('old', hours_ago=100)], now=NOW)
+    assert [a['artist_name'] for a in ranked] == ['new', 'old', 'fresh']
+
+def test_popular_artists_refresh_sooner():
+    popular = priority_score(artist('a', hours_ago=24, hits=50), NOW, 168, 0.5)
+    rare = priority_score(artist('b', hours_ago=24, hits=0), NOW, 168, 0.5)
+    assert popular > rare
+
+def test_repeatedly_empty_artists_are_deprioritized():
+    productive = priority_score(artist('a', hours_ago=48), NOW, 168, 0.5)
+    empty = priority_score(artist('b', hours_ago=48, empty_checks=4), NOW, 168, 0.5)
+    assert productive == 3 * empty
+
+def test_rank_respects_limit():
+    artists = [artist(str(i), hours_ago=i) for i in range(10)]
+    ranked = rank_artists(artists, limit=3, now=NOW)
+    assert [a['artist_name'] for a in ranked] == ['9', '8', '7']
+
+def update_one(filter, update, upsert=False):
+    return {'filter': filter, 'update': update, 'upsert': upsert}
+
+@patch('src.clients.global_concert_client.UpdateOne', side_effect=update_one)
+@patch('src.clients.global_concert_client.MongoClient')
+def test_mark_artists_checked_bulk_updates(mock_mongo, _):
+    from src.clients.global_concert_client import mark_artists_checked
+    collection = MagicMock()
+    mock_mongo.return_value.__getitem__.return_value.__getitem__.return_value = collection
+
+    mark_artists_checked({'A1': 3, 'A2': 0})
+
+    operations = collection.bulk_write.call_args[0][0]
+    assert len(operations) == 2
+    assert operations[0]['update']['$set']['empty_checks'] == 0
+    assert operations[1]['update']['$inc'] == {'empty_checks': 1}
+
+@patch('src.clients.global_concert_client.UpdateOne', side_effect=update_one)
+@patch('src.clients.global_concert_client.MongoClient')
+def test_record_playlist_artists_upserts_hits(mock_mongo, _):
+    from src.clients.global_concert_client import record_playlist_artists
+    collection = MagicMock()
+    mock_mongo.return_value.__getitem__.return_value.__getitem__.return_value = collection
+
+    record_playlist_artists(['Artist One', ' '])
+
+    operations = collection.bulk_write.call_args[0][0]
+    assert len(operations) == 1
+    assert operations[0]['filter'] == {'normalized': 'artist one'}
+    assert operations[0]['upsert'] is True
+
+@patch('src.clients.global_concert_client.MongoClient')
+def test_get_artists_for_refresh_orders_by_priority(mock_mongo):
+    from src.clients.global_concert_client import get_artists_for_refresh
+    collection = MagicMock()
+    collection.find.return_value = [artist('checked', hours_ago=1), artist('never')]
+    mock_mongo.return_value.__getitem__.return_value.__getitem__.return_value = collection
+
+    assert get_artists_for_refresh(limit=1) == ['never']
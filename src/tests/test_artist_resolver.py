@@ -0,0 +1,136 @@
+import pytest
+from unittest.mock import Mock, AsyncMock, MagicMock, patch
+from src.services.concert_service import ConcertMatcherService, CatalogIndex, StreamingConcertMatcher
+from src.services.artist_resolver import ArtistResolver, playlist_artists
+from src.repositories.artist_repository import ArtistRepository
+
+CATALOG = [
+    {'id': 'e1', 'url': 'u1', 'title': 'Zemfira. Большой концерт'},
+    {'id': 'e2', 'url': 'u2', 'title': 'Кино — трибьют'},
+    {'id': 'e3', 'url': 'u3', 'title': 'Джазовый вечер'},
+]
+
+def make_resolver(known=None, materialized=None):
+    repo = Mock()
+    repo.get_artists = AsyncMock(return_value=known or {})
+    repo.get_artist_events = AsyncMock(return_value=materialized or {})
+    repo.upsert_artists = AsyncMock(side_effect=lambda rows: len(rows))
+    streaming = StreamingConcertMatcher(CatalogIndex([dict(c) for c in CATALOG], ConcertMatcherService(Mock(), city='')))
+    return ArtistResolver(repo, streaming, streaming.index.version), repo, streaming
+
+def artist(artist_id, name):
+    a = Mock()
+    a.id = artist_id
+    a.name = name
+    return a
+
+def test_playlist_artists_keeps_every_artist():
+    track = Mock()
+    track.artists = [artist(1, 'A'), artist(2, 'B'), artist(None, 'C')]
+    assert playlist_artists([track, None]) == [('1', 'A'), ('2', 'B'), (None, 'C')]
+
+@pytest.mark.asyncio
+async def test_resolve_matches_transliterations_and_stores():
+    resolver, repo, streaming = make_resolver()
+    found = await resolver.resolve([('1', 'Земфира'), ('2', 'Kino'), (None, 'Nobody')])
+
+    assert {c['url'] for c in found} == {'u1', 'u2'}
+    assert resolver.stats == {'cached': 0, 'materialized': 0, 'matched': 3}
+
+    assert await resolver.flush() == 2
+    rows = {row['id']: row for row in repo.upsert_artists.call_args[0][0]}
+    assert rows['1']['event_ids'] == ['e1']
+    assert rows['1']['variants'] == ['земфира', 'zemfira']
+    assert rows['2']['catalog_version'] == streaming.index.version
+    assert await resolver.flush() == 0
+
+@pytest.mark.asyncio
+async def test_transliterated_variant_needs_whole_name_match():
+    repo = Mock(get_artists=AsyncMock(return_value={}), get_artist_events=AsyncMock(return_value={}))
+    catalog = [
+        {'id': 'e1', 'url': 'u1', 'title': 'Макс Корж'},
+        {'id': 'e2', 'url': 'u2', 'title': 'Фестиваль «Park Live»: Макс, Zemfira'},
+    ]
+    streaming = StreamingConcertMatcher(CatalogIndex(catalog, ConcertMatcherService(Mock(), city='')))
+    found = await ArtistResolver(repo, streaming, 'v1').resolve([(None, 'Maks')])
+
+    assert [c['url'] for c in found] == ['u2']
+
+@pytest.mark.asyncio
+async def test_resolve_uses_precomputed_event_ids():
+    version = CatalogIndex(CATALOG, ConcertMatcherService(Mock(), city='')).version
+    resolver, repo, _ = make_resolver({
+        '7': {'id': '7', 'event_ids': ['e3'], 'aliases': [], 'catalog_version': version}
+    })
+    found = await resolver.resolve([('7', 'Совсем другое имя')])
+
+    assert [c['url'] for c in found] == ['u3']
+    assert resolver.stats['cached'] == 1
+    assert await resolver.flush() == 0
+
+@pytest.mark.asyncio
+async def test_resolve_uses_materialized_artist_events():
+    version = CatalogIndex(CATALOG, ConcertMatcherService(Mock(), city='')).version
+    resolver, repo, _ = make_resolver(materialized={
+        'jazz band': {'normalized_name': 'jazz band', 'event_ids': ['e3'], 'catalog_version': version},
+        'kino': {'normalized_name': 'kino', 'event_ids': ['e3'], 'catalog_version': 'old'},
+    })
+    found = await resolver.resolve([('9', 'Jazz  Band'), (None, 'Kino')])
+
+    assert [c['url'] for c in found] == ['u3', 'u2']
+    assert resolver.stats == {'cached': 0, 'materialized': 1, 'matched': 1}
+    assert sorted(repo.get_artist_events.call_args[0][0]) == ['jazz band', 'kino']
+    await resolver.flush()
+    assert repo.upsert_artists.call_args[0][0][0]['event_ids'] == ['e3']
+
+@pytest.mark.asyncio
+async def test_resolve_stale_row_uses_aliases():
+    resolver, repo, _ = make_resolver({
+        '7': {'id': '7', 'event_ids': ['e3'], 'aliases': ['джазовый'], 'catalog_version': 'old'}
+    })
+    found = await resolver.resolve([('7', 'Jazz Band')])
+
+    assert [c['url'] for c in found] == ['u3']
+    assert resolver.stats['matched'] == 1
+
+@pytest.mark.asyncio
+async def test_resolve_lookup_failure_falls_back():
+    resolver, repo, _ = make_resolver()
+    repo.get_artists.side_effect = Exception('db down')
+    found = await resolver.resolve([('1', 'Zemfira')])
+    assert [c['url'] for c in found] == ['u1']
+
+@pytest.mark.asyncio
+@patch('src.repositories.artist_repository.ArtistRepository._get_session')
+async def test_artist_repository_upsert(mock_get_session):
+    from sqlalchemy.dialects import postgresql
+    session = AsyncMock()
+    mock_get_session.return_value = session
+
+    r = ArtistRepository()
+    res = await r.upsert_artists([
+        {'id': '1', 'name': 'Kino', 'normalized_name': 'kino', 'variants': ['kino', 'кино'], 'event_ids': ['e2']},
+        {'name': 'No id', 'normalized_name': 'no id'},
+    ])
+
+    assert res == 1
+    session.commit.assert_called_once()
+    sql = str(session.execute.call_args[0][0].compile(dialect=postgresql.dialect()))
+    assert 'ON CONFLICT (id) DO UPDATE' in sql
+    assert 'aliases = excluded.aliases' not in sql
+
+@pytest.mark.asyncio
+@patch('src.repositories.artist_repository.ArtistRepository._get_session')
+async def test_artist_repository_get_artists(mock_get_session):
+    session = AsyncMock()
+    result = MagicMock()
+    row = Mock()
+    row.id = '1'
+    row.to_dict.return_value = {'id': '1', 'event_ids': ['e1']}
+    result.scalars.return_value.all.return_value = [row]
+    session.execute = AsyncMock(return_value=result)
+    mock_get_session.return_value = session
+
+    r = ArtistRepository()
+    assert await r.get_artists(['1', '1']) == {'1': {'id': '1', 'event_ids': ['e1']}}
+    assert await r.get_artists([]) == {}
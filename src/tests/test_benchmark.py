@@ -0,0 +1,84 @@
+import json
+import re
+from src.bot.utils import extract_date_sort_key
+from src.utils.concert_utils import get_concert_date
+from src.scripts.synthetic_catalog import generate_artists, generate_catalog, generate_playlist
+from src.scripts import benchmark
+
+def test_generator_is_deterministic():
+    artists = generate_artists(300, seed=7)
+    assert artists == generate_artists(300, seed=7)
+    assert artists != generate_artists(300, seed=8)
+    assert len({a.lower() for a in artists}) == 300
+    assert generate_catalog(200, artists, seed=7) == generate_catalog(200, artists, seed=7)
+    assert generate_playlist(artists, 100, seed=7) == generate_playlist(artists, 100, seed=7)
+
+def test_catalog_looks_like_afisha_and_ticketmaster_data():
+    artists = generate_artists(500)
+    catalog = generate_catalog(1000, artists)
+
+    titles = ' '.join(c['title'] for c in catalog)
+    assert re.search('[а-яё]', titles) and re.search('[a-z]', titles)
+    assert sum('•' in c['description'] for c in catalog) > 500
+    assert {c['source'] for c in catalog} == {'afisha', 'ticketmaster'}
+    assert any('afisha.yandex.ru/moscow/' in c['url'] for c in catalog)
+    assert any('date' in c for c in catalog) and any('dates' in c for c in catalog)
+
+    keys = [extract_date_sort_key(get_concert_date(c) or '') for c in catalog]
+    assert sum(key != (9999, 12, 31) for key in keys) > 700
+
+def test_playlist_sizes_and_overlap_with_catalog():
+    artists = generate_artists(1500)
+    catalog_text = ' '.join(c['title'] for c in generate_catalog(2000, artists)).lower()
+
+    playlist = generate_playlist(artists, 1000)
+
+    assert len(playlist) == len(set(playlist)) == 1000
+    assert 100 < sum(artist.lower() in catalog_text for artist in playlist) < 1000
+    assert len(generate_playlist(artists, 5000)) == 1500
+
+def test_run_benchmarks_covers_all_cases():
+    result = benchmark.run_benchmarks([10, 20], catalog_size=100, repeats=1)
+
+    assert set(result['results']) == {
+        'matcher.find_concerts_for_artists[10]', 'concert_service.find_concerts_by_artists[10]',
+        'matcher.find_concerts_for_artists[20]', 'concert_service.find_concerts_by_artists[20]',
+        'get_available_cities', 'filter_by_city', 'sort_by_date', 'format_concert_message'
+    }
+    assert result['calibration'] > 0
+    for timing in result['results'].values():
+        assert timing['best'] <= timing['median']
+        assert timing['normalized'] == timing['best'] / result['calibration']
+
+def make_result(**normalized):
+    return {'seed': 42, 'catalog_size': 100, 'results': {name: {'normalized': value} for name, value in normalized.items()}}
+
+def test_compare_flags_regressions_beyond_tolerance():
+    baseline = make_result(a=1.0, b=1.0, c=1.0)
+    current = make_result(a=1.4, b=1.6, c=0.5, d=1.0)
+
+    rows = {row['name']: row for row in benchmark.compare(current, baseline, tolerance=0.5)}
+
+    assert not rows['a']['regression']
+    assert rows['b']['regression'] and abs(rows['b']['ratio'] - 1.6) < 1e-9
+    assert not rows['c']['regression']
+    assert rows['d']['ratio'] is None and not rows['d']['regression']
+
+def test_main_fails_on_regression(tmp_path, monkeypatch):
+    path = tmp_path / 'baseline.json'
+    current = dict(make_result(a=2.0), calibration=1.0, version=benchmark.BASELINE_VERSION)
+    for name in current['results']:
+        current['results'][name].update(best=2.0, median=2.0)
+    monkeypatch.setattr(benchmark, 'run_benchmarks', lambda *args, **kwargs: current)
+
+    assert benchmark.main(['--baseline', str(path)]) == 0
+    assert benchmark.main(['--baseline', str(path), '--update-baseline']) == 0
+    assert json.loads(path.read_text())['results']['a']['normalized'] == 2.0
+
+    assert benchmark.main(['--baseline', str(path)]) == 0
+    current['results']['a']['normalized'] = 4.0
+    assert benchmark.main(['--baseline', str(path)]) == 1
+    assert benchmark.main(['--baseline', str(path), '--tolerance', '1.5']) == 0
+
+    current['seed'] = 1
+    assert benchmark.main(['--baseline', str(path)]) == 2
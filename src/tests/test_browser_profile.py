@@ -0,0 +1,83 @@
+import pytest
+from unittest.mock import Mock
+from src.clients.browser_profile import (
+    build_blocked_url_patterns,
+    light_profile_arguments,
+    light_profile_prefs,
+    apply_resource_blocking
+)
+
+def test_build_patterns():
+    res = build_blocked_url_patterns(['image', 'font'])
+    assert '*.png' in res
+    assert '*.woff2' in res
+    assert '*.mp4' not in res
+
+def test_build_patterns_allowlist_type():
+    res = build_blocked_url_patterns(['image', 'font'], allowlist=['font'])
+    assert '*.png' in res
+    assert '*.woff2' not in res
+
+def test_build_patterns_allowlist_pattern():
+    res = build_blocked_url_patterns(['analytics'], allowlist=['mc.yandex.ru'])
+    assert '*mc.yandex.ru*' not in res
+    assert '*google-analytics.com*' in res
+
+def test_build_patterns_allowlist_matches_host():
+    res = build_blocked_url_patterns(['analytics'], allowlist=['yandex.ru'])
+    assert '*mc.yandex.ru*' not in res
+    assert '*an.yandex.ru*' not in res
+    assert '*mc.yandex.com*' in res
+
+    res = build_blocked_url_patterns(['analytics', 'image'], allowlist=['g', 'ex.ru', 'yandex'])
+    assert '*mc.yandex.ru*' in res
+    assert '*.jpg' in res
+
+def test_build_patterns_allowlist_extension():
+    res = build_blocked_url_patterns(['image'], allowlist=['svg'])
+    assert '*.svg' not in res
+    assert '*.png' in res
+
+def test_build_patterns_query_strings():
+    res = build_blocked_url_patterns(['image', 'analytics'])
+    assert '*.png?*' in res
+    assert '*.webp?*' in res
+    assert '*mc.yandex.ru*?*' not in res
+
+def test_build_patterns_unknown_type():
+    res = build_blocked_url_patterns(['unknown'])
+    assert res == []
+
+def test_light_profile_arguments():
+    res = light_profile_arguments(['image', 'font'])
+    assert '--blink-settings=imagesEnabled=false' in res
+    assert '--disable-remote-fonts' in res
+    assert '--mute-audio' not in res
+
+def test_light_profile_arguments_allowlisted_images():
+    res = light_profile_arguments(['image'], allowlist=['image'])
+    assert '--blink-settings=imagesEnabled=false' not in res
+
+def test_light_profile_prefs():
+    res = light_profile_prefs(['image'])
+    assert res['profile.managed_default_content_settings.images'] == 2
+    assert light_profile_prefs([]) == {}
+
+def test_apply_resource_blocking():
+    driver = Mock()
+    res = apply_resource_blocking(driver, ['font'])
+    assert '*.woff' in res
+    driver.execute_cdp_cmd.assert_any_call('Network.enable', {})
+    driver.execute_cdp_cmd.assert_any_call('Network.setBlockedURLs', {'urls': res})
+
+def test_apply_resource_blocking_cdp_error():
+    driver = Mock()
+    driver.execute_cdp_cmd.side_effect = Exception('no cdp')
+    res = apply_resource_blocking(driver, ['font'])
+    assert res == []
+
+def test_apply_resource_blocking_nothing_to_block():
+    driver = Mock()
+    res = apply_resource_blocking(driver, [])
+    assert res == []
+    driver.execute_cdp_cmd.assert_not_called()
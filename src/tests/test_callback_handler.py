@@ -35,6 +35,8 @@ class TestHandleCitySelection:
         callback.from_user.id = 12345
         callback.data = 'city_moscow'
         callback.message = Mock(spec=Message)
+        callback.message.chat = Mock(id=12345)
+        callback.message.message_id = 1
         callback.message.edit_text = AsyncMock()
         callback.answer = AsyncMock()
         return callback
@@ -102,6 +104,8 @@ class TestHandleSort:
         callback.from_user.id = 12345
         callback.data = 'sort_artist'
         callback.message = Mock(spec=Message)
+        callback.message.chat = Mock(id=12345)
+        callback.message.message_id = 1
         callback.message.edit_text = AsyncMock()
         callback.answer = AsyncMock()
         return callback
@@ -153,6 +157,8 @@ class TestHandlePagination:
         callback.from_user.id = 12345
         callback.data = 'page_1'
         callback.message = Mock(spec=Message)
+        callback.message.chat = Mock(id=12345)
+        callback.message.message_id = 1
         callback.message.edit_text = AsyncMock()
         callback.answer = AsyncMock()
         return callback
@@ -230,6 +236,8 @@ class TestHandleRefresh:
         callback.from_user.id = 12345
         callback.answer = AsyncMock()
         callback.message = Mock(spec=Message)
+        callback.message.chat = Mock(id=12345)
+        callback.message.message_id = 1
         callback.message.edit_text = AsyncMock()
         return callback
     
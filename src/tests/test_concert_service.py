@@ -184,3 +184,36 @@ def test_find_artist_single_word_four_chars_not_found(service):
 def test_find_artist_single_word_four_chars_found(service):
     res = service.find_artist_in_text('ABCD', 'Concert ABCD')
     assert res is True
+
+CATALOG = [
+    {'url': 'u1', 'title': 'Кино — трибьют', 'full_title': '', 'description': ''},
+    {'url': 'u2', 'title': 'Arctic Monkeys', 'full_title': 'Arctic Monkeys Live', 'description': ''},
+    {'url': 'u3', 'title': 'Вечер', 'full_title': '', 'description': 'Большой сольный концерт Zemfira в Москве'},
+    {'url': 'u4', 'title': 'Monkeys Business Show', 'full_title': '', 'description': ''},
+    {'url': 'u5', 'title': 'Океан Ельзи', 'full_title': '', 'description': ''},
+    {'url': None, 'title': 'Arctic Monkeys', 'full_title': '', 'description': ''},
+]
+
+def test_catalog_index_matches_full_scan(service):
+    from src.services.concert_service import CatalogIndex
+    index = CatalogIndex(CATALOG, service)
+    for artist in ['Кино', 'Arctic Monkeys', 'Zemfira', 'Океан Ельзи', 'Monkeys', 'Unknown Band', 'AB']:
+        expected = [c for c in CATALOG if service.matches_concert(artist, c)]
+        assert index.match(artist) == expected
+
+def test_catalog_index_prunes_candidates(service):
+    from src.services.concert_service import CatalogIndex
+    index = CatalogIndex(CATALOG, service)
+    assert index.candidates('Zemfira') == [CATALOG[2]]
+    assert index.candidates('Unknown Band') == []
+
+def test_streaming_matcher_accumulates(service):
+    from src.services.concert_service import CatalogIndex, StreamingConcertMatcher
+    streaming = StreamingConcertMatcher(CatalogIndex([dict(c) for c in CATALOG], service))
+    first = streaming.add_artists(['Arctic Monkeys'])
+    assert [c['url'] for c in first] == ['u2']
+    assert streaming.add_artists(['arctic monkeys']) == []
+    second = streaming.add_artists(['Monkeys', 'Zemfira'])
+    assert [c['url'] for c in second] == ['u4', 'u3']
+    results = {c['url']: c['matched_artist'] for c in streaming.results()}
+    assert results == {'u2': 'Arctic Monkeys, Monkeys', 'u4': 'Monkeys', 'u3': 'Zemfira'}
@@ -0,0 +1,196 @@
+import json
+import pytest
+from datetime import datetime, timezone, timedelta
+from unittest.mock import AsyncMock, Mock, patch
+from selenium.common.exceptions import NoSuchElementException, WebDriverException
+from src.clients.crawl_checkpoint import CrawlCheckpoint
+from src.config.settings import config
+
+def test_new_checkpoint_is_empty(tmp_path):
+    cp = CrawlCheckpoint('moscow', directory=tmp_path)
+    assert cp.resumed is False
+    assert cp.is_done('page:x') is False
+    assert not cp.path.exists()
+
+def test_mark_done_and_resume(tmp_path):
+    cp = CrawlCheckpoint('moscow', directory=tmp_path)
+    cp.mark_done(CrawlCheckpoint.page_key('https://a/concert'), 12)
+    cp.mark_done(CrawlCheckpoint.selection_key('https://a/sel'), 5)
+
+    resumed = CrawlCheckpoint('moscow', directory=tmp_path)
+    assert resumed.resumed is True
+    assert resumed.is_done('page:https://a/concert')
+    assert resumed.is_done('selection:https://a/sel')
+    assert resumed.events_count == 17
+
+def test_cities_are_separate(tmp_path):
+    cp = CrawlCheckpoint('moscow', directory=tmp_path)
+    cp.mark_done('category:concert')
+    other = CrawlCheckpoint('kazan', directory=tmp_path)
+    assert other.resumed is False
+
+def test_clear(tmp_path):
+    cp = CrawlCheckpoint('moscow', directory=tmp_path)
+    cp.mark_done('category:concert')
+    cp.clear()
+    assert not cp.path.exists()
+    assert CrawlCheckpoint('moscow', directory=tmp_path).resumed is False
+
+def test_truncated_line_ignored(tmp_path):
+    cp = CrawlCheckpoint('moscow', directory=tmp_path)
+    cp.mark_done('page:1', 3)
+    with open(cp.path, 'a', encoding='utf-8') as f:
+        f.write('{"key": "page:2", "ev')
+
+    resumed = CrawlCheckpoint('moscow', directory=tmp_path)
+    assert resumed.is_done('page:1')
+    assert not resumed.is_done('page:2')
+
+def test_append_after_truncated_line(tmp_path):
+    cp = CrawlCheckpoint('moscow', directory=tmp_path)
+    cp.mark_done('page:1', 3)
+    with open(cp.path, 'a', encoding='utf-8') as f:
+        f.write('{"key": "page:2", "ev')
+
+    resumed = CrawlCheckpoint('moscow', directory=tmp_path)
+    resumed.mark_done('page:3', 4)
+
+    again = CrawlCheckpoint('moscow', directory=tmp_path)
+    assert again.is_done('page:1')
+    assert again.is_done('page:3')
+    assert again.events_count == 7
+
+def test_stale_checkpoint_discarded(tmp_path):
+    started = datetime.now(timezone.utc) - timedelta(hours=30)
+    path = tmp_path / 'moscow.jsonl'
+    path.write_text(
+        json.dumps({'started_at': started.isoformat(), 'city': 'moscow'}) + '\n'
+        + json.dumps({'key': 'page:1', 'events': 3}) + '\n',
+        encoding='utf-8'
+    )
+
+    cp = CrawlCheckpoint('moscow', directory=tmp_path, max_age_hours=12)
+    assert cp.resumed is False
+    assert not path.exists()
+
+@pytest.mark.asyncio
+async def test_parse_city_resumes_from_checkpoint(tmp_path, monkeypatch):
+    from src.scripts.parse_concerts import parse_city
+
+    monkeypatch.setattr(config, 'CHECKPOINT_DIR', str(tmp_path))
+    monkeypatch.setattr(config, 'CRAWL_RESTART_ATTEMPTS', 0)
+    monkeypatch.setattr(config, 'CITY', config.CITY)
+    categories = ['rock', 'jazz', 'pop']
+    seen = []
+
+    def parse_all_events(checkpoint, on_events):
+        seen.append([name for name in categories if checkpoint.is_done(CrawlCheckpoint.category_key(name))])
+        name = next(name for name in categories if not checkpoint.is_done(CrawlCheckpoint.category_key(name)))
+        on_events([{'id': name}])
+        checkpoint.mark_done(CrawlCheckpoint.category_key(name), 1)
+        with open(checkpoint.path, 'a', encoding='utf-8') as f:
+            f.write('{"key": "category:')
+        return [{'id': name}]
+
+    parser = Mock()
+    parser.parse_all_events = Mock(side_effect=parse_all_events)
+    db = Mock()
+    db.save_events_batch = AsyncMock(return_value=1)
+
+    parser.is_alive = Mock(side_effect=[True, False])
+    assert await parse_city('moscow', db, parser) == (1, 1)
+    parser.is_alive = Mock(side_effect=[True, False])
+    assert await parse_city('moscow', db, parser) == (1, 1)
+    parser.is_alive = Mock(return_value=True)
+    assert await parse_city('moscow', db, parser) == (1, 1)
+
+    assert seen == [[], ['rock'], ['rock', 'jazz']]
+    assert not (tmp_path / 'moscow.jsonl').exists()
+
+class DyingDriver:
+    def __init__(self, cards: int, die_after: int = None):
+        self.cards = cards
+        self.die_after = die_after
+        self.extracted = 0
+        self.alive = True
+        self.page_source = ''
+
+    def _check(self):
+        if not self.alive:
+            raise WebDriverException('invalid session id')
+
+    @property
+    def current_url(self):
+        self._check()
+        return 'https://afisha.yandex.ru/moscow/concert'
+
+    def get(self, url):
+        self._check()
+
+    def execute_script(self, script, *args):
+        self._check()
+
+    def find_element(self, by, value):
+        self._check()
+        raise NoSuchElementException(value)
+
+    def find_elements(self, by, value):
+        self._check()
+        return [Mock(index=i) for i in range(self.cards)]
+
+    def extract(self, element, category):
+        self._check()
+        if self.die_after is not None and self.extracted >= self.die_after:
+            self.alive = False
+            self._check()
+        self.extracted += 1
+        return {'url': f'https://afisha.yandex.ru/event/{element.index}', 'title': f'Event {element.index}'}
+
+def make_parser(driver, checkpoint, flushed):
+    from src.clients.local_concert_client import AfishaSeleniumParser
+
+    parser = AfishaSeleniumParser(headless=True)
+    parser.driver = driver
+    parser.capture_enabled = False
+    parser.scheduler.sleep = lambda seconds: None
+    parser._extract_event_data = driver.extract
+    parser.checkpoint = checkpoint
+    parser.on_events = flushed.extend
+    return parser
+
+CATEGORY = {'name': 'concert', 'title': 'Концерты', 'url': 'https://afisha.yandex.ru/moscow/concert'}
+
+def test_parse_category_keeps_page_when_driver_dies(tmp_path, monkeypatch):
+    monkeypatch.setattr(config, 'PARSE_SELECTIONS', False)
+    checkpoint = CrawlCheckpoint('moscow', directory=tmp_path)
+    flushed = []
+    driver = DyingDriver(cards=5, die_after=2)
+    parser = make_parser(driver, checkpoint, flushed)
+
+    parser.parse_category(CATEGORY)
+
+    assert len(flushed) == 2
+    assert not checkpoint.is_done(CrawlCheckpoint.page_key(CATEGORY['url']))
+    assert parser.category_complete is False
+
+    resumed = CrawlCheckpoint('moscow', directory=tmp_path)
+    driver = DyingDriver(cards=5)
+    parser = make_parser(driver, resumed, flushed)
+
+    assert len(parser.parse_category(CATEGORY)) == 5
+    assert resumed.is_done(CrawlCheckpoint.page_key(CATEGORY['url']))
+    assert resumed.events_count == 5
+    assert parser.category_complete is True
+
+def test_parse_category_keeps_captcha_page(tmp_path, monkeypatch):
+    monkeypatch.setattr(config, 'PARSE_SELECTIONS', False)
+    checkpoint = CrawlCheckpoint('moscow', directory=tmp_path)
+    driver = DyingDriver(cards=5)
+    parser = make_parser(driver, checkpoint, [])
+    checks = iter([False, True, True])
+    parser.check_for_captcha = lambda: next(checks, True)
+    parser.driver.refresh = Mock()
+
+    assert parser.parse_category(CATEGORY) == []
+    assert not checkpoint.is_done(CrawlCheckpoint.page_key(CATEGORY['url']))
+    assert parser.category_complete is False
@@ -37,6 +37,8 @@ async def test_init_db(mock_engine):
     
     await init_db()
     conn.run_sync.assert_called_once()
+    statements = [str(call.args[0]) for call in conn.execute.await_args_list]
+    assert any('ADD COLUMN IF NOT EXISTS price' in statement for statement in statements)
 
 @pytest.mark.asyncio
 @patch('src.db.database.engine')
@@ -0,0 +1,154 @@
+import pytest
+from unittest.mock import Mock, patch
+from src.clients.detail_fetcher import RateLimiter, DetailCache, EventDetailFetcher
+from src.clients.politeness import PolitenessScheduler
+
+class FakeSwitchTo:
+    def __init__(self, driver):
+        self.driver = driver
+
+    def new_window(self, kind):
+        self.driver._counter += 1
+        handle = f'tab{self.driver._counter}'
+        self.driver.handles.append(handle)
+        self.driver.current_window_handle = handle
+        self.driver.pages[handle] = 'about:blank'
+
+    def window(self, handle):
+        self.driver.current_window_handle = handle
+
+class FakeDriver:
+    def __init__(self):
+        self._counter = 0
+        self.handles = ['main']
+        self.current_window_handle = 'main'
+        self.pages = {'main': 'https://afisha.yandex.ru/moscow/concert'}
+        self.switch_to = FakeSwitchTo(self)
+        self.opened = []
+
+    @property
+    def current_url(self):
+        return self.pages[self.current_window_handle]
+
+    def execute_script(self, script, *args):
+        if args:
+            self.pages[self.current_window_handle] = args[0]
+            self.opened.append(args[0])
+            return None
+        return 'complete'
+
+    def close(self):
+        self.handles.remove(self.current_window_handle)
+
+def make_fetcher(driver, cache=None, **kwargs):
+    extract = lambda: {'full_title': driver.current_url}
+    return EventDetailFetcher(
+        driver,
+        extract=extract,
+        cache=cache or DetailCache(3600),
+        rate_limiter=RateLimiter(0),
+        **kwargs
+    )
+
+def test_rate_limiter_spacing():
+    limiter = RateLimiter(2)
+    with patch('src.clients.detail_fetcher.time.sleep') as sleep, \
+            patch('src.clients.detail_fetcher.time.monotonic', return_value=100.0):
+        limiter.wait()
+        limiter.wait()
+        sleep.assert_called_once()
+        assert sleep.call_args[0][0] == pytest.approx(0.5)
+
+def test_rate_limiter_multiplier_stretches_interval():
+    limiter = RateLimiter(2)
+    with patch('src.clients.detail_fetcher.time.sleep') as sleep, \
+            patch('src.clients.detail_fetcher.time.monotonic', return_value=100.0):
+        limiter.wait(4)
+        assert limiter.wait() == pytest.approx(2.0)
+        assert sleep.call_args[0][0] == pytest.approx(2.0)
+
+def test_rate_limiter_disabled():
+    limiter = RateLimiter(0)
+    with patch('src.clients.detail_fetcher.time.sleep') as sleep:
+        limiter.wait()
+        limiter.wait()
+        sleep.assert_not_called()
+
+def test_detail_cache_ttl():
+    cache = DetailCache(10)
+    with patch('src.clients.detail_fetcher.time.time', return_value=1000):
+        cache.set('u', {'a': 1})
+    with patch('src.clients.detail_fetcher.time.time', return_value=1005):
+        assert cache.get('u') == {'a': 1}
+    with patch('src.clients.detail_fetcher.time.time', return_value=1011):
+        assert cache.get('u') is None
+    assert len(cache) == 0
+
+def test_fetch_in_tabs():
+    driver = FakeDriver()
+    fetcher = make_fetcher(driver, tabs=2)
+    urls = ['https://a/1', 'https://a/2', 'https://a/3']
+    res = fetcher.fetch(urls)
+    assert set(res) == set(urls)
+    assert res['https://a/2'] == {'full_title': 'https://a/2'}
+    assert driver.handles == ['main']
+    assert driver.current_window_handle == 'main'
+    assert fetcher.fetched == 3
+
+def test_fetch_uses_cache():
+    driver = FakeDriver()
+    cache = DetailCache(3600)
+    cache.set('https://a/1', {'full_title': 'cached'})
+    fetcher = make_fetcher(driver, cache=cache)
+    res = fetcher.fetch(['https://a/1', 'https://a/2', 'https://a/2'])
+    assert res['https://a/1'] == {'full_title': 'cached'}
+    assert driver.opened == ['https://a/2']
+    assert fetcher.cache_hits == 1
+
+def test_fetch_prepares_each_tab():
+    driver = FakeDriver()
+    prepare = Mock()
+    fetcher = make_fetcher(driver, prepare_tab=prepare)
+    fetcher.fetch(['https://a/1', 'https://a/2'])
+    assert prepare.call_count == 2
+
+def test_fetch_skips_captcha_pages():
+    driver = FakeDriver()
+    fetcher = make_fetcher(driver, is_blocked=lambda: True)
+    res = fetcher.fetch(['https://a/1'])
+    assert res == {}
+    assert fetcher.failed == 1
+    assert len(fetcher.cache) == 0
+    assert driver.handles == ['main']
+
+def test_fetch_reports_to_scheduler():
+    driver = FakeDriver()
+    scheduler = PolitenessScheduler(sleep=Mock())
+    fetcher = make_fetcher(driver, scheduler=scheduler)
+    fetcher.fetch(['https://afisha.yandex.ru/e/1', 'https://afisha.yandex.ru/e/2'])
+
+    stats = scheduler.domains['afisha.yandex.ru']
+    assert stats.requests == 2
+    assert stats.waits == 2
+    assert stats.errors == 0
+    assert stats.multiplier < 1
+
+def test_fetch_errors_back_off_host():
+    driver = FakeDriver()
+    scheduler = PolitenessScheduler(sleep=Mock())
+
+    def execute_script(script, *args):
+        if args:
+            driver.pages[driver.current_window_handle] = args[0]
+            return None
+        raise RuntimeError('tab crashed')
+
+    driver.execute_script = execute_script
+    fetcher = make_fetcher(driver, scheduler=scheduler)
+    res = fetcher.fetch(['https://afisha.yandex.ru/e/1'])
+
+    assert res == {}
+    assert fetcher.failed == 1
+    assert scheduler.domains['afisha.yandex.ru'].errors == 1
+    assert scheduler.multiplier('afisha.yandex.ru') > 1
+    assert scheduler.multiplier('other.host') == 1
@@ -0,0 +1,89 @@
+import asyncio
+import pytest
+import pytest_asyncio
+from aiohttp.test_utils import TestServer
+from src.clients.global_concert_client import get_artist_events
+from src.clients.ticketmaster_harvester import TicketmasterHarvester
+from src.scripts.fake_ticketmaster_server import EVENTS_PATH, OPTIONS_KEY, STATS_KEY, FakeServerOptions, create_app, synthetic_events
+from src.scripts.ticketmaster_load_test import NullRepository, percentile, run_harvester, run_sync, synthetic_artists
+
+async def start(options):
+    server = TestServer(create_app(options))
+    await server.start_server()
+    return server
+
+@pytest_asyncio.fixture
+async def server():
+    server = await start(FakeServerOptions(max_events=30))
+    yield server
+    await server.close()
+
+def test_synthetic_events_are_deterministic():
+    options = FakeServerOptions(seed=1)
+    assert synthetic_events('Artist', options) == synthetic_events('Artist', options)
+    assert len(synthetic_events('Artist', options)) == len(synthetic_events('artist', options))
+    assert len(synthetic_events('Artist', options)) <= options.max_events
+
+def test_percentile():
+    values = [i / 100 for i in range(1, 101)]
+    assert percentile(values, 50) == 0.5
+    assert percentile(values, 95) == 0.95
+    assert percentile(values, 99) == 0.99
+    assert percentile([], 99) == 0.0
+
+@pytest.mark.asyncio
+async def test_sync_client_pages_through_fake_server(server):
+    base_url = str(server.make_url(EVENTS_PATH))
+    expected = synthetic_events('Paged Artist', server.app[OPTIONS_KEY])
+
+    events = await asyncio.to_thread(
+        get_artist_events, 'Paged Artist', api_token='test', page_size=5, max_pages=100, base_url=base_url
+    )
+
+    assert len(events) == len(expected)
+    assert server.app[STATS_KEY]['requests'] == max(1, (len(expected) + 4) // 5)
+
+@pytest.mark.asyncio
+async def test_harvester_survives_injected_429_and_failures():
+    server = await start(FakeServerOptions(rate_limit_ratio=0.2, failure_ratio=0.1, retry_after=0.05, max_events=10))
+    try:
+        harvester = TicketmasterHarvester(
+            'test', rate_per_second=500, concurrency=8, retries=5,
+            base_url=str(server.make_url(EVENTS_PATH))
+        )
+        repository = NullRepository()
+        artists = synthetic_artists(40)
+
+        stats = await harvester.run(artists, repository)
+
+        server_stats = server.app[STATS_KEY]
+        assert stats['rate_limited'] == server_stats['rate_limited'] > 0
+        assert stats['failed'] > 0
+        assert len(harvester.checked) + stats['failed'] == len(artists)
+        assert repository.events == stats['events']
+    finally:
+        await server.close()
+
+@pytest.mark.asyncio
+async def test_load_test_reports_latency(server):
+    base_url = str(server.make_url(EVENTS_PATH))
+    artists = synthetic_artists(10)
+
+    harvested = await run_harvester(base_url, artists, rate=500, concurrency=4, max_pages=1)
+    synced = await asyncio.to_thread(run_sync, base_url, artists, 2, 1)
+
+    assert harvested['requests'] == len(harvested['latencies']) == 10
+    assert synced['events'] == harvested['events']
+    assert percentile(harvested['latencies'], 99) >= percentile(harvested['latencies'], 50)
+
+@pytest.mark.asyncio
+async def test_sync_load_test_counts_pages(server):
+    base_url = str(server.make_url(EVENTS_PATH))
+    artists = synthetic_artists(10)
+
+    synced = await asyncio.to_thread(run_sync, base_url, artists, 2, 5)
+
+    assert synced['requests'] == server.app[STATS_KEY]['requests'] > len(artists)
+    assert len(synced['latencies']) == synced['requests']
+    assert synced['rate_limited'] == 0
+    assert max(synced['latencies']) < synced['elapsed']
@@ -85,6 +85,17 @@ def test_rate_limit(mock_get):
             res = get_artist_events('Artist', api_token='test', retries=3)
             assert res == []
 
+@patch('src.clients.global_concert_client.requests.get')
+def test_rate_limit_exhausted_raises(mock_get):
+    resp = Mock()
+    resp.status_code = 429
+    mock_get.return_value = resp
+    with patch.dict('os.environ', {'TICKETMASTER_API_TOKEN': 'test'}):
+        with patch('src.clients.global_concert_client.time.sleep'):
+            with pytest.raises(TicketmasterError):
+                get_artist_events('Artist', api_token='test', retries=2)
+    assert mock_get.call_count == 2
+
 @patch('src.clients.global_concert_client.requests.get')
 def test_error(mock_get):
     resp = Mock()
@@ -1,6 +1,6 @@
 
 import pytest
-from unittest.mock import Mock, patch, MagicMock
+from unittest.mock import Mock, patch, MagicMock, AsyncMock
 import sys
 from pathlib import Path
 
@@ -198,3 +198,140 @@ class TestConvertTicketmasterToAfishaFormat:
         assert result['url'] == '-'
         assert result['date'] == '-'
 
+
+class TestProcessArtists:
+
+    @pytest.mark.asyncio
+    @patch('src.clients.global_concert_client.mark_artists_checked')
+    @patch('src.clients.global_concert_client.asyncio.sleep', new_callable=AsyncMock)
+    @patch('src.clients.global_concert_client.get_artist_events')
+    @patch('src.clients.global_concert_client.ConcertRepository')
+    async def test_batches_writes_and_reports_real_counts(self, mock_repo, mock_events, _, mock_mark):
+        from src.clients.global_concert_client import process_artists
+        repo = mock_repo.return_value
+        repo.upsert_events_batch = AsyncMock(side_effect=[(2, 0), (0, 1)])
+        repo.close = AsyncMock()
+        mock_events.side_effect = lambda artist, max_pages: [{'event_name': artist, 'url': f'http://{artist}'}] if artist != 'B' else []
+
+        with patch('src.clients.global_concert_client.API_TOKEN', 'token'):
+            stats = await process_artists(['A', 'B', 'C', 'D'], batch_size=3, max_pages=2)
+
+        assert repo.upsert_events_batch.call_count == 2
+        first_batch = repo.upsert_events_batch.call_args_list[0][0][0]
+        assert [e['artist_name'] for e in first_batch] == ['A', 'C']
+        assert stats['events'] == 3
+        assert stats['inserted'] == 2
+        assert stats['updated'] == 1
+        mock_mark.assert_called_once_with({'A': 1, 'B': 0, 'C': 1, 'D': 1})
+        assert {call.kwargs['max_pages'] for call in mock_events.call_args_list} == {2}
+        repo.close.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    @patch('src.clients.global_concert_client.ConcertRepository')
+    async def test_no_token(self, mock_repo):
+        from src.clients.global_concert_client import process_artists
+        with patch('src.clients.global_concert_client.API_TOKEN', None):
+            stats = await process_artists(['A'])
+        assert stats['inserted'] == 0
+        mock_repo.assert_not_called()
+
+@pytest.mark.parametrize('count, runs_per_day, expected', [
+    (1000, 4, (1000, 1)),
+    (200, 4, (200, 5)),
+    (500, 4, (500, 2)),
+    (2000, 4, (1250, 1)),
+    (20, 1, (20, 5)),
+])
+def test_plan_run_budget_spreads_daily_quota(count, runs_per_day, expected):
+    from src.clients.global_concert_client import plan_run_budget
+    artists = [f'artist-{i}' for i in range(count)]
+    with patch('src.clients.global_concert_client.config') as mock_config:
+        mock_config.TICKETMASTER_DAILY_QUOTA = 5000
+        mock_config.TICKETMASTER_MAX_PAGES = 5
+        planned, max_pages = plan_run_budget(artists, runs_per_day)
+    assert (len(planned), max_pages) == expected
+    assert planned == artists[:len(planned)]
+
+def page_response(names, page, total_pages):
+    response = Mock()
+    response.status_code = 200
+    response.json.return_value = {
+        '_embedded': {'events': [
+            {'name': name, '_links': {'self': {'href': f'https://tm.example/{name}'}}} for name in names
+        ]},
+        'page': {'size': 2, 'number': page, 'totalPages': total_pages}
+    }
+    return response
+
+class TestPagination:
+
+    @patch('src.clients.global_concert_client.requests.get')
+    def test_iterates_all_pages(self, mock_get):
+        mock_get.side_effect = [page_response(['a', 'b'], 0, 3), page_response(['c', 'd'], 1, 3), page_response(['e'], 2, 3)]
+
+        result = get_artist_events('Artist', api_token='token', page_size=2, max_pages=10)
+
+        assert [e['event_name'] for e in result] == ['a', 'b', 'c', 'd', 'e']
+        assert [call.kwargs['params'].get('page') for call in mock_get.call_args_list] == [None, 1, 2]
+
+    @patch('src.clients.global_concert_client.requests.get')
+    def test_respects_page_cap(self, mock_get):
+        mock_get.side_effect = [page_response(['a', 'b'], 0, 5), page_response(['c', 'd'], 1, 5)]
+
+        result = get_artist_events('Artist', api_token='token', page_size=2, max_pages=2)
+
+        assert len(result) == 4
+        assert mock_get.call_count == 2
+
+    @patch('src.clients.global_concert_client.requests.get')
+    def test_uses_trimming_parser(self, mock_get):
+        mock_get.return_value = page_response(['a'], 0, 1)
+        get_artist_events('Artist', api_token='token')
+        assert 'object_pairs_hook' in mock_get.return_value.json.call_args.kwargs
+
+class TestSearchParams:
+
+    def test_geo_and_date_filters(self):
+        from datetime import datetime, timezone
+        from src.clients.global_concert_client import build_search_params
+        params = build_search_params(
+            'token', 'Artist', 50,
+            country_code='DE', latlong='52.52,13.40', radius=100,
+            start_date=datetime(2025, 1, 1, tzinfo=timezone.utc), end_date='2025-12-31T23:59:59Z'
+        )
+        assert params['countryCode'] == 'DE'
+        assert params['latlong'] == '52.52,13.40'
+        assert params['radius'] == 100
+        assert params['unit'] == 'km'
+        assert params['startDateTime'] == '2025-01-01T00:00:00Z'
+        assert params['endDateTime'] == '2025-12-31T23:59:59Z'
+
+    def test_defaults_have_no_filters(self):
+        from src.clients.global_concert_client import build_search_params
+        params = build_search_params('token', 'Artist')
+        assert params == {'apikey': 'token', 'keyword': 'Artist', 'size': 20}
+
+class TestTrimmedParser:
+
+    def test_drops_unused_blobs(self):
+        import json
+        from src.clients.global_concert_client import loads_trimmed, parse_ticketmaster_events
+        raw = json.dumps({'_embedded': {'events': [{
+            'name': 'Show',
+            'images': [{'url': 'x'}] * 10,
+            'classifications': [{'segment': {}}],
+            '_embedded': {
+                'venues': [{'name': 'Arena', 'city': {'name': 'Berlin'}, 'images': [{'url': 'y'}]}],
+                'attractions': [{'name': 'Artist'}]
+            },
+            '_links': {'self': {'href': 'https://tm.example/show'}}
+        }]}, 'page': {'totalPages': 1}})
+
+        data = loads_trimmed(raw)
+        event = data['_embedded']['events'][0]
+
+        assert 'images' not in event
+        assert 'attractions' not in event['_embedded']
+        assert 'images' not in event['_embedded']['venues'][0]
+        assert data['page'] == {'totalPages': 1}
+        assert parse_ticketmaster_events(data, 'Artist')[0]['venue'] == 'Arena'
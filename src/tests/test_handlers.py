@@ -3,6 +3,24 @@ from unittest.mock import Mock, AsyncMock, patch
 from src.bot.handlers.playlist_handler import ConcertService, handle_playlist_url
 from src.bot.handlers.callback_handler import handle_city_selection, handle_sort, handle_reminder, handle_pagination, handle_refresh, handle_recommendations
 
+def music_client(tracks=None, error=None):
+    async def batches(playlist):
+        if tracks:
+            yield tracks
+
+    client = Mock()
+    client.get_playlist = AsyncMock(return_value=Mock(track_count=len(tracks or []), tracks=[]), side_effect=error)
+    client.iter_track_batches = batches
+    return client
+
+def catalog_repository(concerts, stamp=None):
+    return Mock(
+        get_events_by_category=Mock(return_value=concerts),
+        get_events_by_category_async=AsyncMock(return_value=concerts),
+        get_catalog_stamp=AsyncMock(return_value=stamp),
+        close=Mock()
+    )
+
 @pytest.fixture
 def repo():
     r = Mock()
@@ -47,6 +65,28 @@ def test_concert_service_find_empty(repo):
     res = s.find_concerts_by_artists(['Artist'])
     assert res == []
 
+@pytest.mark.asyncio
+async def test_catalog_index_cached_per_stamp():
+    from src.bot.handlers import playlist_handler
+    playlist_handler._catalog = None
+    concerts = [{'id': 'e1', 'url': 'https://afisha.yandex.ru/moscow/1', 'title': 'Test Artist'}]
+    repository = catalog_repository(concerts, stamp=(1, '2025-01-01T00:00:00+00:00'))
+
+    first = await ConcertService(repository).load_catalog_async()
+    assert await ConcertService(repository).load_catalog_async() is first
+    repository.get_events_by_category_async.assert_awaited_once_with('concert')
+    repository.get_events_by_category.assert_not_called()
+
+    repository.get_catalog_stamp.return_value = (2, '2025-01-02T00:00:00+00:00')
+    assert await ConcertService(repository).load_catalog_async() is not first
+    assert repository.get_events_by_category_async.await_count == 2
+
+    streaming = await ConcertService(repository).create_streaming_matcher_async()
+    streaming.add_artists(['Test Artist'])
+    assert streaming.results()[0]['matched_artist'] == 'Test Artist'
+    assert 'matched_artist' not in concerts[0]
+    playlist_handler._catalog = None
+
 @pytest.mark.asyncio
 async def test_city_selection():
     cb = Mock()
@@ -111,17 +151,17 @@ async def test_reminder():
     cb.answer.assert_called()
 
 @pytest.mark.asyncio
-@patch('src.bot.handlers.playlist_handler.MusicClient')
-@patch('src.bot.handlers.playlist_handler.ServicePlaylist')
+@patch('src.bot.handlers.playlist_handler.UserRecommendationRepository')
+@patch('src.bot.handlers.playlist_handler.UserArtistRepository')
+@patch('src.bot.handlers.playlist_handler.get_shared_music_client', new_callable=AsyncMock)
 @patch('src.bot.handlers.playlist_handler.ConcertRepository')
 @patch('src.bot.handlers.playlist_handler.extract_from_url')
-async def test_playlist(mock_extract, mock_repo, mock_svc, mock_client):
+async def test_playlist(mock_extract, mock_repo, mock_client, mock_users, mock_store):
+    mock_users.return_value.save_user_artists = AsyncMock(return_value=0)
+    mock_store.return_value.mark_active = AsyncMock(return_value=True)
     mock_extract.return_value = ('user', 'kind')
-    pl = Mock()
-    pl.fetch_tracks.return_value = []
-    mock_client.from_env.return_value = Mock(get_playlist=Mock(return_value=pl))
-    mock_svc.return_value = Mock(get_artist_names=Mock(return_value=[]))
-    mock_repo.return_value = Mock(get_events_by_category=Mock(return_value=[]), close=Mock())
+    mock_client.return_value = music_client()
+    mock_repo.return_value = catalog_repository([])
     msg = Mock()
     msg.text = 'https://music.yandex.ru/users/user/playlists/kind'
     msg.from_user = Mock()
@@ -239,23 +279,22 @@ async def test_pagination_no_user():
     cb.answer.assert_called()
 
 @pytest.mark.asyncio
-@patch('src.bot.handlers.playlist_handler.MusicClient')
-@patch('src.bot.handlers.playlist_handler.ServicePlaylist')
+@patch('src.bot.handlers.playlist_handler.UserRecommendationRepository')
+@patch('src.bot.handlers.playlist_handler.UserArtistRepository')
+@patch('src.bot.handlers.playlist_handler.get_shared_music_client', new_callable=AsyncMock)
 @patch('src.bot.handlers.playlist_handler.ConcertRepository')
 @patch('src.bot.handlers.playlist_handler.extract_from_url')
 @patch('bot.handlers.playlist_handler.get_artist_events')
-async def test_playlist_with_artists(mock_events, mock_extract, mock_repo, mock_svc, mock_client):
+async def test_playlist_with_artists(mock_events, mock_extract, mock_repo, mock_client, mock_users, mock_store):
+    mock_users.return_value.save_user_artists = AsyncMock(return_value=1)
+    mock_store.return_value.mark_active = AsyncMock(return_value=True)
     mock_extract.return_value = ('user', 'kind')
-    pl = Mock()
-    tr = Mock()
-    tr.track = Mock()
+    track = Mock()
     a = Mock()
     a.name = 'Artist1'
-    tr.track.artists = [a]
-    pl.fetch_tracks.return_value = [tr]
-    mock_client.from_env.return_value = Mock(get_playlist=Mock(return_value=pl))
-    mock_svc.return_value = Mock(get_artist_names=Mock(return_value=['Artist1']))
-    mock_repo.return_value = Mock(get_events_by_category=Mock(return_value=[{'url': 'http://test.com', 'title': 'Test Artist1'}]), close=Mock())
+    track.artists = [a]
+    mock_client.return_value = music_client([track])
+    mock_repo.return_value = catalog_repository([{'url': 'http://test.com', 'title': 'Test Artist1'}])
     mock_events.return_value = []
     msg = Mock()
     msg.text = 'https://music.yandex.ru/users/user/playlists/kind'
@@ -267,15 +306,16 @@ async def test_playlist_with_artists(mock_events, mock_extract, mock_repo, mock_
     user_res = {}
     await handle_playlist_url(msg, state, user_res)
     msg.answer.assert_called()
+    mock_users.return_value.save_user_artists.assert_awaited_once_with(123, ['Artist1'])
+    mock_store.return_value.mark_active.assert_awaited_once_with(123, '')
 
 @pytest.mark.asyncio
-@patch('src.bot.handlers.playlist_handler.MusicClient')
-@patch('src.bot.handlers.playlist_handler.ServicePlaylist')
+@patch('src.bot.handlers.playlist_handler.get_shared_music_client', new_callable=AsyncMock)
 @patch('src.bot.handlers.playlist_handler.ConcertRepository')
 @patch('src.bot.handlers.playlist_handler.extract_from_url')
-async def test_playlist_init_error(mock_extract, mock_repo, mock_svc, mock_client):
+async def test_playlist_init_error(mock_extract, mock_repo, mock_client):
     mock_extract.return_value = ('user', 'kind')
-    mock_client.from_env.side_effect = Exception("init error")
+    mock_client.side_effect = Exception("init error")
     msg = Mock()
     msg.text = 'https://music.yandex.ru/users/user/playlists/kind'
     msg.from_user = Mock()
@@ -287,9 +327,16 @@ async def test_playlist_init_error(mock_extract, mock_repo, mock_svc, mock_clien
     await handle_playlist_url(msg, state, user_res)
     msg.answer.assert_called()
 
+def no_stored_recommendations():
+    store = Mock()
+    store.mark_active = AsyncMock(return_value=True)
+    store.get_recommendations = AsyncMock(return_value=None)
+    return store
+
 @pytest.mark.asyncio
 @patch('src.services.recommendation_service.RecommendationService')
 @patch('src.repositories.concert_repository.ConcertRepository')
+@patch('src.repositories.user_recommendation_repository.UserRecommendationRepository', no_stored_recommendations)
 async def test_recommendations(mock_repo_class, mock_rec_class):
     cb = Mock()
     cb.from_user = Mock()
@@ -303,7 +350,7 @@ async def test_recommendations(mock_repo_class, mock_rec_class):
     mock_repo_class.return_value = repo
     s = Mock()
     s.enabled = True
-    s.get_recommendations.return_value = [{'title': 'T', 'url': 'http://test.com'}]
+    s.get_recommendations_async = AsyncMock(return_value=[{'title': 'T', 'url': 'http://test.com'}])
     mock_rec_class.return_value = s
     res = {123: {'artists': ['A1'], 'city_filter': None, 'available_cities': []}}
     await handle_recommendations(cb, res)
@@ -323,6 +370,7 @@ async def test_recommendations_no_artists():
 @pytest.mark.asyncio
 @patch('src.services.recommendation_service.RecommendationService')
 @patch('src.repositories.concert_repository.ConcertRepository')
+@patch('src.repositories.user_recommendation_repository.UserRecommendationRepository', no_stored_recommendations)
 async def test_recommendations_disabled(mock_repo_class, mock_rec_class):
     cb = Mock()
     cb.from_user = Mock()
@@ -334,14 +382,17 @@ async def test_recommendations_disabled(mock_repo_class, mock_rec_class):
     mock_repo_class.return_value = repo
     s = Mock()
     s.enabled = False
+    s.get_recommendations_async = AsyncMock(return_value=[])
     mock_rec_class.return_value = s
     res = {123: {'artists': ['A1'], 'city_filter': None}}
     await handle_recommendations(cb, res)
+    s.get_recommendations_async.assert_awaited_once()
     cb.answer.assert_called()
 
 @pytest.mark.asyncio
 @patch('src.services.recommendation_service.RecommendationService')
 @patch('src.repositories.concert_repository.ConcertRepository')
+@patch('src.repositories.user_recommendation_repository.UserRecommendationRepository', no_stored_recommendations)
 async def test_recommendations_empty(mock_repo_class, mock_rec_class):
     cb = Mock()
     cb.from_user = Mock()
@@ -353,7 +404,7 @@ async def test_recommendations_empty(mock_repo_class, mock_rec_class):
     mock_repo_class.return_value = repo
     s = Mock()
     s.enabled = True
-    s.get_recommendations.return_value = []
+    s.get_recommendations_async = AsyncMock(return_value=[])
     mock_rec_class.return_value = s
     res = {123: {'artists': ['A1'], 'city_filter': None}}
     await handle_recommendations(cb, res)
@@ -381,3 +432,33 @@ async def test_recommendations_no_user():
     res = {}
     await handle_recommendations(cb, res)
     cb.answer.assert_called()
+
+@pytest.mark.asyncio
+@patch('src.services.recommendation_service.RecommendationService')
+@patch('src.repositories.concert_repository.ConcertRepository')
+@patch('src.repositories.user_recommendation_repository.UserRecommendationRepository')
+async def test_recommendations_from_store(mock_store_class, mock_repo_class, mock_rec_class):
+    cb = Mock()
+    cb.from_user = Mock()
+    cb.from_user.id = 123
+    cb.data = 'recommendations'
+    cb.message = Mock()
+    cb.message.answer = AsyncMock()
+    cb.answer = AsyncMock()
+    mock_repo_class.return_value = Mock(close=AsyncMock())
+    store = no_stored_recommendations()
+    store.get_recommendations.return_value = [{'title': 'Stored', 'url': 'https://afisha.yandex.ru/moscow/stored'}]
+    mock_store_class.return_value = store
+    res = {123: {'artists': ['A1'], 'city_filter': 'Москва', 'available_cities': []}}
+    await handle_recommendations(cb, res)
+    store.mark_active.assert_awaited_once_with(123, 'moscow')
+    assert store.get_recommendations.await_args.args[:2] == (123, 'moscow')
+    mock_rec_class.assert_not_called()
+    assert res[123]['recommended_concerts'][0]['title'] == 'Stored'
+
+def test_format_streaming_progress():
+    from src.bot.handlers.playlist_handler import format_streaming_progress
+    text = format_streaming_progress(50, 0, 7, [{'title': 'A'}, {'title': 'B'}], preview=1)
+    assert '50/?' in text
+    assert 'концертов в БД: 2' in text
+    assert '• A' in text and '• B' not in text
@@ -0,0 +1,50 @@
+import os
+import sys
+import json
+import subprocess
+from pathlib import Path
+import pytest
+
+PROJECT_ROOT = Path(__file__).parent.parent.parent
+
+HEAVY_OPTIONAL = ['google.genai.client', 'numpy', 'scipy.sparse', 'selenium.webdriver', 'pandas']
+
+ENTRY_POINTS = [
+    (['src.bot.handlers.playlist_handler', 'src.bot.handlers.callback_handler'], 8.0,
+     HEAVY_OPTIONAL + ['asyncpg', 'pymongo.mongo_client']),
+    (['src.scripts.notify_new_concerts'], 2.0, HEAVY_OPTIONAL + ['aiogram.types', 'asyncpg']),
+    (['src.scripts.refresh_artist_events'], 2.0, HEAVY_OPTIONAL + ['aiogram.types', 'asyncpg']),
+    (['src.scripts.update_ticketmaster'], 2.0, HEAVY_OPTIONAL + ['aiogram.types', 'asyncpg']),
+]
+
+def profile_imports(modules):
+    code = f"import sys, json; import {', '.join(modules)}; print(json.dumps(sorted(sys.modules)))"
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', code],
+        cwd=PROJECT_ROOT, capture_output=True, text=True, timeout=120, env=dict(os.environ)
+    )
+    assert result.returncode == 0, result.stderr[-2000:]
+
+    total_us = 0
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:'):
+            continue
+        parts = line.split('|')
+        if len(parts) == 3 and parts[1].strip().isdigit() and not parts[2].startswith('  '):
+            total_us += int(parts[1])
+    return total_us / 1_000_000, set(json.loads(result.stdout.strip().splitlines()[-1]))
+
+@pytest.mark.parametrize('modules,budget,forbidden', ENTRY_POINTS, ids=lambda value: value[0] if isinstance(value, list) else None)
+def test_entry_point_import_budget(modules, budget, forbidden):
+    seconds, loaded = profile_imports(modules)
+    assert not loaded & set(forbidden), f"{modules} eagerly imports {sorted(loaded & set(forbidden))}"
+    assert seconds < budget, f"{modules} took {seconds:.2f}s to import (budget {budget}s)"
+
+def test_database_engine_created_on_first_use():
+    code = (
+        "import sys; import src.db.database as db; "
+        "assert 'asyncpg' not in sys.modules; "
+        "db.async_session_maker(); assert 'asyncpg' in sys.modules"
+    )
+    result = subprocess.run([sys.executable, '-c', code], cwd=PROJECT_ROOT, capture_output=True, text=True, timeout=60)
+    assert result.returncode == 0, result.stderr[-2000:]
@@ -0,0 +1,31 @@
+import sys
+import pytest
+from unittest.mock import Mock, patch
+from src.utils.lazy import LazyObject, is_loaded, lazy_attribute, lazy_module, resolve
+
+def test_lazy_object_resolves_once():
+    factory = Mock(return_value=Mock(value=42))
+    proxy = LazyObject(factory)
+    assert not is_loaded(proxy)
+    assert proxy.value == 42
+    assert proxy() is factory.return_value.return_value
+    factory.assert_called_once()
+    assert is_loaded(proxy)
+    assert resolve(proxy) is factory.return_value
+    assert resolve('plain') == 'plain' and is_loaded('plain')
+
+def test_lazy_attribute_calls_target():
+    dumps = lazy_attribute('json', 'dumps')
+    assert dumps({'a': 1}) == '{"a": 1}'
+
+def test_lazy_module_returns_loaded_module():
+    assert lazy_module('json') is sys.modules['json']
+    with pytest.raises(ModuleNotFoundError):
+        lazy_module('definitely_missing_module_xyz')
+
+def test_global_client_names_stay_patchable():
+    from src.clients import global_concert_client
+    with patch('src.clients.global_concert_client.MongoClient') as mock_client:
+        global_concert_client.MongoClient('mongodb://test')
+    mock_client.assert_called_once_with('mongodb://test')
+    assert isinstance(global_concert_client.MongoClient, LazyObject)
@@ -0,0 +1,137 @@
+import pytest
+from unittest.mock import AsyncMock
+from src.services import local_recommender
+from src.services.local_recommender import (
+    ArtistCooccurrence,
+    LocalRecommender,
+    TfidfIndex,
+    get_local_recommender,
+    get_local_recommender_async,
+    get_shared_cooccurrence,
+    recommend_locally,
+    tokenize
+)
+
+CONCERTS = [
+    {'title': 'Rock Fest', 'description': 'Arctic rock bands', 'url': 'https://afisha.yandex.ru/moscow/concert/rock-fest', 'updated_at': '1'},
+    {'title': 'Jazz Night', 'description': 'Smooth jazz trio', 'url': 'https://afisha.yandex.ru/moscow/concert/jazz-night', 'updated_at': '1'},
+    {'title': 'Кино трибьют', 'description': 'Песни группы Кино', 'url': 'https://afisha.yandex.ru/moscow/concert/kino', 'updated_at': '1'},
+    {'title': 'Земфира', 'description': 'Большой концерт', 'url': 'https://afisha.yandex.ru/kazan/concert/zemfira', 'updated_at': '1'},
+]
+
+def test_tokenize():
+    assert tokenize('The Rock, 2024 & Jazz!') == ['the', 'rock', 'jazz']
+    assert tokenize(None) == []
+
+def test_tfidf_rows_are_normalized():
+    index = TfidfIndex([['rock', 'rock', 'fest'], ['jazz'], []])
+    norms = index.matrix.multiply(index.matrix).sum(axis=1)
+    assert norms[0, 0] == pytest.approx(1.0)
+    assert norms[2, 0] == 0
+    assert index.transform({'unknown': 1.0}).nnz == 0
+
+def test_recommend_ranks_by_similarity():
+    recommender = LocalRecommender(CONCERTS)
+    result = recommender.recommend(['Arctic Monkeys', 'Jazz Trio'])
+    assert [c['title'] for c in result] == ['Jazz Night', 'Rock Fest']
+    assert recommender.recommend(['Unknown Artist']) == []
+    assert recommender.recommend([]) == []
+
+def test_recommend_matches_transliterated_names():
+    result = LocalRecommender(CONCERTS).recommend(['Kino'])
+    assert [c['title'] for c in result] == ['Кино трибьют']
+
+def test_recommend_restricted_to_candidates():
+    recommender = LocalRecommender(CONCERTS)
+    kazan = [c for c in CONCERTS if '/kazan/' in c['url']]
+    assert recommender.recommend(['Kino'], kazan) == []
+    assert [c['title'] for c in recommender.recommend(['Земфира'], kazan)] == ['Земфира']
+
+def test_cooccurrence_related_artists():
+    model = ArtistCooccurrence({
+        1: ['Arctic Monkeys', 'Kino'],
+        2: ['Arctic Monkeys', 'Kino', 'Zemfira'],
+        3: ['Zemfira', 'Jazz Trio'],
+    })
+    related = dict(model.related(['arctic monkeys']))
+    assert set(related) == {'kino', 'zemfira'}
+    assert related['kino'] > related['zemfira']
+    assert model.related(['Nobody']) == []
+
+def test_cooccurrence_related_matches_full_product():
+    import numpy as np
+    playlists = {1: ['A', 'B', 'C'], 2: ['A', 'C'], 3: ['B', 'D'], 4: ['C', 'D', 'E'], 5: ['E']}
+    model = ArtistCooccurrence(playlists)
+    full = (model.users.T @ model.users).toarray()
+    for seeds in (['a'], ['b', 'd'], ['c', 'e']):
+        rows = [model.index[s] for s in seeds]
+        co = full[rows].sum(axis=0)
+        scores = co / np.sqrt(np.maximum(model.counts * model.counts[rows].sum(), 1.0))
+        scores[rows] = 0.0
+        expected = {model.artists[i]: pytest.approx(scores[i]) for i in range(len(scores)) if scores[i] > 0}
+        assert dict(model.related(seeds)) == expected
+
+def test_cooccurrence_expands_profile():
+    model = ArtistCooccurrence({1: ['Arctic Monkeys', 'Kino'], 2: ['Arctic Monkeys', 'Kino']})
+    recommender = LocalRecommender(CONCERTS)
+    plain = recommender.recommend(['Arctic Monkeys'])
+    expanded = recommender.recommend(['Arctic Monkeys'], cooccurrence=model)
+    assert [c['title'] for c in plain] == ['Rock Fest']
+    assert [c['title'] for c in expanded] == ['Rock Fest', 'Кино трибьют']
+
+def test_fitted_model_reused_per_catalog_version():
+    local_recommender._fitted.clear()
+    first = get_local_recommender(CONCERTS)
+    assert get_local_recommender(list(CONCERTS)) is first
+    changed = CONCERTS[:-1] + [dict(CONCERTS[-1], updated_at='2')]
+    assert get_local_recommender(changed) is not first
+    assert [c['title'] for c in recommend_locally(['Jazz'], CONCERTS, 1)] == ['Jazz Night']
+
+@pytest.mark.asyncio
+async def test_async_recommender_fits_off_loop_and_reuses_version():
+    import threading
+    from unittest.mock import patch
+    local_recommender._fitted.clear()
+    threads = []
+    original = LocalRecommender.__init__
+
+    def tracking_init(self, concerts):
+        threads.append(threading.get_ident())
+        original(self, concerts)
+
+    with patch.object(LocalRecommender, '__init__', tracking_init), \
+         patch.object(local_recommender, 'catalog_version', side_effect=AssertionError('version was passed in')):
+        first = await get_local_recommender_async(CONCERTS, 'v1')
+        assert await get_local_recommender_async(CONCERTS, 'v1') is first
+
+    assert threads and threads[0] != threading.get_ident()
+    assert len(threads) == 1
+    local_recommender._fitted.clear()
+
+@pytest.mark.asyncio
+async def test_shared_cooccurrence_cached():
+    local_recommender._cooccurrence = None
+    repository = AsyncMock()
+    repository.get_all_user_artists.return_value = {1: ['Kino', 'Zemfira']}
+    model = await get_shared_cooccurrence(repository)
+    assert await get_shared_cooccurrence(repository) is model
+    repository.get_all_user_artists.assert_awaited_once()
+    local_recommender._cooccurrence = None
+
+@pytest.mark.asyncio
+async def test_shared_cooccurrence_empty():
+    local_recommender._cooccurrence = None
+    repository = AsyncMock()
+    repository.get_all_user_artists.return_value = {}
+    assert await get_shared_cooccurrence(repository) is None
+    assert await get_shared_cooccurrence(repository) is None
+    repository.get_all_user_artists.assert_awaited_once()
+    local_recommender._cooccurrence = None
+
+def test_rank_keeps_unmatched_candidates_after_matches():
+    recommender = LocalRecommender(CONCERTS)
+    moscow = [c for c in CONCERTS if '/moscow/' in c['url']]
+    extra = {'title': 'Unindexed', 'url': 'https://afisha.yandex.ru/moscow/concert/new'}
+    ranked = recommender.rank(['Jazz Trio'], moscow + [extra], limit=4)
+    assert [c['title'] for c in ranked] == ['Jazz Night', 'Rock Fest', 'Кино трибьют', 'Unindexed']
+    assert [c['title'] for c in recommender.rank(['Kino'], moscow, limit=1)] == ['Кино трибьют']
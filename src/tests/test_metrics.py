@@ -0,0 +1,117 @@
+import asyncio
+import pytest
+from unittest.mock import Mock
+from src.utils.metrics import Histogram, MetricsRegistry, metrics
+from src.services.concert_service import ConcertMatcherService
+
+@pytest.fixture
+def registry():
+    return MetricsRegistry(namespace='test', buckets=(0.1, 1.0))
+
+def test_histogram_buckets_and_quantiles():
+    histogram = Histogram(buckets=(1, 2, 4))
+    for value in (0.5, 1.5, 1.5, 3, 10):
+        histogram.observe(value)
+
+    assert histogram.counts == [1, 2, 1, 1]
+    assert histogram.cumulative() == [1, 3, 4, 5]
+    assert histogram.count == 5 and histogram.sum == 16.5 and histogram.max == 10
+    assert 1 <= histogram.quantile(0.5) <= 2
+    assert histogram.quantile(1.0) == 10
+    assert Histogram().quantile(0.5) == 0.0
+
+def test_counters_are_keyed_by_labels(registry):
+    registry.inc('hits_total')
+    registry.inc('hits_total', 2)
+    registry.inc('cache_total', result='hit')
+    registry.inc('cache_total', result='miss')
+    registry.inc('cache_total', result='hit')
+
+    assert registry.counter('hits_total') == 3
+    assert registry.counter('cache_total', result='hit') == 2
+    assert registry.counter('cache_total', result='miss') == 1
+
+def test_span_records_duration_and_errors(registry):
+    with registry.span('load'):
+        pass
+    with pytest.raises(ValueError):
+        with registry.span('load'):
+            raise ValueError('boom')
+
+    assert registry.stage('load').count == 2
+    assert registry.counter('stage_errors_total', stage='load') == 1
+
+def test_timer_records_stage(registry):
+    timer = registry.timer('render', kind='city')
+    elapsed = timer.stop()
+
+    histogram = registry.histogram('stage_seconds', stage='render', kind='city')
+    assert histogram.count == 1 and histogram.sum == elapsed
+
+@pytest.mark.asyncio
+async def test_timed_wraps_sync_and_async_functions(registry):
+    @registry.timed('sync')
+    def add(a, b):
+        return a + b
+
+    @registry.timed('async')
+    async def fetch(value):
+        await asyncio.sleep(0)
+        return value
+
+    assert add(1, 2) == 3
+    assert await fetch('x') == 'x'
+    assert add.__name__ == 'add'
+    assert registry.stage('sync').count == 1
+    assert registry.stage('async').count == 1
+
+def test_render_prometheus_text(registry):
+    registry.inc('tracks_total', 5)
+    registry.inc('requests_total', status=429)
+    registry.observe('stage_seconds', 0.05, stage='fetch')
+    registry.observe('stage_seconds', 2.0, stage='fetch')
+
+    text = registry.render()
+
+    assert '# TYPE test_tracks_total counter' in text
+    assert 'test_tracks_total 5' in text
+    assert 'test_requests_total{status="429"} 1' in text
+    assert text.count('# TYPE test_stage_seconds histogram') == 1
+    assert 'test_stage_seconds_bucket{stage="fetch",le="0.1"} 1' in text
+    assert 'test_stage_seconds_bucket{stage="fetch",le="1"} 1' in text
+    assert 'test_stage_seconds_bucket{stage="fetch",le="+Inf"} 2' in text
+    assert 'test_stage_seconds_sum{stage="fetch"} 2.05' in text
+    assert 'test_stage_seconds_count{stage="fetch"} 2' in text
+
+def test_render_escapes_label_values(registry):
+    registry.inc('errors_total', reason='say "hi"\n')
+    assert 'reason="say \\"hi\\"\\n"' in registry.render()
+
+def test_summary_lists_stages_and_counters(registry):
+    registry.observe('stage_seconds', 0.2, stage='playlist.fetch')
+    registry.inc('tracks_total', 10)
+
+    summary = registry.summary()
+
+    assert 'playlist.fetch: n=1' in summary
+    assert 'tracks_total=10' in summary
+    registry.reset()
+    assert registry.summary() == ''
+
+def test_matcher_reports_scanned_and_matched_concerts():
+    metrics.reset()
+    repository = Mock()
+    repository.get_events_by_category.return_value = [
+        {'url': 'https://afisha.yandex.ru/moscow/1', 'title': 'Metallica', 'full_title': '', 'description': ''},
+        {'url': 'https://afisha.yandex.ru/moscow/2', 'title': 'Metallica tribute', 'full_title': '', 'description': ''},
+        {'url': 'https://afisha.yandex.ru/moscow/3', 'title': 'Jazz evening', 'full_title': '', 'description': ''},
+    ]
+
+    results = ConcertMatcherService(repository, city='moscow').find_concerts_for_artists(['Metallica', 'Nobody'])
+
+    assert len(results['Metallica']) == 2
+    assert metrics.counter('matcher_artists_total') == 2
+    assert metrics.counter('matcher_matches_total') == 2
+    assert metrics.counter('matcher_concerts_scanned_total') >= 2
+    assert metrics.stage('matcher.find_concerts_for_artists').count == 1
+    metrics.reset()
@@ -1,5 +1,5 @@
 import pytest
-from unittest.mock import Mock, patch
+from unittest.mock import Mock, AsyncMock, patch
 from src.services.music_playlist_client import MusicClient
 
 @patch('src.services.music_playlist_client.Client')
@@ -26,3 +26,78 @@ def test_no_token(mock_getenv):
     with pytest.raises(EnvironmentError):
         MusicClient.from_env()
 
+
+def short(track_id, track=None):
+    s = Mock()
+    s.track_id = track_id
+    s.track = track
+    return s
+
+def track(*names):
+    t = Mock()
+    t.artists = []
+    for name in names:
+        a = Mock()
+        a.name = name
+        t.artists.append(a)
+    return t
+
+@pytest.mark.asyncio
+@patch('src.services.music_playlist_client.ClientAsync')
+async def test_async_client_initializes_once(mock_client):
+    from src.services.music_playlist_client import AsyncMusicClient
+    inner = Mock()
+    inner.users_playlists = AsyncMock(return_value=Mock())
+    mock_client.return_value.init = AsyncMock(return_value=inner)
+
+    c = AsyncMusicClient('token')
+    await c.get_playlist('1', 'owner')
+    await c.get_playlist('2', 'owner')
+
+    mock_client.return_value.init.assert_awaited_once()
+    assert inner.users_playlists.await_count == 2
+
+@pytest.mark.asyncio
+@patch('src.services.music_playlist_client.ClientAsync')
+async def test_async_client_loads_missing_tracks_in_batches(mock_client):
+    from src.services.music_playlist_client import AsyncMusicClient
+    inner = Mock()
+    inner.tracks = AsyncMock(side_effect=lambda ids: [track(f'A{i}') for i in ids])
+    mock_client.return_value.init = AsyncMock(return_value=inner)
+
+    playlist = Mock()
+    playlist.tracks = [short('0', track('Loaded'))] + [short(str(i)) for i in range(1, 6)]
+    c = AsyncMusicClient('token', batch_size=2)
+
+    batches = [batch async for batch in c.iter_track_batches(playlist)]
+
+    assert len(batches) == 4
+    assert sum(len(b) for b in batches) == 6
+    assert sorted(len(call.args[0]) for call in inner.tracks.await_args_list) == [1, 2, 2]
+
+@pytest.mark.asyncio
+@patch('src.services.music_playlist_client.ClientAsync')
+async def test_async_client_skips_failed_batches(mock_client):
+    from src.services.music_playlist_client import AsyncMusicClient
+    inner = Mock()
+    inner.users_playlists = AsyncMock(return_value=Mock(tracks=[short('1'), short('2')]))
+    inner.tracks = AsyncMock(side_effect=[[track('A', 'B')], Exception('timeout')])
+    mock_client.return_value.init = AsyncMock(return_value=inner)
+
+    c = AsyncMusicClient('token', batch_size=1, concurrency=1)
+    assert await c.get_artist_names('1', 'owner') == ['A', 'B']
+
+@pytest.mark.asyncio
+@patch('src.services.music_playlist_client.ClientAsync')
+@patch('src.services.music_playlist_client.os.getenv')
+async def test_shared_client_is_reused(mock_getenv, mock_client):
+    import src.services.music_playlist_client as module
+    mock_getenv.return_value = 'token'
+    mock_client.return_value.init = AsyncMock(return_value=Mock())
+
+    with patch.object(module, '_shared_client', None):
+        first = await module.get_shared_music_client()
+        second = await module.get_shared_music_client()
+
+    assert first is second
+    mock_client.return_value.init.assert_awaited_once()
@@ -0,0 +1,158 @@
+import time
+import asyncio
+import pytest
+from unittest.mock import AsyncMock, Mock
+from aiogram.exceptions import TelegramRetryAfter
+from src.bot.outbound import OutboundScheduler
+
+def make_message(chat_id=1, message_id=10):
+    message = Mock()
+    message.chat.id = chat_id
+    message.message_id = message_id
+    message.edit_text = AsyncMock(side_effect=lambda text, **kwargs: text)
+    message.answer = AsyncMock(side_effect=lambda text, **kwargs: text)
+    return message
+
+def scheduler(**kwargs):
+    options = dict(global_rate=1000, chat_rate=1000, chat_burst=10, retries=3, delay_warning=60)
+    options.update(kwargs)
+    return OutboundScheduler(**options)
+
+@pytest.mark.asyncio
+async def test_pending_edits_are_coalesced_to_latest_text():
+    outbound = scheduler()
+    message = make_message()
+    release = asyncio.Event()
+
+    async def slow_send():
+        await release.wait()
+        return 'first'
+
+    first = outbound.submit(message.chat.id, slow_send)
+    edits = [outbound.edit(message, f'progress {i}') for i in range(5)]
+    release.set()
+
+    assert await first == 'first'
+    assert await asyncio.gather(*edits) == ['progress 4'] * 5
+    message.edit_text.assert_awaited_once_with('progress 4')
+    assert outbound.stats['coalesced'] == 4
+    assert outbound.stats['sent'] == 2
+
+@pytest.mark.asyncio
+async def test_edits_to_other_messages_keep_order():
+    outbound = scheduler()
+    first, second = make_message(message_id=1), make_message(message_id=2)
+    calls = []
+    first.edit_text.side_effect = lambda text, **kwargs: calls.append(text)
+    second.edit_text.side_effect = lambda text, **kwargs: calls.append(text)
+
+    await asyncio.gather(outbound.edit(first, 'a'), outbound.edit(second, 'b'), outbound.edit(first, 'c'))
+
+    assert calls == ['c', 'b']
+
+@pytest.mark.asyncio
+async def test_retry_after_is_retried_transparently():
+    outbound = scheduler()
+    message = make_message()
+    message.answer.side_effect = [TelegramRetryAfter(retry_after=0.01), 'sent']
+
+    assert await outbound.send(message, 'hello') == 'sent'
+    assert message.answer.await_count == 2
+    assert outbound.stats['retried'] == 1
+    assert outbound.stats['failed'] == 0
+
+@pytest.mark.asyncio
+async def test_retry_after_gives_up_after_retries():
+    outbound = scheduler(retries=1)
+    message = make_message()
+    message.answer.side_effect = TelegramRetryAfter(retry_after=0)
+
+    with pytest.raises(TelegramRetryAfter):
+        await outbound.send(message, 'hello')
+    assert message.answer.await_count == 2
+    assert outbound.stats['failed'] == 1
+
+@pytest.mark.asyncio
+async def test_edit_arriving_during_retry_replaces_retried_text():
+    outbound = scheduler()
+    message = make_message()
+    sent = []
+
+    async def edit_text(text, **kwargs):
+        if not sent:
+            sent.append(None)
+            outbound.edit(message, 'newer')
+            raise TelegramRetryAfter(retry_after=0)
+        sent.append(text)
+        return text
+
+    message.edit_text.side_effect = edit_text
+
+    assert await outbound.edit(message, 'older') == 'newer'
+    assert sent == [None, 'newer']
+
+@pytest.mark.asyncio
+async def test_per_chat_budget_does_not_block_other_chats():
+    outbound = scheduler(chat_rate=10, chat_burst=1)
+    busy = make_message(chat_id=1)
+    other = make_message(chat_id=2)
+
+    started = time.perf_counter()
+    busy_sends = [outbound.send(busy, str(i)) for i in range(3)]
+    await outbound.send(other, 'x')
+    other_elapsed = time.perf_counter() - started
+    await asyncio.gather(*busy_sends)
+    busy_elapsed = time.perf_counter() - started
+
+    assert other_elapsed < 0.1
+    assert busy_elapsed >= 0.18
+
+@pytest.mark.asyncio
+async def test_fire_and_forget_failure_does_not_stop_the_queue():
+    outbound = scheduler()
+    message = make_message()
+    message.edit_text.side_effect = [Exception('message is not modified'), 'done']
+
+    outbound.edit(message, 'same')
+    await asyncio.sleep(0)
+    assert await outbound.send(message, 'next') == 'next'
+    assert outbound.stats['failed'] == 1
+
+@pytest.mark.asyncio
+async def test_fire_and_forget_failure_is_logged(caplog):
+    outbound = scheduler()
+    message = make_message()
+    message.edit_text.side_effect = Exception('Bad Request: chat not found')
+
+    outbound.edit(message, 'progress')
+    await outbound.close()
+
+    assert 'Outbound call to chat 1 failed' in caplog.text
+
+@pytest.mark.asyncio
+async def test_send_message_uses_chat_queue():
+    outbound = scheduler()
+    bot = Mock()
+    bot.send_message = AsyncMock(return_value='sent')
+
+    assert await outbound.send_message(bot, 7, 'hello') == 'sent'
+    bot.send_message.assert_awaited_once_with(7, 'hello')
+    assert outbound.stats['sent'] == 1
+
+@pytest.mark.asyncio
+async def test_summary_reports_queue_delay_and_close_drains():
+    outbound = scheduler(chat_rate=20, chat_burst=1)
+    message = make_message()
+
+    for i in range(3):
+        outbound.send(message, str(i))
+    assert outbound.pending == 3
+
+    await outbound.close()
+    summary = outbound.summary()
+
+    assert message.answer.await_count == 3
+    assert summary['sent'] == 3
+    assert summary['pending'] == 0
+    assert summary['delay_max'] >= 0.05
+    assert summary['delay_p50'] <= summary['delay_p95'] <= summary['delay_max']
@@ -0,0 +1,154 @@
+import pytest
+from unittest.mock import AsyncMock, MagicMock, patch
+from src.services.concert_service import ConcertMatcherService
+from src.services.percolator import ArtistPercolator
+from src.repositories.user_artist_repository import UserArtistRepository
+
+USERS = {
+    1: ['Zemfira', 'Arctic Monkeys'],
+    2: ['Кино', 'Arctic Monkeys'],
+    3: ['Nobody Known'],
+}
+
+EVENTS = [
+    {'id': 'e1', 'url': 'u1', 'title': 'Земфира. Большой концерт'},
+    {'id': 'e2', 'url': 'u2', 'title': 'Arctic Monkeys', 'full_title': 'Arctic Monkeys Live'},
+    {'id': 'e3', 'url': 'u3', 'title': 'Kino. Трибьют', 'description': 'Трибьют-концерт группы в клубе'},
+    {'id': 'e4', 'url': 'u4', 'title': 'Джазовый вечер'},
+    {'id': 'e5', 'url': 'u5', 'title': 'Земфира и друзья: трибьют'},
+]
+
+def test_match_event():
+    percolator = ArtistPercolator(USERS)
+    assert percolator.match_event(EVENTS[0]) == {1: ['Zemfira']}
+    assert percolator.match_event(EVENTS[1]) == {1: ['Arctic Monkeys'], 2: ['Arctic Monkeys']}
+    assert percolator.match_event(EVENTS[3]) == {}
+    assert percolator.match_event(EVENTS[4]) == {}
+
+def test_agrees_with_full_scan():
+    matcher = ConcertMatcherService(None, city='')
+    percolator = ArtistPercolator(USERS, matcher)
+    from src.utils.transliteration import name_variants
+    for event in EVENTS:
+        expected = {
+            user_id for user_id, names in USERS.items()
+            if any(
+                matcher.matches_concert(name, event) or any(matcher.matches_variant(v, event) for v in name_variants(name)[1:])
+                for name in names
+            )
+        }
+        assert set(percolator.match_event(event)) == expected
+
+def test_candidates_are_pruned():
+    percolator = ArtistPercolator(USERS)
+    assert percolator.candidate_artists(EVENTS[3]) == set()
+    assert percolator.candidate_artists(EVENTS[0]) == {'zemfira'}
+
+def test_percolate_groups_by_user():
+    notifications = ArtistPercolator(USERS).percolate(EVENTS)
+    assert {u: [e['url'] for e in events] for u, events in notifications.items()} == {
+        1: ['u1', 'u2'], 2: ['u2', 'u3']
+    }
+    assert notifications[2][1]['matched_artist'] == 'Кино'
+    assert 'matched_artist' not in EVENTS[2]
+
+@pytest.mark.asyncio
+async def test_collect_notifications_skips_sent():
+    from src.scripts.notify_new_concerts import collect_notifications
+    repo = UserArtistRepository()
+    repo.get_all_user_artists = AsyncMock(return_value=USERS)
+    repo.get_notified = AsyncMock(return_value={(1, 'e1')})
+
+    pending = await collect_notifications(EVENTS, repo)
+    assert {u: [e['id'] for e in events] for u, events in pending.items()} == {1: ['e2'], 2: ['e2', 'e3']}
+    assert await collect_notifications([], repo) == {}
+
+@pytest.mark.asyncio
+@patch('src.repositories.user_artist_repository.UserArtistRepository._get_session')
+async def test_save_user_artists_replaces_set(mock_get_session):
+    session = AsyncMock()
+    mock_get_session.return_value = session
+
+    res = await UserArtistRepository().save_user_artists(5, ['Kino', 'KINO', '', 'Zemfira'])
+    assert res == 2
+    assert session.execute.await_count == 2
+    session.commit.assert_called_once()
+
+@pytest.mark.asyncio
+@patch('src.repositories.user_artist_repository.UserArtistRepository._get_session')
+async def test_get_all_user_artists(mock_get_session):
+    session = AsyncMock()
+    result = MagicMock()
+    result.all.return_value = [(1, 'A'), (1, 'B'), (2, 'A')]
+    session.execute = AsyncMock(return_value=result)
+    mock_get_session.return_value = session
+
+    assert await UserArtistRepository().get_all_user_artists() == {1: ['A', 'B'], 2: ['A']}
+
+def make_created_events(count, created_at):
+    return [
+        {'id': f'n{i}', 'url': f'https://afisha.yandex.ru/moscow/concert/n{i}', 'title': 'Arctic Monkeys',
+         'created_at': created_at.isoformat()}
+        for i in range(count)
+    ]
+
+@pytest.mark.asyncio
+async def test_notify_marks_only_sent_batches_and_keeps_failed_events():
+    from datetime import datetime, timedelta, timezone
+    from src.scripts import notify_new_concerts
+
+    created_at = datetime.now(timezone.utc) - timedelta(minutes=30)
+    events = make_created_events(25, created_at)
+    concerts = MagicMock(get_events_created_since=AsyncMock(return_value=events))
+    users = MagicMock(
+        get_all_user_artists=AsyncMock(return_value={1: ['Arctic Monkeys'], 2: ['Arctic Monkeys']}),
+        get_notified=AsyncMock(return_value=set()),
+        mark_notified=AsyncMock(return_value=10)
+    )
+    async def send_message(user_id, text):
+        if user_id == 2:
+            raise Exception('blocked')
+
+    bot = MagicMock()
+    bot.session.close = AsyncMock()
+    bot.send_message = AsyncMock(side_effect=send_message)
+    saved = []
+
+    with patch.object(notify_new_concerts, 'ConcertRepository', return_value=concerts), \
+         patch.object(notify_new_concerts, 'UserArtistRepository', return_value=users), \
+         patch.object(notify_new_concerts, 'load_last_run', return_value=created_at), \
+         patch.object(notify_new_concerts, 'save_last_run', side_effect=saved.append), \
+         patch('aiogram.Bot', return_value=bot):
+        stats = await notify_new_concerts.run()
+
+    since = concerts.get_events_created_since.await_args.args[0]
+    assert since == created_at - notify_new_concerts.OVERLAP
+    assert stats['sent'] == 1 and stats['failed'] == 1 and stats['deferred'] == 25
+    marked = [pair for call in users.mark_notified.await_args_list for pair in call.args[0]]
+    assert len(marked) == 25 and {user_id for user_id, _ in marked} == {1}
+    assert bot.send_message.await_count == 4
+    assert saved == [created_at]
+
+@pytest.mark.asyncio
+async def test_notify_after_ingest_respects_setting_and_swallows_errors(monkeypatch):
+    from src.scripts import notify_new_concerts
+
+    monkeypatch.setenv('BOT_TOKEN', '42:TEST')
+    with patch.object(notify_new_concerts, 'config') as mock_config, \
+         patch.object(notify_new_concerts, 'run', AsyncMock(side_effect=[{'sent': 1}, Exception('db down')])) as run:
+        mock_config.NOTIFY_AFTER_INGEST = False
+        assert await notify_new_concerts.notify_after_ingest() is None
+        run.assert_not_awaited()
+
+        mock_config.NOTIFY_AFTER_INGEST = True
+        assert await notify_new_concerts.notify_after_ingest() == {'sent': 1}
+        assert await notify_new_concerts.notify_after_ingest() is None
+
+def test_next_checkpoint_is_bounded_by_lookback():
+    from datetime import datetime, timedelta, timezone
+    from src.scripts.notify_new_concerts import DEFAULT_LOOKBACK_HOURS, next_checkpoint
+
+    started = datetime.now(timezone.utc)
+    assert next_checkpoint(started, []) == started
+    old = make_created_events(1, started - timedelta(days=30))
+    assert next_checkpoint(started, old) == started - timedelta(hours=DEFAULT_LOOKBACK_HOURS)
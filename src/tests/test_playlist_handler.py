@@ -26,6 +26,8 @@ class TestConcertService:
         
         mock_repository = Mock()
         mock_repository.get_events_by_category.return_value = []
+        mock_repository.get_events_by_category_async = AsyncMock(return_value=[])
+        mock_repository.get_catalog_stamp = AsyncMock(return_value=None)
         return mock_repository
     
     @pytest.fixture
@@ -90,6 +92,8 @@ class TestHandlePlaylistUrl:
         message = Mock(spec=Message)
         message.from_user = Mock(spec=User)
         message.from_user.id = 12345
+        message.chat = Mock()
+        message.chat.id = 12345
         message.text = 'https://music.yandex.ru/users/user123/playlists/456789'
         message.answer = AsyncMock()
         return message
@@ -118,16 +122,14 @@ class TestHandlePlaylistUrl:
         assert 'Неверный формат' in call_args or 'не подходит' in call_args
     
     @pytest.mark.asyncio
-    @patch('bot.handlers.playlist_handler.MusicClient')
-    @patch('bot.handlers.playlist_handler.ServicePlaylist')
+    @patch('bot.handlers.playlist_handler.get_shared_music_client', new_callable=AsyncMock)
     @patch('bot.handlers.playlist_handler.ConcertRepository')
     @patch('bot.handlers.playlist_handler.extract_from_url')
     async def test_successful_playlist_processing(
         self, 
         extract, 
         mock_repo_class,
-        mock_service_class,
-        mock_client_class,
+        mock_get_client,
         mock_message, 
         mock_state, 
         user_results
@@ -136,20 +138,21 @@ class TestHandlePlaylistUrl:
 
         extract.return_value = ('user123', '456789')
         
-        mock_client = Mock()
-        mock_playlist = Mock()
         mock_track = Mock()
-        mock_track.track = Mock()
-        mock_track.track.artists = [Mock(name='Artist 1')]
-        mock_playlist.fetch_tracks.return_value = [mock_track]
-        mock_client.get_playlist.return_value = mock_playlist
-        mock_client_class.from_env.return_value = mock_client
-        
-        mock_service = Mock()
-        mock_service_class.return_value = mock_service
+        mock_track.artists = [Mock(name='Artist 1')]
+
+        async def batches(playlist):
+            yield [mock_track]
+
+        mock_client = Mock()
+        mock_client.get_playlist = AsyncMock(return_value=Mock(track_count=1))
+        mock_client.iter_track_batches = batches
+        mock_get_client.return_value = mock_client
         
         mock_repository = Mock()
         mock_repository.get_events_by_category.return_value = []
+        mock_repository.get_events_by_category_async = AsyncMock(return_value=[])
+        mock_repository.get_catalog_stamp = AsyncMock(return_value=None)
         mock_repository.close = Mock()
         mock_repo_class.return_value = mock_repository
         
@@ -163,12 +166,12 @@ class TestHandlePlaylistUrl:
         mock_state.clear.assert_called()
     
     @pytest.mark.asyncio
-    @patch('bot.handlers.playlist_handler.MusicClient')
+    @patch('bot.handlers.playlist_handler.get_shared_music_client', new_callable=AsyncMock)
     @patch('bot.handlers.playlist_handler.extract_from_url')
     async def test_playlist_not_found_error(
         self,
         extract,
-        mock_client_class,
+        mock_get_client,
         mock_message,
         mock_state,
         user_results
@@ -177,8 +180,8 @@ class TestHandlePlaylistUrl:
         extract.return_value = ('user123', '456789')
         
         mock_client = Mock()
-        mock_client.get_playlist.side_effect = Exception("not found")
-        mock_client_class.from_env.return_value = mock_client
+        mock_client.get_playlist = AsyncMock(side_effect=Exception("not found"))
+        mock_get_client.return_value = mock_client
         
         mock_message.answer.return_value = Mock()
         mock_message.answer.return_value.edit_text = AsyncMock()
@@ -52,3 +52,17 @@ def test_no_artists():
     s = ServicePlaylist(c)
     res = s.get_artist_names('kind', 'owner')
     assert res == []
+
+def test_keeps_all_artists_of_track():
+    c = Mock()
+    pl = Mock()
+    tr = Mock()
+    tr.track = Mock()
+    a, b = Mock(), Mock()
+    a.name = 'Artist1'
+    b.name = 'Artist2'
+    tr.track.artists = [a, b]
+    pl.fetch_tracks.return_value = [tr]
+    c.get_playlist.return_value = pl
+    s = ServicePlaylist(c)
+    assert s.get_artist_names('kind', 'owner') == ['Artist1', 'Artist2']
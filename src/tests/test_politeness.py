@@ -0,0 +1,60 @@
+import json
+import pytest
+from unittest.mock import Mock, patch
+from src.clients.politeness import PolitenessScheduler, DEFAULT_DOMAIN
+
+DOMAIN = 'afisha.yandex.ru'
+
+@pytest.fixture
+def scheduler():
+    return PolitenessScheduler(sleep=Mock())
+
+def test_domain_of():
+    assert PolitenessScheduler.domain_of('https://afisha.yandex.ru/moscow/concert') == DOMAIN
+    assert PolitenessScheduler.domain_of('') == DEFAULT_DOMAIN
+    assert PolitenessScheduler.domain_of(None) == DEFAULT_DOMAIN
+
+def test_healthy_responses_shrink_delay(scheduler):
+    for _ in range(5):
+        scheduler.record(DOMAIN, latency=1.0)
+    assert scheduler.domains[DOMAIN].multiplier < 1.0
+
+def test_multiplier_floor(scheduler):
+    for _ in range(100):
+        scheduler.record(DOMAIN, latency=0.5)
+    assert scheduler.domains[DOMAIN].multiplier == scheduler.min_multiplier
+
+def test_captcha_backs_off(scheduler):
+    scheduler.record(DOMAIN, captcha=True)
+    stats = scheduler.domains[DOMAIN]
+    assert stats.multiplier == 4.0
+    assert stats.captchas == 1
+
+def test_error_backs_off(scheduler):
+    scheduler.record(DOMAIN, error=True)
+    assert scheduler.domains[DOMAIN].multiplier == 2.0
+    assert scheduler.domains[DOMAIN].errors == 1
+
+def test_slow_site_backs_off(scheduler):
+    scheduler.record(DOMAIN, latency=10.0)
+    assert scheduler.domains[DOMAIN].multiplier > 1.0
+    assert scheduler.domains[DOMAIN].latency_max == 10.0
+
+def test_domains_are_independent(scheduler):
+    scheduler.record(DOMAIN, captcha=True)
+    assert scheduler.delay(1, 1, 'other.example') == pytest.approx(1.0)
+    assert scheduler.delay(1, 1, DOMAIN) == pytest.approx(4.0)
+
+def test_wait_sleeps_scaled_delay(scheduler):
+    scheduler.record(DOMAIN, error=True)
+    delay = scheduler.wait(2, 2, DOMAIN)
+    assert delay == pytest.approx(4.0)
+    scheduler.sleep.assert_called_once_with(delay)
+    assert scheduler.domains[DOMAIN].slept_seconds == pytest.approx(4.0)
+
+def test_export(scheduler, tmp_path):
+    scheduler.record(DOMAIN, latency=1.5)
+    path = scheduler.export(tmp_path / 'stats' / 'run.json')
+    data = json.loads(path.read_text(encoding='utf-8'))
+    assert data['domains'][DOMAIN]['requests'] == 1
+    assert data['domains'][DOMAIN]['latency_ewma'] == 1.5
@@ -1,5 +1,5 @@
 import pytest
-from unittest.mock import Mock, patch
+from unittest.mock import AsyncMock, Mock, patch
 from src.services.recommendation_service import RecommendationService
 
 @pytest.fixture
@@ -39,10 +39,12 @@ def test_filter(repo):
             res = s._filter_concerts_by_city(data)
             assert len(res) == 1
 
-def test_get_empty(repo):
+@pytest.mark.asyncio
+async def test_get_empty(repo):
+    repo.get_events_by_category_async = AsyncMock(return_value=[])
     with patch('src.services.recommendation_service.config') as cfg:
         cfg.GEMINI_API_KEY = ''
         s = RecommendationService(repo, city='moscow')
-        res = s.get_recommendations(['A'])
+        res = await s.get_recommendations_async(['A'])
         assert res == []
 
@@ -0,0 +1,114 @@
+import pytest
+from datetime import datetime, timedelta, timezone
+from unittest.mock import Mock, AsyncMock, MagicMock, patch
+from src.repositories.user_recommendation_repository import UserRecommendationRepository
+from src.services.recommendation_batch import group_profiles, precompute_recommendations
+from src.services.recommendation_cache import profile_key
+
+CONCERTS = [
+    {'id': 'e1', 'url': 'https://afisha.yandex.ru/moscow/concert/rock', 'title': 'Rock Fest', 'description': 'Arctic rock bands'},
+    {'id': 'e2', 'url': 'https://afisha.yandex.ru/moscow/concert/jazz', 'title': 'Jazz Night', 'description': 'Smooth jazz'},
+    {'id': 'e3', 'url': 'https://afisha.yandex.ru/kazan/concert/kino', 'title': 'Кино трибьют', 'description': ''},
+]
+
+def make_repositories(active, artists):
+    concerts = Mock()
+    concerts.get_events_by_category_async = AsyncMock(return_value=CONCERTS)
+    users = Mock()
+    users.get_user_artists = AsyncMock(return_value=artists)
+    store = Mock()
+    store.get_active_users = AsyncMock(return_value=active)
+    store.save_recommendations = AsyncMock(side_effect=lambda rows, version: len(rows))
+    return concerts, users, store
+
+def test_group_profiles_merges_similar_users():
+    groups = group_profiles({
+        1: ['Kino', 'Zemfira', 'Splean'],
+        2: ['KINO', 'Земфира', 'Splean'],
+        3: ['Miles Davis', 'John Coltrane'],
+    }, threshold=0.5)
+    assert sorted(sorted(members) for members, _ in groups) == [[1, 2], [3]]
+    merged = next(artists for members, artists in groups if 1 in members)
+    assert merged[:2] == ['Kino', 'Splean']
+
+def test_group_profiles_threshold_one_keeps_users_apart():
+    groups = group_profiles({1: ['Kino', 'Zemfira'], 2: ['Kino']}, threshold=1.0)
+    assert len(groups) == 2
+
+def test_profile_key_ignores_order_and_case():
+    assert profile_key(['Kino', 'Zemfira']) == profile_key(['zemfira ', 'KINO'])
+    assert profile_key(['Kino']) != profile_key(['Kino', 'Zemfira'])
+
+@pytest.mark.asyncio
+async def test_precompute_stores_local_results_per_user():
+    concerts, users, store = make_repositories(
+        {'moscow': [1, 2, 3], 'kazan': [4]},
+        {1: ['Arctic Monkeys'], 2: ['Jazz Trio'], 4: ['Kino']}
+    )
+    with patch('src.services.recommendation_service.config') as mock_config, \
+            patch('src.services.recommendation_service.get_shared_cooccurrence', AsyncMock(return_value=None)):
+        mock_config.GEMINI_API_KEY = ''
+        stats = await precompute_recommendations(concerts, users, store)
+
+    rows, version = store.save_recommendations.await_args.args
+    by_user = {row['user_id']: row for row in rows}
+    assert [c['title'] for c in by_user[1]['concerts']] == ['Rock Fest']
+    assert [c['title'] for c in by_user[2]['concerts']] == ['Jazz Night']
+    assert [c['title'] for c in by_user[4]['concerts']] == ['Кино трибьют']
+    assert by_user[1]['profile_key'] == profile_key(['Arctic Monkeys'])
+    assert 3 not in by_user
+    assert version
+    assert stats['users'] == 3 and stats['cities'] == 2 and stats['stored'] == 3
+    users.get_user_artists.assert_awaited_once_with([1, 2, 3, 4])
+
+@pytest.mark.asyncio
+async def test_precompute_batches_similar_profiles_into_one_call():
+    concerts, users, store = make_repositories(
+        {'moscow': [1, 2, 3]},
+        {1: ['Kino', 'Zemfira'], 2: ['Kino', 'Zemfira'], 3: ['Miles Davis']}
+    )
+    service = Mock(enabled=True)
+    service.recommend_from_catalog = AsyncMock(return_value=[CONCERTS[0]])
+    with patch('src.services.recommendation_batch.RecommendationService', return_value=service):
+        stats = await precompute_recommendations(concerts, users, store)
+
+    assert service.recommend_from_catalog.await_count == 2
+    assert stats['groups'] == 2 and stats['stored'] == 3
+
+@pytest.mark.asyncio
+async def test_precompute_skips_without_active_users():
+    concerts, users, store = make_repositories({}, {})
+    stats = await precompute_recommendations(concerts, users, store)
+    assert stats['users'] == 0
+    concerts.get_events_by_category_async.assert_not_awaited()
+    store.save_recommendations.assert_not_awaited()
+
+def _stored_row(computed_at, profile='key'):
+    row = Mock()
+    row.concerts = [{'title': 'Stored'}]
+    row.profile_key = profile
+    row.computed_at = computed_at
+    return row
+
+def _session_returning(row):
+    session = AsyncMock()
+    result = MagicMock()
+    result.scalar_one_or_none.return_value = row
+    session.execute = AsyncMock(return_value=result)
+    return session
+
+@pytest.mark.asyncio
+async def test_stored_recommendations_are_returned_while_fresh():
+    fresh = datetime.now(timezone.utc) - timedelta(hours=1)
+    store = UserRecommendationRepository(session=_session_returning(_stored_row(fresh)))
+
+    assert await store.get_recommendations(1, 'moscow', 'key') == [{'title': 'Stored'}]
+    assert await store.get_recommendations(1, 'moscow', 'other') is None
+
+@pytest.mark.asyncio
+async def test_stale_stored_recommendations_are_ignored():
+    stale = datetime.now(timezone.utc) - timedelta(days=2)
+    store = UserRecommendationRepository(session=_session_returning(_stored_row(stale)))
+
+    assert await store.get_recommendations(1, 'moscow', 'key') is None
+    assert await store.get_recommendations(1, 'moscow', 'key', max_age=timedelta(days=3)) == [{'title': 'Stored'}]
@@ -0,0 +1,90 @@
+import pytest
+from unittest.mock import Mock, MagicMock, AsyncMock, patch
+from src.services.recommendation_cache import RecommendationCache, recommendation_key, resolve_urls
+from src.services.recommendation_service import RecommendationService
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+def test_key_is_stable_for_same_artist_set():
+    base = recommendation_key(['Kino', 'Zemfira'], 'moscow', 'v1')
+    assert recommendation_key(['zemfira', ' KINO ', 'Kino'], 'moscow', 'v1') == base
+    assert recommendation_key(['Kino', 'Zemfira'], 'kazan', 'v1') != base
+    assert recommendation_key(['Kino', 'Zemfira'], 'moscow', 'v2') != base
+    artists = [f'Artist {i}' for i in range(20)]
+    assert recommendation_key(artists + ['Tail'], '', 'v1') == recommendation_key(artists, '', 'v1')
+
+def test_ttl_expiry():
+    clock = Clock()
+    cache = RecommendationCache(max_entries=10, ttl_seconds=60, clock=clock)
+    cache.set('k', ['u1'])
+    assert cache.get('k') == ['u1']
+    clock.now += 61
+    assert cache.get('k') is None
+    assert cache.stats == {'hits': 1, 'misses': 1}
+
+def test_lru_eviction():
+    cache = RecommendationCache(max_entries=2, ttl_seconds=60)
+    cache.set('a', ['1'])
+    cache.set('b', ['2'])
+    cache.get('a')
+    cache.set('c', ['3'])
+    assert cache.get('b') is None
+    assert cache.get('a') == ['1'] and cache.get('c') == ['3']
+
+def test_disk_backend(tmp_path):
+    clock = Clock()
+    RecommendationCache(max_entries=5, ttl_seconds=60, directory=tmp_path, clock=clock).set('k', ['u1', 'u2'])
+    fresh = RecommendationCache(max_entries=5, ttl_seconds=60, directory=tmp_path, clock=clock)
+    assert fresh.get('k') == ['u1', 'u2']
+    clock.now += 120
+    fresh.clear()
+    assert fresh.get('k') is None
+    assert not (tmp_path / 'k.json').exists()
+
+def test_disk_backend_sweeps_expired_and_caps_files(tmp_path):
+    from src.services.recommendation_cache import SWEEP_INTERVAL_SECONDS
+    clock = Clock()
+    cache = RecommendationCache(max_entries=5, ttl_seconds=1000, directory=tmp_path, clock=clock, max_disk_entries=3)
+    cache.set('old', ['u0'])
+    (tmp_path / 'broken.json').write_text('{', encoding='utf-8')
+
+    clock.now += 1000
+    for i in range(5):
+        clock.now += 1
+        cache.set(f'k{i}', [f'u{i}'])
+
+    assert sorted(p.stem for p in tmp_path.glob('*.json')) == ['k0', 'k1', 'k2', 'k3', 'k4']
+    clock.now += SWEEP_INTERVAL_SECONDS
+    cache.set('k5', ['u5'])
+    assert sorted(p.stem for p in tmp_path.glob('*.json')) == ['k3', 'k4', 'k5']
+
+def test_resolve_urls_ignores_order_and_missing():
+    concerts = [{'url': 'b', 'title': 'B'}, {'url': 'a', 'title': 'A'}]
+    assert [c['title'] for c in resolve_urls(['a', 'gone', 'b'], concerts)] == ['A', 'B']
+
+@pytest.mark.asyncio
+async def test_service_uses_cache_across_reordering():
+    concerts = [
+        {'url': 'https://afisha.yandex.ru/moscow/1', 'title': 'One'},
+        {'url': 'https://afisha.yandex.ru/moscow/2', 'title': 'Two'},
+    ]
+    repository = Mock(get_events_by_category_async=AsyncMock(return_value=concerts))
+    with patch('src.services.recommendation_service.config') as mock_config:
+        mock_config.GEMINI_API_KEY = 'key'
+        mock_config.proxy_url = None
+        with patch('src.services.recommendation_service.genai.Client', return_value=MagicMock()):
+            service = RecommendationService(repository, city='moscow', cache=RecommendationCache(max_entries=10, ttl_seconds=60))
+
+    service.client.aio.models.generate_content = AsyncMock(return_value=Mock(text='{"recommended_indices": [2]}'))
+    first = await service.get_recommendations_async(['Artist'])
+
+    repository.get_events_by_category_async.return_value = list(reversed(concerts))
+    second = await service.get_recommendations_async(['artist'])
+
+    assert [c['title'] for c in first] == [c['title'] for c in second] == ['Two']
+    assert service.client.aio.models.generate_content.await_count == 1
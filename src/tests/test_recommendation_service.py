@@ -70,28 +70,33 @@ class TestRecommendationService:
         assert 'Concert 2' in result
         assert 'Test description' in result
     
-    def test_get_recommendations_disabled(self, service_disabled):
-        
-        result = service_disabled.get_recommendations(['Artist 1'])
+    @pytest.mark.asyncio
+    async def test_get_recommendations_disabled(self, service_disabled, mock_repository):
+        from unittest.mock import AsyncMock
+        mock_repository.get_events_by_category_async = AsyncMock(return_value=[])
+        result = await service_disabled.get_recommendations_async(['Artist 1'])
         assert result == []
-    
-    def test_get_recommendations_no_artists(self, service_enabled):
-        
-        result = service_enabled.get_recommendations([])
+
+    @pytest.mark.asyncio
+    async def test_get_recommendations_no_artists(self, service_enabled, mock_repository):
+        from unittest.mock import AsyncMock
+        mock_repository.get_events_by_category_async = AsyncMock(return_value=[])
+        result = await service_enabled.get_recommendations_async([])
         assert result == []
-    
-    def test_get_recommendations_no_concerts(self, service_enabled, mock_repository):
-        
-        mock_repository.get_events_by_category.return_value = []
-        result = service_enabled.get_recommendations(['Artist 1'])
+        mock_repository.get_events_by_category_async.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_get_recommendations_no_concerts(self, service_enabled, mock_repository):
+        from unittest.mock import AsyncMock
+        mock_repository.get_events_by_category_async = AsyncMock(return_value=[])
+        result = await service_enabled.get_recommendations_async(['Artist 1'])
         assert result == []
-    
-    @patch('src.services.recommendation_service.json.loads')
-    @patch('src.services.recommendation_service.genai.types.GenerateContentConfig')
-    def test_get_recommendations_success(self, mock_config, mock_json, service_enabled, mock_repository):
-        
+        service_enabled.client.aio.models.generate_content.assert_not_called()
 
-        mock_repository.get_events_by_category.return_value = [
+    @pytest.mark.asyncio
+    async def test_get_recommendations_success(self, service_enabled, mock_repository):
+        from unittest.mock import AsyncMock
+        mock_repository.get_events_by_category_async = AsyncMock(return_value=[
             {
                 'url': 'https://afisha.yandex.ru/moscow/concert1',
                 'title': 'Concert 1',
@@ -102,15 +107,146 @@ class TestRecommendationService:
                 'title': 'Concert 2',
                 'description': 'Test'
             }
-        ]
-        
-        mock_response = Mock()
-        mock_response.text = '{"recommended_indices": [1, 2]}'
-        service_enabled.client.models.generate_content.return_value = mock_response
-        
-        mock_json.return_value = {'recommended_indices': [1, 2]}
-        
-        result = service_enabled.get_recommendations(['Artist 1'])
+        ])
+        service_enabled.client.aio.models.generate_content = AsyncMock(
+            return_value=Mock(text='{"recommended_indices": [1, 2]}')
+        )
+
+        result = await service_enabled.get_recommendations_async(['Artist 1'])
+
+        assert service_enabled.client.aio.models.generate_content.await_count == 1
+        assert {c['title'] for c in result} == {'Concert 1', 'Concert 2'}
+
+
+CITY_CONCERTS = [
+    {'url': 'https://afisha.yandex.ru/moscow/concert1', 'title': 'Jazz Night', 'description': 'Smooth jazz'},
+    {'url': 'https://afisha.yandex.ru/moscow/concert2', 'title': 'Rock Fest', 'description': 'Arctic rock bands'},
+    {'url': 'https://afisha.yandex.ru/kazan/concert3', 'title': 'Rock Kazan', 'description': ''},
+]
+
+def quota_error():
+    from google.genai import errors as genai_errors
+    return genai_errors.ClientError(429, {'error': {'code': 429, 'message': 'quota', 'status': 'RESOURCE_EXHAUSTED'}})
+
+class TestRecommendationServiceAsync:
+
+    @pytest.fixture
+    def mock_repository(self):
+        from unittest.mock import AsyncMock
+        mock_repository = Mock()
+        mock_repository.get_events_by_category_async = AsyncMock(return_value=CITY_CONCERTS)
+        return mock_repository
+
+    @pytest.fixture
+    def service(self, mock_repository):
+        with patch('src.services.recommendation_service.config') as mock_config:
+            mock_config.GEMINI_API_KEY = 'test_key'
+            mock_config.proxy_url = None
+            with patch('src.services.recommendation_service.genai.Client') as mock_client_class:
+                mock_client_class.return_value = MagicMock()
+                return RecommendationService(mock_repository, city='moscow')
+
+    @pytest.mark.asyncio
+    async def test_async_success(self, service):
+        from unittest.mock import AsyncMock
+        service.client.aio.models.generate_content = AsyncMock(return_value=Mock(text='{"recommended_indices": [2, 1, 9]}'))
+        result = await service.get_recommendations_async(['Artist'])
+        assert [c['title'] for c in result] == ['Rock Fest', 'Jazz Night']
+
+    @pytest.mark.asyncio
+    @patch('src.services.recommendation_service.asyncio.sleep')
+    async def test_async_retries_quota_without_blocking(self, mock_sleep, service):
+        from unittest.mock import AsyncMock
+        service.client.aio.models.generate_content = AsyncMock(
+            side_effect=[quota_error(), Mock(text='{"recommended_indices": [1]}')]
+        )
+        result = await service.get_recommendations_async(['Artist'], deadline_seconds=60)
+        assert [c['title'] for c in result] == ['Jazz Night']
+        mock_sleep.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    @patch('src.services.recommendation_service.asyncio.sleep')
+    async def test_async_last_quota_error_does_not_sleep(self, mock_sleep, service):
+        from unittest.mock import AsyncMock
+        service.client.aio.models.generate_content = AsyncMock(side_effect=quota_error())
+        with patch('src.services.recommendation_service.config') as mock_config:
+            mock_config.GEMINI_MAX_RETRIES = 2
+            mock_config.GEMINI_RETRY_BASE_DELAY = 1
+            mock_config.GEMINI_CANDIDATES = 10
+            mock_config.GEMINI_DESCRIPTION_CHARS = 80
+            result = await service.get_recommendations_async(['Arctic Monkeys'], deadline_seconds=60)
+
+        assert [c['title'] for c in result] == ['Rock Fest']
+        assert service.client.aio.models.generate_content.await_count == 2
+        mock_sleep.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_async_quota_past_deadline_falls_back(self, service):
+        from unittest.mock import AsyncMock
+        service.client.aio.models.generate_content = AsyncMock(side_effect=quota_error())
+        result = await service.get_recommendations_async(['Arctic Monkeys'], deadline_seconds=0.5)
+        assert [c['title'] for c in result] == ['Rock Fest']
+        assert service.client.aio.models.generate_content.await_count == 1
+
+    @pytest.mark.asyncio
+    async def test_async_deadline_falls_back(self, service):
+        import asyncio
+
+        async def slow(**kwargs):
+            await asyncio.sleep(5)
+
+        service.client.aio.models.generate_content = slow
+        result = await service.get_recommendations_async(['Jazz Band'], deadline_seconds=0.05)
+        assert [c['title'] for c in result] == ['Jazz Night']
+
+    @pytest.mark.asyncio
+    async def test_async_disabled_uses_local(self, mock_repository):
+        with patch('src.services.recommendation_service.config') as mock_config:
+            mock_config.GEMINI_API_KEY = ''
+            service = RecommendationService(mock_repository, city='moscow')
+        result = await service.get_recommendations_async(['Rock Band'])
+        assert [c['title'] for c in result] == ['Rock Fest']
+        assert await service.get_recommendations_async([]) == []
+
+    @pytest.mark.asyncio
+    async def test_async_prompt_uses_preranked_candidates(self, service, caplog):
+        import logging
+        from unittest.mock import AsyncMock
+        usage = Mock(prompt_token_count=120, candidates_token_count=8, total_token_count=128)
+        service.client.aio.models.generate_content = AsyncMock(
+            return_value=Mock(text='{"recommended_indices": [1]}', usage_metadata=usage)
+        )
+        with patch('src.services.recommendation_service.config') as mock_config:
+            mock_config.GEMINI_CANDIDATES = 1
+            mock_config.GEMINI_DESCRIPTION_CHARS = 80
+            mock_config.GEMINI_MAX_RETRIES = 1
+            mock_config.GEMINI_DEADLINE_SECONDS = 5
+            with caplog.at_level(logging.INFO, logger='src.services.recommendation_service'):
+                result = await service.get_recommendations_async(['Arctic Monkeys'])
+
+        assert [c['title'] for c in result] == ['Rock Fest']
+        prompt = service.client.aio.models.generate_content.await_args.kwargs['contents']
+        assert 'Rock Fest' in prompt and 'Jazz Night' not in prompt
+        assert 'tokens prompt=120 output=8 total=128' in caplog.text
+
 
-        assert service_enabled.client.models.generate_content.called or result == []
+def test_compact_prompt_deduplicates_venues():
+    with patch('src.services.recommendation_service.config') as mock_config:
+        mock_config.GEMINI_API_KEY = ''
+        service = RecommendationService(Mock(), city='moscow')
+    concerts = [
+        {'title': 'Jazz | Night', 'description': '12 марта, 19:00 • Крокус Сити Холл', 'url': 'u1'},
+        {'title': 'Rock Fest', 'description': '14 марта • Крокус Сити Холл • Большой рок-фестиваль ' + 'x' * 200, 'url': 'u2'},
+        {'title': 'Open Air', 'description': 'Без площадки', 'url': 'u3'},
+    ]
+    with patch('src.services.recommendation_service.config') as mock_config:
+        mock_config.GEMINI_DESCRIPTION_CHARS = 40
+        prompt = service._format_concerts_for_prompt(concerts)
 
+    assert prompt.count('Крокус Сити Холл') == 1
+    assert '1|Jazz / Night|12 марта|V1' in prompt
+    lines = prompt.splitlines()
+    rock = next(line for line in lines if line.startswith('2|'))
+    assert rock.startswith('2|Rock Fest|14 марта|V1|Большой рок-фестиваль')
+    assert rock.endswith('…') and len(rock.split('|')[-1]) == 41
+    assert '3|Open Air|||Без площадки' in prompt
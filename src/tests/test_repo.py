@@ -333,3 +333,48 @@ async def test_get_events_by_category_error(mock_get_session):
     r = ConcertRepository()
     res = r.get_events_by_category('concert')
     assert res == []
+
+@pytest.mark.asyncio
+@patch('src.repositories.concert_repository.ConcertRepository._get_session')
+async def test_upsert_events_batch_counts(mock_get_session):
+    from sqlalchemy.dialects import postgresql
+    session = AsyncMock()
+    result = MagicMock()
+    result.scalars.return_value.all.return_value = [True, False]
+    session.execute = AsyncMock(return_value=result)
+    mock_get_session.return_value = session
+
+    r = ConcertRepository()
+    events = [
+        {'url': 'http://a.com', 'title': 'A'},
+        {'url': 'http://b.com', 'title': 'B'},
+        {'url': 'http://a.com', 'title': 'A updated'},
+        {'title': 'No url'},
+    ]
+    res = await r.upsert_events_batch(events)
+
+    assert res == (1, 1)
+    session.commit.assert_called_once()
+    stmt = session.execute.call_args[0][0]
+    sql = str(stmt.compile(dialect=postgresql.dialect()))
+    assert 'ON CONFLICT (url) DO UPDATE' in sql
+    assert 'RETURNING (xmax = 0)' in sql
+    assert len(stmt.compile(dialect=postgresql.dialect()).params) > 0
+
+@pytest.mark.asyncio
+@patch('src.repositories.concert_repository.ConcertRepository._get_session')
+async def test_upsert_events_batch_empty(mock_get_session):
+    r = ConcertRepository()
+    assert await r.upsert_events_batch([{'title': 'No url'}]) == (0, 0)
+    mock_get_session.assert_not_called()
+
+@pytest.mark.asyncio
+@patch('src.repositories.concert_repository.ConcertRepository._get_session')
+async def test_upsert_events_batch_error(mock_get_session):
+    session = AsyncMock()
+    session.execute = AsyncMock(side_effect=Exception('db down'))
+    mock_get_session.return_value = session
+
+    r = ConcertRepository()
+    assert await r.upsert_events_batch([{'url': 'http://a.com'}]) == (0, 0)
+    session.rollback.assert_called_once()
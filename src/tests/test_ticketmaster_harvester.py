@@ -0,0 +1,135 @@
+import time
+import asyncio
+import pytest
+import pytest_asyncio
+from unittest.mock import AsyncMock, Mock
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+from src.clients.global_concert_client import TicketmasterError
+from src.clients.ticketmaster_harvester import TicketmasterHarvester, TokenBucket, retry_after_seconds
+
+def tm_payload(keyword, count=2):
+    return {'_embedded': {'events': [
+        {
+            'name': f'{keyword} live {i}',
+            'dates': {'start': {'dateTime': '2025-06-01T19:00:00Z'}},
+            '_embedded': {'venues': [{'name': 'Arena', 'city': {'name': 'Berlin'}}]},
+            '_links': {'self': {'href': f'https://tm.example/{keyword}/{i}'}}
+        }
+        for i in range(count)
+    ]}}
+
+@pytest_asyncio.fixture
+async def tm_server():
+    calls = {'count': 0, 'limited': False}
+
+    async def events(request):
+        calls['count'] += 1
+        keyword = request.query['keyword']
+        if keyword == 'limited' and not calls['limited']:
+            calls['limited'] = True
+            return web.json_response({}, status=429, headers={'Retry-After': '0.2'})
+        if keyword == 'throttled':
+            return web.json_response({}, status=429, headers={'Retry-After': '0'})
+        if keyword == 'broken':
+            return web.json_response({'fault': 'boom'}, status=500)
+        if keyword == 'touring':
+            page = int(request.query.get('page', 0))
+            payload = tm_payload(f'touring-{page}')
+            payload['page'] = {'number': page, 'totalPages': 3}
+            return web.json_response(payload)
+        return web.json_response(tm_payload(keyword))
+
+    app = web.Application()
+    app.router.add_get('/events.json', events)
+    server = TestServer(app)
+    await server.start_server()
+    server.calls = calls
+    yield server
+    await server.close()
+
+def make_repository():
+    repository = Mock()
+    repository.upsert_events_batch = AsyncMock(side_effect=lambda batch: (len(batch), 0))
+    return repository
+
+def test_retry_after_seconds():
+    assert retry_after_seconds('3', 0) == 3.0
+    assert 1 <= retry_after_seconds(None, 0) < 2
+    assert 4 <= retry_after_seconds('soon', 2) < 5
+
+def test_harvester_requires_token():
+    with pytest.raises(TicketmasterError):
+        TicketmasterHarvester(None)
+
+@pytest.mark.asyncio
+async def test_token_bucket_limits_rate():
+    bucket = TokenBucket(rate_per_second=20, capacity=1)
+    start = time.monotonic()
+    for _ in range(5):
+        await bucket.acquire()
+    assert time.monotonic() - start >= 0.18
+
+@pytest.mark.asyncio
+async def test_token_bucket_pause_blocks_acquire():
+    bucket = TokenBucket(rate_per_second=100)
+    bucket.pause(0.2)
+    start = time.monotonic()
+    await bucket.acquire()
+    assert time.monotonic() - start >= 0.19
+
+@pytest.mark.asyncio
+async def test_harvest_pipelines_fetch_convert_write(tm_server):
+    harvester = TicketmasterHarvester(
+        'token', rate_per_second=100, concurrency=4, write_batch_size=3,
+        base_url=str(tm_server.make_url('/events.json'))
+    )
+    repository = make_repository()
+
+    stats = await harvester.run(['a', 'b', 'limited', 'broken', 'c'], repository)
+
+    assert stats['events'] == 8
+    assert stats['inserted'] == 8
+    assert stats['rate_limited'] == 1
+    assert stats['failed'] == 1
+    assert harvester.checked == {'a': 2, 'b': 2, 'limited': 2, 'c': 2}
+    written = [e for call in repository.upsert_events_batch.call_args_list for e in call[0][0]]
+    assert {e['artist_name'] for e in written} == {'a', 'b', 'limited', 'c'}
+    assert all(len(call[0][0]) <= 4 for call in repository.upsert_events_batch.call_args_list)
+
+@pytest.mark.asyncio
+async def test_harvest_follows_pages(tm_server):
+    harvester = TicketmasterHarvester(
+        'token', rate_per_second=100, concurrency=1, max_pages=2,
+        base_url=str(tm_server.make_url('/events.json'))
+    )
+
+    stats = await harvester.run(['touring'], make_repository())
+
+    assert harvester.checked == {'touring': 4}
+    assert stats['requests'] == 2
+
+@pytest.mark.asyncio
+async def test_harvest_does_not_mark_rate_limited_artist_checked(tm_server):
+    harvester = TicketmasterHarvester(
+        'token', rate_per_second=100, concurrency=2, retries=2,
+        base_url=str(tm_server.make_url('/events.json'))
+    )
+
+    stats = await harvester.run(['a', 'throttled'], make_repository())
+
+    assert harvester.checked == {'a': 2}
+    assert stats['failed'] == 1
+    assert stats['rate_limited'] == 2
+
+@pytest.mark.asyncio
+async def test_harvest_stops_when_writer_fails(tm_server):
+    harvester = TicketmasterHarvester(
+        'token', rate_per_second=100, concurrency=2, queue_size=1, write_batch_size=1,
+        base_url=str(tm_server.make_url('/events.json'))
+    )
+    repository = Mock()
+    repository.upsert_events_batch = AsyncMock(side_effect=RuntimeError('db is down'))
+
+    with pytest.raises(RuntimeError, match='db is down'):
+        await asyncio.wait_for(harvester.run([f'artist-{i}' for i in range(20)], repository), timeout=5)
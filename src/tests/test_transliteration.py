@@ -0,0 +1,17 @@
+from src.utils.transliteration import to_latin, to_cyrillic, name_variants, normalize
+
+def test_to_latin():
+    assert to_latin('Земфира') == 'zemfira'
+    assert to_latin('Щербаков') == 'shcherbakov'
+
+def test_to_cyrillic():
+    assert to_cyrillic('Zemfira') == 'земфира'
+    assert to_cyrillic('Monetochka') == 'монеточка'
+
+def test_name_variants():
+    assert name_variants('  Кино ') == ['кино', 'kino']
+    assert name_variants('Kino') == ['kino', 'кино']
+    assert name_variants('') == []
+
+def test_normalize():
+    assert normalize('  Arctic   Monkeys ') == 'arctic monkeys'
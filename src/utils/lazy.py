@@ -0,0 +1,51 @@
+import sys
+import importlib
+import importlib.util
+from types import ModuleType
+from typing import Any, Callable
+
+def lazy_module(name: str) -> ModuleType:
+    if name in sys.modules:
+        return sys.modules[name]
+
+    spec = importlib.util.find_spec(name)
+    if spec is None:
+        raise ModuleNotFoundError(f"No module named '{name}'", name=name)
+    loader = importlib.util.LazyLoader(spec.loader)
+    spec.loader = loader
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    loader.exec_module(module)
+    return module
+
+class LazyObject:
+    __slots__ = ('_factory', '_value')
+
+    def __init__(self, factory: Callable[[], Any]):
+        object.__setattr__(self, '_factory', factory)
+        object.__setattr__(self, '_value', None)
+
+    def _resolve(self) -> Any:
+        if self._value is None:
+            object.__setattr__(self, '_value', self._factory())
+        return self._value
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._resolve(), name)
+
+    def __call__(self, *args, **kwargs) -> Any:
+        return self._resolve()(*args, **kwargs)
+
+    def __repr__(self) -> str:
+        if self._value is None:
+            return f"<lazy {getattr(self._factory, '__qualname__', self._factory)}>"
+        return repr(self._value)
+
+def lazy_attribute(module_name: str, attribute: str) -> LazyObject:
+    return LazyObject(lambda: getattr(importlib.import_module(module_name), attribute))
+
+def resolve(value: Any) -> Any:
+    return value._resolve() if isinstance(value, LazyObject) else value
+
+def is_loaded(value: Any) -> bool:
+    return not isinstance(value, LazyObject) or value._value is not None
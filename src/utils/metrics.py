@@ -0,0 +1,218 @@
+import time
+import asyncio
+import logging
+import functools
+import threading
+from bisect import bisect_left
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+NAMESPACE = 'concert_bot'
+STAGE_METRIC = 'stage_seconds'
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0)
+
+Labels = Tuple[Tuple[str, str], ...]
+
+def _labels(labels: Dict) -> Labels:
+    return tuple(sorted((key, str(value)) for key, value in labels.items()))
+
+def _escape(value: str) -> str:
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+def _format_labels(labels: Labels, extra: Optional[Tuple[str, str]] = None) -> str:
+    pairs = list(labels) + ([extra] if extra else [])
+    if not pairs:
+        return ''
+    return '{' + ','.join(f'{key}="{_escape(value)}"' for key, value in pairs) + '}'
+
+def _format_value(value: float) -> str:
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
+
+class Histogram:
+    def __init__(self, buckets: Tuple[float, ...] = DEFAULT_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+
+    def observe(self, value: float):
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+        self.max = max(self.max, value)
+
+    def quantile(self, q: float) -> float:
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        for i, count in enumerate(self.counts):
+            if seen + count >= rank and count:
+                lower = self.buckets[i - 1] if i > 0 else 0.0
+                upper = self.buckets[i] if i < len(self.buckets) else self.max
+                return min(self.max, lower + (upper - lower) * (rank - seen) / count)
+            seen += count
+        return self.max
+
+    def cumulative(self) -> List[int]:
+        total = 0
+        result = []
+        for count in self.counts:
+            total += count
+            result.append(total)
+        return result
+
+class Timer:
+    def __init__(self, registry: 'MetricsRegistry', stage: str, labels: Dict):
+        self.registry = registry
+        self.stage = stage
+        self.labels = labels
+        self.started = time.perf_counter()
+
+    def stop(self) -> float:
+        elapsed = time.perf_counter() - self.started
+        self.registry.observe(STAGE_METRIC, elapsed, stage=self.stage, **self.labels)
+        return elapsed
+
+class MetricsRegistry:
+    def __init__(self, namespace: str = NAMESPACE, buckets: Tuple[float, ...] = DEFAULT_BUCKETS):
+        self.namespace = namespace
+        self.buckets = buckets
+        self.counters: Dict[Tuple[str, Labels], float] = {}
+        self.histograms: Dict[Tuple[str, Labels], Histogram] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, name: str, value: float = 1, **labels):
+        key = (name, _labels(labels))
+        with self._lock:
+            self.counters[key] = self.counters.get(key, 0) + value
+
+    def observe(self, name: str, value: float, **labels):
+        key = (name, _labels(labels))
+        with self._lock:
+            histogram = self.histograms.get(key)
+            if histogram is None:
+                histogram = self.histograms[key] = Histogram(self.buckets)
+            histogram.observe(value)
+
+    @contextmanager
+    def span(self, stage: str, **labels) -> Iterator[None]:
+        started = time.perf_counter()
+        try:
+            yield
+        except BaseException:
+            self.inc('stage_errors_total', stage=stage, **labels)
+            raise
+        finally:
+            self.observe(STAGE_METRIC, time.perf_counter() - started, stage=stage, **labels)
+
+    def timer(self, stage: str, **labels) -> Timer:
+        return Timer(self, stage, labels)
+
+    def timed(self, stage: str) -> Callable:
+        def decorator(func: Callable) -> Callable:
+            if asyncio.iscoroutinefunction(func):
+                @functools.wraps(func)
+                async def async_wrapper(*args, **kwargs):
+                    with self.span(stage):
+                        return await func(*args, **kwargs)
+                return async_wrapper
+
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                with self.span(stage):
+                    return func(*args, **kwargs)
+            return wrapper
+        return decorator
+
+    def counter(self, name: str, **labels) -> float:
+        return self.counters.get((name, _labels(labels)), 0)
+
+    def histogram(self, name: str, **labels) -> Optional[Histogram]:
+        return self.histograms.get((name, _labels(labels)))
+
+    def stage(self, stage: str) -> Optional[Histogram]:
+        return self.histogram(STAGE_METRIC, stage=stage)
+
+    def reset(self):
+        with self._lock:
+            self.counters.clear()
+            self.histograms.clear()
+
+    def render(self) -> str:
+        with self._lock:
+            counters = sorted(self.counters.items())
+            histograms = sorted(self.histograms.items(), key=lambda item: item[0])
+
+        lines = []
+        declared = set()
+        for (name, labels), value in counters:
+            metric = f'{self.namespace}_{name}'
+            if metric not in declared:
+                declared.add(metric)
+                lines.append(f'# TYPE {metric} counter')
+            lines.append(f'{metric}{_format_labels(labels)} {_format_value(value)}')
+
+        for (name, labels), histogram in histograms:
+            metric = f'{self.namespace}_{name}'
+            if metric not in declared:
+                declared.add(metric)
+                lines.append(f'# TYPE {metric} histogram')
+            bounds = [_format_value(b) for b in histogram.buckets] + ['+Inf']
+            for bound, total in zip(bounds, histogram.cumulative()):
+                lines.append(f'{metric}_bucket{_format_labels(labels, ("le", bound))} {total}')
+            lines.append(f'{metric}_sum{_format_labels(labels)} {_format_value(histogram.sum)}')
+            lines.append(f'{metric}_count{_format_labels(labels)} {histogram.count}')
+
+        return '\n'.join(lines) + '\n'
+
+    def summary(self) -> str:
+        with self._lock:
+            stages = sorted((
+                (dict(labels).get('stage', name), histogram)
+                for (name, labels), histogram in self.histograms.items()
+                if name == STAGE_METRIC
+            ), key=lambda item: item[0])
+            counters = sorted(self.counters.items())
+
+        lines = []
+        for stage, histogram in stages:
+            lines.append(
+                f"  {stage}: n={histogram.count} avg={histogram.sum / histogram.count * 1000:.0f}ms "
+                f"p50={histogram.quantile(0.5) * 1000:.0f}ms p95={histogram.quantile(0.95) * 1000:.0f}ms "
+                f"max={histogram.max * 1000:.0f}ms"
+            )
+        for (name, labels), value in counters:
+            lines.append(f"  {name}{_format_labels(labels)}={_format_value(value)}")
+        return '\n'.join(lines)
+
+    def log_summary(self):
+        summary = self.summary()
+        if summary:
+            logger.info(f"Metrics summary:\n{summary}")
+
+metrics = MetricsRegistry()
+
+def span(stage: str, **labels):
+    return metrics.span(stage, **labels)
+
+def inc(name: str, value: float = 1, **labels):
+    metrics.inc(name, value, **labels)
+
+def observe(name: str, value: float, **labels):
+    metrics.observe(name, value, **labels)
+
+def timer(stage: str, **labels) -> Timer:
+    return metrics.timer(stage, **labels)
+
+def timed(stage: str) -> Callable:
+    return metrics.timed(stage)
+
+async def log_periodically(interval: float, registry: MetricsRegistry = None):
+    registry = registry or metrics
+    while True:
+        await asyncio.sleep(interval)
+        registry.log_summary()
@@ -0,0 +1,7 @@
+import os
+from pathlib import Path
+
+def logs_dir() -> Path:
+    if os.path.exists('/app/logs'):
+        return Path('/app/logs')
+    return Path(__file__).parent.parent / 'logs'
@@ -0,0 +1,49 @@
+import time
+import asyncio
+import logging
+from typing import Callable, Optional
+
+logger = logging.getLogger(__name__)
+
+class TokenBucket:
+    def __init__(
+        self,
+        rate_per_second: float,
+        capacity: Optional[float] = None,
+        clock: Callable[[], float] = time.monotonic,
+        name: str = "Ticketmaster"
+    ):
+        self.rate = rate_per_second
+        self.capacity = capacity if capacity is not None else max(1.0, rate_per_second)
+        self.clock = clock
+        self.name = name
+        self.tokens = self.capacity
+        self.updated_at = clock()
+        self.paused_until = 0.0
+        self._lock = asyncio.Lock()
+
+    def pause(self, seconds: float):
+        resume_at = self.clock() + seconds
+        if resume_at > self.paused_until:
+            self.paused_until = resume_at
+            self.tokens = 0.0
+            logger.warning(f"[{self.name}] Rate limited, pausing all requests for {seconds:.1f}s")
+
+    def _refill(self, now: float):
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.rate)
+        self.updated_at = now
+
+    async def acquire(self):
+        async with self._lock:
+            while True:
+                now = self.clock()
+                if now < self.paused_until:
+                    await asyncio.sleep(self.paused_until - now)
+                    self.updated_at = self.clock()
+                    continue
+
+                self._refill(now)
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                await asyncio.sleep((1 - self.tokens) / self.rate)
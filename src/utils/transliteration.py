@@ -0,0 +1,49 @@
+import re
+from typing import List
+
+CYRILLIC_TO_LATIN = {
+    'а': 'a', 'б': 'b', 'в': 'v', 'г': 'g', 'д': 'd', 'е': 'e', 'ё': 'e', 'ж': 'zh',
+    'з': 'z', 'и': 'i', 'й': 'y', 'к': 'k', 'л': 'l', 'м': 'm', 'н': 'n', 'о': 'o',
+    'п': 'p', 'р': 'r', 'с': 's', 'т': 't', 'у': 'u', 'ф': 'f', 'х': 'kh', 'ц': 'ts',
+    'ч': 'ch', 'ш': 'sh', 'щ': 'shch', 'ъ': '', 'ы': 'y', 'ь': '', 'э': 'e', 'ю': 'yu',
+    'я': 'ya'
+}
+
+LATIN_TO_CYRILLIC = [
+    ('shch', 'щ'), ('sch', 'щ'), ('zh', 'ж'), ('kh', 'х'), ('ts', 'ц'), ('ch', 'ч'),
+    ('sh', 'ш'), ('yu', 'ю'), ('ya', 'я'), ('yo', 'ё'), ('ye', 'е'), ('ph', 'ф'),
+    ('a', 'а'), ('b', 'б'), ('c', 'к'), ('d', 'д'), ('e', 'е'), ('f', 'ф'), ('g', 'г'),
+    ('h', 'х'), ('i', 'и'), ('j', 'дж'), ('k', 'к'), ('l', 'л'), ('m', 'м'), ('n', 'н'),
+    ('o', 'о'), ('p', 'п'), ('q', 'к'), ('r', 'р'), ('s', 'с'), ('t', 'т'), ('u', 'у'),
+    ('v', 'в'), ('w', 'в'), ('x', 'кс'), ('y', 'и'), ('z', 'з')
+]
+
+_LATIN_PATTERN = re.compile('|'.join(latin for latin, _ in LATIN_TO_CYRILLIC))
+_LATIN_MAP = dict(LATIN_TO_CYRILLIC)
+
+def normalize(name: str) -> str:
+    return re.sub(r'\s+', ' ', name.lower().strip())
+
+def has_cyrillic(text: str) -> bool:
+    return bool(re.search(r'[а-яё]', text, re.IGNORECASE))
+
+def has_latin(text: str) -> bool:
+    return bool(re.search(r'[a-z]', text, re.IGNORECASE))
+
+def to_latin(text: str) -> str:
+    return ''.join(CYRILLIC_TO_LATIN.get(ch, ch) for ch in text.lower())
+
+def to_cyrillic(text: str) -> str:
+    return _LATIN_PATTERN.sub(lambda m: _LATIN_MAP[m.group(0)], text.lower())
+
+def name_variants(name: str) -> List[str]:
+    normalized = normalize(name)
+    if not normalized:
+        return []
+
+    variants = [normalized]
+    if has_cyrillic(normalized):
+        variants.append(to_latin(normalized))
+    if has_latin(normalized):
+        variants.append(to_cyrillic(normalized))
+    return list(dict.fromkeys(variants))